@@ -0,0 +1,38 @@
+"""Add analysis_runs table
+
+Revision ID: 045
+Revises: 044
+Create Date: 2026-10-17
+
+One row per queued parameter sweep or walk-forward analysis. Their records
+live in Redis, so without this row they were invisible to the daily
+backtest limit.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "045"
+down_revision: Union[str, None] = "044"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "analysis_runs",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("kind", sa.String(length=20), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_analysis_runs_user_id", "analysis_runs", ["user_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_analysis_runs_user_id", table_name="analysis_runs")
+    op.drop_table("analysis_runs")
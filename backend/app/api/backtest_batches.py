@@ -10,6 +10,7 @@ from sqlmodel import Session, select
 
 from app.api.deps import get_current_user
 from app.api.backtests import get_redis_queue, _build_status_response
+from app.core.config import settings
 from app.core.database import get_session
 from app.core.logging import correlation_id_var
 from app.core.plans import get_effective_limits
@@ -17,6 +18,7 @@ from app.models.backtest_run import BacktestRun
 from app.models.strategy import Strategy
 from app.models.user import User
 import app.services.backtest_service as backtest_service
+from app.services.exceptions import RunTooExpensive
 import app.services.working_copy as working_copy
 from app.schemas.backtest import (
     BatchBacktestCreateRequest,
@@ -91,6 +93,12 @@ def create_batch_backtest(
 
         date_to = now
         date_from = now - timedelta(days=days)
+        try:
+            admission = backtest_service.admit_run(version, strategy.timeframe, date_from, date_to)
+        except RunTooExpensive as exc:
+            results.append(BatchRunResult(period_key=period, status="skipped", skip_reason=exc.detail()["detail"]))
+            continue
+
         if batch_id is None:
             batch_id = uuid4()
 
@@ -108,7 +116,7 @@ def create_batch_backtest(
         session.commit()
 
         try:
-            queue = get_redis_queue()
+            queue = get_redis_queue(settings.backtest_heavy_queue) if admission.heavy else get_redis_queue()
             queue.enqueue(
                 "app.worker.jobs.run_backtest_job",
                 job_spec.run_id,
@@ -126,6 +134,8 @@ def create_batch_backtest(
                     "timeframe": strategy.timeframe,
                     "batch_id": str(batch_id),
                     "period_key": period,
+                    "heavy": admission.heavy,
+                    "estimated_seconds": admission.eta_seconds,
                 },
             )
         except Exception:
@@ -139,7 +149,9 @@ def create_batch_backtest(
             )
 
         queued += 1
-        results.append(BatchRunResult(period_key=period, run_id=run.id, status="pending"))
+        results.append(
+            BatchRunResult(period_key=period, run_id=run.id, status="pending", estimated_seconds=admission.eta_seconds)
+        )
 
     if queued == 0 and results:
         return BatchBacktestCreateResponse(batch_id=None, runs=results)
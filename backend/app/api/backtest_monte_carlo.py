@@ -0,0 +1,141 @@
+"""API endpoints for Monte Carlo analyses of completed backtest runs."""
+import logging
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlmodel import Session, select
+
+from app.api.deps import get_current_user
+from app.api.backtests import get_redis_queue
+from app.core.config import settings
+from app.core.database import get_session
+from app.core.logging import correlation_id_var
+from app.models.backtest_run import BacktestRun
+from app.models.user import User
+from app.schemas.backtest import MonteCarloDistributionResponse, MonteCarloStatusResponse
+from app.services.sweep_store import MonteCarloRecord, MonteCarloStore, get_monte_carlo_store
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/backtests", tags=["backtests"])
+
+JOB_TIMEOUT_SECONDS = 300
+# A pending or running record older than this belongs to a job that was lost
+# (worker died, job dropped), so a new request may replace it.
+STALE_AFTER = timedelta(minutes=30)
+
+
+def _is_retryable(record: MonteCarloRecord) -> bool:
+    if record.status == "failed":
+        return True
+    if record.status == "completed":
+        return False
+    created_at = record.created_at
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return datetime.now(timezone.utc) - created_at > STALE_AFTER
+
+
+def _status_response(record: MonteCarloRecord) -> MonteCarloStatusResponse:
+    result = record.result or {}
+    return MonteCarloStatusResponse(
+        run_id=record.run_id,
+        status=record.status,
+        num_simulations=record.num_simulations,
+        num_trades=result.get("num_trades"),
+        shuffle=MonteCarloDistributionResponse(**result["shuffle"]) if result else None,
+        bootstrap=MonteCarloDistributionResponse(**result["bootstrap"]) if result else None,
+        error_message=record.error_message,
+        created_at=record.created_at,
+        completed_at=record.completed_at,
+    )
+
+
+@router.post(
+    "/{run_id}/monte-carlo",
+    response_model=MonteCarloStatusResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def create_monte_carlo(
+    run_id: UUID,
+    user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+    store: MonteCarloStore = Depends(get_monte_carlo_store),
+) -> MonteCarloStatusResponse:
+    """Enqueue a Monte Carlo analysis of a completed run.
+
+    Results are cached per run: while a completed record, or a pending or
+    running one younger than ``STALE_AFTER``, exists it is returned as-is and
+    nothing is enqueued. A failed or stale analysis is retried. Not charged
+    against the daily backtest limit.
+    """
+    run = session.exec(
+        select(BacktestRun).where(
+            BacktestRun.id == run_id,
+            BacktestRun.user_id == user.id,
+        )
+    ).first()
+    if not run:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Backtest run not found",
+        )
+
+    if run.status != "completed":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Monte Carlo analysis only available for completed runs",
+        )
+
+    cached = store.read(run_id)
+    if cached is not None and not _is_retryable(cached):
+        return _status_response(cached)
+
+    record = MonteCarloRecord(
+        run_id=run.id,
+        user_id=user.id,
+        num_simulations=settings.monte_carlo_simulations,
+        created_at=datetime.now(timezone.utc),
+    )
+    # Written before the enqueue: the job only runs a pending record
+    try:
+        store.write(record)
+        queue = get_redis_queue()
+        queue.enqueue(
+            "app.worker.jobs.run_monte_carlo_job",
+            str(run.id),
+            correlation_id_var.get("") or None,
+            job_timeout=JOB_TIMEOUT_SECONDS,
+        )
+        logger.info(
+            "monte_carlo_enqueued",
+            extra={"run_id": str(run.id), "user_id": str(user.id)},
+        )
+    except Exception:
+        record.status = "failed"
+        record.error_message = "Failed to queue analysis job"
+        try:
+            store.write(record)
+        except Exception:
+            logger.warning("monte_carlo_record_write_failed", extra={"run_id": str(run.id)})
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to queue analysis job",
+        )
+
+    return _status_response(record)
+
+
+@router.get("/{run_id}/monte-carlo", response_model=MonteCarloStatusResponse)
+def get_monte_carlo(
+    run_id: UUID,
+    user: User = Depends(get_current_user),
+    store: MonteCarloStore = Depends(get_monte_carlo_store),
+) -> MonteCarloStatusResponse:
+    """Get the status and, once completed, the percentiles of a run's Monte Carlo analysis."""
+    record = store.read(run_id)
+    if record is None or record.user_id != user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Monte Carlo analysis not found")
+
+    return _status_response(record)
@@ -0,0 +1,313 @@
+"""API endpoints for parameter sweeps and walk-forward analyses."""
+import logging
+import math
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID, uuid4
+
+logger = logging.getLogger(__name__)
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlmodel import Session, select
+
+from app.api.deps import get_current_user
+from app.api.backtests import get_redis_queue
+from app.backtest.optimization import RANKABLE_METRICS, expand_grid
+from app.core.config import settings
+from app.core.database import get_session
+from app.core.logging import correlation_id_var
+from app.models.analysis_run import AnalysisRun
+from app.models.strategy import Strategy
+from app.models.strategy_version import StrategyVersion
+from app.models.user import User
+import app.services.backtest_service as backtest_service
+import app.services.working_copy as working_copy
+from app.schemas.backtest import (
+    EquityCurvePoint,
+    SweepCreateRequest,
+    SweepCreateResponse,
+    SweepRowResponse,
+    SweepStatusResponse,
+    WalkForwardCreateRequest,
+    WalkForwardCreateResponse,
+    WalkForwardStatusResponse,
+    WalkForwardWindowResponse,
+)
+from app.schemas.strategy import StrategyDefinitionValidate
+from app.services.exceptions import StrategyValidationError
+from app.services.parameter_sweep import build_sweep_variants
+from app.services.strategy_validation import validate_strategy
+from app.services.sweep_store import (
+    SweepRecord,
+    SweepStore,
+    WalkForwardRecord,
+    WalkForwardStore,
+    get_sweep_store,
+    get_walk_forward_store,
+)
+
+router = APIRouter(prefix="/backtests", tags=["backtests"])
+
+
+def _prepare_sweep(
+    data: SweepCreateRequest,
+    user: User,
+    session: Session,
+) -> tuple[Strategy, StrategyVersion, list[dict[str, Any]], bool]:
+    """Shared preflight for sweeps and walk-forward analyses.
+
+    Resolves the strategy, enforces the combination cap, history depth and
+    daily limit, freezes the working copy and validates every combination so
+    bad overrides are rejected now rather than as a failed job. Returns
+    ``(strategy, version, combinations, use_credit)``; does NOT commit.
+    """
+    if data.rank_by not in RANKABLE_METRICS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"rank_by must be one of: {', '.join(RANKABLE_METRICS)}",
+        )
+
+    strategy = session.exec(
+        select(Strategy).where(
+            Strategy.id == data.strategy_id,
+            Strategy.user_id == user.id,
+        )
+    ).first()
+    if not strategy:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Strategy not found")
+
+    combinations = expand_grid(data.grid) if data.grid else data.combinations
+    if len(combinations) > settings.max_sweep_combinations:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A sweep can run at most {settings.max_sweep_combinations} combinations, got {len(combinations)}.",
+        )
+
+    backtest_service.enforce_history_depth(user, data.date_from, data.date_to)
+    use_credit = backtest_service.enforce_daily_limit(user, session)
+    version = working_copy.freeze(strategy, session)
+
+    try:
+        parsed = StrategyDefinitionValidate.model_validate(version.definition_json)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Strategy definition structure is malformed",
+        )
+    validation = validate_strategy(parsed)
+    if validation.errors:
+        raise StrategyValidationError(list(validation.errors))
+    build_sweep_variants(validation.strategy, combinations)
+
+    return strategy, version, combinations, use_credit
+
+
+def _record_fields(
+    data: SweepCreateRequest,
+    user: User,
+    strategy: Strategy,
+    version: StrategyVersion,
+    combinations: list[dict[str, Any]],
+) -> dict[str, Any]:
+    fee_rate, slippage_rate, spread_rate = backtest_service.resolve_rates(
+        user, data.fee_rate, data.slippage_rate, data.spread_rate,
+    )
+    return dict(
+        sweep_id=uuid4(),
+        user_id=user.id,
+        strategy_id=strategy.id,
+        strategy_version_id=version.id,
+        asset=strategy.asset,
+        timeframe=strategy.timeframe,
+        date_from=data.date_from,
+        date_to=data.date_to,
+        initial_balance=settings.default_initial_balance,
+        fee_rate=fee_rate,
+        slippage_rate=slippage_rate,
+        spread_rate=spread_rate,
+        combinations=combinations,
+        rank_by=data.rank_by,
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+def _commit_and_enqueue(
+    record: SweepRecord,
+    store: SweepStore | WalkForwardStore,
+    job: str,
+    kind: str,
+    user: User,
+    session: Session,
+    use_credit: bool,
+) -> None:
+    """Store the record, enqueue its job and only then charge the user.
+
+    The frozen version is committed first because the job reads it. The
+    AnalysisRun row is what the daily limit counts; on a failed enqueue
+    the record is marked failed and nothing is charged.
+    """
+    session.commit()
+
+    try:
+        store.write(record)
+        queue = get_redis_queue()
+        queue.enqueue(
+            job,
+            str(record.sweep_id),
+            correlation_id_var.get("") or None,
+            job_timeout=1800,
+        )
+    except Exception:
+        record.status = "failed"
+        record.error_message = "Failed to queue analysis job"
+        try:
+            store.write(record)
+        except Exception:
+            logger.warning("sweep_record_write_failed", extra={"record_id": str(record.sweep_id)})
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to queue analysis job",
+        )
+
+    session.add(AnalysisRun(id=record.sweep_id, user_id=user.id, kind=kind))
+    if use_credit:
+        user.backtest_credit_balance -= 1
+        session.add(user)
+    session.commit()
+
+    logger.info(
+        "sweep_enqueued",
+        extra={
+            "job": job,
+            "record_id": str(record.sweep_id),
+            "strategy_id": str(record.strategy_id),
+            "user_id": str(user.id),
+            "num_combinations": len(record.combinations),
+        },
+    )
+
+
+@router.post("/sweeps", response_model=SweepCreateResponse, status_code=status.HTTP_201_CREATED)
+def create_sweep(
+    data: SweepCreateRequest,
+    user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+    store: SweepStore = Depends(get_sweep_store),
+) -> SweepCreateResponse:
+    """Validate every parameter combination and enqueue one sweep job.
+
+    A sweep is charged like a single backtest: it needs daily headroom or a
+    credit, counts toward the daily limit, and consumes a credit when over
+    the free limit. Nothing is charged if the job cannot be queued.
+    """
+    strategy, version, combinations, use_credit = _prepare_sweep(data, user, session)
+    record = SweepRecord(**_record_fields(data, user, strategy, version, combinations))
+    _commit_and_enqueue(
+        record, store, "app.worker.jobs.run_parameter_sweep_job", "sweep", user, session, use_credit,
+    )
+
+    return SweepCreateResponse(
+        sweep_id=record.sweep_id,
+        status=record.status,
+        num_combinations=len(combinations),
+    )
+
+
+@router.get("/sweeps/{sweep_id}", response_model=SweepStatusResponse)
+def get_sweep_status(
+    sweep_id: UUID,
+    user: User = Depends(get_current_user),
+    store: SweepStore = Depends(get_sweep_store),
+) -> SweepStatusResponse:
+    """Get the status and, once completed, the ranked table of a sweep."""
+    record = store.read(sweep_id)
+    if record is None or record.user_id != user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sweep not found")
+
+    return SweepStatusResponse(
+        sweep_id=record.sweep_id,
+        strategy_id=record.strategy_id,
+        status=record.status,
+        asset=record.asset,
+        timeframe=record.timeframe,
+        date_from=record.date_from,
+        date_to=record.date_to,
+        rank_by=record.rank_by,
+        num_combinations=len(record.combinations),
+        rows=[SweepRowResponse(**row) for row in record.rows],
+        error_message=record.error_message,
+        created_at=record.created_at,
+        completed_at=record.completed_at,
+    )
+
+
+@router.post("/walk-forward", response_model=WalkForwardCreateResponse, status_code=status.HTTP_201_CREATED)
+def create_walk_forward(
+    data: WalkForwardCreateRequest,
+    user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+    store: WalkForwardStore = Depends(get_walk_forward_store),
+) -> WalkForwardCreateResponse:
+    """Enqueue a walk-forward analysis; charged like a single backtest."""
+    range_days = (data.date_to - data.date_from).days
+    num_windows = math.ceil((range_days - data.in_sample_days) / data.out_of_sample_days)
+    if num_windows > settings.max_walk_forward_windows:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"A walk-forward analysis can have at most {settings.max_walk_forward_windows} windows, "
+                f"got {num_windows}. Lengthen the out-of-sample window or shorten the date range."
+            ),
+        )
+
+    strategy, version, combinations, use_credit = _prepare_sweep(data, user, session)
+    record = WalkForwardRecord(
+        **_record_fields(data, user, strategy, version, combinations),
+        in_sample_days=data.in_sample_days,
+        out_of_sample_days=data.out_of_sample_days,
+    )
+    _commit_and_enqueue(
+        record, store, "app.worker.jobs.run_walk_forward_job", "walk_forward", user, session, use_credit,
+    )
+
+    return WalkForwardCreateResponse(
+        walk_forward_id=record.sweep_id,
+        status=record.status,
+        num_combinations=len(combinations),
+    )
+
+
+@router.get("/walk-forward/{walk_forward_id}", response_model=WalkForwardStatusResponse)
+def get_walk_forward_status(
+    walk_forward_id: UUID,
+    user: User = Depends(get_current_user),
+    store: WalkForwardStore = Depends(get_walk_forward_store),
+) -> WalkForwardStatusResponse:
+    """Get the status and, once completed, the per-window results and stitched curve."""
+    record = store.read(walk_forward_id)
+    if record is None or record.user_id != user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Walk-forward analysis not found")
+
+    summary = record.summary or {}
+    return WalkForwardStatusResponse(
+        walk_forward_id=record.sweep_id,
+        strategy_id=record.strategy_id,
+        status=record.status,
+        asset=record.asset,
+        timeframe=record.timeframe,
+        date_from=record.date_from,
+        date_to=record.date_to,
+        rank_by=record.rank_by,
+        in_sample_days=record.in_sample_days,
+        out_of_sample_days=record.out_of_sample_days,
+        num_combinations=len(record.combinations),
+        windows=[WalkForwardWindowResponse(**window) for window in record.windows],
+        equity_curve=[EquityCurvePoint(**point) for point in record.equity_curve],
+        total_return_pct=summary.get("total_return_pct"),
+        max_drawdown_pct=summary.get("max_drawdown_pct"),
+        sharpe_ratio=summary.get("sharpe_ratio"),
+        num_trades=summary.get("num_trades"),
+        error_message=record.error_message,
+        created_at=record.created_at,
+        completed_at=record.completed_at,
+    )
@@ -15,7 +15,6 @@ from app.core.config import settings
 from app.core.database import get_session
 from app.core.logging import correlation_id_var
 from app.models.backtest_run import BacktestRun
-from app.models.candle import Candle
 from app.models.notification import Notification
 from app.models.strategy import Strategy
 from app.models.strategy_version import StrategyVersion
@@ -24,6 +23,7 @@ import app.services.backtest_service as backtest_service
 import app.services.backtest_responses as _backtest_responses
 import app.services.backtest_sharing as _backtest_sharing
 import app.services.working_copy as working_copy
+from app.backtest.candle_reader import read_candles
 from app.backtest.data_quality import query_metrics_for_range
 from app.backtest.storage import download_json
 from app.backtest.trades_artifact import load_trades
@@ -47,10 +47,10 @@ from app.schemas.backtest import (
 router = APIRouter(prefix="/backtests", tags=["backtests"])
 
 
-def get_redis_queue() -> Queue:
+def get_redis_queue(name: str = "default") -> Queue:
     """Get Redis queue for job enqueueing."""
     redis_conn = Redis.from_url(settings.redis_url)
-    return Queue("default", connection=redis_conn)
+    return Queue(name, connection=redis_conn)
 
 
 def _build_status_response(
@@ -130,6 +130,7 @@ def create_backtest(
     use_credit = backtest_service.enforce_daily_limit(user, session)
     backtest_service.enforce_history_depth(user, data.date_from, data.date_to)
     version = working_copy.freeze(strategy, session)
+    admission = backtest_service.admit_run(version, strategy.timeframe, data.date_from, data.date_to)
 
     fee_rate, slippage_rate, spread_rate = backtest_service.resolve_rates(
         user, data.fee_rate, data.slippage_rate, data.spread_rate,
@@ -151,7 +152,7 @@ def create_backtest(
     session.commit()
 
     try:
-        queue = get_redis_queue()
+        queue = get_redis_queue(settings.backtest_heavy_queue) if admission.heavy else get_redis_queue()
         queue.enqueue(
             "app.worker.jobs.run_backtest_job",
             job_spec.run_id,
@@ -169,6 +170,8 @@ def create_backtest(
                 "timeframe": strategy.timeframe,
                 "batch_id": None,
                 "period_key": None,
+                "heavy": admission.heavy,
+                "estimated_seconds": admission.eta_seconds,
             },
         )
     except Exception:
@@ -181,7 +184,7 @@ def create_backtest(
             detail="Failed to queue backtest job",
         )
 
-    return BacktestCreateResponse(run_id=run.id, status=run.status)
+    return BacktestCreateResponse(run_id=run.id, status=run.status, estimated_seconds=admission.eta_seconds)
 
 
 @router.get("/{run_id}", response_model=BacktestStatusResponse)
@@ -422,14 +425,8 @@ def get_trade_detail(
         chart_end += timedelta(days=needed - needed // 2)
 
     # Fetch candles for the window
-    candles = session.exec(
-        select(Candle)
-        .where(Candle.asset == run.asset)
-        .where(Candle.timeframe == run.timeframe)
-        .where(Candle.timestamp >= chart_start)
-        .where(Candle.timestamp <= chart_end)
-        .order_by(Candle.timestamp)
-    ).all()
+    candles = read_candles(session, run.asset, run.timeframe, chart_start, chart_end)
+    bars = candles.bars
 
     candles_response = [
         CandleResponse(
@@ -439,7 +436,7 @@ def get_trade_detail(
             low=c.low,
             close=c.close,
         )
-        for c in candles
+        for c in bars
     ]
 
     # Fetch strategy definition for explanation
@@ -459,10 +456,10 @@ def get_trade_detail(
 
     try:
         entry_idx = next(
-            (i for i, c in enumerate(candles) if c.timestamp == entry_ts), None
+            (i for i, c in enumerate(bars) if c.timestamp == entry_ts), None
         )
         exit_idx = next(
-            (i for i, c in enumerate(candles) if c.timestamp == exit_ts), None
+            (i for i, c in enumerate(bars) if c.timestamp == exit_ts), None
         )
 
         if entry_idx is None or exit_idx is None:
@@ -473,7 +470,7 @@ def get_trade_detail(
 
         entry_exp, exit_exp, indicators = build_trade_explanation(
             definition=strategy_version.definition_json,
-            candles=list(candles),
+            candles=candles,
             trade_entry_idx=entry_idx,
             trade_exit_idx=exit_idx,
             exit_reason=trade.exit_reason,
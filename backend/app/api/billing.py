@@ -1,8 +1,8 @@
 """API endpoints for billing operations."""
 import logging
+from types import ModuleType
 from typing import Literal
 
-import stripe
 from sqlalchemy.exc import IntegrityError
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel
@@ -19,8 +19,14 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/billing", tags=["billing"])
 
-# Initialize Stripe
-stripe.api_key = settings.stripe_secret_key
+
+def _stripe() -> ModuleType:
+    """The Stripe SDK, configured; imported on first use to keep API start-up light."""
+    import stripe
+
+    stripe.api_key = settings.stripe_secret_key
+    return stripe
+
 
 # Price ID mapping
 PRICE_IDS = {
@@ -73,7 +79,7 @@ def create_checkout_session(
     if user.stripe_customer_id:
         customer_id = user.stripe_customer_id
     else:
-        customer = stripe.Customer.create(
+        customer = _stripe().Customer.create(
             email=user.email,
             metadata={"user_id": str(user.id)},
         )
@@ -89,7 +95,7 @@ def create_checkout_session(
     # Create checkout session with beta discount if applicable
     if pricing["discount_percent"] > 0:
         # Beta user - create discounted price on-the-fly
-        checkout_session = stripe.checkout.Session.create(
+        checkout_session = _stripe().checkout.Session.create(
             customer=customer_id,
             mode="subscription",
             line_items=[{
@@ -114,7 +120,7 @@ def create_checkout_session(
         )
     else:
         # Standard pricing - use price ID
-        checkout_session = stripe.checkout.Session.create(
+        checkout_session = _stripe().checkout.Session.create(
             customer=customer_id,
             mode="subscription",
             line_items=[{"price": price_id, "quantity": 1}],
@@ -141,7 +147,7 @@ def create_portal_session(
             detail="No active subscription found",
         )
 
-    portal_session = stripe.billing_portal.Session.create(
+    portal_session = _stripe().billing_portal.Session.create(
         customer=user.stripe_customer_id,
         return_url=f"{settings.frontend_url}/profile",
     )
@@ -173,7 +179,7 @@ def create_credit_pack_checkout(
     if user.stripe_customer_id:
         customer_id = user.stripe_customer_id
     else:
-        customer = stripe.Customer.create(
+        customer = _stripe().Customer.create(
             email=user.email,
             metadata={"user_id": str(user.id)},
         )
@@ -183,7 +189,7 @@ def create_credit_pack_checkout(
         session.commit()
 
     # Create checkout session for one-time payment
-    checkout_session = stripe.checkout.Session.create(
+    checkout_session = _stripe().checkout.Session.create(
         customer=customer_id,
         mode="payment",
         line_items=[{"price": price_id, "quantity": 1}],
@@ -208,13 +214,13 @@ async def stripe_webhook(
     sig_header = request.headers.get("stripe-signature")
 
     try:
-        event = stripe.Webhook.construct_event(
+        event = _stripe().Webhook.construct_event(
             payload, sig_header, settings.stripe_webhook_secret
         )
     except ValueError:
         logger.error("Invalid webhook payload")
         raise HTTPException(status_code=400, detail="Invalid payload")
-    except stripe.error.SignatureVerificationError:
+    except _stripe().error.SignatureVerificationError:
         logger.error("Invalid webhook signature")
         raise HTTPException(status_code=400, detail="Invalid signature")
 
@@ -7,10 +7,11 @@ from datetime import datetime
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlmodel import Session, select
+from sqlmodel import Session, func, select
 
 from app.api.deps import get_current_user
-from app.backtest import indicators as ind
+from app.backtest.candle_reader import read_candles
+from app.backtest.indicator_cache import FrameIndicatorCache, compute_period_batches, shared_indicator_cache
 from app.core.database import get_session
 from app.models.candle import Candle
 from app.models.user import User
@@ -31,6 +32,9 @@ MAX_INDICATORS = 8
 
 _OSCILLATOR_KEYS = {"rsi", "atr", "macd", "stochastic", "adx", "obv"}
 
+# Periods charted when a request names none
+_DEFAULT_PERIODS = {"sma": 20, "ema": 20, "rsi": 14, "atr": 14}
+
 _SUPPORTED_KEYS = {
     "sma", "ema", "rsi", "atr", "macd", "bollinger",
     "stochastic", "adx", "ichimoku", "obv", "fib",
@@ -97,37 +101,36 @@ def _series(
 def _compute_series(
     req: IndicatorRequest,
     timestamps: list[datetime],
-    highs: list[float],
-    lows: list[float],
-    closes: list[float],
-    volumes: list[float],
+    cache: FrameIndicatorCache,
 ) -> list[IndicatorSeries]:
-    """Compute one or more output series for a single indicator request."""
-    key = req.key
+    """Compute one or more output series for a single indicator request.
 
-    if key == "sma":
-        period = req.period or 20
-        return [_series("sma", f"SMA({period})", {"period": period}, "price",
-                        timestamps, ind.sma(closes, period))]
+    Series come from the catalogue block of the same name, read through the
+    cross-run indicator cache shared with backtests; only the ports charted
+    are computed. Several periods of SMA, EMA or RSI are batched beforehand
+    (see get_chart_data).
+    """
+    key = req.key
 
-    if key == "ema":
-        period = req.period or 20
-        return [_series("ema", f"EMA({period})", {"period": period}, "price",
-                        timestamps, ind.ema(closes, period))]
+    def lines(block_type: str, params: dict, *ports: str) -> list[list[Optional[float]]]:
+        outputs = cache.compute(block_type, params, ports)
+        return [outputs[port].to_list() for port in ports]
 
-    if key == "rsi":
-        period = req.period or 14
-        return [_series("rsi", f"RSI({period})", {"period": period}, "oscillator",
-                        timestamps, ind.rsi(closes, period))]
+    if key in ("sma", "ema"):
+        period = req.period or _DEFAULT_PERIODS[key]
+        [values] = lines(key, {"period": period}, "output")
+        return [_series(key, f"{key.upper()}({period})", {"period": period}, "price", timestamps, values)]
 
-    if key == "atr":
-        period = req.period or 14
-        return [_series("atr", f"ATR({period})", {"period": period}, "oscillator",
-                        timestamps, ind.atr(highs, lows, closes, period))]
+    if key in ("rsi", "atr"):
+        period = req.period or _DEFAULT_PERIODS[key]
+        [values] = lines(key, {"period": period}, "output")
+        return [_series(key, f"{key.upper()}({period})", {"period": period}, "oscillator", timestamps, values)]
 
     if key == "macd":
-        macd_line, signal_line, hist = ind.macd(closes)
         params = {"fast": 12, "slow": 26, "signal": 9}
+        macd_line, signal_line, hist = lines(
+            "macd", {"fast_period": 12, "slow_period": 26, "signal_period": 9}, "macd", "signal", "histogram"
+        )
         return [
             _series("macd", "MACD(12,26,9)", params, "oscillator", timestamps, macd_line),
             _series("macd_signal", "MACD signal", params, "oscillator", timestamps, signal_line),
@@ -136,7 +139,7 @@ def _compute_series(
 
     if key == "bollinger":
         period = req.period or 20
-        upper, middle, lower = ind.bollinger(closes, period=period, std_dev=2.0)
+        upper, middle, lower = lines("bollinger", {"period": period, "stddev": 2.0}, "upper", "middle", "lower")
         params = {"period": period, "std_dev": 2.0}
         return [
             _series("bollinger_upper", f"BB upper({period})", params, "price", timestamps, upper),
@@ -146,8 +149,8 @@ def _compute_series(
 
     if key == "stochastic":
         k_period = req.period or 14
-        smoothed_k, d_line = ind.stochastic(highs, lows, closes, k_period=k_period)
         params = {"k_period": k_period, "d_period": 3, "smooth": 3}
+        smoothed_k, d_line = lines("stochastic", params, "k", "d")
         return [
             _series("stochastic_k", f"Stoch %K({k_period})", params, "oscillator", timestamps, smoothed_k),
             _series("stochastic_d", "Stoch %D(3)", params, "oscillator", timestamps, d_line),
@@ -155,8 +158,8 @@ def _compute_series(
 
     if key == "adx":
         period = req.period or 14
-        adx_line, plus_di, minus_di = ind.adx(highs, lows, closes, period=period)
         params = {"period": period}
+        adx_line, plus_di, minus_di = lines("adx", params, "adx", "plus_di", "minus_di")
         return [
             _series("adx", f"ADX({period})", params, "oscillator", timestamps, adx_line),
             _series("adx_plus_di", f"+DI({period})", params, "oscillator", timestamps, plus_di),
@@ -164,8 +167,8 @@ def _compute_series(
         ]
 
     if key == "ichimoku":
-        conv, base, span_a, span_b = ind.ichimoku(highs, lows, closes)
         params = {"conversion": 9, "base": 26, "span_b": 52}
+        conv, base, span_a, span_b = lines("ichimoku", params, "conversion", "base", "span_a", "span_b")
         return [
             _series("ichimoku_conversion", "Ichimoku Tenkan(9)", params, "price", timestamps, conv),
             _series("ichimoku_base", "Ichimoku Kijun(26)", params, "price", timestamps, base),
@@ -174,12 +177,15 @@ def _compute_series(
         ]
 
     if key == "obv":
-        return [_series("obv", "OBV", {}, "oscillator", timestamps, ind.obv(closes, volumes))]
+        [values] = lines("obv", {}, "output")
+        return [_series("obv", "OBV", {}, "oscillator", timestamps, values)]
 
     if key == "fib":
         lookback = req.period or 50
-        l236, l382, l5, l618, l786 = ind.fibonacci_retracements(highs, lows, lookback=lookback)
         params = {"lookback": lookback}
+        l236, l382, l5, l618, l786 = lines(
+            "fibonacci", params, "level_236", "level_382", "level_5", "level_618", "level_786"
+        )
         return [
             _series("fib_0_236", "Fib 23.6%", params, "price", timestamps, l236),
             _series("fib_0_382", "Fib 38.2%", params, "price", timestamps, l382),
@@ -237,48 +243,50 @@ def get_chart_data(
 
     requests = _parse_indicators(indicators)
 
-    stmt = select(Candle).where(Candle.asset == asset, Candle.timeframe == timeframe)
-    if start_dt:
-        stmt = stmt.where(Candle.timestamp >= start_dt)
-    if end_dt:
-        stmt = stmt.where(Candle.timestamp <= end_dt)
-    stmt = stmt.order_by(Candle.timestamp.asc())
-    rows = session.exec(stmt).all()
+    frame = read_candles(session, asset, timeframe, start_dt, end_dt)
+    bars = frame.bars
 
     candles = [
         ChartCandle(
-            timestamp=r.timestamp,
-            open=r.open, high=r.high, low=r.low, close=r.close, volume=r.volume,
+            timestamp=b.timestamp,
+            open=b.open, high=b.high, low=b.low, close=b.close, volume=b.volume,
         )
-        for r in rows
+        for b in bars
     ]
 
-    timestamps = [r.timestamp for r in rows]
-    highs = [r.high for r in rows]
-    lows = [r.low for r in rows]
-    closes = [r.close for r in rows]
-    volumes = [r.volume for r in rows]
+    timestamps = [b.timestamp for b in bars]
+    cache = shared_indicator_cache().view(frame)
+
+    if bars:
+        # e.g. ema:20,ema:50,ema:200 — the periods of one indicator in one pass
+        compute_period_batches(
+            cache,
+            cache.frame,
+            [
+                (req.key, {"period": req.period or _DEFAULT_PERIODS[req.key]})
+                for req in requests
+                if req.key in _DEFAULT_PERIODS
+            ],
+        )
 
     series: list[IndicatorSeries] = []
     for req in requests:
-        if rows:
-            series.extend(_compute_series(req, timestamps, highs, lows, closes, volumes))
+        if bars:
+            series.extend(_compute_series(req, timestamps, cache))
         else:
             pane = "oscillator" if req.key in _OSCILLATOR_KEYS else "price"
             params = {"period": req.period} if req.period else {}
             series.append(_series(req.key, req.key.upper(), params, pane, [], []))
 
-    avail_stmt = (
-        select(Candle.timestamp)
-        .where(Candle.asset == asset, Candle.timeframe == timeframe)
-        .order_by(Candle.timestamp.asc())
+    avail_stmt = select(func.min(Candle.timestamp), func.max(Candle.timestamp)).where(
+        Candle.asset == asset, Candle.timeframe == timeframe
     )
-    all_timestamps = session.exec(avail_stmt).all()
+    earliest_candle, latest_candle = session.exec(avail_stmt).one()
 
     data_status = ChartDataStatus(
-        has_candles=len(rows) > 0,
-        earliest_candle=all_timestamps[0] if all_timestamps else None,
-        latest_candle=all_timestamps[-1] if all_timestamps else None,
+        has_candles=len(bars) > 0,
+        earliest_candle=earliest_candle,
+        latest_candle=latest_candle,
     )
 
     return ChartDataResponse(
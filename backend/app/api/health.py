@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 from sqlmodel import text
+from app.backtest.indicator_cache import shared_indicator_cache
 from app.core.config import settings
 from app.core.database import engine
 
@@ -20,3 +21,9 @@ def health_check():
         "db": db_status,
         "version": settings.app_version,
     }
+
+
+@router.get("/health/indicator-cache")
+def indicator_cache_stats():
+    """Hit/miss counters and size of this process's cross-run indicator cache."""
+    return shared_indicator_cache().stats()
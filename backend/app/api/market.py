@@ -2,7 +2,6 @@
 import json
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -11,11 +10,6 @@ from rq import Queue
 from sqlmodel import Session, select
 
 from app.api.deps import get_current_user
-from app.backtest.volatility import (
-    calculate_atr_pct,
-    calculate_stddev_volatility,
-    calculate_volatility_percentile,
-)
 from app.core.config import settings
 from app.core.database import get_session
 from app.models.candle import Candle
@@ -26,7 +20,6 @@ from app.schemas.market import (
     MarketSentimentResponse,
     SentimentIndicator,
     SourceStatus,
-    TickerItem,
     TickerListResponse,
 )
 from app.schemas.strategy import ALLOWED_ASSETS
@@ -45,77 +38,15 @@ def _get_redis() -> Redis:
     return Redis.from_url(settings.redis_url)
 
 
-def _fetch_candles_for_asset(asset: str, session: Session) -> Optional[list[Candle]]:
-    """Fetch up to 365 daily candles for an asset.
-
-    Returns None if insufficient data exists (less than 30 candles).
-    """
-    try:
-        candles = session.exec(
-            select(Candle)
-            .where(Candle.asset == asset, Candle.timeframe == "1d")
-            .order_by(Candle.timestamp.desc())
-            .limit(365)
-        ).all()
-
-        if len(candles) < 30:  # Need minimum 30 for current volatility
-            return None
-
-        # Reverse to chronological order (oldest first)
-        return list(reversed(candles))
-    except Exception as e:
-        logger.error(f"Failed to fetch candles for {asset}: {e}")
-        return None
-
-
-def _calculate_volatility_metrics(asset: str, current_price: float, session: Session) -> dict:
-    """Calculate all three volatility metrics for an asset.
-
-    Returns dict with volatility_stddev, volatility_atr_pct, volatility_percentile_1y.
-    All values are None if insufficient data.
-    """
-    candles = _fetch_candles_for_asset(asset, session)
-
-    if not candles:
-        return {
-            "volatility_stddev": None,
-            "volatility_atr_pct": None,
-            "volatility_percentile_1y": None,
-        }
-
-    closes = [c.close for c in candles]
-    highs = [c.high for c in candles]
-    lows = [c.low for c in candles]
-
-    try:
-        stddev_vol = calculate_stddev_volatility(closes, window=30)
-        atr_pct = calculate_atr_pct(highs, lows, closes, current_price, window=30)
-        percentile = calculate_volatility_percentile(closes, window=30, history_days=365)
-
-        return {
-            "volatility_stddev": stddev_vol,
-            "volatility_atr_pct": atr_pct,
-            "volatility_percentile_1y": percentile,
-        }
-    except Exception as e:
-        logger.error(f"Failed to calculate volatility for {asset}: {e}")
-        return {
-            "volatility_stddev": None,
-            "volatility_atr_pct": None,
-            "volatility_percentile_1y": None,
-        }
-
-
-
 @router.get("/market/tickers", response_model=TickerListResponse)
 def get_tickers(
     user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
 ) -> TickerListResponse:
     """Return spot prices from the single-writer SpotPriceCache (stale-while-revalidate).
 
-    Never calls a price provider directly. On cold cache, enqueues a one-shot
-    refresh (deduped) and returns 503 so the client retries.
+    Prices and the worker's volatility snapshot come from one Redis read;
+    never calls a price provider or the database. On cold cache, enqueues a
+    one-shot refresh (deduped) and returns 503 so the client retries.
 
     Raises:
         HTTPException: 503 if the cache is cold (job hasn't run yet)
@@ -125,7 +56,7 @@ def get_tickers(
 
     cache.mark_viewed()
 
-    cached = cache.read()
+    cached = cache.read_tickers()
 
     if cached is None:
         # Cold cache: trigger a one-shot refresh if not already pending
@@ -138,19 +69,7 @@ def get_tickers(
             detail="Market data initialising — please retry in a few seconds",
         )
 
-    # Enrich with DB volatility (no external calls)
-    enriched_items = [
-        TickerItem(
-            pair=item.pair,
-            price=item.price,
-            change_24h_pct=item.change_24h_pct,
-            volume_24h=item.volume_24h,
-            **_calculate_volatility_metrics(item.pair, item.price, session),
-        )
-        for item in cached.items
-    ]
-
-    return TickerListResponse(items=enriched_items, as_of=cached.as_of)
+    return cached
 
 
 @router.get("/market/data-availability", response_model=DataAvailabilityResponse)
@@ -6,9 +6,9 @@ from sqlmodel import Session, select, func
 from app.api.deps import get_current_user
 from app.core.database import get_session
 from app.core.plans import get_plan_limits
-from app.models.backtest_run import BacktestRun
 from app.models.strategy import Strategy
 from app.models.user import User
+from app.services.backtest_service import count_today_backtests
 from app.schemas.auth import (
     AnalyticsConsentRequest,
     MessageResponse,
@@ -34,16 +34,11 @@ def _build_profile_response(user: User, session: Session) -> ProfileResponse:
         )
     ).one()
 
-    # Count today's backtests (UTC day)
+    # Count today's backtests and analyses (UTC day)
     today_start = datetime.now(timezone.utc).replace(
         hour=0, minute=0, second=0, microsecond=0
     )
-    backtests_today = session.exec(
-        select(func.count(BacktestRun.id)).where(
-            BacktestRun.user_id == user.id,
-            BacktestRun.created_at >= today_start,
-        )
-    ).one()
+    backtests_today = count_today_backtests(user.id, session)
 
     # Calculate reset time (midnight UTC tomorrow)
     tomorrow = today_start + timedelta(days=1)
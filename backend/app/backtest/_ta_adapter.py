@@ -1,12 +1,24 @@
-"""Bridge between list[float] indicator inputs and pandas Series used by pandas-ta-classic."""
-from typing import Optional
+"""Bridge between list[float] indicator inputs and pandas Series used by pandas-ta-classic.
+
+pandas is imported on the first conversion so that importing the indicator
+modules does not load it.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, Sequence
 
 import numpy as np
-import pandas as pd
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def to_series(values: Sequence[Optional[float]]) -> pd.Series:
+    """Convert a list of floats (None → NaN) or a float array to a pandas Series."""
+    import pandas as pd
 
-def to_series(values: list[Optional[float]]) -> pd.Series:
-    """Convert a list of floats (None → NaN) to a pandas Series."""
+    if isinstance(values, np.ndarray):
+        return pd.Series(values, dtype=float)
     return pd.Series([np.nan if v is None else v for v in values], dtype=float)
 
 
@@ -0,0 +1,308 @@
+"""Memory-mapped local archive of closed candles.
+
+Closed candles never change (except under ``force_refresh``), and most
+backtests read the same assets over the same years, so each worker host
+keeps them on local disk: one segment file per (asset, timeframe) holding
+every stored candle up to its last one. ``fetch_candles`` slices the
+archived part of a range straight out of the mapping — the CandleFrame
+columns are views of the file, no copy — and asks Postgres only for the
+candles after it.
+
+Segment layout: a 4 KiB header (magic, count, capacity, revision,
+tz_aware), then one fixed-capacity region per column — timestamps as
+int64 microseconds, OHLCV as float64, the backup-source flag as uint8.
+Appends write past ``count`` and then bump it, so readers never see a
+partial row; outgrowing the capacity, or a rebuild, writes a new file
+and renames it over the old one, and mappings of the old file stay
+valid. Writers take an ``flock`` on a sidecar lock file.
+
+The archive is only a copy of the ``candles`` table. A write that
+changes an archived candle or fills a gap before the last archived
+one invalidates the segment here and bumps its shared revision, so other
+hosts rebuild theirs on next use.
+"""
+from __future__ import annotations
+
+import fcntl
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional, Protocol
+
+import numpy as np
+
+from app.backtest.candle_frame import CandleFrame, _utc_naive
+
+_MAGIC = b"BBCNDL01"
+_HEADER = struct.Struct("<8sQQqB")  # magic, count, capacity, revision, tz_aware
+_COUNT = struct.Struct("<Q")
+_COUNT_OFFSET = 8
+_DATA_OFFSET = 4096
+_MIN_CAPACITY = 1024
+
+# Column name -> on-disk dtype; the order is the order of the regions.
+_COLUMNS: dict[str, str] = {
+    "timestamps": "<M8[us]",
+    "open": "<f8",
+    "high": "<f8",
+    "low": "<f8",
+    "close": "<f8",
+    "volume": "<f8",
+    "backup": "u1",
+}
+
+
+class ArchiveRevisions(Protocol):
+    """Shared per-(asset, timeframe) revision counters; bumping one marks every host's segment stale."""
+
+    def get(self, asset: str, timeframe: str) -> int: ...
+
+    def bump(self, asset: str, timeframe: str) -> None: ...
+
+
+class ArchivedCandles(NamedTuple):
+    frame: CandleFrame  # archived candles inside the requested range
+    until: Optional[datetime]  # everything stored before this is archived; None when the segment is empty
+
+
+def _offsets(capacity: int) -> dict[str, int]:
+    offsets, offset = {}, _DATA_OFFSET
+    for name, dtype in _COLUMNS.items():
+        offsets[name] = offset
+        offset += np.dtype(dtype).itemsize * capacity
+    return offsets
+
+
+def _file_size(capacity: int) -> int:
+    return _DATA_OFFSET + sum(np.dtype(dtype).itemsize for dtype in _COLUMNS.values()) * capacity
+
+
+def _datetime64(ts: datetime) -> np.datetime64:
+    return np.datetime64(_utc_naive(ts), "us")
+
+
+def _frame_columns(frame: CandleFrame, backup: np.ndarray) -> dict[str, np.ndarray]:
+    return {
+        "timestamps": frame.timestamps,
+        "open": frame.open,
+        "high": frame.high,
+        "low": frame.low,
+        "close": frame.close,
+        "volume": frame.volume,
+        "backup": backup,
+    }
+
+
+@dataclass
+class _Segment:
+    """One mapped segment file; ``columns`` span the full capacity, ``count`` is read live."""
+
+    inode: int
+    capacity: int
+    revision: int
+    tz_aware: bool
+    buffer: mmap.mmap
+    columns: dict[str, np.ndarray]
+
+    @classmethod
+    def open(cls, path: Path) -> "_Segment":
+        with open(path, "rb") as f:
+            inode = os.fstat(f.fileno()).st_ino
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, _, capacity, revision, tz_aware = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a candle archive segment")
+        offsets = _offsets(capacity)
+        columns = {
+            name: np.frombuffer(buffer, dtype=dtype, count=capacity, offset=offsets[name])
+            for name, dtype in _COLUMNS.items()
+        }
+        return cls(inode, capacity, revision, bool(tz_aware), buffer, columns)
+
+    @property
+    def count(self) -> int:
+        return _COUNT.unpack_from(self.buffer, _COUNT_OFFSET)[0]
+
+
+class CandleArchive:
+    """Segment files under ``root``; ``revisions`` is shared between hosts (None for a single host)."""
+
+    def __init__(self, root: Path, revisions: Optional[ArchiveRevisions] = None) -> None:
+        self.root = Path(root)
+        self.revisions = revisions
+        self._segments: dict[tuple[str, str], _Segment] = {}
+        self._lock = threading.Lock()
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, asset: str, timeframe: str) -> Path:
+        return self.root / f"{asset.replace('/', '-')}_{timeframe}.seg"
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def read(
+        self,
+        asset: str,
+        timeframe: str,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> Optional[ArchivedCandles]:
+        """Archived candles in [date_from, date_to] (open bounds when None), or None when there is no current segment."""
+        segment = self._current(asset, timeframe)
+        if segment is None:
+            return None
+        count = segment.count
+        stamps = segment.columns["timestamps"][:count]
+        lo = 0 if date_from is None else int(np.searchsorted(stamps, _datetime64(date_from), side="left"))
+        hi = count if date_to is None else int(np.searchsorted(stamps, _datetime64(date_to), side="right"))
+        columns = {name: values[lo:hi] for name, values in segment.columns.items()}
+        backup = columns.pop("backup")
+        frame = CandleFrame.from_arrays(
+            tz_aware=segment.tz_aware,
+            used_backup_data=bool(backup.any()),
+            asset=asset,
+            timeframe=timeframe,
+            **columns,
+        )
+        until = None
+        if count:
+            until = stamps[count - 1].item().replace(tzinfo=timezone.utc) + timedelta(microseconds=1)
+        return ArchivedCandles(frame, until)
+
+    def revision(self, asset: str, timeframe: str) -> int:
+        """The shared revision a current segment must carry (always 0 without shared revisions)."""
+        return self.revisions.get(asset, timeframe) if self.revisions is not None else 0
+
+    def _current(self, asset: str, timeframe: str) -> Optional[_Segment]:
+        """The mapped segment if it exists and matches the shared revision."""
+        segment = self._mapped(asset, timeframe)
+        if segment is None or segment.revision != self.revision(asset, timeframe):
+            return None
+        return segment
+
+    def _mapped(self, asset: str, timeframe: str) -> Optional[_Segment]:
+        key = (asset, timeframe)
+        path = self.path(asset, timeframe)
+        with self._lock:
+            try:
+                inode = path.stat().st_ino
+            except FileNotFoundError:
+                self._segments.pop(key, None)
+                return None
+            segment = self._segments.get(key)
+            if segment is None or segment.inode != inode:
+                segment = self._segments[key] = _Segment.open(path)
+            return segment
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def rebuild(self, asset: str, timeframe: str, frame: CandleFrame, backup: np.ndarray, revision: int) -> None:
+        """Replace the segment with ``frame`` — every stored closed candle, in order.
+
+        ``backup`` flags the candles that came from a backup provider;
+        ``revision`` is ``self.revision()`` taken before the candles were
+        read, so an invalidation in between leaves the new segment stale.
+        """
+        with self._writing(asset, timeframe):
+            columns = _frame_columns(frame, backup)
+            self._write(asset, timeframe, columns, len(frame), revision, frame.tz_aware)
+
+    def extend(self, asset: str, timeframe: str, frame: CandleFrame, backup: np.ndarray) -> int:
+        """Append the candles of ``frame`` after the last archived one; returns how many were added.
+
+        ``frame`` must continue the segment with nothing stored in between
+        (the caller read it from ``until`` on). Skipped when the segment is
+        missing or stale.
+        """
+        with self._writing(asset, timeframe):
+            segment = self._current(asset, timeframe)
+            if segment is None or not len(frame):
+                return 0
+            count = segment.count
+            new = _frame_columns(frame, backup)
+            if count:
+                keep = new["timestamps"] > segment.columns["timestamps"][count - 1]
+                new = {name: values[keep] for name, values in new.items()}
+            added = len(new["timestamps"])
+            if not added:
+                return 0
+            if count + added > segment.capacity or not count:
+                # Rewrite; an empty segment also takes its tz_aware from the first candles
+                columns = {
+                    name: np.concatenate([segment.columns[name][:count], new[name].astype(dtype)])
+                    for name, dtype in _COLUMNS.items()
+                }
+                tz_aware = segment.tz_aware if count else frame.tz_aware
+                self._write(asset, timeframe, columns, count + added, segment.revision, tz_aware)
+                return added
+            offsets = _offsets(segment.capacity)
+            fd = os.open(self.path(asset, timeframe), os.O_WRONLY)
+            try:
+                for name, dtype in _COLUMNS.items():
+                    data = np.ascontiguousarray(new[name], dtype=dtype).tobytes()
+                    os.pwrite(fd, data, offsets[name] + count * np.dtype(dtype).itemsize)
+                os.pwrite(fd, _COUNT.pack(count + added), _COUNT_OFFSET)
+            finally:
+                os.close(fd)
+            return added
+
+    def invalidate(self, asset: str, timeframe: str) -> None:
+        """Drop the segment on this host and mark it stale on every other."""
+        with self._writing(asset, timeframe):
+            self.path(asset, timeframe).unlink(missing_ok=True)
+            if self.revisions is not None:
+                self.revisions.bump(asset, timeframe)
+
+    @contextmanager
+    def _writing(self, asset: str, timeframe: str) -> Iterator[None]:
+        lock_path = self.path(asset, timeframe).with_suffix(".lock")
+        with open(lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _write(
+        self,
+        asset: str,
+        timeframe: str,
+        columns: dict[str, np.ndarray],
+        count: int,
+        revision: int,
+        tz_aware: bool,
+    ) -> None:
+        """Write a new segment file with room to grow and rename it into place."""
+        capacity = max(_MIN_CAPACITY, 2 * count)
+        path = self.path(asset, timeframe)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        offsets = _offsets(capacity)
+        with open(tmp, "wb") as f:
+            f.truncate(_file_size(capacity))
+            f.write(_HEADER.pack(_MAGIC, count, capacity, revision, tz_aware))
+            for name, dtype in _COLUMNS.items():
+                f.seek(offsets[name])
+                f.write(np.ascontiguousarray(columns[name][:count], dtype=dtype).tobytes())
+        os.replace(tmp, path)
+
+
+_archive: Optional[CandleArchive] = None
+
+
+def set_candle_archive(archive: Optional[CandleArchive]) -> None:
+    """Install (or, with None, remove) this process's archive."""
+    global _archive
+    _archive = archive
+
+
+def candle_archive() -> Optional[CandleArchive]:
+    """This process's archive, or None when workers read every candle from Postgres."""
+    return _archive
@@ -0,0 +1,236 @@
+"""Columnar candle container — the native input of the Backtest pipeline.
+
+A CandleFrame holds one (asset, timeframe) candle range as contiguous NumPy
+columns: timestamps (UTC, microsecond precision) plus OHLCV as float64. It is
+built once at the candle-fetch boundary and handed to the Interpreter, the
+Engine and the benchmark computation, none of which touch ORM rows again.
+
+``as_candle_frame`` accepts either a frame or a legacy ``list[Candle]`` so
+callers (and tests) that still build SQLModel rows keep working unchanged.
+"""
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from functools import cached_property
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, NamedTuple, Sequence, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from app.models.candle import Candle
+
+# Sources that do NOT count as backup data for RunOutcome.used_backup_data.
+PRIMARY_SOURCE = "cryptocompare"
+
+_OHLCV_FIELDS: tuple[str, ...] = ("open", "high", "low", "close", "volume")
+
+
+class Bar(NamedTuple):
+    """One candle materialised from a frame row.
+
+    Attribute-compatible with ``Candle`` for the fields the Engine reads, so
+    PositionManager and the exit checkers accept either.
+    """
+
+    timestamp: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+def _utc_naive(ts: datetime) -> datetime:
+    if ts.tzinfo is None:
+        return ts
+    return ts.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _readonly(values: np.ndarray) -> np.ndarray:
+    values.setflags(write=False)
+    return values
+
+
+@dataclass(frozen=True, eq=False)
+class CandleFrame:
+    """Immutable struct-of-arrays view over a sorted candle range.
+
+    ``timestamps`` is ``datetime64[us]`` in UTC; ``tz_aware`` records whether
+    the source timestamps carried a tzinfo so materialised datetimes and ISO
+    strings round-trip exactly as the ORM rows would have produced them.
+    """
+
+    timestamps: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    tz_aware: bool = True
+    used_backup_data: bool = False
+    asset: str = ""  # empty when built from rows without one (tests, synthetic data)
+    timeframe: str = ""
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_arrays(
+        cls,
+        timestamps: np.ndarray,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+        tz_aware: bool = True,
+        used_backup_data: bool = False,
+        asset: str = "",
+        timeframe: str = "",
+    ) -> "CandleFrame":
+        """Wrap pre-filled columns; arrays are frozen, not copied, when possible."""
+        return cls(
+            timestamps=_readonly(np.ascontiguousarray(timestamps, dtype="datetime64[us]")),
+            open=_readonly(np.ascontiguousarray(open, dtype=np.float64)),
+            high=_readonly(np.ascontiguousarray(high, dtype=np.float64)),
+            low=_readonly(np.ascontiguousarray(low, dtype=np.float64)),
+            close=_readonly(np.ascontiguousarray(close, dtype=np.float64)),
+            volume=_readonly(np.ascontiguousarray(volume, dtype=np.float64)),
+            tz_aware=tz_aware,
+            used_backup_data=used_backup_data,
+            asset=asset,
+            timeframe=timeframe,
+        )
+
+    @classmethod
+    def from_candles(cls, candles: Sequence["Candle"]) -> "CandleFrame":
+        """Build a frame from ORM rows (or any objects with Candle attributes)."""
+        n = len(candles)
+        timestamps = np.array([_utc_naive(c.timestamp) for c in candles], dtype="datetime64[us]")
+        columns = {
+            name: np.fromiter((getattr(c, name) for c in candles), dtype=np.float64, count=n)
+            for name in _OHLCV_FIELDS
+        }
+        used_backup_data = any(
+            getattr(c, "source", PRIMARY_SOURCE) != PRIMARY_SOURCE for c in candles
+        )
+        tz_aware = bool(n) and candles[0].timestamp.tzinfo is not None
+        return cls.from_arrays(
+            timestamps,
+            tz_aware=tz_aware,
+            used_backup_data=used_backup_data,
+            asset=getattr(candles[0], "asset", None) or "" if n else "",
+            timeframe=getattr(candles[0], "timeframe", None) or "" if n else "",
+            **columns,
+        )
+
+    @classmethod
+    def empty(cls) -> "CandleFrame":
+        return cls.from_candles([])
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return int(self.close.shape[0])
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Bar, "CandleFrame"]:
+        if isinstance(index, slice):
+            return CandleFrame(
+                timestamps=self.timestamps[index],
+                open=self.open[index],
+                high=self.high[index],
+                low=self.low[index],
+                close=self.close[index],
+                volume=self.volume[index],
+                tz_aware=self.tz_aware,
+                used_backup_data=self.used_backup_data,
+                asset=self.asset,
+                timeframe=self.timeframe,
+            )
+        return self.bar(index)
+
+    def timestamp_at(self, index: int) -> datetime:
+        """Materialise one timestamp as a ``datetime`` (UTC-aware when tz_aware)."""
+        ts: datetime = self.timestamps[index].item()
+        return ts.replace(tzinfo=timezone.utc) if self.tz_aware else ts
+
+    def bar(self, index: int) -> Bar:
+        """Materialise row ``index`` as a lightweight Candle-compatible tuple."""
+        return Bar(
+            timestamp=self.timestamp_at(index),
+            open=float(self.open[index]),
+            high=float(self.high[index]),
+            low=float(self.low[index]),
+            close=float(self.close[index]),
+            volume=float(self.volume[index]),
+        )
+
+    @cached_property
+    def bars(self) -> tuple[Bar, ...]:
+        """Every row as a Bar, converted in bulk once per frame.
+
+        For callers that walk every candle (chart, trade detail); the Engine
+        builds ``bar(i)`` only for the candles it visits.
+        """
+        stamps = self.timestamps.tolist()
+        if self.tz_aware:
+            stamps = [ts.replace(tzinfo=timezone.utc) for ts in stamps]
+        return tuple(map(Bar._make, zip(
+            stamps,
+            self.open.tolist(),
+            self.high.tolist(),
+            self.low.tolist(),
+            self.close.tolist(),
+            self.volume.tolist(),
+        )))
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """Content hash of the timestamps and OHLCV columns.
+
+        Equal fingerprints mean equal candles, so series computed from one
+        frame are valid for any other with the same fingerprint.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for column in (self.timestamps, self.open, self.high, self.low, self.close, self.volume):
+            digest.update(column.tobytes())
+        return digest.hexdigest()
+
+    def iso_timestamps(self) -> list[str]:
+        """ISO-8601 strings identical to ``Candle.timestamp.isoformat()``."""
+        if not len(self):
+            return []
+        whole_seconds = not (self.timestamps.astype(np.int64) % 1_000_000).any()
+        strings = np.datetime_as_string(self.timestamps, unit="s" if whole_seconds else "us")
+        suffix = "+00:00" if self.tz_aware else ""
+        return [s + suffix for s in strings.tolist()]
+
+    def candle_data(self) -> dict[str, np.ndarray]:
+        """Named price series consumed by catalogue handlers via BlockContext.
+
+        ``prev_close`` is the close shifted by one bar, NaN on the first bar.
+        """
+        prev_close = np.empty_like(self.close)
+        if len(self):
+            prev_close[0] = np.nan
+            prev_close[1:] = self.close[:-1]
+        return {
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "prev_close": _readonly(prev_close),
+            "volume": self.volume,
+        }
+
+
+def as_candle_frame(candles: Union[CandleFrame, Sequence["Candle"]]) -> CandleFrame:
+    """Return ``candles`` as a CandleFrame, converting ORM rows once if needed."""
+    if isinstance(candles, CandleFrame):
+        return candles
+    return CandleFrame.from_candles(candles)
@@ -0,0 +1,180 @@
+"""ORM-free candle reads straight into CandleFrame columns.
+
+``select(Candle)`` hydrates a SQLModel object per row — UUID ``id``,
+``source`` and ``created_at`` included — only for the caller to copy six
+numbers out of it. The reader selects just ``timestamp`` and OHLCV (plus
+whether the row came from a backup provider, computed by the database)
+on the session's Core connection, streams them with a server-side cursor
+and copies each partition of rows into preallocated NumPy columns.
+
+``read_candles`` returns one frame for the whole range; ``iter_candles``
+yields one frame per partition, for ranges too long to hold at once;
+``read_candles_with_sources`` adds the per-candle backup flags the candle
+archive stores.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import Select, select
+from sqlmodel import Session
+
+from app.backtest.candle_frame import PRIMARY_SOURCE, CandleFrame, _utc_naive
+from app.models.candle import Candle
+
+# Rows per cursor fetch: large enough to amortise round trips, small enough
+# that a partition of Python tuples stays a few MB.
+FETCH_SIZE = 10_000
+
+_FLOAT_COLUMNS: tuple[str, ...] = ("open", "high", "low", "close", "volume")
+
+
+def candle_query(
+    asset: str,
+    timeframe: str,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    *,
+    newest_first: bool = False,
+    limit: Optional[int] = None,
+) -> Select:
+    """Core select of (timestamp, OHLCV, is-backup) for one asset/timeframe range (bounds inclusive)."""
+    stmt = select(
+        Candle.timestamp,
+        Candle.open,
+        Candle.high,
+        Candle.low,
+        Candle.close,
+        Candle.volume,
+        (Candle.source != PRIMARY_SOURCE).label("backup"),
+    ).where(Candle.asset == asset, Candle.timeframe == timeframe)
+    if date_from is not None:
+        stmt = stmt.where(Candle.timestamp >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(Candle.timestamp <= date_to)
+    stmt = stmt.order_by(Candle.timestamp.desc() if newest_first else Candle.timestamp)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+class _Columns:
+    """Growable preallocated columns that row partitions are copied into."""
+
+    def __init__(self, capacity: int) -> None:
+        self.size = 0
+        self.tz_aware: Optional[bool] = None
+        self.timestamps = np.empty(capacity, dtype="datetime64[us]")
+        self.floats = {name: np.empty(capacity, dtype=np.float64) for name in _FLOAT_COLUMNS}
+        self.backup = np.empty(capacity, dtype=bool)
+
+    def append(self, rows: Sequence[tuple]) -> None:
+        k = len(rows)
+        if not k:
+            return
+        if self.size + k > len(self.timestamps):
+            self._grow(max(self.size + k, 2 * len(self.timestamps)))
+        stamps, *floats, backup = zip(*rows)
+        if self.tz_aware is None:
+            self.tz_aware = stamps[0].tzinfo is not None
+        if self.tz_aware:
+            stamps = [_utc_naive(ts) for ts in stamps]
+        end = self.size + k
+        self.timestamps[self.size:end] = np.array(stamps, dtype="datetime64[us]")
+        for name, values in zip(_FLOAT_COLUMNS, floats):
+            self.floats[name][self.size:end] = values
+        self.backup[self.size:end] = np.array(backup, dtype=bool)  # NULL source reads as primary
+        self.size = end
+
+    def _grow(self, capacity: int) -> None:
+        self.timestamps = np.resize(self.timestamps, capacity)
+        self.floats = {name: np.resize(values, capacity) for name, values in self.floats.items()}
+        self.backup = np.resize(self.backup, capacity)
+
+    def filled(self, values: np.ndarray, reverse: bool = False) -> np.ndarray:
+        values = values[: self.size]
+        return values[::-1] if reverse else values
+
+    def frame(self, asset: str, timeframe: str, reverse: bool = False) -> CandleFrame:
+        return CandleFrame.from_arrays(
+            self.filled(self.timestamps, reverse),
+            tz_aware=bool(self.tz_aware),
+            used_backup_data=bool(self.backup[: self.size].any()),
+            asset=asset,
+            timeframe=timeframe,
+            **{name: self.filled(values, reverse) for name, values in self.floats.items()},
+        )
+
+
+def _partitions(session: Session, stmt: Select, size: int) -> Iterator[Sequence[tuple]]:
+    """Stream ``stmt`` on the session's connection in lists of at most ``size`` rows."""
+    result = session.connection().execute(stmt.execution_options(stream_results=True, max_row_buffer=size))
+    try:
+        yield from result.partitions(size)
+    finally:
+        result.close()
+
+
+def read_candles(
+    session: Session,
+    asset: str,
+    timeframe: str,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    *,
+    newest_first: bool = False,
+    limit: Optional[int] = None,
+    capacity: Optional[int] = None,
+) -> CandleFrame:
+    """Candles of one asset/timeframe range as a chronological CandleFrame.
+
+    ``newest_first`` with ``limit`` reads the latest ``limit`` candles (the
+    frame is still oldest first). ``capacity`` is the expected row count;
+    the columns grow past it if needed, so it is only a hint.
+    """
+    stmt = candle_query(asset, timeframe, date_from, date_to, newest_first=newest_first, limit=limit)
+    columns = _read_columns(session, stmt, capacity or limit or FETCH_SIZE)
+    return columns.frame(asset, timeframe, reverse=newest_first)
+
+
+def read_candles_with_sources(
+    session: Session,
+    asset: str,
+    timeframe: str,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    *,
+    capacity: Optional[int] = None,
+) -> tuple[CandleFrame, np.ndarray]:
+    """``read_candles`` plus a per-candle bool column: True where the candle came from a backup provider."""
+    columns = _read_columns(session, candle_query(asset, timeframe, date_from, date_to), capacity or FETCH_SIZE)
+    return columns.frame(asset, timeframe), columns.filled(columns.backup).copy()
+
+
+def _read_columns(session: Session, stmt: Select, capacity: int) -> _Columns:
+    columns = _Columns(capacity)
+    for rows in _partitions(session, stmt, FETCH_SIZE):
+        columns.append(rows)
+    return columns
+
+
+def iter_candles(
+    session: Session,
+    asset: str,
+    timeframe: str,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    *,
+    chunk_size: int = FETCH_SIZE,
+) -> Iterator[CandleFrame]:
+    """Stream a range as consecutive chronological frames of at most ``chunk_size`` candles.
+
+    Holds one partition in memory at a time; ``used_backup_data`` is per chunk.
+    """
+    stmt = candle_query(asset, timeframe, date_from, date_to)
+    for rows in _partitions(session, stmt, chunk_size):
+        columns = _Columns(len(rows))
+        columns.append(rows)
+        yield columns.frame(asset, timeframe)
@@ -1,14 +1,20 @@
 """Candle fetching service: DB cache + vendor via PriceRouter."""
 from datetime import datetime, timezone
 import logging
+from typing import Optional, Sequence, Union
 
-from sqlmodel import Session, select
+import numpy as np
+from sqlmodel import Session, func, select
 
 from app.core.config import settings
 from app.market_data import price_router
 from app.market_data.protocol import PriceUnavailableError
 from app.models.candle import Candle
+from app.backtest.candle_archive import CandleArchive, candle_archive
+from app.backtest.candle_frame import CandleFrame, _utc_naive, as_candle_frame
+from app.backtest.candle_reader import read_candles, read_candles_with_sources
 from app.backtest.errors import DataUnavailableError
+from app.services.candle_boundary import last_closed_candle_ts
 
 logger = logging.getLogger(__name__)
 
@@ -27,9 +33,10 @@ def fetch_candles(
     date_to: datetime,
     session: Session,
     force_refresh: bool = False,
-) -> list[Candle]:
+) -> CandleFrame:
     """
-    Fetch candles from DB, fill gaps from vendor, return sorted list.
+    Fetch candles from DB, fill gaps from vendor, return them as a sorted
+    CandleFrame — the columnar form the Backtest pipeline consumes.
     When force_refresh=True, always fetch from vendor and overwrite existing
     candles in the requested range.
     Raises DataUnavailableError if large gaps or vendor unavailable.
@@ -40,33 +47,29 @@ def fetch_candles(
     if date_to.tzinfo is None:
         date_to = date_to.replace(tzinfo=timezone.utc)
 
-    # Query existing candles from DB
-    stmt = (
-        select(Candle)
-        .where(Candle.asset == asset)
-        .where(Candle.timeframe == timeframe)
-        .where(Candle.timestamp >= date_from)
-        .where(Candle.timestamp <= date_to)
-        .order_by(Candle.timestamp)
-    )
-    db_candles = list(session.exec(stmt).all())
-
     # Calculate expected candle count
     interval_seconds = TIMEFRAME_SECONDS.get(timeframe, 3600)
     expected_count = int((date_to.timestamp() - date_from.timestamp()) / interval_seconds) + 1
 
+    # Query existing candles straight into columns (no ORM rows): closed
+    # candles from the local archive when there is one, the rest from the DB
+    if force_refresh:
+        frame = read_candles(session, asset, timeframe, date_from, date_to, capacity=expected_count)
+    else:
+        frame = _stored_candles(session, asset, timeframe, date_from, date_to, expected_count)
+
     # Check if we have enough candles AND they cover the requested end date
     # The 95% threshold alone isn't enough - we must also verify the latest
     # cached candle is close to date_to, otherwise we'd skip fetching fresh data
-    if not force_refresh and len(db_candles) >= expected_count * 0.95:  # 95% threshold
-        if db_candles:
-            latest_candle_ts = db_candles[-1].timestamp
+    if not force_refresh and len(frame) >= expected_count * 0.95:  # 95% threshold
+        if len(frame):
+            latest_candle_ts = frame.timestamp_at(-1)
             # Allow up to 2 candle intervals of slack for the end date
             max_end_gap = interval_seconds * 2
             if (date_to.timestamp() - latest_candle_ts.timestamp()) <= max_end_gap:
-                return db_candles
+                return frame
         else:
-            return db_candles
+            return frame
 
     # Fetch missing candles from vendor via PriceRouter
     logger.info(
@@ -97,6 +100,11 @@ def fetch_candles(
             ts = existing.timestamp
             normalized = ts.replace(tzinfo=None) if ts.tzinfo is not None else ts
             existing_by_ts[normalized] = existing
+        latest_stored = session.exec(
+            select(func.max(Candle.timestamp))
+            .where(Candle.asset == asset)
+            .where(Candle.timeframe == timeframe)
+        ).one()
 
         new_candles: list[Candle] = []
         updated_count = 0
@@ -150,40 +158,151 @@ def fetch_candles(
         if new_candles or updated_count:
             session.commit()
 
+        # Archived candles are a copy of the table: a changed candle or one
+        # filled in before the latest stored one makes the segment wrong.
+        if updated_count or (
+            new_candles
+            and (
+                latest_stored is None
+                or min(_utc_naive(c.timestamp) for c in new_candles) < _utc_naive(latest_stored)
+            )
+        ):
+            _invalidate_archive(asset, timeframe)
+
     # Re-query to get all candles sorted
-    db_candles = list(session.exec(stmt).all())
+    frame = read_candles(session, asset, timeframe, date_from, date_to, capacity=expected_count)
 
     # Check for gaps
-    gaps = _detect_gaps(db_candles, timeframe, settings.max_gap_candles)
+    gaps = _detect_gaps(frame, timeframe, settings.max_gap_candles)
     if gaps:
         gap_msg = f"Missing price data from {gaps[0][0]} to {gaps[0][1]}"
         raise DataUnavailableError(gap_msg, f"{gap_msg}. Please try a shorter period.")
 
-    return db_candles
+    return frame
+
+
+def _stored_candles(
+    session: Session,
+    asset: str,
+    timeframe: str,
+    date_from: datetime,
+    date_to: datetime,
+    capacity: int,
+) -> CandleFrame:
+    """Stored candles in the range, via the candle archive when it is enabled."""
+    archive = candle_archive()
+    if archive is not None:
+        try:
+            frame = _read_through_archive(archive, session, asset, timeframe, date_from, date_to)
+            if frame is not None:
+                return frame
+        except Exception as exc:
+            logger.warning(
+                "candle_archive_failed",
+                extra={"asset": asset, "timeframe": timeframe, "error": str(exc)},
+            )
+    return read_candles(session, asset, timeframe, date_from, date_to, capacity=capacity)
+
+
+def _read_through_archive(
+    archive: CandleArchive,
+    session: Session,
+    asset: str,
+    timeframe: str,
+    date_from: datetime,
+    date_to: datetime,
+) -> Optional[CandleFrame]:
+    """Archived candles of the range plus the DB tail after them; None without a usable segment.
+
+    Closed candles of a tail that directly continues the segment are
+    appended to it on the way.
+    """
+    archived = archive.read(asset, timeframe, date_from, date_to)
+    if archived is None:
+        sync_archived_candles(archive, session, asset, timeframe)
+        archived = archive.read(asset, timeframe, date_from, date_to)
+        if archived is None:
+            return None
+    if archived.until is None:
+        tail_from = date_from
+    else:
+        tail_from = max(date_from, archived.until)
+        if tail_from > date_to:
+            return archived.frame
+    tail, backup = read_candles_with_sources(session, asset, timeframe, tail_from, date_to)
+    if archived.until is not None and tail_from == archived.until and len(tail):
+        cutoff = np.datetime64(_utc_naive(last_closed_candle_ts(timeframe)), "us")
+        closed = int(np.searchsorted(tail.timestamps, cutoff, side="right"))
+        archive.extend(asset, timeframe, tail[:closed], backup[:closed])
+    if not len(tail):
+        return archived.frame
+    return _concat(archived.frame, tail)
+
+
+def sync_archived_candles(archive: CandleArchive, session: Session, asset: str, timeframe: str) -> int:
+    """Bring one archive segment up to the stored closed candles; returns how many were written.
+
+    A current segment is extended from its last candle; a missing or
+    stale one is rebuilt from the table.
+    """
+    cutoff = last_closed_candle_ts(timeframe)
+    revision = archive.revision(asset, timeframe)
+    archived = archive.read(asset, timeframe, cutoff, cutoff)
+    if archived is not None and archived.until is not None:
+        if archived.until > cutoff:
+            return 0
+        frame, backup = read_candles_with_sources(session, asset, timeframe, archived.until, cutoff)
+        return archive.extend(asset, timeframe, frame, backup)
+    frame, backup = read_candles_with_sources(session, asset, timeframe, date_to=cutoff)
+    archive.rebuild(asset, timeframe, frame, backup, revision)
+    return len(frame)
+
+
+def _invalidate_archive(asset: str, timeframe: str) -> None:
+    archive = candle_archive()
+    if archive is None:
+        return
+    try:
+        archive.invalidate(asset, timeframe)
+    except Exception as exc:
+        logger.warning(
+            "candle_archive_failed",
+            extra={"asset": asset, "timeframe": timeframe, "error": str(exc)},
+        )
+
+
+def _concat(head: CandleFrame, tail: CandleFrame) -> CandleFrame:
+    """``head`` followed by ``tail`` (copies both; archived heads are otherwise zero-copy)."""
+    if not len(head):
+        return tail
+    return CandleFrame.from_arrays(
+        np.concatenate([head.timestamps, tail.timestamps]),
+        tz_aware=head.tz_aware,
+        used_backup_data=head.used_backup_data or tail.used_backup_data,
+        asset=head.asset,
+        timeframe=head.timeframe,
+        **{
+            name: np.concatenate([getattr(head, name), getattr(tail, name)])
+            for name in ("open", "high", "low", "close", "volume")
+        },
+    )
 
 
 def _detect_gaps(
-    candles: list[Candle],
+    candles: Union[CandleFrame, Sequence[Candle]],
     timeframe: str,
     max_gap_candles: int,
 ) -> list[tuple[datetime, datetime]]:
     """Return list of (start, end) gaps larger than threshold."""
-    if len(candles) < 2:
+    frame = as_candle_frame(candles)
+    if len(frame) < 2:
         return []
 
     interval_seconds = TIMEFRAME_SECONDS.get(timeframe, 3600)
-    gaps = []
-
-    for i in range(1, len(candles)):
-        prev_ts = candles[i - 1].timestamp
-        curr_ts = candles[i].timestamp
-        diff_seconds = (curr_ts - prev_ts).total_seconds()
-        expected_diff = interval_seconds
-        gap_candles = int(diff_seconds / interval_seconds) - 1
-
-        if gap_candles > max_gap_candles:
-            gap_start = prev_ts
-            gap_end = curr_ts
-            gaps.append((gap_start, gap_end))
+    diff_seconds = np.diff(frame.timestamps).astype(np.int64) / 1e6
+    gap_candles = (diff_seconds / interval_seconds).astype(np.int64) - 1
 
-    return gaps
+    return [
+        (frame.timestamp_at(i), frame.timestamp_at(i + 1))
+        for i in np.flatnonzero(gap_candles > max_gap_candles).tolist()
+    ]
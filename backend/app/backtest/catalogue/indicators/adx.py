@@ -1,10 +1,21 @@
 """ADX (Average Directional Index) indicator block handler."""
 from __future__ import annotations
 
-from typing import Any, Mapping
+from typing import Any, Iterable, Mapping, Optional
 
-from app.backtest import indicators
-from app.backtest.catalogue.types import BlockContext, BlockHandler, BlockSpec, Issue, ParamSpec, PortSpec
+from app.backtest import indicator_kernels, indicators, online_indicators
+from app.backtest.catalogue.types import (
+    ArrayContext,
+    BlockContext,
+    BlockHandler,
+    BlockSpec,
+    Issue,
+    ParamSpec,
+    PortSpec,
+    SeriesArray,
+    compute_via_lists,
+)
+from app.backtest.online_indicators import CandleLike
 
 _SPEC = BlockSpec(
     type="adx",
@@ -31,13 +42,34 @@ class AdxHandler:
         highs = ctx.candle_data["high"]
         lows = ctx.candle_data["low"]
         closes = ctx.candle_data["close"]
-        adx_line, plus_di, minus_di = indicators.adx(highs, lows, closes, period)
-        return {
+        adx_line, plus_di, minus_di = indicators.adx(highs, lows, closes, period, outputs=ctx.wanted("adx"))
+        return ctx.select({
             "output": adx_line,
             "adx": adx_line,
             "plus_di": plus_di,
             "minus_di": minus_di,
-        }
+        })
+
+    def compute_arrays(self, ctx: ArrayContext) -> dict[str, SeriesArray]:
+        if indicators.use_pandas_ta():
+            return compute_via_lists(self, ctx)
+        period = int(ctx.params.get("period", 14))
+        candles = ctx.candle_data
+        adx_line, plus_di, minus_di = indicator_kernels.adx(candles["high"], candles["low"], candles["close"], period)
+        lines = ctx.select({
+            "output": adx_line,
+            "adx": adx_line,
+            "plus_di": plus_di,
+            "minus_di": minus_di,
+        })
+        return {port: SeriesArray.floats(values) for port, values in lines.items()}
+
+    def init_state(self, params: Mapping[str, Any], history: Iterable[CandleLike]) -> online_indicators.Adx:
+        return online_indicators.Adx(int(params.get("period", 14))).replay(history)
+
+    def update(self, state: online_indicators.Adx, candle: CandleLike) -> dict[str, Optional[float]]:
+        adx_line, plus_di, minus_di = state.update(candle)
+        return {"output": adx_line, "adx": adx_line, "plus_di": plus_di, "minus_di": minus_di}
 
     def validate(self, params: Mapping[str, Any]) -> list[Issue]:
         issues: list[Issue] = []
@@ -1,10 +1,21 @@
 """ATR indicator block handler."""
 from __future__ import annotations
 
-from typing import Any, Mapping
+from typing import Any, Iterable, Mapping, Optional
 
-from app.backtest import indicators
-from app.backtest.catalogue.types import BlockContext, BlockHandler, BlockSpec, Issue, ParamSpec, PortSpec
+from app.backtest import indicator_kernels, indicators, online_indicators
+from app.backtest.catalogue.types import (
+    ArrayContext,
+    BlockContext,
+    BlockHandler,
+    BlockSpec,
+    Issue,
+    ParamSpec,
+    PortSpec,
+    SeriesArray,
+    compute_via_lists,
+)
+from app.backtest.online_indicators import CandleLike
 
 _SPEC = BlockSpec(
     type="atr",
@@ -28,6 +39,20 @@ class AtrHandler:
         closes = ctx.candle_data["close"]
         return {"output": indicators.atr(highs, lows, closes, period)}
 
+    def compute_arrays(self, ctx: ArrayContext) -> dict[str, SeriesArray]:
+        if indicators.use_pandas_ta():
+            return compute_via_lists(self, ctx)
+        period = int(ctx.params.get("period", 14))
+        candles = ctx.candle_data
+        atr = indicator_kernels.atr(candles["high"], candles["low"], candles["close"], period)
+        return {"output": SeriesArray.floats(atr)}
+
+    def init_state(self, params: Mapping[str, Any], history: Iterable[CandleLike]) -> online_indicators.Atr:
+        return online_indicators.Atr(int(params.get("period", 14))).replay(history)
+
+    def update(self, state: online_indicators.Atr, candle: CandleLike) -> dict[str, Optional[float]]:
+        return {"output": state.update(candle)}
+
     def validate(self, params: Mapping[str, Any]) -> list[Issue]:
         period = params.get("period", 14)
         if not isinstance(period, (int, float)) or not 1 <= period <= 500:
@@ -1,10 +1,22 @@
 """Bollinger Bands indicator block handler."""
 from __future__ import annotations
 
-from typing import Any, Mapping
+from typing import Any, Iterable, Mapping, Optional
 
-from app.backtest import indicators
-from app.backtest.catalogue.types import BlockContext, BlockHandler, BlockSpec, Issue, ParamSpec, PortSpec
+from app.backtest import indicator_kernels, indicators, online_indicators
+from app.backtest.catalogue.types import (
+    ArrayContext,
+    BlockContext,
+    BlockHandler,
+    BlockSpec,
+    Issue,
+    ParamSpec,
+    PortSpec,
+    SeriesArray,
+    compute_via_lists,
+)
+from app.backtest.indicator_kernels import as_array
+from app.backtest.online_indicators import CandleLike
 
 _SPEC = BlockSpec(
     type="bollinger",
@@ -33,13 +45,37 @@ class BollingerHandler:
         period = int(ctx.params.get("period", 20))
         std_dev = float(ctx.params.get("stddev", 2.0))
         series = ctx.source_series()
-        upper, middle, lower = indicators.bollinger(series, period, std_dev)
-        return {
+        upper, middle, lower = indicators.bollinger(series, period, std_dev, outputs=ctx.wanted("middle"))
+        return ctx.select({
+            "output": middle,
+            "upper": upper,
+            "middle": middle,
+            "lower": lower,
+        })
+
+    def compute_arrays(self, ctx: ArrayContext) -> dict[str, SeriesArray]:
+        if indicators.use_pandas_ta():
+            return compute_via_lists(self, ctx)
+        period = int(ctx.params.get("period", 20))
+        std_dev = float(ctx.params.get("stddev", 2.0))
+        series = as_array(ctx.source_series())
+        upper, middle, lower = indicator_kernels.bbands(series, period, std_dev, outputs=ctx.wanted("middle"))
+        lines = ctx.select({
             "output": middle,
             "upper": upper,
             "middle": middle,
             "lower": lower,
-        }
+        })
+        return {port: SeriesArray.floats(values) for port, values in lines.items()}
+
+    def init_state(self, params: Mapping[str, Any], history: Iterable[CandleLike]) -> online_indicators.Bollinger:
+        return online_indicators.Bollinger(
+            int(params.get("period", 20)), float(params.get("stddev", 2.0)), params.get("source", "close")
+        ).replay(history)
+
+    def update(self, state: online_indicators.Bollinger, candle: CandleLike) -> dict[str, Optional[float]]:
+        upper, middle, lower = state.update(candle)
+        return {"output": middle, "upper": upper, "middle": middle, "lower": lower}
 
     def validate(self, params: Mapping[str, Any]) -> list[Issue]:
         issues: list[Issue] = []
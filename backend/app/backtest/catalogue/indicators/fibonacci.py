@@ -1,10 +1,20 @@
 """Fibonacci Retracement indicator block handler."""
 from __future__ import annotations
 
-from typing import Any, Mapping
+from typing import Any, Iterable, Mapping, Optional
 
-from app.backtest import indicators
-from app.backtest.catalogue.types import BlockContext, BlockHandler, BlockSpec, Issue, ParamSpec, PortSpec
+from app.backtest import indicator_kernels, indicators, online_indicators
+from app.backtest.catalogue.types import (
+    ArrayContext,
+    BlockContext,
+    BlockHandler,
+    BlockSpec,
+    Issue,
+    ParamSpec,
+    PortSpec,
+    SeriesArray,
+)
+from app.backtest.online_indicators import CandleLike
 
 _SPEC = BlockSpec(
     type="fibonacci",
@@ -33,8 +43,38 @@ class FibonacciHandler:
         highs = ctx.candle_data["high"]
         lows = ctx.candle_data["low"]
         level_236, level_382, level_5, level_618, level_786 = indicators.fibonacci_retracements(
-            highs, lows, lookback
+            highs, lows, lookback, outputs=ctx.wanted("level_5")
+        )
+        return ctx.select({
+            "output": level_5,
+            "level_236": level_236,
+            "level_382": level_382,
+            "level_5": level_5,
+            "level_618": level_618,
+            "level_786": level_786,
+        })
+
+    def compute_arrays(self, ctx: ArrayContext) -> dict[str, SeriesArray]:
+        lookback = int(ctx.params.get("lookback", 50))
+        candles = ctx.candle_data
+        level_236, level_382, level_5, level_618, level_786 = indicator_kernels.fibonacci(
+            candles["high"], candles["low"], lookback, outputs=ctx.wanted("level_5")
         )
+        lines = ctx.select({
+            "output": level_5,
+            "level_236": level_236,
+            "level_382": level_382,
+            "level_5": level_5,
+            "level_618": level_618,
+            "level_786": level_786,
+        })
+        return {port: SeriesArray.floats(values) for port, values in lines.items()}
+
+    def init_state(self, params: Mapping[str, Any], history: Iterable[CandleLike]) -> online_indicators.Fibonacci:
+        return online_indicators.Fibonacci(int(params.get("lookback", 50))).replay(history)
+
+    def update(self, state: online_indicators.Fibonacci, candle: CandleLike) -> dict[str, Optional[float]]:
+        level_236, level_382, level_5, level_618, level_786 = state.update(candle)
         return {
             "output": level_5,
             "level_236": level_236,
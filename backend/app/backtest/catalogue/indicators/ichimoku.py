@@ -1,10 +1,21 @@
 """Ichimoku Cloud indicator block handler."""
 from __future__ import annotations
 
-from typing import Any, Mapping
+from typing import Any, Iterable, Mapping, Optional
 
-from app.backtest import indicators
-from app.backtest.catalogue.types import BlockContext, BlockHandler, BlockSpec, Issue, ParamSpec, PortSpec
+from app.backtest import indicator_kernels, indicators, online_indicators
+from app.backtest.catalogue.types import (
+    ArrayContext,
+    BlockContext,
+    BlockHandler,
+    BlockSpec,
+    Issue,
+    ParamSpec,
+    PortSpec,
+    SeriesArray,
+    compute_via_lists,
+)
+from app.backtest.online_indicators import CandleLike
 
 _SPEC = BlockSpec(
     type="ichimoku",
@@ -39,8 +50,45 @@ class IchimokuHandler:
         lows = ctx.candle_data["low"]
         closes = ctx.candle_data["close"]
         conv_line, base_line, span_a, span_b_line = indicators.ichimoku(
-            highs, lows, closes, conversion, base, span_b, displacement
+            highs, lows, closes, conversion, base, span_b, displacement, outputs=ctx.wanted("conversion")
+        )
+        return ctx.select({
+            "output": conv_line,
+            "conversion": conv_line,
+            "base": base_line,
+            "span_a": span_a,
+            "span_b": span_b_line,
+        })
+
+    def compute_arrays(self, ctx: ArrayContext) -> dict[str, SeriesArray]:
+        if indicators.use_pandas_ta():
+            return compute_via_lists(self, ctx)
+        conversion = int(ctx.params.get("conversion", 9))
+        base = int(ctx.params.get("base", 26))
+        span_b = int(ctx.params.get("span_b", 52))
+        candles = ctx.candle_data
+        conv_line, base_line, span_a, span_b_line = indicator_kernels.ichimoku(
+            candles["high"], candles["low"], conversion, base, span_b, outputs=ctx.wanted("conversion")
         )
+        lines = ctx.select({
+            "output": conv_line,
+            "conversion": conv_line,
+            "base": base_line,
+            "span_a": span_a,
+            "span_b": span_b_line,
+        })
+        return {port: SeriesArray.floats(values) for port, values in lines.items()}
+
+    def init_state(self, params: Mapping[str, Any], history: Iterable[CandleLike]) -> online_indicators.Ichimoku:
+        return online_indicators.Ichimoku(
+            int(params.get("conversion", 9)),
+            int(params.get("base", 26)),
+            int(params.get("span_b", 52)),
+            int(params.get("displacement", 26)),
+        ).replay(history)
+
+    def update(self, state: online_indicators.Ichimoku, candle: CandleLike) -> dict[str, Optional[float]]:
+        conv_line, base_line, span_a, span_b_line = state.update(candle)
         return {
             "output": conv_line,
             "conversion": conv_line,
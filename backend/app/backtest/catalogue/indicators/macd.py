@@ -1,10 +1,22 @@
 """MACD indicator block handler."""
 from __future__ import annotations
 
-from typing import Any, Mapping
+from typing import Any, Iterable, Mapping, Optional
 
-from app.backtest import indicators
-from app.backtest.catalogue.types import BlockContext, BlockHandler, BlockSpec, Issue, ParamSpec, PortSpec
+from app.backtest import indicator_kernels, indicators, online_indicators
+from app.backtest.catalogue.types import (
+    ArrayContext,
+    BlockContext,
+    BlockHandler,
+    BlockSpec,
+    Issue,
+    ParamSpec,
+    PortSpec,
+    SeriesArray,
+    compute_via_lists,
+)
+from app.backtest.indicator_kernels import as_array
+from app.backtest.online_indicators import CandleLike
 
 _SPEC = BlockSpec(
     type="macd",
@@ -35,13 +47,41 @@ class MacdHandler:
         slow = int(ctx.params.get("slow_period", 26))
         signal = int(ctx.params.get("signal_period", 9))
         series = ctx.source_series()
-        macd_line, signal_line, histogram = indicators.macd(series, fast, slow, signal)
-        return {
+        macd_line, signal_line, histogram = indicators.macd(series, fast, slow, signal, outputs=ctx.wanted("macd"))
+        return ctx.select({
             "output": macd_line,
             "macd": macd_line,
             "signal": signal_line,
             "histogram": histogram,
-        }
+        })
+
+    def compute_arrays(self, ctx: ArrayContext) -> dict[str, SeriesArray]:
+        if indicators.use_pandas_ta():
+            return compute_via_lists(self, ctx)
+        fast = int(ctx.params.get("fast_period", 12))
+        slow = int(ctx.params.get("slow_period", 26))
+        signal = int(ctx.params.get("signal_period", 9))
+        series = as_array(ctx.source_series())
+        macd_line, signal_line, histogram = indicator_kernels.macd(series, fast, slow, signal)
+        lines = ctx.select({
+            "output": macd_line,
+            "macd": macd_line,
+            "signal": signal_line,
+            "histogram": histogram,
+        })
+        return {port: SeriesArray.floats(values) for port, values in lines.items()}
+
+    def init_state(self, params: Mapping[str, Any], history: Iterable[CandleLike]) -> online_indicators.Macd:
+        return online_indicators.Macd(
+            int(params.get("fast_period", 12)),
+            int(params.get("slow_period", 26)),
+            int(params.get("signal_period", 9)),
+            params.get("source", "close"),
+        ).replay(history)
+
+    def update(self, state: online_indicators.Macd, candle: CandleLike) -> dict[str, Optional[float]]:
+        macd_line, signal_line, histogram = state.update(candle)
+        return {"output": macd_line, "macd": macd_line, "signal": signal_line, "histogram": histogram}
 
     def validate(self, params: Mapping[str, Any]) -> list[Issue]:
         issues: list[Issue] = []
@@ -1,10 +1,20 @@
 """OBV indicator block handler."""
 from __future__ import annotations
 
-from typing import Any, Mapping
+from typing import Any, Iterable, Mapping, Optional
 
-from app.backtest import indicators
-from app.backtest.catalogue.types import BlockContext, BlockHandler, BlockSpec, Issue, PortSpec
+from app.backtest import indicator_kernels, indicators, online_indicators
+from app.backtest.catalogue.types import (
+    ArrayContext,
+    BlockContext,
+    BlockHandler,
+    BlockSpec,
+    Issue,
+    PortSpec,
+    SeriesArray,
+    compute_via_lists,
+)
+from app.backtest.online_indicators import CandleLike
 
 _SPEC = BlockSpec(
     type="obv",
@@ -24,5 +34,17 @@ class ObvHandler:
         volumes = ctx.candle_data["volume"]
         return {"output": indicators.obv(closes, volumes)}
 
+    def compute_arrays(self, ctx: ArrayContext) -> dict[str, SeriesArray]:
+        if indicators.use_pandas_ta():
+            return compute_via_lists(self, ctx)
+        candles = ctx.candle_data
+        return {"output": SeriesArray.floats(indicator_kernels.obv(candles["close"], candles["volume"]))}
+
+    def init_state(self, params: Mapping[str, Any], history: Iterable[CandleLike]) -> online_indicators.Obv:
+        return online_indicators.Obv().replay(history)
+
+    def update(self, state: online_indicators.Obv, candle: CandleLike) -> dict[str, Optional[float]]:
+        return {"output": state.update(candle)}
+
     def validate(self, params: Mapping[str, Any]) -> list[Issue]:
         return []
@@ -1,10 +1,11 @@
 """Price Variation % indicator block handler."""
 from __future__ import annotations
 
-from typing import Any, Mapping
+from typing import Any, Iterable, Mapping, Optional
 
-from app.backtest import indicators
+from app.backtest import indicators, online_indicators
 from app.backtest.catalogue.types import BlockContext, BlockHandler, BlockSpec, Issue, PortSpec
+from app.backtest.online_indicators import CandleLike
 
 _SPEC = BlockSpec(
     type="price_variation_pct",
@@ -22,5 +23,11 @@ class PriceVariationPctHandler:
     def compute(self, ctx: BlockContext) -> dict[str, list]:
         return {"output": indicators.price_variation_pct(ctx.candle_data["close"])}
 
+    def init_state(self, params: Mapping[str, Any], history: Iterable[CandleLike]) -> online_indicators.PriceVariationPct:
+        return online_indicators.PriceVariationPct().replay(history)
+
+    def update(self, state: online_indicators.PriceVariationPct, candle: CandleLike) -> dict[str, Optional[float]]:
+        return {"output": state.update(candle)}
+
     def validate(self, params: Mapping[str, Any]) -> list[Issue]:
         return []
@@ -1,10 +1,23 @@
 """RSI indicator block handler."""
 from __future__ import annotations
 
-from typing import Any, Mapping
+from dataclasses import replace
+from typing import Any, Iterable, Mapping, Optional, Sequence
 
-from app.backtest import indicators
-from app.backtest.catalogue.types import BlockContext, BlockHandler, BlockSpec, Issue, ParamSpec, PortSpec
+from app.backtest import indicator_kernels, indicators, online_indicators
+from app.backtest.catalogue.types import (
+    ArrayContext,
+    BlockContext,
+    BlockHandler,
+    BlockSpec,
+    Issue,
+    ParamSpec,
+    PortSpec,
+    SeriesArray,
+    compute_via_lists,
+)
+from app.backtest.indicator_kernels import as_array
+from app.backtest.online_indicators import CandleLike
 
 _SPEC = BlockSpec(
     type="rsi",
@@ -32,6 +45,24 @@ class RsiHandler:
         period = int(ctx.params.get("period", 14))
         return {"output": indicators.rsi(ctx.source_series(), period)}
 
+    def compute_arrays(self, ctx: ArrayContext) -> dict[str, SeriesArray]:
+        if indicators.use_pandas_ta():
+            return compute_via_lists(self, ctx)
+        period = int(ctx.params.get("period", 14))
+        return {"output": SeriesArray.floats(indicator_kernels.rsi(as_array(ctx.source_series()), period))}
+
+    def compute_periods(self, ctx: ArrayContext, periods: Sequence[int]) -> list[dict[str, SeriesArray]]:
+        if indicators.use_pandas_ta():
+            return [compute_via_lists(self, replace(ctx, params={**ctx.params, "period": p})) for p in periods]
+        rows = indicator_kernels.rsi_batch(as_array(ctx.source_series()), periods)
+        return [{"output": SeriesArray.floats(row)} for row in rows]
+
+    def init_state(self, params: Mapping[str, Any], history: Iterable[CandleLike]) -> online_indicators.Rsi:
+        return online_indicators.Rsi(int(params.get("period", 14)), params.get("source", "close")).replay(history)
+
+    def update(self, state: online_indicators.Rsi, candle: CandleLike) -> dict[str, Optional[float]]:
+        return {"output": state.update(candle)}
+
     def validate(self, params: Mapping[str, Any]) -> list[Issue]:
         period = params.get("period", 14)
         if not isinstance(period, (int, float)) or not 2 <= period <= 100:
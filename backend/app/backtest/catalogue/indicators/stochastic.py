@@ -1,10 +1,21 @@
 """Stochastic Oscillator indicator block handler."""
 from __future__ import annotations
 
-from typing import Any, Mapping
+from typing import Any, Iterable, Mapping, Optional
 
-from app.backtest import indicators
-from app.backtest.catalogue.types import BlockContext, BlockHandler, BlockSpec, Issue, ParamSpec, PortSpec
+from app.backtest import indicator_kernels, indicators, online_indicators
+from app.backtest.catalogue.types import (
+    ArrayContext,
+    BlockContext,
+    BlockHandler,
+    BlockSpec,
+    Issue,
+    ParamSpec,
+    PortSpec,
+    SeriesArray,
+    compute_via_lists,
+)
+from app.backtest.online_indicators import CandleLike
 
 _SPEC = BlockSpec(
     type="stochastic",
@@ -34,12 +45,40 @@ class StochasticHandler:
         highs = ctx.candle_data["high"]
         lows = ctx.candle_data["low"]
         closes = ctx.candle_data["close"]
-        k_line, d_line = indicators.stochastic(highs, lows, closes, k_period, d_period, smooth)
-        return {
+        k_line, d_line = indicators.stochastic(
+            highs, lows, closes, k_period, d_period, smooth, outputs=ctx.wanted("k")
+        )
+        return ctx.select({
+            "output": k_line,
+            "k": k_line,
+            "d": d_line,
+        })
+
+    def compute_arrays(self, ctx: ArrayContext) -> dict[str, SeriesArray]:
+        if indicators.use_pandas_ta():
+            return compute_via_lists(self, ctx)
+        k_period = int(ctx.params.get("k_period", 14))
+        d_period = int(ctx.params.get("d_period", 3))
+        smooth = int(ctx.params.get("smooth", 3))
+        candles = ctx.candle_data
+        k_line, d_line = indicator_kernels.stoch(
+            candles["high"], candles["low"], candles["close"], k_period, d_period, smooth
+        )
+        lines = ctx.select({
             "output": k_line,
             "k": k_line,
             "d": d_line,
-        }
+        })
+        return {port: SeriesArray.floats(values) for port, values in lines.items()}
+
+    def init_state(self, params: Mapping[str, Any], history: Iterable[CandleLike]) -> online_indicators.Stochastic:
+        return online_indicators.Stochastic(
+            int(params.get("k_period", 14)), int(params.get("d_period", 3)), int(params.get("smooth", 3))
+        ).replay(history)
+
+    def update(self, state: online_indicators.Stochastic, candle: CandleLike) -> dict[str, Optional[float]]:
+        k_line, d_line = state.update(candle)
+        return {"output": k_line, "k": k_line, "d": d_line}
 
     def validate(self, params: Mapping[str, Any]) -> list[Issue]:
         issues: list[Issue] = []
@@ -1,9 +1,21 @@
 """Compare block handler for the block catalogue."""
 from __future__ import annotations
 
+import operator as _op
 from typing import Any, Mapping
 
-from app.backtest.catalogue.types import BlockContext, BlockSpec, Issue, ParamSpec, PortSpec
+import numpy as np
+
+from app.backtest.catalogue.types import (
+    ArrayContext,
+    BlockContext,
+    BlockSpec,
+    Issue,
+    ParamSpec,
+    PortSpec,
+    SeriesArray,
+    compute_lists,
+)
 
 _OPERATOR_MAP: dict[str, str] = {
     ">": ">",
@@ -51,39 +63,26 @@ def _normalize_operator(operator: Any) -> str | None:
     return _OPERATOR_MAP.get(operator.strip().lower())
 
 
-def _to_bool_result(l_val: Any, r_val: Any, op: str) -> bool:
-    if l_val is None or r_val is None:
-        return False
-    if op == ">":
-        return l_val > r_val
-    if op == "<":
-        return l_val < r_val
-    if op == ">=":
-        return l_val >= r_val
-    if op == "<=":
-        return l_val <= r_val
-    return False
+_COMPARATORS = {">": _op.gt, "<": _op.lt, ">=": _op.ge, "<=": _op.le}
 
 
 class CompareHandler:
     spec: BlockSpec = _SPEC
 
     def compute(self, ctx: BlockContext) -> dict[str, list]:
+        return compute_lists(self, ctx)
+
+    def compute_arrays(self, ctx: ArrayContext) -> dict[str, SeriesArray]:
         # Tolerate legacy a/b port names for backward compatibility
-        left = ctx.input("left") or ctx.input("a", [0.0] * ctx.n)
-        right = ctx.input("right") or ctx.input("b", [0.0] * ctx.n)
-        raw_op = ctx.params.get("operator", ">")
-        op = _normalize_operator(raw_op)
+        left = ctx.input("left") or ctx.numbers("a")
+        right = ctx.input("right") or ctx.numbers("b")
+        comparator = _COMPARATORS.get(_normalize_operator(ctx.params.get("operator", ">")) or "")
+        if comparator is None:
+            return {"output": SeriesArray.signal(np.zeros(ctx.n, dtype=bool))}
 
-        result = [
-            _to_bool_result(
-                left[i] if i < len(left) else None,
-                right[i] if i < len(right) else None,
-                op or "",
-            )
-            for i in range(ctx.n)
-        ]
-        return {"output": result}
+        with np.errstate(invalid="ignore"):
+            result = comparator(left.values, right.values)
+        return {"output": SeriesArray.signal(result & left.valid & right.valid)}
 
     def validate(self, params: Mapping[str, Any]) -> list[Issue]:
         operator = params.get("operator", ">")
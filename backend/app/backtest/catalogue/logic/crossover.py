@@ -3,7 +3,18 @@ from __future__ import annotations
 
 from typing import Any, Mapping
 
-from app.backtest.catalogue.types import BlockContext, BlockSpec, Issue, ParamSpec, PortSpec
+import numpy as np
+
+from app.backtest.catalogue.types import (
+    ArrayContext,
+    BlockContext,
+    BlockSpec,
+    Issue,
+    ParamSpec,
+    PortSpec,
+    SeriesArray,
+    compute_lists,
+)
 
 _VALID_DIRECTIONS = ("crosses_above", "crosses_below")
 
@@ -32,27 +43,26 @@ class CrossoverHandler:
     spec: BlockSpec = _SPEC
 
     def compute(self, ctx: BlockContext) -> dict[str, list]:
-        fast = ctx.input("fast", [0.0] * ctx.n)
-        slow = ctx.input("slow", [0.0] * ctx.n)
-        direction = ctx.params.get("direction", "crosses_above")
+        return compute_lists(self, ctx)
 
-        result: list[bool] = [False]  # first candle has no previous — always False
-        for i in range(1, ctx.n):
-            fp = fast[i - 1] if i - 1 < len(fast) else None
-            fc = fast[i] if i < len(fast) else None
-            sp = slow[i - 1] if i - 1 < len(slow) else None
-            sc = slow[i] if i < len(slow) else None
-
-            if any(v is None for v in (fp, fc, sp, sc)):
-                result.append(False)
-                continue
+    def compute_arrays(self, ctx: ArrayContext) -> dict[str, SeriesArray]:
+        fast = ctx.numbers("fast")
+        slow = ctx.numbers("slow")
+        direction = ctx.params.get("direction", "crosses_above")
 
-            if direction == "crosses_above":
-                result.append(fp <= sp and fc > sc)
-            else:  # crosses_below
-                result.append(fp >= sp and fc < sc)
+        result = np.zeros(ctx.n, dtype=bool)  # first candle has no previous — always False
+        if ctx.n > 1:
+            fp, fc = fast.values[:-1], fast.values[1:]
+            sp, sc = slow.values[:-1], slow.values[1:]
+            with np.errstate(invalid="ignore"):
+                if direction == "crosses_above":
+                    crossed = (fp <= sp) & (fc > sc)
+                else:  # crosses_below
+                    crossed = (fp >= sp) & (fc < sc)
+            valid = fast.valid & slow.valid
+            result[1:] = crossed & valid[:-1] & valid[1:]
 
-        return {"output": result}
+        return {"output": SeriesArray.signal(result)}
 
     def validate(self, params: Mapping[str, Any]) -> list[Issue]:
         direction = params.get("direction", "crosses_above")
@@ -3,17 +3,16 @@ from __future__ import annotations
 
 from typing import Any, Mapping
 
-from app.backtest.catalogue.types import BlockContext, BlockSpec, Issue, PortSpec
-
+from app.backtest.catalogue.types import (
+    ArrayContext,
+    BlockContext,
+    BlockSpec,
+    Issue,
+    PortSpec,
+    SeriesArray,
+    compute_lists,
+)
 
-def _to_bool(value: Any) -> bool:
-    if value is None:
-        return False
-    if isinstance(value, bool):
-        return value
-    if isinstance(value, (int, float)):
-        return value != 0
-    return bool(value)
 
 
 _SPEC = BlockSpec(
@@ -30,8 +29,10 @@ class ExitSignalHandler:
     spec: BlockSpec = _SPEC
 
     def compute(self, ctx: BlockContext) -> dict[str, list]:
-        data = ctx.input("signal", [False] * ctx.n)
-        return {"output": [_to_bool(data[i]) for i in range(ctx.n)]}
+        return compute_lists(self, ctx)
+
+    def compute_arrays(self, ctx: ArrayContext) -> dict[str, SeriesArray]:
+        return {"output": SeriesArray.signal(ctx.flags("signal"))}
 
     def validate(self, params: Mapping[str, Any]) -> list[Issue]:
         return []
@@ -3,7 +3,9 @@ from __future__ import annotations
 
 from typing import Any, Mapping
 
-from app.backtest.catalogue.types import BlockContext, BlockHandler, BlockSpec, Issue, ParamSpec, PortSpec
+import numpy as np
+
+from app.backtest.catalogue.types import ArrayContext, BlockContext, BlockHandler, BlockSpec, Issue, ParamSpec, PortSpec, SeriesArray
 
 _SPEC = BlockSpec(
     type="constant",
@@ -31,6 +33,10 @@ class ConstantHandler:
         value = float(ctx.params.get("value", 0.0))
         return {"output": [value] * ctx.n}
 
+    def compute_arrays(self, ctx: ArrayContext) -> dict[str, SeriesArray]:
+        value = float(ctx.params.get("value", 0.0))
+        return {"output": SeriesArray.floats(np.full(ctx.n, value))}
+
     def validate(self, params: Mapping[str, Any]) -> list[Issue]:
         value = params.get("value", 0)
         if not isinstance(value, (int, float)):
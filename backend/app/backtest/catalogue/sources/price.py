@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from typing import Any, Mapping
 
-from app.backtest.catalogue.types import BlockContext, BlockHandler, BlockSpec, Issue, ParamSpec, PortSpec
+from app.backtest.catalogue.types import ArrayContext, BlockContext, BlockHandler, BlockSpec, Issue, ParamSpec, PortSpec, SeriesArray
 
 _SPEC = BlockSpec(
     type="price",
@@ -30,5 +30,9 @@ class PriceHandler:
         source = ctx.params.get("source", "close")
         return {"output": ctx.candle_data.get(source, ctx.candle_data["close"])}
 
+    def compute_arrays(self, ctx: ArrayContext) -> dict[str, SeriesArray]:
+        source = ctx.params.get("source", "close")
+        return {"output": SeriesArray.floats(ctx.candle_data.get(source, ctx.candle_data["close"]))}
+
     def validate(self, params: Mapping[str, Any]) -> list[Issue]:
         return []
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from typing import Any, Mapping
 
-from app.backtest.catalogue.types import BlockContext, BlockHandler, BlockSpec, Issue, PortSpec
+from app.backtest.catalogue.types import ArrayContext, BlockContext, BlockHandler, BlockSpec, Issue, PortSpec, SeriesArray
 
 _SPEC = BlockSpec(
     type="volume",
@@ -21,5 +21,8 @@ class VolumeHandler:
     def compute(self, ctx: BlockContext) -> dict[str, list]:
         return {"output": ctx.candle_data["volume"]}
 
+    def compute_arrays(self, ctx: ArrayContext) -> dict[str, SeriesArray]:
+        return {"output": SeriesArray.floats(ctx.candle_data["volume"])}
+
     def validate(self, params: Mapping[str, Any]) -> list[Issue]:
         return []
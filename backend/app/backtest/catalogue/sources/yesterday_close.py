@@ -3,7 +3,9 @@ from __future__ import annotations
 
 from typing import Any, Mapping
 
-from app.backtest.catalogue.types import BlockContext, BlockHandler, BlockSpec, Issue, PortSpec
+import numpy as np
+
+from app.backtest.catalogue.types import ArrayContext, BlockContext, BlockHandler, BlockSpec, Issue, PortSpec, SeriesArray
 
 _SPEC = BlockSpec(
     type="yesterday_close",
@@ -19,8 +21,16 @@ class YesterdayCloseHandler:
     spec: BlockSpec = _SPEC
 
     def compute(self, ctx: BlockContext) -> dict[str, list]:
+        if "prev_close" in ctx.candle_data:
+            return {"output": ctx.candle_data["prev_close"]}
         closes = ctx.candle_data["close"]
-        return {"output": [None] + closes[:-1]}
+        return {"output": [None] + list(closes[:-1])}
+
+    def compute_arrays(self, ctx: ArrayContext) -> dict[str, SeriesArray]:
+        if "prev_close" in ctx.candle_data:
+            return {"output": SeriesArray.floats(ctx.candle_data["prev_close"])}
+        closes = np.asarray(ctx.candle_data["close"], dtype=np.float64)
+        return {"output": SeriesArray.floats(np.concatenate(([np.nan], closes[:-1])))}
 
     def validate(self, params: Mapping[str, Any]) -> list[Issue]:
         return []
@@ -1,11 +1,16 @@
 """Protocol types for the block catalogue.
 
 Every block handler in the catalogue must satisfy the BlockHandler protocol.
+Handlers that also implement ArrayBlockHandler are evaluated on NumPy arrays
+by the Interpreter; ``compute_arrays`` adapts the rest (see SeriesArray).
+Indicator handlers also implement OnlineBlockHandler, one candle at a time.
 """
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Literal, Mapping, Protocol, runtime_checkable
+from typing import Any, Iterable, Literal, Mapping, Optional, Protocol, Sequence, runtime_checkable
+
+import numpy as np
 
 from app.backtest.errors import StrategyInvalidError
 
@@ -48,12 +53,21 @@ class Issue:
 
 @dataclass(frozen=True)
 class BlockContext:
-    candle_data: dict[str, list]
+    """Inputs to one handler call.
+
+    ``candle_data`` maps each price source to a read-only series — NumPy
+    columns of the run's CandleFrame in the pipeline, plain lists in tests.
+    ``ports`` names the outputs the strategy consumes; None means all of
+    them. Handlers may skip the rest (see ``wanted`` and ``select``).
+    """
+
+    candle_data: Mapping[str, Sequence]
     params: dict
     inputs: dict[str, list]
     n: int
+    ports: Optional[frozenset[str]] = None
 
-    def source_series(self, default: str = "close") -> list:
+    def source_series(self, default: str = "close") -> Sequence:
         source = self.params.get("source", default)
         if source not in self.candle_data:
             raise StrategyInvalidError(
@@ -65,6 +79,129 @@ class BlockContext:
     def input(self, port: str, default: list | None = None) -> list:
         return self.inputs.get(port, default or [])
 
+    def wanted(self, output_alias: str) -> Optional[frozenset[str]]:
+        """Consumed ports with "output" resolved to the port it aliases; None for all."""
+        if self.ports is None:
+            return None
+        return frozenset(output_alias if port == "output" else port for port in self.ports)
+
+    def select(self, outputs: dict[str, Any]) -> dict[str, Any]:
+        """The consumed entries of ``outputs``."""
+        if self.ports is None:
+            return outputs
+        return {port: values for port, values in outputs.items() if port in self.ports}
+
+
+@dataclass(frozen=True)
+class SeriesArray:
+    """One output port as arrays: ``values`` plus a ``valid`` mask.
+
+    ``values`` is float64 (NaN where invalid) for numeric series and bool
+    (False where invalid) for signals. Invalid bars — indicator warm-up,
+    missing data — are the ``None`` entries of the list contract.
+    """
+
+    values: np.ndarray
+    valid: np.ndarray
+
+    @classmethod
+    def from_list(cls, values: Sequence, n: int) -> "SeriesArray":
+        """Convert a list-contract series (None = invalid) of up to ``n`` bars."""
+        if isinstance(values, SeriesArray):
+            return values
+        if isinstance(values, np.ndarray) and values.dtype == np.bool_:
+            array = values
+        elif not isinstance(values, np.ndarray) and _is_signal_list(values):
+            array = np.array([bool(v) for v in values], dtype=bool)
+            valid = np.array([v is not None for v in values], dtype=bool)
+            return cls._padded(array, valid, n)
+        else:
+            # None becomes NaN; NaN in a list series is just as invalid
+            series = cls.floats(values)
+            return cls._padded(series.values, series.valid, n)
+        return cls._padded(array, np.ones(array.shape[0], dtype=bool), n)
+
+    @classmethod
+    def floats(cls, values: Sequence) -> "SeriesArray":
+        """A numeric series, invalid where ``values`` is None or NaN."""
+        array = np.asarray(values, dtype=np.float64)
+        return cls(array, ~np.isnan(array))
+
+    @classmethod
+    def signal(cls, values: np.ndarray) -> "SeriesArray":
+        """A bool series valid on every bar."""
+        return cls(values, np.ones(values.shape[0], dtype=bool))
+
+    @classmethod
+    def _padded(cls, values: np.ndarray, valid: np.ndarray, n: int) -> "SeriesArray":
+        if values.shape[0] >= n:
+            return cls(values[:n], valid[:n])
+        fill = False if values.dtype == np.bool_ else np.nan
+        pad = n - values.shape[0]
+        return cls(
+            np.concatenate((values, np.full(pad, fill, dtype=values.dtype))),
+            np.concatenate((valid, np.zeros(pad, dtype=bool))),
+        )
+
+    @property
+    def is_signal(self) -> bool:
+        return self.values.dtype == np.bool_
+
+    def truthy(self) -> np.ndarray:
+        """Per-bar truth of the list contract: invalid, zero and False are False."""
+        if self.is_signal:
+            return self.values & self.valid
+        return self.valid & (self.values != 0)
+
+    def to_list(self) -> list:
+        """Back to the list contract: Python bools/floats, None where invalid."""
+        items = self.values.tolist()
+        if self.valid.all():
+            return items
+        return [v if ok else None for v, ok in zip(items, self.valid.tolist())]
+
+
+def _is_signal_list(values: Sequence) -> bool:
+    for v in values:
+        if v is not None:
+            return isinstance(v, (bool, np.bool_))
+    return False
+
+
+@dataclass(frozen=True)
+class ArrayContext:
+    """Inputs to one ``compute_arrays`` call: BlockContext with SeriesArray inputs."""
+
+    candle_data: Mapping[str, np.ndarray]
+    params: dict
+    inputs: dict[str, SeriesArray]
+    n: int
+    ports: Optional[frozenset[str]] = None
+
+    def source_series(self, default: str = "close") -> Sequence:
+        return BlockContext(self.candle_data, self.params, {}, self.n).source_series(default)
+
+    def wanted(self, output_alias: str) -> Optional[frozenset[str]]:
+        return BlockContext(self.candle_data, self.params, {}, self.n, self.ports).wanted(output_alias)
+
+    def select(self, outputs: dict[str, Any]) -> dict[str, Any]:
+        return BlockContext(self.candle_data, self.params, {}, self.n, self.ports).select(outputs)
+
+    def input(self, port: str) -> Optional[SeriesArray]:
+        return self.inputs.get(port)
+
+    def numbers(self, port: str, default: float = 0.0) -> SeriesArray:
+        """Input ``port``, or a valid constant series when it is not connected."""
+        series = self.inputs.get(port)
+        if series is not None:
+            return series
+        return SeriesArray(np.full(self.n, default, dtype=np.float64), np.ones(self.n, dtype=bool))
+
+    def flags(self, port: str) -> np.ndarray:
+        """Truth of input ``port`` per bar; False when it is not connected."""
+        series = self.inputs.get(port)
+        return series.truthy() if series is not None else np.zeros(self.n, dtype=bool)
+
 
 @runtime_checkable
 class BlockHandler(Protocol):
@@ -73,3 +210,69 @@ class BlockHandler(Protocol):
     def compute(self, ctx: BlockContext) -> dict[str, list]: ...
 
     def validate(self, params: Mapping[str, Any]) -> list[Issue]: ...
+
+
+@runtime_checkable
+class ArrayBlockHandler(BlockHandler, Protocol):
+    """Second-generation contract: arrays in, arrays out, no per-bar Python."""
+
+    def compute_arrays(self, ctx: ArrayContext) -> dict[str, SeriesArray]: ...
+
+
+@runtime_checkable
+class OnlineBlockHandler(BlockHandler, Protocol):
+    """Incremental contract: a state built from a candle history, then one candle at a time.
+
+    ``update`` returns every output port for the new candle — what
+    ``compute`` over the history plus that candle gives for its last bar —
+    in O(1). States come from app/backtest/online_indicators.py.
+    """
+
+    def init_state(self, params: Mapping[str, Any], history: Iterable[Any]) -> Any: ...
+
+    def update(self, state: Any, candle: Any) -> dict[str, Optional[float]]: ...
+
+
+@runtime_checkable
+class PeriodBatchBlockHandler(ArrayBlockHandler, Protocol):
+    """Batch contract: one block at several ``period`` values in one pass.
+
+    ``compute_periods`` returns, per period, what ``compute_arrays`` gives
+    with ``ctx.params`` plus that period — the same values, not an
+    approximation — so batch and single results can share cache entries.
+    """
+
+    def compute_periods(self, ctx: ArrayContext, periods: Sequence[int]) -> list[dict[str, SeriesArray]]: ...
+
+
+def compute_arrays(handler: BlockHandler, ctx: ArrayContext) -> dict[str, SeriesArray]:
+    """Run any handler on arrays; list-contract handlers go through a shim."""
+    compute_native = getattr(handler, "compute_arrays", None)
+    if compute_native is not None:
+        return compute_native(ctx)
+    return compute_via_lists(handler, ctx)
+
+
+def compute_via_lists(handler: BlockHandler, ctx: ArrayContext) -> dict[str, SeriesArray]:
+    """``handler.compute`` on a list copy of ``ctx``, converted back to arrays."""
+    list_ctx = BlockContext(
+        candle_data=ctx.candle_data,
+        params=ctx.params,
+        inputs={port: series.to_list() for port, series in ctx.inputs.items()},
+        n=ctx.n,
+        ports=ctx.ports,
+    )
+    return {port: SeriesArray.from_list(values, ctx.n) for port, values in handler.compute(list_ctx).items()}
+
+
+def compute_lists(handler: ArrayBlockHandler, ctx: BlockContext) -> dict[str, list]:
+    """The list contract of an array-native handler, for list callers."""
+    array_ctx = ArrayContext(
+        candle_data={k: np.asarray(v, dtype=np.float64) for k, v in ctx.candle_data.items()},
+        params=ctx.params,
+        # An empty list reads as "not connected", as it does for list handlers
+        inputs={port: SeriesArray.from_list(values, ctx.n) for port, values in ctx.inputs.items() if len(values)},
+        n=ctx.n,
+        ports=ctx.ports,
+    )
+    return {port: series.to_list() for port, series in handler.compute_arrays(array_ctx).items()}
@@ -0,0 +1,82 @@
+"""Engine checkpoints — resume a backtest where the previous run stopped.
+
+A checkpoint is a snapshot of the StreamingBacktest after candles
+``[0, next_index)``: balance, peak equity, max drawdown, the PositionManager
+(open position, TP ladder, excursions), a pending entry from the last
+candle's signal, and the trades and equity curve so far. It is taken before
+the end-of-data close, which is a result, not state. A later run over the
+same range extended by new candles resumes at ``next_index`` and simulates
+only the new candles, with a result identical to a full re-run.
+
+``fingerprint`` hashes every input the state depends on (candles and
+signals ``[0, next_index)``, risk and cost params); the Engine ignores a
+checkpoint whose fingerprint does not match, e.g. after candles were
+refreshed.
+
+Indicators are not checkpointed: the Interpreter is vectorised and only
+looks backwards, so re-interpreting the extended range reproduces the old
+signals and adds the new ones.
+
+Documented in CONTEXT.md (term: Engine checkpoint).
+"""
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from app.backtest.streaming import StreamingBacktest
+
+if TYPE_CHECKING:
+    from app.backtest.candle_frame import CandleFrame
+    from app.backtest.interpreter import StrategySignals
+
+
+@dataclass(frozen=True)
+class EngineCheckpoint:
+    """Engine state after candles ``[0, next_index)``. Treat as read-only."""
+
+    next_index: int
+    fingerprint: str
+    engine: StreamingBacktest
+
+
+def _padded(flags: list[bool], length: int) -> bytes:
+    head = np.asarray(flags[:length], dtype=bool)
+    return np.concatenate((head, np.zeros(length - head.size, dtype=bool))).tobytes()
+
+
+def input_fingerprint(
+    frame: "CandleFrame",
+    signals: "StrategySignals",
+    next_index: int,
+    initial_balance: float,
+    fee_rate: float,
+    slippage_rate: float,
+    spread_rate: float,
+) -> str:
+    """Hash of every input the Engine state after ``next_index`` bars depends on."""
+    rows = slice(0, next_index)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(frame.timestamps[rows].astype("datetime64[us]").tobytes())
+    for column in (frame.open, frame.high, frame.low, frame.close):
+        digest.update(np.ascontiguousarray(column[rows], dtype=np.float64).tobytes())
+    digest.update(_padded(signals.entry_long, next_index))
+    digest.update(_padded(signals.exit_long, next_index))
+    digest.update(
+        repr((
+            signals.position_size_pct,
+            signals.take_profit_levels or None,
+            signals.stop_loss_pct,
+            signals.max_drawdown_pct,
+            signals.time_exit_bars,
+            signals.trailing_stop_pct,
+            initial_balance,
+            fee_rate,
+            slippage_rate,
+            spread_rate,
+        )).encode()
+    )
+    return digest.hexdigest()
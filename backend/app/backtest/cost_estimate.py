@@ -0,0 +1,96 @@
+"""Run cost estimate — CPU time and peak memory of a backtest, before it runs.
+
+The estimate is static: it reads the compiled execution plan (which blocks
+run, with which params) and the bar count implied by the timeframe and date
+range, and prices them with per-bar costs measured by the benchmark suite
+(``python -m benchmarks --calibrate`` prints the current measurements next
+to these constants). It errs high: the Engine is priced as if every bar
+held a position.
+
+The API uses it for admission control — runs over the limits are rejected
+before they are queued, heavy runs go to their own queue, and the estimate
+is returned as an ETA (see backtest_service.admit_run).
+
+Documented in CONTEXT.md (term: Run cost estimate).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from app.backtest.candles import TIMEFRAME_SECONDS
+from app.backtest.execution_plan import ExecutionPlan, plan_for
+from app.backtest.types import ValidatedStrategy
+
+
+@dataclass(frozen=True)
+class BlockCost:
+    """Per-bar cost of one block."""
+
+    ns_per_bar: float
+    bytes_per_bar: float  # transient peak while computing, beyond its outputs
+
+
+# Measured on 100k synthetic bars with default params, all ports, on the
+# default NumPy indicator kernels (the pandas_ta backend costs 0.7-3 us/bar).
+BLOCK_COSTS: dict[str, BlockCost] = {
+    "sma": BlockCost(30, 60),
+    "ema": BlockCost(20, 45),
+    "rsi": BlockCost(45, 65),
+    "atr": BlockCost(25, 50),
+    "obv": BlockCost(10, 35),
+    "price_variation_pct": BlockCost(600, 45),
+    "macd": BlockCost(300, 80),
+    "bollinger": BlockCost(110, 195),
+    "stochastic": BlockCost(70, 100),
+    "adx": BlockCost(80, 110),
+    "ichimoku": BlockCost(95, 75),
+    "fibonacci": BlockCost(40, 75),
+}
+# Sources, logic and signals are single vectorised NumPy passes.
+DEFAULT_BLOCK_COST = BlockCost(10, 10)
+
+# Engine plus benchmark curve, metrics and trades artifact, per bar.
+ENGINE_NS_PER_BAR = 10_000
+# Candles, Bars, ISO timestamps, equity and benchmark curves, per bar.
+BASE_BYTES_PER_BAR = 900
+# Fetching candles, uploading artifacts and bookkeeping around the pipeline.
+JOB_OVERHEAD_SECONDS = 0.5
+# Each output series kept for the run: float64 values plus a validity mask.
+SERIES_BYTES_PER_BAR = 9
+
+
+@dataclass(frozen=True)
+class RunCostEstimate:
+    bars: int
+    cpu_seconds: float
+    peak_memory_mb: float
+
+
+def estimate_bars(timeframe: str, date_from: datetime, date_to: datetime) -> int:
+    """Candles a run over [date_from, date_to] fetches at ``timeframe``."""
+    seconds = TIMEFRAME_SECONDS.get(timeframe, TIMEFRAME_SECONDS["1h"])
+    return max(int((date_to - date_from).total_seconds() // seconds) + 1, 0)
+
+
+def estimate_plan_cost(plan: ExecutionPlan, bars: int) -> RunCostEstimate:
+    ns_per_bar = ENGINE_NS_PER_BAR
+    retained_bytes = BASE_BYTES_PER_BAR
+    transient_bytes = 0.0
+    for step in plan.steps:
+        cost = BLOCK_COSTS.get(step.block_type, DEFAULT_BLOCK_COST)
+        ns_per_bar += cost.ns_per_bar
+        retained_bytes += SERIES_BYTES_PER_BAR * max(len(step.ports), 1)
+        transient_bytes = max(transient_bytes, cost.bytes_per_bar)
+    return RunCostEstimate(
+        bars=bars,
+        cpu_seconds=JOB_OVERHEAD_SECONDS + bars * ns_per_bar / 1e9,
+        peak_memory_mb=bars * (retained_bytes + transient_bytes) / 2**20,
+    )
+
+
+def estimate_run_cost(
+    strategy: ValidatedStrategy, timeframe: str, date_from: datetime, date_to: datetime
+) -> RunCostEstimate:
+    """Estimate a run of ``strategy``; raises StrategyInvalidError if it does not compile."""
+    return estimate_plan_cost(plan_for(strategy), estimate_bars(timeframe, date_from, date_to))
@@ -4,6 +4,7 @@ import logging
 
 from sqlmodel import Session, select, func
 
+from app.backtest.candle_reader import read_candles
 from app.backtest.candles import TIMEFRAME_SECONDS, _detect_gaps
 from app.core.config import settings
 from app.models.candle import Candle
@@ -195,14 +196,8 @@ def compute_completeness_metrics(
     else:
         completeness_percent = 100.0
 
-    # Query all candles to detect gaps
-    candles_stmt = (
-        select(Candle)
-        .where(Candle.asset == asset)
-        .where(Candle.timeframe == timeframe)
-        .order_by(Candle.timestamp)
-    )
-    candles = list(session.exec(candles_stmt).all())
+    # Read every timestamp as columns to detect gaps
+    candles = read_candles(session, asset, timeframe, capacity=actual_count)
 
     # Detect gaps (using threshold of 0 to catch all gaps)
     gaps = _detect_gaps(candles, timeframe, max_gap_candles=0)
@@ -1,12 +1,19 @@
 """Core backtest simulation engine."""
-from dataclasses import dataclass
+import copy
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Sequence, Union
 import math
 
+import numpy as np
+
 from app.models.candle import Candle
+from app.backtest import metrics
+from app.backtest.candle_frame import CandleFrame, as_candle_frame
+from app.backtest.checkpoint import EngineCheckpoint, input_fingerprint
 from app.backtest.interpreter import StrategySignals
-from app.backtest.position_manager import TPLevelState, Trade, RiskConfig, PositionManager, _create_trade  # re-exported via __all__
+from app.backtest.position_manager import TPLevelState, Trade, _create_trade  # re-exported via __all__
+from app.backtest.streaming import StreamingBacktest
 
 # Re-export so existing `from app.backtest.engine import TPLevelState / Trade / _create_trade` keep working.
 __all__ = [
@@ -47,127 +54,137 @@ class BacktestResult:
     avg_cost_per_trade_usd: float
     equity_curve: list[dict]  # [{timestamp, equity}, ...]
     trades: list[Trade]
+    # Loop state to resume from when the same run is extended by new candles
+    checkpoint: Optional[EngineCheckpoint] = field(default=None, compare=False, repr=False)
 
 
 def run_backtest(
-    candles: list[Candle],
+    candles: Union[CandleFrame, Sequence[Candle]],
     signals: StrategySignals,
     initial_balance: float,
     fee_rate: float,
     slippage_rate: float,
     spread_rate: float = 0.0002,
     timeframe: str = "1d",
+    resume_from: Optional[EngineCheckpoint] = None,
+    capture_checkpoint: bool = False,
 ) -> BacktestResult:
     """
     Simulate trading over candles using signals.
     Returns complete backtest results.
+
+    ``resume_from`` skips the bars a previous run over a prefix of these
+    candles already simulated; it is ignored unless its fingerprint matches
+    the current inputs. ``capture_checkpoint`` attaches the state before the
+    end-of-data close to ``BacktestResult.checkpoint``.
+
+    A loop over StreamingBacktest, the candle-at-a-time Engine. While flat
+    it jumps straight to the next entry signal, so sparse strategies only
+    visit the candles that can change a position.
     """
-    if not candles:
-        return BacktestResult(
-            initial_balance=initial_balance,
-            final_balance=initial_balance,
-            total_return_pct=0.0,
-            cagr_pct=0.0,
-            max_drawdown_pct=0.0,
-            num_trades=0,
-            win_rate_pct=0.0,
-            sharpe_ratio=0.0,
-            sortino_ratio=0.0,
-            calmar_ratio=0.0,
-            max_consecutive_losses=0,
-            gross_return_usd=0.0,
-            gross_return_pct=0.0,
-            total_fees_usd=0.0,
-            total_slippage_usd=0.0,
-            total_spread_usd=0.0,
-            total_costs_usd=0.0,
-            cost_pct_gross_return=None,
-            avg_cost_per_trade_usd=0.0,
-            equity_curve=[],
-            trades=[],
+    frame = as_candle_frame(candles)
+    if not len(frame):
+        return empty_result(initial_balance)
+
+    n = len(frame)
+    costs = (initial_balance, fee_rate, slippage_rate, spread_rate)
+    if resume_from is not None and (
+        resume_from.next_index > n
+        or resume_from.fingerprint != input_fingerprint(frame, signals, resume_from.next_index, *costs)
+    ):
+        resume_from = None
+
+    if resume_from is not None:
+        stream = copy.deepcopy(resume_from.engine)
+    else:
+        stream = StreamingBacktest.for_signals(signals, initial_balance, fee_rate, slippage_rate, spread_rate)
+
+    entry_long = _flags(signals.entry_long, n)
+    exit_long = _flags(signals.exit_long, n)
+    entry_bars = np.flatnonzero(entry_long)
+    iso_timestamps = frame.iso_timestamps()
+    # Bars are built only for the candles visited; a skipped flat run needs just its last
+    i = stream.index
+    while i < n:
+        if stream.is_flat and not entry_long[i]:
+            # Nothing happens before the next entry signal
+            following = int(np.searchsorted(entry_bars, i))
+            stop = int(entry_bars[following]) if following < entry_bars.size else n
+            stream.skip_flat(iso_timestamps[i:stop], frame.bar(stop - 1))
+            i = stop
+            continue
+        stream.on_candle(frame.bar(i), bool(entry_long[i]), bool(exit_long[i]), iso_timestamps[i])
+        i += 1
+
+    checkpoint = None
+    if capture_checkpoint:
+        checkpoint = EngineCheckpoint(
+            next_index=n,
+            fingerprint=input_fingerprint(frame, signals, n, *costs),
+            engine=copy.deepcopy(stream),
         )
+    stream.finish()
+
+    result = summarize(
+        frame, initial_balance, stream.equity, stream.equity_curve, stream.trades, stream.max_drawdown, timeframe
+    )
+    result.checkpoint = checkpoint
+    return result
+
+
+def _flags(signal: Sequence[bool], n: int) -> np.ndarray:
+    """``signal`` as a boolean array of exactly ``n`` bars (missing bars are False)."""
+    flags = np.zeros(n, dtype=bool)
+    head = np.asarray(signal[:n], dtype=bool)
+    flags[: head.size] = head
+    return flags
 
-    pm = PositionManager(fee_rate=fee_rate, slippage_rate=slippage_rate, spread_rate=spread_rate)
-
-    equity = initial_balance
-    equity_curve: list[dict] = []
-    trades: list[Trade] = []
-    peak_equity = initial_balance
-    max_drawdown = 0.0
-
-    n = len(candles)
-
-    for i in range(n):
-        candle = candles[i]
-        entry_signal = signals.entry_long[i] if i < len(signals.entry_long) else False
-        exit_signal = signals.exit_long[i] if i < len(signals.exit_long) else False
-
-        if pm.is_open:
-            pm.update_excursions(candle)
-            candle_exit = pm.check_exits(candle, i, exit_signal)
-
-            for partial in candle_exit.partials:
-                trade = pm.apply_partial(partial, candle.timestamp)
-                trades.append(trade)
-                equity += trade.pnl
-                if not pm.is_open:
-                    break
-
-            if candle_exit.full is not None and pm.is_open:
-                trade = pm.close(candle_exit.full.exit_price_raw, candle_exit.full.reason, candle.timestamp)
-                trades.append(trade)
-                equity += trade.pnl
-
-        # Entry signal on candle i means we enter at candle i+1 open
-        if not pm.is_open and entry_signal and i + 1 < n:
-            next_candle = candles[i + 1]
-            effective_entry = next_candle.open * (1 + slippage_rate) * (1 + fee_rate) * (1 + spread_rate / 2)
-            qty = equity * (signals.position_size_pct / 100) / effective_entry
-            risk = RiskConfig(
-                take_profit_levels=signals.take_profit_levels or None,
-                stop_loss_pct=signals.stop_loss_pct,
-                max_drawdown_pct=signals.max_drawdown_pct,
-                time_exit_bars=signals.time_exit_bars,
-                trailing_stop_pct=signals.trailing_stop_pct,
-            )
-            pm.enter(price=effective_entry, qty=qty, timestamp=next_candle.timestamp, index=i + 1, risk=risk)
-
-        current_equity = equity
-        if pm.is_open:
-            current_equity = equity + pm.unrealized_pnl(candle.close)
-
-        equity_curve.append({
-            "timestamp": candle.timestamp.isoformat(),
-            "equity": round(current_equity, 2),
-        })
-
-        if current_equity > peak_equity:
-            peak_equity = current_equity
-        drawdown = (peak_equity - current_equity) / peak_equity * 100
-        if drawdown > max_drawdown:
-            max_drawdown = drawdown
-
-    # Force-close any open position at end of data
-    if pm.is_open and candles:
-        final_candle = candles[-1]
-        trade = pm.close(final_candle.close, "end_of_data", final_candle.timestamp)
-        trades.append(trade)
-        equity += trade.pnl
-        if equity_curve:
-            equity_curve[-1]["equity"] = round(equity, 2)
-
-    # Compute summary metrics
-    final_balance = equity
+
+def empty_result(initial_balance: float) -> BacktestResult:
+    """Result of a backtest over no candles."""
+    return BacktestResult(
+        initial_balance=initial_balance,
+        final_balance=initial_balance,
+        total_return_pct=0.0,
+        cagr_pct=0.0,
+        max_drawdown_pct=0.0,
+        num_trades=0,
+        win_rate_pct=0.0,
+        sharpe_ratio=0.0,
+        sortino_ratio=0.0,
+        calmar_ratio=0.0,
+        max_consecutive_losses=0,
+        gross_return_usd=0.0,
+        gross_return_pct=0.0,
+        total_fees_usd=0.0,
+        total_slippage_usd=0.0,
+        total_spread_usd=0.0,
+        total_costs_usd=0.0,
+        cost_pct_gross_return=None,
+        avg_cost_per_trade_usd=0.0,
+        equity_curve=[],
+        trades=[],
+    )
+
+
+def summarize(
+    frame: CandleFrame,
+    initial_balance: float,
+    final_balance: float,
+    equity_curve: list[dict],
+    trades: list[Trade],
+    max_drawdown: float,
+    timeframe: str,
+) -> BacktestResult:
+    """Summary metrics of one simulated run (shared by both engine kernels)."""
+    n = len(frame)
     total_return_pct = ((final_balance - initial_balance) / initial_balance) * 100
 
     # CAGR
-    if candles:
-        days = (candles[-1].timestamp - candles[0].timestamp).days
-        years = max(days / 365.25, 1 / 365.25)  # At least 1 day
-        if final_balance > 0 and initial_balance > 0:
-            cagr_pct = (math.pow(final_balance / initial_balance, 1 / years) - 1) * 100
-        else:
-            cagr_pct = 0.0
+    days = (frame.timestamp_at(n - 1) - frame.timestamp_at(0)).days
+    years = max(days / 365.25, 1 / 365.25)  # At least 1 day
+    if final_balance > 0 and initial_balance > 0:
+        cagr_pct = (math.pow(final_balance / initial_balance, 1 / years) - 1) * 100
     else:
         cagr_pct = 0.0
 
@@ -227,7 +244,7 @@ def run_backtest(
 
 
 def compute_benchmark_curve(
-    candles: list[Candle],
+    candles: Union[CandleFrame, Sequence[Candle]],
     initial_balance: float
 ) -> list[dict]:
     """
@@ -235,20 +252,16 @@ def compute_benchmark_curve(
     Buy at first candle open, hold until last candle close.
     No fees, no slippage.
     """
-    if not candles:
+    frame = as_candle_frame(candles)
+    if not len(frame):
         return []
 
-    first_open = candles[0].open
-    equity_curve = []
+    benchmark_equity = initial_balance * (frame.close / frame.open[0])
 
-    for candle in candles:
-        benchmark_equity = initial_balance * (candle.close / first_open)
-        equity_curve.append({
-            "timestamp": candle.timestamp.isoformat(),
-            "equity": round(benchmark_equity, 2),
-        })
-
-    return equity_curve
+    return [
+        {"timestamp": ts, "equity": round(equity, 2)}
+        for ts, equity in zip(frame.iso_timestamps(), benchmark_equity.tolist())
+    ]
 
 
 def compute_benchmark_metrics(
@@ -263,43 +276,13 @@ def compute_benchmark_metrics(
     if not benchmark_equity or not strategy_equity:
         return 0.0, 0.0, 0.0
 
-    # Benchmark return
-    final_benchmark = benchmark_equity[-1]["equity"]
-    benchmark_return_pct = ((final_benchmark - initial_balance) / initial_balance) * 100
-
-    # Strategy return (from equity curve, not BacktestResult to be consistent)
-    final_strategy = strategy_equity[-1]["equity"]
-    strategy_return_pct = ((final_strategy - initial_balance) / initial_balance) * 100
+    strategy_values = _equity_values(strategy_equity)
+    benchmark_values = _equity_values(benchmark_equity)
 
-    # Alpha
-    alpha = strategy_return_pct - benchmark_return_pct
-
-    # Beta calculation
-    if len(strategy_equity) < 2 or len(benchmark_equity) < 2:
-        beta = 0.0
-    else:
-        # Compute returns series
-        strategy_returns = []
-        benchmark_returns = []
-
-        for i in range(1, min(len(strategy_equity), len(benchmark_equity))):
-            s_ret = (strategy_equity[i]["equity"] / strategy_equity[i-1]["equity"]) - 1
-            b_ret = (benchmark_equity[i]["equity"] / benchmark_equity[i-1]["equity"]) - 1
-            strategy_returns.append(s_ret)
-            benchmark_returns.append(b_ret)
-
-        # Calculate covariance and variance
-        n = len(strategy_returns)
-        if n > 0:
-            mean_s = sum(strategy_returns) / n
-            mean_b = sum(benchmark_returns) / n
-
-            covariance = sum((strategy_returns[i] - mean_s) * (benchmark_returns[i] - mean_b) for i in range(n)) / n
-            variance = sum((benchmark_returns[i] - mean_b) ** 2 for i in range(n)) / n
-
-            beta = covariance / variance if variance > 0 else 0.0
-        else:
-            beta = 0.0
+    # Strategy return taken from the equity curve, not BacktestResult, to be consistent
+    benchmark_return_pct = metrics.total_return_pct(benchmark_values, initial_balance)
+    alpha = metrics.alpha(strategy_values, benchmark_values, initial_balance)
+    beta = metrics.beta(strategy_values, benchmark_values)
 
     return round(benchmark_return_pct, 2), round(alpha, 2), round(beta, 2)
 
@@ -316,79 +299,16 @@ def compute_risk_metrics(
 
     Returns: (sharpe_ratio, sortino_ratio, calmar_ratio, max_consecutive_losses)
     """
-    # Timeframe to periods per year mapping
-    periods_per_year = {
-        "1h": 365.25 * 24,      # 8766 hours/year
-        "4h": 365.25 * 6,       # 2191.5 periods/year
-        "1d": 365.25,           # 365.25 days/year
-    }
-
-    annualization_factor = periods_per_year.get(timeframe, 365.25)
-
-    # 1. Sharpe Ratio
-    sharpe_ratio = 0.0
-    if len(equity_curve) >= 2:
-        returns = []
-        for i in range(1, len(equity_curve)):
-            prev_equity = equity_curve[i-1]["equity"]
-            curr_equity = equity_curve[i]["equity"]
-            if prev_equity > 0:
-                ret = (curr_equity - prev_equity) / prev_equity
-                returns.append(ret)
-
-        if len(returns) > 0:
-            mean_return = sum(returns) / len(returns)
-            variance = sum((r - mean_return) ** 2 for r in returns) / len(returns)
-            std_dev = variance ** 0.5
-
-            if std_dev > 0:
-                # Annualize: mean * periods, std * sqrt(periods)
-                annualized_return = mean_return * annualization_factor
-                annualized_std = std_dev * (annualization_factor ** 0.5)
-                sharpe_ratio = annualized_return / annualized_std
-
-    # 2. Sortino Ratio
-    sortino_ratio = 0.0
-    if len(equity_curve) >= 2:
-        returns = []
-        for i in range(1, len(equity_curve)):
-            prev_equity = equity_curve[i-1]["equity"]
-            curr_equity = equity_curve[i]["equity"]
-            if prev_equity > 0:
-                ret = (curr_equity - prev_equity) / prev_equity
-                returns.append(ret)
-
-        if len(returns) > 0:
-            mean_return = sum(returns) / len(returns)
-            # Downside deviation: only negative returns
-            negative_returns = [r for r in returns if r < 0]
-
-            if len(negative_returns) > 0:
-                downside_variance = sum(r ** 2 for r in negative_returns) / len(returns)
-                downside_dev = downside_variance ** 0.5
-
-                if downside_dev > 0:
-                    # Annualize
-                    annualized_return = mean_return * annualization_factor
-                    annualized_downside_dev = downside_dev * (annualization_factor ** 0.5)
-                    sortino_ratio = annualized_return / annualized_downside_dev
-
-    # 3. Calmar Ratio
-    calmar_ratio = 0.0
-    if max_drawdown_pct > 0:
-        calmar_ratio = cagr_pct / max_drawdown_pct
-
-    # 4. Max Consecutive Losses
-    max_consecutive_losses = 0
-    if len(trades) > 0:
-        current_streak = 0
-        for trade in trades:
-            if trade.pnl < 0:
-                current_streak += 1
-                if current_streak > max_consecutive_losses:
-                    max_consecutive_losses = current_streak
-            else:
-                current_streak = 0
+    annualization_factor = metrics.annualization_factor(timeframe)
+
+    # One returns pass shared by Sharpe and Sortino
+    returns = metrics.period_returns(_equity_values(equity_curve))
+    sharpe_ratio = metrics.sharpe_ratio(returns, annualization_factor)
+    sortino_ratio = metrics.sortino_ratio(returns, annualization_factor)
+    calmar_ratio = metrics.calmar_ratio(cagr_pct, max_drawdown_pct)
+    max_consecutive_losses = metrics.max_consecutive_losses(
+        np.fromiter((t.pnl for t in trades), dtype=np.float64, count=len(trades))
+    )
 
     return (
         round(sharpe_ratio, 2),
@@ -396,3 +316,8 @@ def compute_risk_metrics(
         round(calmar_ratio, 2),
         max_consecutive_losses,
     )
+
+
+def _equity_values(curve: list[dict]) -> np.ndarray:
+    """Extract the ``equity`` column of an equity-curve payload as a float array."""
+    return np.fromiter((point["equity"] for point in curve), dtype=np.float64, count=len(curve))
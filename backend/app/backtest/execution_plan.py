@@ -0,0 +1,231 @@
+"""Execution plan — a ValidatedStrategy compiled for the Interpreter.
+
+Compiling resolves the block graph once: it keeps only the blocks reachable
+from entry and exit signals (dead blocks are dropped), merges blocks that
+compute the same thing (same type, params and inputs — e.g. two identical
+``sma`` blocks) into one step, and orders the steps so every step's inputs
+come before it. Executing a plan is then a flat loop of handler calls.
+Each step also records which of its output ports the rest of the plan reads,
+so multi-output handlers can skip the others.
+
+Plans depend only on the definition, so ``plan_for`` caches them by a
+content hash: re-running one Strategy version (auto-updates, alerts, sweeps
+and batches) skips graph work entirely.
+
+Documented in CONTEXT.md (term: Execution plan).
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any, Optional
+
+from app.backtest.catalogue import lookup as catalogue_lookup
+from app.backtest.catalogue.types import BlockHandler, BlockSpec
+from app.backtest.errors import StrategyInvalidError
+from app.backtest.types import RiskParams, ValidatedStrategy
+
+_ENTRY_SIGNAL_TYPES: frozenset[str] = frozenset({"entry_signal"})
+_EXIT_SIGNAL_TYPES: frozenset[str] = frozenset({"exit_signal"})
+
+# Risk blocks configure the position instead of producing a series; wired
+# into the graph they read as a series with no valid bar.
+RISK_BLOCK_TYPES: frozenset[str] = frozenset(
+    {"position_size", "take_profit", "stop_loss", "max_drawdown", "time_exit", "trailing_stop"}
+)
+
+# Catalogue categories whose output depends only on candle data and params,
+# so it can be shared across strategies evaluated over the same candles.
+CACHEABLE_CATEGORIES: frozenset[str] = frozenset({"input", "indicator"})
+
+_PLAN_CACHE_SIZE = 512
+
+
+@dataclass(frozen=True)
+class PlanStep:
+    """One block evaluation. ``handler`` is None for risk blocks."""
+
+    block_id: str  # the first block merged into this step
+    block_type: str
+    params: dict
+    handler: Optional[BlockHandler]
+    inputs: tuple[tuple[str, str, str], ...]  # (port, source block_id, source port)
+    cache_key: Optional[tuple[str, str]]  # IndicatorCache key prefix; only for input-free blocks
+    ports: frozenset[str] = frozenset()  # output ports read by later steps or as signals
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """Topologically ordered steps plus the signal ports OR-ed into entries/exits."""
+
+    steps: tuple[PlanStep, ...]
+    entry_outputs: tuple[str, ...]  # block_ids of steps whose "output" is an entry signal
+    exit_outputs: tuple[str, ...]
+    risk_params: RiskParams
+    step_ids: dict[str, str] = field(default_factory=dict)  # every reachable block_id -> its step's block_id
+
+
+def params_key(params: dict) -> str:
+    """Canonical JSON of block params, shared by the plan and IndicatorCache keys."""
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def normalized_params(spec: BlockSpec, params: dict) -> dict:
+    """``params`` with every spec default filled in and numbers coerced to the param's kind.
+
+    Two blocks whose params normalise equally compute the same series, so
+    ``{"period": 20}`` and ``{"period": 20.0, "source": "close"}`` share one
+    IndicatorCache entry.
+    """
+    normalized = dict(params)
+    for param in spec.params:
+        value = normalized.get(param.name, param.default)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            if param.kind == "int":
+                value = int(value)
+            elif param.kind == "float":
+                value = float(value)
+        normalized[param.name] = value
+    return normalized
+
+
+def strategy_hash(strategy: ValidatedStrategy) -> str:
+    """Content hash of everything a plan depends on (not layout or labels)."""
+    content = {
+        "blocks": [[b["id"], b["type"], b.get("params", {})] for b in strategy.blocks],
+        "connections": [
+            [c["from_port"]["block_id"], c["from_port"]["port"], c["to_port"]["block_id"], c["to_port"]["port"]]
+            for c in strategy.connections
+        ],
+        "risk": repr(strategy.risk_params),
+    }
+    return hashlib.blake2b(
+        json.dumps(content, sort_keys=True, default=str).encode(), digest_size=16
+    ).hexdigest()
+
+
+def compile_strategy(strategy: ValidatedStrategy) -> ExecutionPlan:
+    """Compile ``strategy`` into an ExecutionPlan.
+
+    Raises StrategyInvalidError for a strategy without blocks and for a
+    reachable block that is missing, of an unknown type, or on a cycle.
+    Unreachable blocks are never inspected.
+    """
+    if not strategy.blocks:
+        raise StrategyInvalidError("Strategy has no blocks", "Invalid strategy: no blocks defined.")
+
+    block_map = {b["id"]: b for b in strategy.blocks}
+
+    # to_block_id -> {port -> (from_block_id, from_port)}; a later connection to
+    # the same port replaces an earlier one.
+    input_map: dict[str, dict[str, tuple[str, str]]] = {}
+    for conn in strategy.connections:
+        to_block = conn["to_port"]["block_id"]
+        input_map.setdefault(to_block, {})[conn["to_port"]["port"]] = (
+            conn["from_port"]["block_id"],
+            conn["from_port"]["port"],
+        )
+
+    steps: list[PlanStep] = []
+    canonical: dict[str, str] = {}  # block_id -> block_id of the step computing it
+    by_signature: dict[tuple, str] = {}
+    visiting: set[str] = set()
+
+    def visit(block_id: str) -> str:
+        if block_id in canonical:
+            return canonical[block_id]
+        block = block_map.get(block_id)
+        if not block:
+            raise StrategyInvalidError(
+                f"Block not found: {block_id}",
+                "Invalid strategy: missing block reference.",
+            )
+        if block_id in visiting:
+            raise StrategyInvalidError(
+                f"Cycle through block: {block_id}",
+                "Invalid strategy: blocks are connected in a loop.",
+            )
+
+        block_type = block["type"]
+        handler = catalogue_lookup(block_type)
+        if handler is None and block_type not in RISK_BLOCK_TYPES:
+            raise StrategyInvalidError(
+                f"Unknown block type: {block_type}",
+                f"Invalid strategy: unsupported block type '{block_type}'.",
+            )
+
+        params = copy.deepcopy(block.get("params", {}))  # plans outlive the definition they came from
+        inputs: tuple[tuple[str, str, str], ...] = ()
+        if handler is not None:
+            visiting.add(block_id)
+            inputs = tuple(
+                (port, visit(source_id), source_port)
+                for port, (source_id, source_port) in input_map.get(block_id, {}).items()
+            )
+            visiting.discard(block_id)
+
+        signature = (block_type, params_key(params), tuple(sorted(inputs)))
+        if signature in by_signature:
+            canonical[block_id] = by_signature[signature]
+            return canonical[block_id]
+
+        cache_key = None
+        if handler is not None and not inputs and handler.spec.category in CACHEABLE_CATEGORIES:
+            cache_key = (block_type, params_key(normalized_params(handler.spec, params)))
+        steps.append(PlanStep(block_id, block_type, params, handler, inputs, cache_key))
+        by_signature[signature] = canonical[block_id] = block_id
+        return block_id
+
+    entry_outputs = [visit(b["id"]) for b in strategy.blocks if b["type"] in _ENTRY_SIGNAL_TYPES]
+    exit_outputs = [visit(b["id"]) for b in strategy.blocks if b["type"] in _EXIT_SIGNAL_TYPES]
+
+    consumed: dict[str, set[str]] = {block_id: {"output"} for block_id in entry_outputs + exit_outputs}
+    for step in steps:
+        for _, source_id, source_port in step.inputs:
+            consumed.setdefault(source_id, set()).add(source_port)
+
+    return ExecutionPlan(
+        steps=tuple(replace(step, ports=_produced(step, consumed.get(step.block_id, set()))) for step in steps),
+        entry_outputs=tuple(dict.fromkeys(entry_outputs)),
+        exit_outputs=tuple(dict.fromkeys(exit_outputs)),
+        risk_params=strategy.risk_params,
+        step_ids=dict(canonical),
+    )
+
+
+def _produced(step: PlanStep, consumed: set[str]) -> frozenset[str]:
+    """Ports ``step`` must produce; a read of a port the block lacks falls back to "output"."""
+    if step.handler is None:
+        return frozenset(consumed)
+    outputs = {port.name for port in step.handler.spec.outputs}
+    return frozenset(port if port in outputs else "output" for port in consumed)
+
+
+_plan_cache: "OrderedDict[str, ExecutionPlan]" = OrderedDict()
+_plan_cache_lock = threading.Lock()
+
+
+def plan_for(strategy: ValidatedStrategy) -> ExecutionPlan:
+    """``compile_strategy`` memoised by ``strategy_hash`` (LRU, process-wide)."""
+    key = strategy_hash(strategy)
+    with _plan_cache_lock:
+        plan = _plan_cache.get(key)
+        if plan is not None:
+            _plan_cache.move_to_end(key)
+            return plan
+
+    plan = compile_strategy(strategy)
+    with _plan_cache_lock:
+        _plan_cache[key] = plan
+        if len(_plan_cache) > _PLAN_CACHE_SIZE:
+            _plan_cache.popitem(last=False)
+    return plan
+
+
+def output_of(outputs: dict[str, Any], port: str, missing: Any) -> Any:
+    """Read ``port`` from a step's outputs, falling back to its "output" port, then ``missing``."""
+    return outputs.get(port, outputs.get("output", missing))
@@ -10,13 +10,14 @@ from typing import TYPE_CHECKING, Callable, Optional
 if TYPE_CHECKING:
     from app.backtest.position_manager import TPLevelState
     from app.models.candle import Candle
+    from app.backtest.candle_frame import Bar
 
 
 @dataclass(frozen=True)
 class PositionContext:
     """Snapshot of all state needed to evaluate exit conditions for one candle."""
 
-    candle: "Candle"
+    candle: "Candle | Bar"
     entry_price: float
     sl_price: Optional[float]
     highest_close_since_entry: float
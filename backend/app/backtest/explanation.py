@@ -2,10 +2,20 @@
 
 Parses strategy definitions to generate human-readable explanations
 of why trades entered and exited.
+
+Conditions are evaluated with the same compiled plan and catalogue handlers
+as the backtest (see interpreter.evaluate_plan), and the chart overlays read
+their series through the same indicator cache view, so a series is computed
+once per request.
 """
-from typing import Optional
+from typing import Optional, Sequence, Union
 from app.models.candle import Candle
-from app.backtest import indicators
+from app.backtest.candle_frame import CandleFrame, as_candle_frame
+from app.backtest.errors import StrategyInvalidError
+from app.backtest.execution_plan import plan_for
+from app.backtest.indicator_cache import FrameIndicatorCache, shared_indicator_cache
+from app.backtest.interpreter import PlanOutputs, evaluate_plan
+from app.backtest.types import RiskParams, ValidatedStrategy
 from app.schemas.backtest import (
     EntryExplanation,
     ExitExplanation,
@@ -26,7 +36,7 @@ INDICATOR_COLORS = {
 
 def build_trade_explanation(
     definition: dict,
-    candles: list[Candle],
+    candles: Union[CandleFrame, Sequence[Candle]],
     trade_entry_idx: int,
     trade_exit_idx: int,
     exit_reason: str,
@@ -38,7 +48,7 @@ def build_trade_explanation(
 
     Args:
         definition: Strategy definition JSON with blocks and connections
-        candles: Candle window around the trade
+        candles: Candle window around the trade (a CandleFrame or Candle rows)
         trade_entry_idx: Index in candles where trade entered (execution candle)
         trade_exit_idx: Index in candles where trade exited
         exit_reason: Exit reason code ("tp", "sl", "signal", etc.)
@@ -65,6 +75,8 @@ def build_trade_explanation(
     # Build block lookup and connection map
     block_map = {b["id"]: b for b in blocks}
     input_map = _build_input_map(connections)
+    cache = shared_indicator_cache().view(as_candle_frame(candles))
+    outputs = _evaluate_definition(blocks, input_map, cache)
 
     # Find entry signal blocks
     entry_blocks = [b for b in blocks if b["type"] == "entry_signal"]
@@ -82,7 +94,7 @@ def build_trade_explanation(
                 entry_block["id"],
                 block_map,
                 input_map,
-                candles,
+                outputs,
                 signal_idx,
             )
             if not conditions and signal_idx != trade_entry_idx:
@@ -90,7 +102,7 @@ def build_trade_explanation(
                     entry_block["id"],
                     block_map,
                     input_map,
-                    candles,
+                    outputs,
                     trade_entry_idx,
                 )
             entry_conditions.extend(conditions)
@@ -120,7 +132,7 @@ def build_trade_explanation(
     exit_explanation = _build_exit_explanation(exit_reason, sl_price, tp_price)
 
     # Compute indicator series for chart overlays
-    indicator_series = _compute_indicator_series(definition, candles)
+    indicator_series = _compute_indicator_series(definition, candles, cache)
 
     return entry_explanation, exit_explanation, indicator_series
 
@@ -129,12 +141,15 @@ def _extract_triggered_conditions(
     block_id: str,
     block_map: dict[str, dict],
     input_map: dict[str, dict[str, tuple[str, str]]],
-    candles: list[Candle],
+    outputs: Optional[PlanOutputs],
     idx: int,
 ) -> list[str]:
     """Extract only the conditions that are true at the trade entry candle."""
-    evaluator = _build_block_evaluator(block_map, input_map, candles)
-    root_is_true = evaluator.is_true(block_id, idx)
+
+    def is_true(current_block_id: str) -> bool:
+        return outputs is not None and outputs.is_true(current_block_id, idx)
+
+    root_is_true = is_true(block_id)
 
     def recurse(current_block_id: str) -> list[str]:
         block = block_map.get(current_block_id)
@@ -152,7 +167,7 @@ def _extract_triggered_conditions(
             return recurse(from_block_id)
 
         if block_type == "and":
-            if not evaluator.is_true(current_block_id, idx):
+            if not is_true(current_block_id):
                 return []
             conditions: list[str] = []
             for port in ("a", "b"):
@@ -160,7 +175,7 @@ def _extract_triggered_conditions(
                 if not input_conn:
                     continue
                 from_block_id, _ = input_conn
-                if evaluator.is_true(from_block_id, idx):
+                if is_true(from_block_id):
                     conditions.extend(recurse(from_block_id))
             return conditions
 
@@ -171,7 +186,7 @@ def _extract_triggered_conditions(
                 if not input_conn:
                     continue
                 from_block_id, _ = input_conn
-                if evaluator.is_true(from_block_id, idx):
+                if is_true(from_block_id):
                     conditions.extend(recurse(from_block_id))
             return conditions
 
@@ -187,7 +202,7 @@ def _extract_triggered_conditions(
             return [f"NOT ({label})"] if label else []
 
         # Leaf condition block
-        if evaluator.is_true(current_block_id, idx):
+        if is_true(current_block_id):
             label = _generate_condition_label(block, block_map, input_map)
             return [label] if label else []
 
@@ -204,182 +219,24 @@ def _extract_triggered_conditions(
     return []
 
 
-class _BlockEvaluator:
-    """Evaluate block outputs at a candle index for explanation purposes."""
-
-    def __init__(
-        self,
-        block_map: dict[str, dict],
-        input_map: dict[str, dict[str, tuple[str, str]]],
-        candles: list[Candle],
-    ):
-        self.block_map = block_map
-        self.input_map = input_map
-        self.n = len(candles)
-        self.opens = [c.open for c in candles]
-        self.highs = [c.high for c in candles]
-        self.lows = [c.low for c in candles]
-        self.closes = [c.close for c in candles]
-        self.volumes = [c.volume for c in candles]
-        self.prev_closes = [None] + self.closes[:-1]
-        self.cache: dict[str, dict[str, list]] = {}
-
-    def is_true(self, block_id: str, idx: int) -> bool:
-        if idx < 0 or idx >= self.n:
-            return False
-        output = self.get_output(block_id)
-        if idx >= len(output):
-            return False
-        value = output[idx]
-        if value is None:
-            return False
-        return bool(value)
-
-    def get_output(self, block_id: str, port: str = "output") -> list:
-        if block_id in self.cache and port in self.cache[block_id]:
-            return self.cache[block_id][port]
-
-        block = self.block_map.get(block_id)
-        if not block:
-            return [None] * self.n
-
-        if block_id not in self.cache:
-            self.cache[block_id] = {}
-
-        block_type = block["type"]
-        params = block.get("params", {})
-        inputs = self.input_map.get(block_id, {})
-
-        if block_type == "price":
-            source = params.get("source", "close")
-            result = self._get_source_series(source)
-            self.cache[block_id]["output"] = result
-
-        elif block_type == "constant":
-            value = float(params.get("value", 0.0))
-            self.cache[block_id]["output"] = [value] * self.n
-
-        elif block_type == "volume":
-            self.cache[block_id]["output"] = self.volumes
-
-        elif block_type == "yesterday_close":
-            self.cache[block_id]["output"] = [None] + self.closes[:-1]
-
-        elif block_type == "price_variation_pct":
-            self.cache[block_id]["output"] = indicators.price_variation_pct(self.closes)
-
-        elif block_type == "sma":
-            source = params.get("source", "close")
-            period = int(params.get("period", 20))
-            input_data = self._get_source_series(source)
-            self.cache[block_id]["output"] = indicators.sma(input_data, period)
-
-        elif block_type == "ema":
-            source = params.get("source", "close")
-            period = int(params.get("period", 20))
-            input_data = self._get_source_series(source)
-            self.cache[block_id]["output"] = indicators.ema(input_data, period)
-
-        elif block_type == "rsi":
-            source = params.get("source", "close")
-            period = int(params.get("period", 14))
-            input_data = self._get_source_series(source)
-            self.cache[block_id]["output"] = indicators.rsi(input_data, period)
-
-        elif block_type == "compare":
-            left = self._get_input_any(inputs, ["left", "a"], [0.0] * self.n)
-            right = self._get_input_any(inputs, ["right", "b"], [0.0] * self.n)
-            operator = params.get("operator", ">")
-            result = []
-            for l_val, r_val in zip(left, right):
-                if l_val is None or r_val is None:
-                    result.append(False)
-                elif operator == ">":
-                    result.append(l_val > r_val)
-                elif operator == "<":
-                    result.append(l_val < r_val)
-                elif operator == ">=":
-                    result.append(l_val >= r_val)
-                elif operator == "<=":
-                    result.append(l_val <= r_val)
-                elif operator == "==":
-                    result.append(l_val == r_val)
-                elif operator == "!=":
-                    result.append(l_val != r_val)
-                else:
-                    result.append(False)
-            self.cache[block_id]["output"] = result
-
-        elif block_type == "crossover":
-            fast = self._get_input(inputs, "fast", [0.0] * self.n)
-            slow = self._get_input(inputs, "slow", [0.0] * self.n)
-            direction = params.get("direction", "crosses_above")
-            result = [False]
-            for i in range(1, self.n):
-                fast_prev, fast_curr = fast[i - 1], fast[i]
-                slow_prev, slow_curr = slow[i - 1], slow[i]
-                if any(v is None for v in (fast_prev, fast_curr, slow_prev, slow_curr)):
-                    result.append(False)
-                elif direction == "crosses_above":
-                    result.append(fast_prev <= slow_prev and fast_curr > slow_curr)
-                else:
-                    result.append(fast_prev >= slow_prev and fast_curr < slow_curr)
-            self.cache[block_id]["output"] = result
-
-        elif block_type == "and":
-            a = self._get_input(inputs, "a", [False] * self.n)
-            b = self._get_input(inputs, "b", [False] * self.n)
-            self.cache[block_id]["output"] = [bool(av) and bool(bv) for av, bv in zip(a, b)]
-
-        elif block_type == "or":
-            a = self._get_input(inputs, "a", [False] * self.n)
-            b = self._get_input(inputs, "b", [False] * self.n)
-            self.cache[block_id]["output"] = [bool(av) or bool(bv) for av, bv in zip(a, b)]
-
-        elif block_type == "not":
-            input_data = self._get_input(inputs, "input", [False] * self.n)
-            self.cache[block_id]["output"] = [not bool(v) for v in input_data]
-
-        elif block_type in ("entry_signal", "exit_signal"):
-            signal_input = self._get_input(inputs, "signal", [False] * self.n)
-            self.cache[block_id]["output"] = [bool(v) for v in signal_input]
-
-        else:
-            # Unsupported block types are treated as non-triggering for explanation filtering.
-            self.cache[block_id]["output"] = [None] * self.n
-
-        return self.cache[block_id].get(port, self.cache[block_id].get("output", [None] * self.n))
-
-    def _get_input(self, inputs: dict[str, tuple[str, str]], port: str, default: list) -> list:
-        if port in inputs:
-            from_block, from_port = inputs[port]
-            return self.get_output(from_block, from_port)
-        return default
-
-    def _get_source_series(self, source: str) -> list:
-        return {
-            "open": self.opens,
-            "high": self.highs,
-            "low": self.lows,
-            "close": self.closes,
-            "prev_close": self.prev_closes,
-            "volume": self.volumes,
-        }.get(source, self.closes)
-
-    def _get_input_any(self, inputs: dict[str, tuple[str, str]], ports: list[str], default: list) -> list:
-        for port in ports:
-            if port in inputs:
-                from_block, from_port = inputs[port]
-                return self.get_output(from_block, from_port)
-        return default
-
-
-def _build_block_evaluator(
-    block_map: dict[str, dict],
+def _evaluate_definition(
+    blocks: list[dict],
     input_map: dict[str, dict[str, tuple[str, str]]],
-    candles: list[Candle],
-) -> _BlockEvaluator:
-    return _BlockEvaluator(block_map, input_map, candles)
+    cache: FrameIndicatorCache,
+) -> Optional[PlanOutputs]:
+    """Run the definition's compiled plan over the cached frame; None if it cannot compile."""
+    connections = tuple(
+        {"from_port": {"block_id": from_block, "port": from_port}, "to_port": {"block_id": to_block, "port": to_port}}
+        for to_block, ports in input_map.items()
+        for to_port, (from_block, from_port) in ports.items()
+    )
+    strategy = ValidatedStrategy(blocks=tuple(blocks), connections=connections, risk_params=RiskParams())
+    try:
+        plan = plan_for(strategy)
+    except StrategyInvalidError:
+        # Blocks the catalogue does not know are treated as non-triggering.
+        return None
+    return evaluate_plan(plan, cache.frame, cache)
 
 
 def _build_input_map(connections: list[dict]) -> dict[str, dict[str, tuple[str, str]]]:
@@ -632,18 +489,21 @@ def _build_exit_explanation(
 
 def _compute_indicator_series(
     definition: dict,
-    candles: list[Candle]
+    candles: Union[CandleFrame, Sequence[Candle]],
+    cache: Optional[FrameIndicatorCache] = None,
 ) -> list[IndicatorSeries]:
     """
-    Recompute all indicators used in strategy for chart overlays.
+    Read all indicators used in strategy for chart overlays.
+
+    Series come from the catalogue through ``cache``, so blocks the
+    explanation already evaluated are not recomputed.
 
     Only returns price-pane indicators (SMA, EMA, Bollinger Bands).
     Subplot indicators (RSI, MACD, etc.) are deferred to Phase 2.
     """
     blocks = definition.get("blocks", [])
-    closes = [c.close for c in candles]
-    highs = [c.high for c in candles]
-    lows = [c.low for c in candles]
+    if cache is None:
+        cache = shared_indicator_cache().view(as_candle_frame(candles))
 
     indicator_series = []
 
@@ -652,94 +512,36 @@ def _compute_indicator_series(
         params = block.get("params", {})
 
         try:
-            if block_type == "sma":
-                period = int(params.get("period", 20))
-                source = params.get("source", "close")
-                if source == "close":
-                    data = closes
-                elif source == "high":
-                    data = highs
-                elif source == "low":
-                    data = lows
-                else:
-                    data = closes
-
-                series_data = indicators.sma(data, period)
-                indicator_series.append(IndicatorSeries(
-                    indicator_type="sma",
-                    label=f"SMA({period})",
-                    series_data=series_data,
-                    plot_type="line",
-                    subplot=False,
-                    color=INDICATOR_COLORS.get("sma")
-                ))
-
-            elif block_type == "ema":
+            if block_type in ("sma", "ema"):
                 period = int(params.get("period", 20))
-                source = params.get("source", "close")
-                if source == "close":
-                    data = closes
-                elif source == "high":
-                    data = highs
-                elif source == "low":
-                    data = lows
-                else:
-                    data = closes
-
-                series_data = indicators.ema(data, period)
+                series_data = cache.compute(block_type, params)["output"].to_list()
                 indicator_series.append(IndicatorSeries(
-                    indicator_type="ema",
-                    label=f"EMA({period})",
+                    indicator_type=block_type,
+                    label=f"{block_type.upper()}({period})",
                     series_data=series_data,
                     plot_type="line",
                     subplot=False,
-                    color=INDICATOR_COLORS.get("ema")
+                    color=INDICATOR_COLORS.get(block_type)
                 ))
 
             elif block_type == "bollinger":
                 period = int(params.get("period", 20))
-                source = params.get("source", "close")
-                if source == "close":
-                    data = closes
-                elif source == "high":
-                    data = highs
-                elif source == "low":
-                    data = lows
-                else:
-                    data = closes
-
-                std_dev = float(params.get("stddev", params.get("std_dev", 2.0)))
-                upper, middle, lower = indicators.bollinger(data, period, std_dev)
-
-                indicator_series.extend([
-                    IndicatorSeries(
-                        indicator_type="bollinger",
-                        label=f"BB Upper({period})",
-                        series_data=upper,
-                        plot_type="line",
-                        subplot=False,
-                        color=INDICATOR_COLORS.get("bollinger"),
-                        port="upper"
-                    ),
-                    IndicatorSeries(
-                        indicator_type="bollinger",
-                        label=f"BB Middle({period})",
-                        series_data=middle,
-                        plot_type="line",
-                        subplot=False,
-                        color=INDICATOR_COLORS.get("bollinger"),
-                        port="middle"
-                    ),
+                if "stddev" not in params and "std_dev" in params:
+                    params = {**params, "stddev": params["std_dev"]}
+                bands = cache.compute("bollinger", params, ("upper", "middle", "lower"))
+
+                indicator_series.extend(
                     IndicatorSeries(
                         indicator_type="bollinger",
-                        label=f"BB Lower({period})",
-                        series_data=lower,
+                        label=f"BB {port.capitalize()}({period})",
+                        series_data=bands[port].to_list(),
                         plot_type="line",
                         subplot=False,
                         color=INDICATOR_COLORS.get("bollinger"),
-                        port="lower"
+                        port=port
                     )
-                ])
+                    for port in ("upper", "middle", "lower")
+                )
 
             # Skip subplot indicators (RSI, MACD, etc.) for Phase 1
             # These will be added in Phase 2 with proper subplot support
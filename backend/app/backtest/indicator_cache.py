@@ -0,0 +1,352 @@
+"""Cross-run indicator cache — indicator series shared between runs and requests.
+
+Every user's run, auto-update and alert re-backtest over the same candles
+computes the same ``ema(20)``. ``SharedIndicatorCache`` keeps indicator block
+series keyed by (indicator backend, asset, timeframe, frame fingerprint,
+block type, normalised params, output port) in two tiers:
+
+- an in-process LRU bounded by the bytes of the arrays it holds;
+- an optional remote tier (``RemoteIndicatorTier``, Redis in production —
+  see app/services/indicator_cache_store.py) holding the arrays as compact
+  binary, shared by every worker process and the API.
+
+The frame fingerprint is a content hash, so a key never matches a series
+computed from different candles; nothing needs invalidating. Only blocks of
+the ``indicator`` category are shared — input blocks are views of candle
+columns and cheaper to rebuild than to look up.
+
+``interpret_strategy`` reads through ``shared_indicator_cache()`` when its
+caller passes no per-run cache, and so does ``GET /market/chart-data``.
+
+``compute_period_batches`` fills any IndicatorCache ahead of those reads
+when several periods of one batchable block (SMA, EMA, RSI) are needed:
+one ``compute_periods`` call per group instead of one call per period.
+
+Documented in CONTEXT.md (term: Shared indicator cache).
+"""
+from __future__ import annotations
+
+import json
+import logging
+import struct
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, MutableMapping, Optional, Protocol, Sequence
+
+import numpy as np
+
+from app.backtest.candle_frame import CandleFrame
+from app.backtest.catalogue import lookup as catalogue_lookup
+from app.backtest.catalogue.types import ArrayContext, PeriodBatchBlockHandler, SeriesArray, compute_arrays
+from app.backtest.errors import StrategyInvalidError
+from app.backtest.execution_plan import normalized_params, params_key
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SHARED_CATEGORIES: frozenset[str] = frozenset({"indicator"})
+
+# (block_type, canonical params JSON, output port) -> series
+IndicatorCache = MutableMapping[tuple[str, str, str], SeriesArray]
+
+# kind byte, bar count
+_HEADER = struct.Struct("<cI")
+
+
+class RemoteIndicatorTier(Protocol):
+    """Byte store behind the in-process tier; misses are None."""
+
+    def read(self, keys: Sequence[str]) -> list[Optional[bytes]]: ...
+
+    def write(self, entries: dict[str, bytes]) -> None: ...
+
+
+def encode_series(series: SeriesArray) -> bytes:
+    """Header, bit-packed validity mask, then float64 values or bit-packed flags."""
+    n = series.values.shape[0]
+    if series.is_signal:
+        body = np.packbits(series.values).tobytes()
+    else:
+        body = np.ascontiguousarray(series.values, dtype="<f8").tobytes()
+    return _HEADER.pack(b"b" if series.is_signal else b"f", n) + np.packbits(series.valid).tobytes() + body
+
+
+def decode_series(raw: bytes) -> SeriesArray:
+    kind, n = _HEADER.unpack_from(raw)
+    offset = _HEADER.size
+    mask_bytes = (n + 7) // 8
+    valid = np.unpackbits(np.frombuffer(raw, dtype=np.uint8, count=mask_bytes, offset=offset), count=n).astype(bool)
+    offset += mask_bytes
+    if kind == b"b":
+        values = np.unpackbits(np.frombuffer(raw, dtype=np.uint8, offset=offset), count=n).astype(bool)
+    else:
+        values = np.frombuffer(raw, dtype="<f8", count=n, offset=offset).astype(np.float64)
+    return SeriesArray(values, valid)
+
+
+@dataclass
+class IndicatorCacheStats:
+    """Lookup counters since process start (or the last ``reset_stats``)."""
+
+    memory_hits: int = 0
+    remote_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    remote_errors: int = 0
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        lookups = self.memory_hits + self.remote_hits + self.misses
+        return (self.memory_hits + self.remote_hits) / lookups if lookups else None
+
+
+def read_through(
+    cache: IndicatorCache,
+    key: tuple[str, str],
+    ports: frozenset[str],
+    compute: Callable[[frozenset[str]], dict[str, SeriesArray]],
+) -> dict[str, SeriesArray]:
+    """``ports`` of the block at ``key``, computing only the ones ``cache`` lacks.
+
+    ``compute`` receives the missing ports; everything it returns is cached.
+    """
+    outputs: dict[str, SeriesArray] = {}
+    for port in ports:
+        series = cache.get((*key, port))
+        if series is not None:
+            outputs[port] = series
+    missing = ports.difference(outputs)
+    if missing:
+        computed = compute(missing)
+        for port, series in computed.items():
+            cache[(*key, port)] = series
+        outputs.update(computed)
+    return outputs
+
+
+def period_batch_key(block_type: str, params: dict) -> Optional[tuple[str, str]]:
+    """(block type, canonical params without ``period``) for blocks with a batch contract, else None.
+
+    Blocks with equal batch keys differ at most in ``period`` and can be
+    computed in one ``compute_periods`` call.
+    """
+    handler = catalogue_lookup(block_type)
+    if not isinstance(handler, PeriodBatchBlockHandler):
+        return None
+    shared = normalized_params(handler.spec, params)
+    del shared["period"]
+    return block_type, params_key(shared)
+
+
+def compute_period_batches(cache: IndicatorCache, frame: CandleFrame, blocks: Iterable[tuple[str, dict]]) -> None:
+    """Fill ``cache`` for the (block type, params) ``blocks`` that differ only in ``period``, one batch per group.
+
+    Groups with fewer than two uncached periods are left to the caller's
+    own read-through; so is everything without a batch contract.
+    """
+    groups: dict[tuple[str, str], dict[int, str]] = {}
+    for block_type, params in blocks:
+        batch_key = period_batch_key(block_type, params)
+        if batch_key is not None:
+            normalized = normalized_params(catalogue_lookup(block_type).spec, params)
+            groups.setdefault(batch_key, {})[normalized["period"]] = params_key(normalized)
+
+    candle_data = frame.candle_data()
+    for (block_type, shared_key), periods in groups.items():
+        if len(periods) < 2:
+            continue
+        handler = catalogue_lookup(block_type)
+        ports = [port.name for port in handler.spec.outputs]
+        missing = {
+            period: key for period, key in periods.items() if not all((block_type, key, port) in cache for port in ports)
+        }
+        if len(missing) < 2:
+            continue
+        ctx = ArrayContext(candle_data=candle_data, params=json.loads(shared_key), inputs={}, n=len(frame))
+        for key, outputs in zip(missing.values(), handler.compute_periods(ctx, list(missing))):
+            for port, series in outputs.items():
+                cache[(block_type, key, port)] = series
+
+
+class SharedIndicatorCache:
+    """Two-tier store of indicator series by string key; thread-safe, treat series as read-only."""
+
+    def __init__(self, max_bytes: int, remote: Optional[RemoteIndicatorTier] = None) -> None:
+        self.max_bytes = max_bytes
+        self.remote = remote
+        self._entries: "OrderedDict[str, SeriesArray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = IndicatorCacheStats()
+
+    def attach_remote(self, remote: Optional[RemoteIndicatorTier]) -> None:
+        self.remote = remote
+
+    @staticmethod
+    def shareable(block_type: str) -> bool:
+        handler = catalogue_lookup(block_type)
+        return handler is not None and handler.spec.category in SHARED_CATEGORIES
+
+    def get(self, key: str) -> Optional[SeriesArray]:
+        with self._lock:
+            series = self._entries.get(key)
+            if series is not None:
+                self._entries.move_to_end(key)
+                self._stats.memory_hits += 1
+                return series
+
+        series = self._read_remote(key)
+        with self._lock:
+            if series is None:
+                self._stats.misses += 1
+                return None
+            self._stats.remote_hits += 1
+            self._store(key, series)
+        return series
+
+    def put(self, key: str, series: SeriesArray) -> None:
+        with self._lock:
+            self._store(key, series)
+        if self.remote is not None:
+            try:
+                self.remote.write({key: encode_series(series)})
+            except Exception as exc:
+                self._count_remote_error(exc)
+
+    def view(self, frame: CandleFrame) -> "FrameIndicatorCache":
+        return FrameIndicatorCache(self, frame)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = self._stats
+            return {
+                "memory_hits": stats.memory_hits,
+                "remote_hits": stats.remote_hits,
+                "misses": stats.misses,
+                "hit_rate": stats.hit_rate,
+                "evictions": stats.evictions,
+                "remote_errors": stats.remote_errors,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "remote_enabled": self.remote is not None,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats = IndicatorCacheStats()
+
+    def clear(self) -> None:
+        """Drop the in-process tier; the remote tier expires on its own."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _read_remote(self, key: str) -> Optional[SeriesArray]:
+        if self.remote is None:
+            return None
+        try:
+            [raw] = self.remote.read([key])
+            return decode_series(raw) if raw is not None else None
+        except Exception as exc:
+            self._count_remote_error(exc)
+            return None
+
+    def _count_remote_error(self, exc: Exception) -> None:
+        logger.warning("indicator_cache_remote_failed", extra={"error": str(exc)})
+        with self._lock:
+            self._stats.remote_errors += 1
+
+    def _store(self, key: str, series: SeriesArray) -> None:
+        """Insert under ``self._lock``, then evict least recently used entries."""
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= _nbytes(previous)
+        self._entries[key] = series
+        self._bytes += _nbytes(series)
+        while self._bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= _nbytes(evicted)
+            self._stats.evictions += 1
+
+
+def _nbytes(series: SeriesArray) -> int:
+    return series.values.nbytes + series.valid.nbytes
+
+
+class FrameIndicatorCache(MutableMapping):
+    """An IndicatorCache for one frame that reads through a SharedIndicatorCache.
+
+    Every series is kept locally for the run; indicator series are also
+    looked up in, and written to, the shared tiers.
+    """
+
+    def __init__(self, shared: SharedIndicatorCache, frame: CandleFrame) -> None:
+        self._shared = shared
+        self._frame = frame
+        self._local: dict[tuple[str, str, str], SeriesArray] = {}
+
+    @property
+    def frame(self) -> CandleFrame:
+        return self._frame
+
+    def _shared_key(self, key: tuple[str, str, str]) -> str:
+        # The backend is part of the key so switching to pandas-ta never serves kernel output
+        frame = self._frame
+        return ":".join((settings.indicator_backend, frame.asset, frame.timeframe, frame.fingerprint, *key))
+
+    def __getitem__(self, key: tuple[str, str, str]) -> SeriesArray:
+        if key in self._local:
+            return self._local[key]
+        if not self._shared.shareable(key[0]):
+            raise KeyError(key)
+        series = self._shared.get(self._shared_key(key))
+        if series is None:
+            raise KeyError(key)
+        self._local[key] = series
+        return series
+
+    def __setitem__(self, key: tuple[str, str, str], series: SeriesArray) -> None:
+        self._local[key] = series
+        if self._shared.shareable(key[0]):
+            self._shared.put(self._shared_key(key), series)
+
+    def __delitem__(self, key: tuple[str, str, str]) -> None:
+        del self._local[key]
+
+    def __iter__(self) -> Iterator[tuple[str, str, str]]:
+        return iter(self._local)
+
+    def __len__(self) -> int:
+        return len(self._local)
+
+    def compute(self, block_type: str, params: dict, ports: Sequence[str] = ("output",)) -> dict[str, SeriesArray]:
+        """``ports`` of one input-free catalogue block over the frame, read through the cache."""
+        handler = catalogue_lookup(block_type)
+        if handler is None:
+            raise StrategyInvalidError(
+                f"Unknown block type: {block_type}",
+                f"Invalid strategy: unsupported block type '{block_type}'.",
+            )
+        key = (block_type, params_key(normalized_params(handler.spec, params)))
+        candle_data = self._frame.candle_data()
+
+        def run(missing: frozenset[str]) -> dict[str, SeriesArray]:
+            ctx = ArrayContext(candle_data=candle_data, params=params, inputs={}, n=len(self._frame), ports=missing)
+            return compute_arrays(handler, ctx)
+
+        return read_through(self, key, frozenset(ports), run)
+
+
+_shared: Optional[SharedIndicatorCache] = None
+_shared_lock = threading.Lock()
+
+
+def shared_indicator_cache() -> SharedIndicatorCache:
+    """The process-wide cache, created on first use with an in-process tier only."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = SharedIndicatorCache(max_bytes=settings.indicator_cache_max_mb * 2**20)
+        return _shared
@@ -0,0 +1,536 @@
+"""NumPy indicator kernels — pandas-ta's maths without the pandas round trip.
+
+Each kernel takes float64 arrays (NaN where a value is missing) and returns
+arrays of the same length, NaN over the warm-up, for the indicator of the
+same name in app/backtest/indicators.py. They follow pandas-ta-classic step
+for step — its default lengths, the length checks that return no values at
+all, SMA-seeded EMA and Wilder smoothing, the ``non_zero_range`` epsilon —
+and agree with it to rounding, not bit for bit:
+
+- rolling sums are prefix sums carrying their own rounding error
+  (``rolling_sum``) instead of pandas' Kahan add/remove loop;
+- ``ewm(adjust=False)`` is solved in closed form a block of bars at a time
+  (``_recurrence``) instead of bar by bar;
+- rolling max/min (``rolling_extreme``), the Bollinger variance and MACD
+  (pandas-ta's own EMA loop, replayed on Python floats) are exact.
+
+``settings.indicator_backend = "pandas_ta"`` switches indicators.py and the
+catalogue back to pandas-ta, the reference these are tested against.
+"""
+from __future__ import annotations
+
+import math
+import sys
+from typing import Collection, Optional, Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# pandas-ta's ``sflt.epsilon``
+_EPSILON = sys.float_info.epsilon
+
+
+def as_array(values: Sequence[Optional[float]]) -> np.ndarray:
+    """A float64 view of ``values``; None becomes NaN."""
+    return np.asarray(values, dtype=np.float64)
+
+
+def _nan(n: int) -> np.ndarray:
+    return np.full(n, np.nan)
+
+
+def _wants(outputs: Optional[Collection[str]], name: str) -> bool:
+    return outputs is None or name in outputs
+
+
+def shift(values: np.ndarray, periods: int) -> np.ndarray:
+    """``Series.shift(periods)`` for ``periods >= 0``."""
+    out = _nan(values.shape[0])
+    if periods == 0:
+        out[:] = values
+    elif periods < values.shape[0]:
+        out[periods:] = values[:-periods]
+    return out
+
+
+# ── Building blocks ──────────────────────────────────────────────────────────
+
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Sums of complete windows, NaN where a window is short or holds a NaN.
+
+    Differences of one prefix sum lose digits as the prefix grows, so the
+    rounding error of every prefix step is recovered (TwoSum) and summed
+    separately; the result is accurate to the window sum, not the prefix.
+    """
+    return rolling_sums(values, [window])[0]
+
+
+def rolling_sums(values: np.ndarray, windows: Sequence[int]) -> np.ndarray:
+    """``rolling_sum`` for every window in ``windows``, one row each, from one prefix sum."""
+    n = values.shape[0]
+    out = np.full((len(windows), n), np.nan)
+    if not any(1 <= window <= n for window in windows):
+        return out
+    missing = np.isnan(values)
+    x = np.where(missing, 0.0, values)
+    prefix = np.concatenate(([0.0], np.cumsum(x)))
+    previous, current = prefix[:-1], prefix[1:]
+    added = current - previous
+    error = np.concatenate(([0.0], np.cumsum((previous - (current - added)) + (x - added))))
+    gaps = np.concatenate(([0], np.cumsum(missing))) if missing.any() else None
+    for row, window in enumerate(windows):
+        if not 1 <= window <= n:
+            continue
+        sums = out[row, window - 1:]
+        sums[:] = (prefix[window:] - prefix[:-window]) + (error[window:] - error[:-window])
+        if gaps is not None:
+            sums[gaps[window:] - gaps[:-window] > 0] = np.nan
+    return out
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """``Series.rolling(window).mean()``."""
+    return rolling_sum(values, window) / window
+
+
+def rolling_extreme(values: np.ndarray, window: int, largest: bool) -> np.ndarray:
+    """``Series.rolling(window).max()`` (or ``.min()``), exact, in O(n).
+
+    Van Herk/Gil-Werman: cut the series into blocks of ``window`` bars; every
+    window is the suffix of one block plus the prefix of the next, so it is
+    the extreme of one running suffix and one running prefix extreme. A NaN
+    spreads through the running extremes of its block, which lands it in
+    exactly the windows that hold it.
+    """
+    n = values.shape[0]
+    out = _nan(n)
+    if window < 1 or window > n:
+        return out
+    if window == 1:
+        out[:] = values
+        return out
+    pick = np.maximum if largest else np.minimum
+    pad = -n % window
+    blocks = np.concatenate((values, np.full(pad, -np.inf if largest else np.inf))).reshape(-1, window)
+    prefix = pick.accumulate(blocks, axis=1).ravel()[:n]
+    suffix = pick.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()[:n]
+    out[window - 1:] = pick(suffix[: n - window + 1], prefix[window - 1:])
+    return out
+
+
+def _recurrence(initial: float, values: np.ndarray, alpha: float) -> np.ndarray:
+    """``y[t] = alpha * values[t] + (1 - alpha) * y[t - 1]`` with ``y[-1] = initial``.
+
+    Within a block of bars from a zero state the recurrence has the closed
+    form ``alpha * d**j * cumsum(values * d**-s)`` (d = 1 - alpha), so whole
+    blocks are solved with array operations and only the state carried from
+    block to block is a Python loop. Blocks are short enough for ``d**-s``
+    to stay far from overflow. A NaN input poisons every later value, as it
+    does bar by bar.
+    """
+    return _recurrences(np.array([initial], dtype=np.float64), values[np.newaxis], np.array([alpha]))[0]
+
+
+def _recurrences(initial: np.ndarray, values: np.ndarray, alpha: np.ndarray) -> np.ndarray:
+    """``_recurrence`` for every row of ``values`` (k, m), with one ``initial`` and ``alpha`` per row.
+
+    Rows with the same block length share one carry loop. Each row gets the
+    same arithmetic it would alone, so stacking never changes a value.
+    """
+    out = np.empty(values.shape)
+    decay = 1.0 - alpha
+    blocks = np.array([_block_length(d) for d in decay.tolist()])
+    for block in np.unique(blocks).tolist():
+        rows = np.flatnonzero(blocks == block)
+        if block == 0 or values.shape[1] == 0:
+            out[rows] = values[rows]
+        else:
+            out[rows] = _blockwise_recurrence(initial[rows], values[rows], alpha[rows], block)
+    return out
+
+
+def _block_length(decay: float) -> int:
+    """Bars per closed-form block; 0 when the recurrence is the input itself."""
+    if decay == 0.0:
+        return 0
+    return int(min(256, max(1, 250 // -math.log10(decay))))
+
+
+def _blockwise_recurrence(initial: np.ndarray, values: np.ndarray, alpha: np.ndarray, block: int) -> np.ndarray:
+    k, m = values.shape
+    decay = (1.0 - alpha)[:, np.newaxis]
+    nb = -(-m // block)
+    steps = np.arange(block).astype(np.float64)
+    growth = decay ** -steps
+    powers = decay ** steps
+    blocks = np.concatenate((values, np.zeros((k, nb * block - m))), axis=1).reshape(k, nb, block)
+    local = (alpha[:, np.newaxis] * powers)[:, np.newaxis] * np.cumsum(blocks * growth[:, np.newaxis], axis=2)
+
+    carried = np.empty((k, nb))
+    state, step = initial, decay[:, 0] ** block
+    for b in range(nb):
+        carried[:, b] = state
+        state = local[:, b, -1] + step * state
+    return (local + carried[:, :, np.newaxis] * (decay * powers)[:, np.newaxis]).reshape(k, -1)[:, :m]
+
+
+def ewm(values: np.ndarray, alpha: float) -> np.ndarray:
+    """``Series.ewm(alpha=alpha, adjust=False).mean()``.
+
+    Starts at the first non-NaN value. NaNs after that are rare (the candle
+    columns have none) and take pandas' bar-by-bar path, where the weight of
+    the running mean keeps decaying across the gap.
+    """
+    n = values.shape[0]
+    out = _nan(n)
+    observed = ~np.isnan(values)
+    if not observed.any():
+        return out
+    start = int(np.argmax(observed))
+    if not observed[start:].all():
+        return _ewm_with_gaps(values, alpha)
+    out[start] = values[start]
+    out[start + 1:] = _recurrence(values[start], values[start + 1:], alpha)
+    return out
+
+
+def _ewm_with_gaps(values: np.ndarray, alpha: float) -> np.ndarray:
+    """pandas' ``ewm(adjust=False)`` loop, for series with NaNs inside."""
+    out = _nan(values.shape[0])
+    old_wt, weighted = 1.0, math.nan
+    for i, value in enumerate(values.tolist()):
+        if weighted == weighted:
+            old_wt *= 1.0 - alpha
+            if value == value:
+                if weighted != value:
+                    weighted = (old_wt * weighted + alpha * value) / (old_wt + alpha)
+                old_wt = 1.0
+        elif value == value:
+            weighted = value
+        out[i] = weighted
+    return out
+
+
+def _seeded_ewm(values: np.ndarray, length: int, alpha: float) -> np.ndarray:
+    """pandas-ta's ``ema``/``rma``: the NaN-skipping mean of the first ``length`` values at ``length - 1``, then ``ewm``."""
+    n = values.shape[0]
+    if n < length:
+        return _nan(n)
+    seeded = values.copy()
+    seeded[: length - 1] = np.nan
+    seeded[length - 1] = _seed(values, length)
+    return ewm(seeded, alpha)
+
+
+def _seed(values: np.ndarray, length: int) -> float:
+    head = values[:length]
+    observed = ~np.isnan(head)
+    count = int(observed.sum())
+    return np.where(observed, head, 0.0).sum() / count if count else np.nan
+
+
+def _seeded_ewms(values: np.ndarray, lengths: Sequence[int], alphas: Sequence[float]) -> np.ndarray:
+    """``_seeded_ewm`` for each (length, alpha), one row each, through one stacked recurrence.
+
+    Each row's tail after its seed is left-aligned, so its blocks line up as
+    they would alone.
+    """
+    n = values.shape[0]
+    out = np.full((len(lengths), n), np.nan)
+    live = [row for row, length in enumerate(lengths) if length <= n]
+    if not live:
+        return out
+    seeds = np.array([_seed(values, lengths[row]) for row in live])
+    if np.isnan(seeds).any() or np.isnan(values[min(lengths[row] for row in live):]).any():
+        for row in live:
+            out[row] = _seeded_ewm(values, lengths[row], alphas[row])
+        return out
+
+    tails = np.zeros((len(live), n - min(lengths[row] for row in live)))
+    for i, row in enumerate(live):
+        tails[i, : n - lengths[row]] = values[lengths[row]:]
+    solved = _recurrences(seeds, tails, np.array([alphas[row] for row in live], dtype=np.float64))
+    for i, row in enumerate(live):
+        length = lengths[row]
+        out[row, length - 1] = seeds[i]
+        out[row, length:] = solved[i, : n - length]
+    return out
+
+
+def _aligned_ema(values: np.ndarray, period: int, seed_at: int) -> np.ndarray:
+    """pandas-ta's MACD EMA: seeded with the mean of the ``period`` values up to ``seed_at``.
+
+    Replays pandas-ta's own bar-by-bar loop on Python floats rather than
+    ``_recurrence``: MACD lines hover around zero, where the closed form's
+    rounding would flip the histogram's sign on trendless stretches.
+    """
+    m = values.shape[0]
+    out = _nan(m)
+    start = seed_at - period + 1
+    if start < 0 or seed_at >= m:
+        return out
+    k = 2.0 / (period + 1)
+    decay = 1 - k
+    state = float(values[start: seed_at + 1].mean())
+    line = [state]
+    append = line.append
+    for value in values[seed_at + 1:].tolist():
+        state = k * value + decay * state
+        append(state)
+    out[seed_at:] = line
+    return out
+
+
+# ── Indicators ───────────────────────────────────────────────────────────────
+
+
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    length = period if period > 0 else 10
+    return rolling_mean(values, length)
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    length = period if period > 0 else 10
+    return _seeded_ewm(values, length, 2.0 / (length + 1))
+
+
+def rma(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder's moving average."""
+    length = period if period > 0 else 10
+    return _seeded_ewm(values, length, 1.0 / length)
+
+
+def rsi(values: np.ndarray, period: int) -> np.ndarray:
+    length = period if period > 0 else 14
+    n = values.shape[0]
+    if n < length:
+        return _nan(n)
+    gain, loss = _gains_and_losses(values)
+    return _rsi(rma(gain, length), rma(loss, length))
+
+
+def _gains_and_losses(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    change = np.diff(values, prepend=np.nan)
+    return np.where(change < 0, 0.0, change), np.where(change > 0, 0.0, change)
+
+
+def _rsi(gain: np.ndarray, loss: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100.0 * gain / (gain + np.abs(loss))
+
+
+# ── Several periods at once ──────────────────────────────────────────────────
+#
+# One row per period, each equal to the single-period kernel's output; the
+# work every period repeats (prefix sums, price changes, the block carry
+# loop) is done once.
+
+
+def sma_batch(values: np.ndarray, periods: Sequence[int]) -> np.ndarray:
+    lengths = [period if period > 0 else 10 for period in periods]
+    return rolling_sums(values, lengths) / np.array(lengths, dtype=np.float64)[:, np.newaxis]
+
+
+def ema_batch(values: np.ndarray, periods: Sequence[int]) -> np.ndarray:
+    lengths = [period if period > 0 else 10 for period in periods]
+    return _seeded_ewms(values, lengths, [2.0 / (length + 1) for length in lengths])
+
+
+def rsi_batch(values: np.ndarray, periods: Sequence[int]) -> np.ndarray:
+    lengths = [period if period > 0 else 14 for period in periods]
+    alphas = [1.0 / length for length in lengths]
+    gain, loss = _gains_and_losses(values)
+    return _rsi(_seeded_ewms(gain, lengths, alphas), _seeded_ewms(loss, lengths, alphas))
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """pandas-ta ``true_range`` (drift 1): NaN on the first bar."""
+    high_low = high - low
+    if (high_low == 0).any():
+        high_low = high_low + _EPSILON
+    prev_close = shift(close, 1)
+    out = np.fmax(np.fmax(np.abs(high_low), np.abs(high - prev_close)), np.abs(prev_close - low))
+    out[:1] = np.nan
+    return out
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+    length = period if period > 0 else 14
+    if close.shape[0] < length:
+        return _nan(close.shape[0])
+    return rma(true_range(high, low, close), length)
+
+
+def macd(values: np.ndarray, fast: int, slow: int, signal: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(macd, signal, histogram)."""
+    fast = fast if fast > 0 else 12
+    slow = slow if slow > 0 else 26
+    signal = signal if signal > 0 else 9
+    if slow < fast:
+        fast, slow = slow, fast
+    n = values.shape[0]
+    if n < max(fast, slow, signal):
+        return _nan(n), _nan(n), _nan(n)
+    macd_line = _aligned_ema(values, fast, fast - 1) - _aligned_ema(values, slow, slow - 1)
+    signal_line = _aligned_ema(macd_line, signal, slow + signal - 2)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def bbands(
+    values: np.ndarray,
+    period: int,
+    std_dev: float,
+    outputs: Optional[Collection[str]] = None,
+) -> tuple[Optional[np.ndarray], Optional[np.ndarray], Optional[np.ndarray]]:
+    """(upper, middle, lower); bands not in ``outputs`` are None and their variance is skipped.
+
+    The variance is pandas-ta's own two-pass ``var`` over every window —
+    O(n * period), and bit for bit.
+    """
+    length = period if period > 1 else 5
+    std = std_dev if std_dev > 0 else 2.0
+    n = values.shape[0]
+    if n < length:
+        return _nan(n), _nan(n), _nan(n)
+    middle = rolling_mean(values, length)
+    if not (_wants(outputs, "upper") or _wants(outputs, "lower")):
+        return None, middle, None
+    deviation = _nan(n)
+    deviation[length - 1:] = std * np.sqrt(sliding_window_view(values, length).var(axis=1))
+    return middle + deviation, middle, middle - deviation
+
+
+def stoch(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    k_period: int,
+    d_period: int,
+    smooth: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """(%K, %D); each line is smoothed from the first valid value of the one before."""
+    k_period = k_period if k_period > 0 else 14
+    d_period = d_period if d_period > 0 else 3
+    smooth = smooth if smooth > 0 else 3
+    n = close.shape[0]
+    if n < max(k_period, d_period, smooth):
+        return _nan(n), _nan(n)
+    lowest = rolling_extreme(low, k_period, largest=False)
+    spread = rolling_extreme(high, k_period, largest=True) - lowest
+    if (spread == 0).any():
+        spread = spread + _EPSILON
+    with np.errstate(divide="ignore", invalid="ignore"):
+        raw = 100 * (close - lowest) / spread
+
+    k_line, d_line = _nan(n), _nan(n)
+    k_start = _first_valid(raw)
+    if n - k_start < smooth:
+        return _nan(n), _nan(n)
+    k_line[k_start:] = rolling_mean(raw[k_start:], smooth)
+    d_start = max(k_start, _first_valid(k_line))
+    if n - d_start < d_period:
+        return _nan(n), _nan(n)
+    d_line[d_start:] = rolling_mean(k_line[d_start:], d_period)
+    return k_line, d_line
+
+
+def _first_valid(values: np.ndarray) -> int:
+    """Index of the first non-NaN value; 0 when there is none (``.loc[None:]``)."""
+    observed = ~np.isnan(values)
+    return int(np.argmax(observed)) if observed.any() else 0
+
+
+def adx(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(adx, plus_di, minus_di)."""
+    length = period if period > 0 else 14
+    n = close.shape[0]
+    if n < length:
+        return _nan(n), _nan(n), _nan(n)
+    up = high - shift(high, 1)
+    down = shift(low, 1) - low
+    plus_move = np.where((up > down) & (up > 0), up, 0.0 * up)
+    minus_move = np.where((down > up) & (down > 0), down, 0.0 * down)
+    plus_move[np.abs(plus_move) < _EPSILON] = 0.0
+    minus_move[np.abs(minus_move) < _EPSILON] = 0.0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = 100.0 / atr(high, low, close, length)
+        plus_di = k * rma(plus_move, length)
+        minus_di = k * rma(minus_move, length)
+        dx = 100.0 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    return rma(dx, length), plus_di, minus_di
+
+
+def midprice(high: np.ndarray, low: np.ndarray, length: int) -> np.ndarray:
+    length = length if length > 0 else 2
+    return 0.5 * (rolling_extreme(low, length, largest=False) + rolling_extreme(high, length, largest=True))
+
+
+def ichimoku(
+    high: np.ndarray,
+    low: np.ndarray,
+    conversion: int,
+    base: int,
+    span_b: int,
+    outputs: Optional[Collection[str]] = None,
+) -> tuple[Optional[np.ndarray], ...]:
+    """(conversion, base, span_a, span_b); lines not in ``outputs`` are None and not computed.
+
+    The spans are shifted forward by the base period, as ``indicators.ichimoku`` does.
+    """
+    n = high.shape[0]
+    if n < max(conversion, base, span_b):
+        return _nan(n), _nan(n), _nan(n), _nan(n)
+    wants_span_a = _wants(outputs, "span_a")
+    conversion_line = base_line = span_a = span_b_line = None
+    if wants_span_a or _wants(outputs, "conversion"):
+        conversion_line = midprice(high, low, conversion)
+    if wants_span_a or _wants(outputs, "base"):
+        base_line = midprice(high, low, base)
+    if wants_span_a:
+        span_a = shift(0.5 * (conversion_line + base_line), base)
+    if _wants(outputs, "span_b"):
+        span_b_line = shift(midprice(high, low, span_b), base)
+    return (
+        conversion_line if _wants(outputs, "conversion") else None,
+        base_line if _wants(outputs, "base") else None,
+        span_a,
+        span_b_line,
+    )
+
+
+FIBONACCI_RATIOS: dict[str, float] = {
+    "level_236": 0.236, "level_382": 0.382, "level_5": 0.5, "level_618": 0.618, "level_786": 0.786,
+}
+
+
+def fibonacci(
+    high: np.ndarray,
+    low: np.ndarray,
+    lookback: int,
+    outputs: Optional[Collection[str]] = None,
+) -> tuple[Optional[np.ndarray], ...]:
+    """Retracement levels of the last ``lookback`` bars' range, in ``FIBONACCI_RATIOS`` order.
+
+    A flat range puts every level at the low. Levels not in ``outputs`` are None.
+    """
+    highest = rolling_extreme(high, lookback, largest=True)
+    lowest = rolling_extreme(low, lookback, largest=False)
+    range_val = highest - lowest
+    flat = range_val == 0
+    return tuple(
+        np.where(flat, lowest, highest - range_val * ratio) if _wants(outputs, name) else None
+        for name, ratio in FIBONACCI_RATIOS.items()
+    )
+
+
+def obv(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """Cumulative signed volume; the first bar counts as a rise."""
+    sign = np.sign(np.diff(close, prepend=np.nan))
+    sign[:1] = 1.0
+    signed_volume = sign * volume
+    missing = np.isnan(signed_volume)
+    out = np.cumsum(np.where(missing, 0.0, signed_volume))
+    out[missing] = np.nan
+    return out
@@ -2,30 +2,116 @@
 
 All functions operate on lists of floats and return lists of the same length.
 Returns None for periods where indicator cannot be computed (warm-up period).
+
+Multi-output indicators take ``outputs``, the names of the lines to return;
+lines not named are neither computed nor converted where the maths allows,
+and come back as None in place of their list. ``None`` means every line.
+
+``sma_batch``, ``ema_batch`` and ``rsi_batch`` take several periods and
+return a (periods, bars) float array, NaN over each warm-up; every row
+equals the single-period function's output, and the work the periods
+share is done once.
+
+The maths runs in the NumPy kernels of app/backtest/indicator_kernels.py.
+``settings.indicator_backend = "pandas_ta"`` computes with pandas-ta-classic
+instead — the reference the kernels are tested against. pandas-ta (and
+pandas behind it) is then imported on the first indicator call, not with
+this module: the catalogue imports it, and API processes that never compute
+an indicator should not pay for pandas.
 """
-from typing import Optional
+from types import ModuleType
+from typing import Callable, Collection, Optional, Sequence
 
-import pandas_ta_classic as ta
+import numpy as np
 
+from app.backtest import indicator_kernels as kernels
 from app.backtest._ta_adapter import from_series, to_series
+from app.core.config import settings
+
+
+def use_pandas_ta() -> bool:
+    """Whether ``settings.indicator_backend`` selects the pandas-ta reference."""
+    return settings.indicator_backend == "pandas_ta"
+
+
+def _ta() -> ModuleType:
+    import pandas_ta_classic
+
+    return pandas_ta_classic
+
+
+def _wants(outputs: Optional[Collection[str]], name: str) -> bool:
+    return outputs is None or name in outputs
+
+
+def _values(array: np.ndarray) -> list[Optional[float]]:
+    """A kernel output in the list contract: NaN becomes None."""
+    return [None if v != v else v for v in array.tolist()]
+
+
+def _kernel_lines(lines: dict[str, Optional[np.ndarray]], outputs: Optional[Collection[str]]) -> tuple:
+    """Convert the kernel ``lines`` that ``outputs`` asks for."""
+    return tuple(_values(line) if line is not None and _wants(outputs, name) else None for name, line in lines.items())
+
+
+def _lines(df, columns: dict[str, str], n: int, outputs: Optional[Collection[str]]) -> tuple:
+    """Convert the ``columns`` (line name -> DataFrame column) that ``outputs`` asks for."""
+    return tuple(from_series(df[column], n) if _wants(outputs, name) else None for name, column in columns.items())
 
 
 def sma(closes: list[float], period: int) -> list[Optional[float]]:
     """Simple Moving Average."""
+    if not use_pandas_ta():
+        return _values(kernels.sma(kernels.as_array(closes), period))
     n = len(closes)
-    return from_series(ta.sma(to_series(closes), length=period), n)
+    return from_series(_ta().sma(to_series(closes), length=period), n)
 
 
 def ema(closes: list[float], period: int) -> list[Optional[float]]:
     """Exponential Moving Average."""
+    if not use_pandas_ta():
+        return _values(kernels.ema(kernels.as_array(closes), period))
     n = len(closes)
-    return from_series(ta.ema(to_series(closes), length=period), n)
+    return from_series(_ta().ema(to_series(closes), length=period), n)
 
 
 def rsi(closes: list[float], period: int) -> list[Optional[float]]:
     """Relative Strength Index (0-100)."""
+    if not use_pandas_ta():
+        return _values(kernels.rsi(kernels.as_array(closes), period))
     n = len(closes)
-    return from_series(ta.rsi(to_series(closes), length=period), n)
+    return from_series(_ta().rsi(to_series(closes), length=period), n)
+
+
+def sma_batch(closes: list[float], periods: Sequence[int]) -> np.ndarray:
+    """SMA at every period in ``periods``, one row each."""
+    if not use_pandas_ta():
+        return kernels.sma_batch(kernels.as_array(closes), periods)
+    return _stacked(sma, closes, periods)
+
+
+def ema_batch(closes: list[float], periods: Sequence[int]) -> np.ndarray:
+    """EMA at every period in ``periods``, one row each."""
+    if not use_pandas_ta():
+        return kernels.ema_batch(kernels.as_array(closes), periods)
+    return _stacked(ema, closes, periods)
+
+
+def rsi_batch(closes: list[float], periods: Sequence[int]) -> np.ndarray:
+    """RSI at every period in ``periods``, one row each."""
+    if not use_pandas_ta():
+        return kernels.rsi_batch(kernels.as_array(closes), periods)
+    return _stacked(rsi, closes, periods)
+
+
+def _stacked(
+    indicator: Callable[[list[float], int], list[Optional[float]]], closes: list[float], periods: Sequence[int]
+) -> np.ndarray:
+    """One pandas-ta call per period, as a batch array."""
+    rows = np.full((len(periods), len(closes)), np.nan)
+    for row, period in enumerate(periods):
+        rows[row] = kernels.as_array(indicator(closes, period))
+    return rows
 
 
 def macd(
@@ -33,33 +119,40 @@ def macd(
     fast: int = 12,
     slow: int = 26,
     signal: int = 9,
+    outputs: Optional[Collection[str]] = None,
 ) -> tuple[list[Optional[float]], list[Optional[float]], list[Optional[float]]]:
-    """MACD indicator. Returns (macd_line, signal_line, histogram)."""
+    """MACD indicator. Returns (macd_line, signal_line, histogram); outputs: macd, signal, histogram."""
+    if not use_pandas_ta():
+        macd_line, signal_line, histogram = kernels.macd(kernels.as_array(closes), fast, slow, signal)
+        return _kernel_lines({"macd": macd_line, "signal": signal_line, "histogram": histogram}, outputs)
     n = len(closes)
-    df = ta.macd(to_series(closes), fast=fast, slow=slow, signal=signal)
+    df = _ta().macd(to_series(closes), fast=fast, slow=slow, signal=signal)
     if df is None:
         return [None] * n, [None] * n, [None] * n
     normalized_fast, normalized_slow = min(fast, slow), max(fast, slow)
-    macd_col = f"MACD_{normalized_fast}_{normalized_slow}_{signal}"
-    signal_col = f"MACDs_{normalized_fast}_{normalized_slow}_{signal}"
-    hist_col = f"MACDh_{normalized_fast}_{normalized_slow}_{signal}"
-    return from_series(df[macd_col], n), from_series(df[signal_col], n), from_series(df[hist_col], n)
+    suffix = f"{normalized_fast}_{normalized_slow}_{signal}"
+    return _lines(df, {"macd": f"MACD_{suffix}", "signal": f"MACDs_{suffix}", "histogram": f"MACDh_{suffix}"}, n, outputs)
 
 
 def bollinger(
     closes: list[float],
     period: int = 20,
     std_dev: float = 2.0,
+    outputs: Optional[Collection[str]] = None,
 ) -> tuple[list[Optional[float]], list[Optional[float]], list[Optional[float]]]:
-    """Bollinger Bands. Returns (upper, middle, lower)."""
+    """Bollinger Bands. Returns (upper, middle, lower); outputs: upper, middle, lower."""
+    if not use_pandas_ta():
+        upper, middle, lower = kernels.bbands(kernels.as_array(closes), period, std_dev, outputs)
+        return _kernel_lines({"upper": upper, "middle": middle, "lower": lower}, outputs)
     n = len(closes)
-    df = ta.bbands(to_series(closes), length=period, std=std_dev)
+    df = _ta().bbands(to_series(closes), length=period, std=std_dev)
     if df is None:
         return [None] * n, [None] * n, [None] * n
-    upper_col = next(c for c in df.columns if c.startswith(f"BBU_{period}_"))
-    middle_col = next(c for c in df.columns if c.startswith(f"BBM_{period}_"))
-    lower_col = next(c for c in df.columns if c.startswith(f"BBL_{period}_"))
-    return from_series(df[upper_col], n), from_series(df[middle_col], n), from_series(df[lower_col], n)
+    columns = {
+        name: next(c for c in df.columns if c.startswith(f"{prefix}_{period}_"))
+        for name, prefix in (("upper", "BBU"), ("middle", "BBM"), ("lower", "BBL"))
+    }
+    return _lines(df, columns, n, outputs)
 
 
 def atr(
@@ -69,8 +162,10 @@ def atr(
     period: int = 14,
 ) -> list[Optional[float]]:
     """Average True Range."""
+    if not use_pandas_ta():
+        return _values(kernels.atr(kernels.as_array(highs), kernels.as_array(lows), kernels.as_array(closes), period))
     n = len(closes)
-    return from_series(ta.atr(to_series(highs), to_series(lows), to_series(closes), length=period), n)
+    return from_series(_ta().atr(to_series(highs), to_series(lows), to_series(closes), length=period), n)
 
 
 def stochastic(
@@ -80,15 +175,20 @@ def stochastic(
     k_period: int = 14,
     d_period: int = 3,
     smooth: int = 3,
+    outputs: Optional[Collection[str]] = None,
 ) -> tuple[list[Optional[float]], list[Optional[float]]]:
-    """Stochastic Oscillator. Returns (%K, %D)."""
+    """Stochastic Oscillator. Returns (%K, %D); outputs: k, d."""
+    if not use_pandas_ta():
+        k_line, d_line = kernels.stoch(
+            kernels.as_array(highs), kernels.as_array(lows), kernels.as_array(closes), k_period, d_period, smooth
+        )
+        return _kernel_lines({"k": k_line, "d": d_line}, outputs)
     n = len(closes)
-    df = ta.stoch(to_series(highs), to_series(lows), to_series(closes), k=k_period, d=d_period, smooth_k=smooth)
+    df = _ta().stoch(to_series(highs), to_series(lows), to_series(closes), k=k_period, d=d_period, smooth_k=smooth)
     if df is None:
         return [None] * n, [None] * n
-    k_col = f"STOCHk_{k_period}_{d_period}_{smooth}"
-    d_col = f"STOCHd_{k_period}_{d_period}_{smooth}"
-    return from_series(df[k_col], n), from_series(df[d_col], n)
+    suffix = f"{k_period}_{d_period}_{smooth}"
+    return _lines(df, {"k": f"STOCHk_{suffix}", "d": f"STOCHd_{suffix}"}, n, outputs)
 
 
 def adx(
@@ -96,16 +196,19 @@ def adx(
     lows: list[float],
     closes: list[float],
     period: int = 14,
+    outputs: Optional[Collection[str]] = None,
 ) -> tuple[list[Optional[float]], list[Optional[float]], list[Optional[float]]]:
-    """Average Directional Index. Returns (ADX, +DI, -DI)."""
+    """Average Directional Index. Returns (ADX, +DI, -DI); outputs: adx, plus_di, minus_di."""
+    if not use_pandas_ta():
+        adx_line, plus_di, minus_di = kernels.adx(
+            kernels.as_array(highs), kernels.as_array(lows), kernels.as_array(closes), period
+        )
+        return _kernel_lines({"adx": adx_line, "plus_di": plus_di, "minus_di": minus_di}, outputs)
     n = len(closes)
-    df = ta.adx(to_series(highs), to_series(lows), to_series(closes), length=period)
+    df = _ta().adx(to_series(highs), to_series(lows), to_series(closes), length=period)
     if df is None:
         return [None] * n, [None] * n, [None] * n
-    adx_col = f"ADX_{period}"
-    dmp_col = f"DMP_{period}"
-    dmn_col = f"DMN_{period}"
-    return from_series(df[adx_col], n), from_series(df[dmp_col], n), from_series(df[dmn_col], n)
+    return _lines(df, {"adx": f"ADX_{period}", "plus_di": f"DMP_{period}", "minus_di": f"DMN_{period}"}, n, outputs)
 
 
 def ichimoku(
@@ -116,22 +219,37 @@ def ichimoku(
     base: int = 26,
     span_b: int = 52,
     displacement: int = 26,
+    outputs: Optional[Collection[str]] = None,
 ) -> tuple[list[Optional[float]], list[Optional[float]], list[Optional[float]], list[Optional[float]]]:
-    """Ichimoku Cloud. Returns (conversion_line, base_line, span_a, span_b)."""
+    """Ichimoku Cloud. Returns (conversion_line, base_line, span_a, span_b).
+
+    outputs: conversion, base, span_a, span_b. Each line is built from the
+    same pandas-ta midprices ``ta.ichimoku`` uses (spans shifted forward by
+    the base period), so only the requested ones are computed.
+    """
+    if not use_pandas_ta():
+        lines = kernels.ichimoku(kernels.as_array(highs), kernels.as_array(lows), conversion, base, span_b, outputs)
+        return _kernel_lines(dict(zip(("conversion", "base", "span_a", "span_b"), lines)), outputs)
     n = len(closes)
-    result = ta.ichimoku(to_series(highs), to_series(lows), to_series(closes), tenkan=conversion, kijun=base, senkou=span_b)
-    if result is None or result[0] is None:
+    if n < max(conversion, base, span_b):
         return [None] * n, [None] * n, [None] * n, [None] * n
-    df = result[0]
-    conv_col = f"ITS_{conversion}"
-    base_col = f"IKS_{base}"
-    span_a_col = f"ISA_{conversion}"
-    span_b_col = f"ISB_{base}"
+    high, low = to_series(highs), to_series(lows)
+    wants_span_a = _wants(outputs, "span_a")
+
+    conversion_line = base_line = span_a = span_b_line = None
+    if wants_span_a or _wants(outputs, "conversion"):
+        conversion_line = _ta().midprice(high=high, low=low, length=conversion)
+    if wants_span_a or _wants(outputs, "base"):
+        base_line = _ta().midprice(high=high, low=low, length=base)
+    if wants_span_a:
+        span_a = from_series((0.5 * (conversion_line + base_line)).shift(base), n)
+    if _wants(outputs, "span_b"):
+        span_b_line = from_series(_ta().midprice(high=high, low=low, length=span_b).shift(base), n)
     return (
-        from_series(df[conv_col], n),
-        from_series(df[base_col], n),
-        from_series(df[span_a_col], n),
-        from_series(df[span_b_col], n),
+        from_series(conversion_line, n) if _wants(outputs, "conversion") else None,
+        from_series(base_line, n) if _wants(outputs, "base") else None,
+        span_a,
+        span_b_line,
     )
 
 
@@ -140,14 +258,17 @@ def obv(
     volumes: list[float],
 ) -> list[Optional[float]]:
     """On-Balance Volume. Returns cumulative volume."""
+    if not use_pandas_ta():
+        return _values(kernels.obv(kernels.as_array(closes), kernels.as_array(volumes)))
     n = len(closes)
-    return from_series(ta.obv(to_series(closes), to_series(volumes)), n)
+    return from_series(_ta().obv(to_series(closes), to_series(volumes)), n)
 
 
 def fibonacci_retracements(
     highs: list[float],
     lows: list[float],
     lookback: int = 50,
+    outputs: Optional[Collection[str]] = None,
 ) -> tuple[
     list[Optional[float]],  # 0.236
     list[Optional[float]],  # 0.382
@@ -155,44 +276,12 @@ def fibonacci_retracements(
     list[Optional[float]],  # 0.618
     list[Optional[float]],  # 0.786
 ]:
-    """Fibonacci Retracements. Returns 5 fixed retracement levels."""
-    n = len(highs)
-
-    level_236: list[Optional[float]] = []
-    level_382: list[Optional[float]] = []
-    level_5: list[Optional[float]] = []
-    level_618: list[Optional[float]] = []
-    level_786: list[Optional[float]] = []
-
-    for i in range(n):
-        if i < lookback - 1:
-            level_236.append(None)
-            level_382.append(None)
-            level_5.append(None)
-            level_618.append(None)
-            level_786.append(None)
-        else:
-            window_highs = highs[i - lookback + 1 : i + 1]
-            window_lows = lows[i - lookback + 1 : i + 1]
-
-            highest = max(window_highs)
-            lowest = min(window_lows)
-            range_val = highest - lowest
-
-            if range_val == 0:
-                level_236.append(lowest)
-                level_382.append(lowest)
-                level_5.append(lowest)
-                level_618.append(lowest)
-                level_786.append(lowest)
-            else:
-                level_236.append(highest - range_val * 0.236)
-                level_382.append(highest - range_val * 0.382)
-                level_5.append(highest - range_val * 0.5)
-                level_618.append(highest - range_val * 0.618)
-                level_786.append(highest - range_val * 0.786)
-
-    return level_236, level_382, level_5, level_618, level_786
+    """Fibonacci Retracements. Returns 5 fixed retracement levels.
+
+    outputs: level_236, level_382, level_5, level_618, level_786.
+    """
+    lines = kernels.fibonacci(kernels.as_array(highs), kernels.as_array(lows), lookback, outputs)
+    return _kernel_lines(dict(zip(kernels.FIBONACCI_RATIOS, lines)), outputs)
 
 
 def price_variation_pct(closes: list[float]) -> list[Optional[float]]:
@@ -1,23 +1,49 @@
 """Strategy interpreter: parse blocks and compute signals."""
-from dataclasses import dataclass
-from typing import Any, Optional
+from dataclasses import dataclass, fields
+from typing import Optional, Sequence, Union
+
+import numpy as np
 
 from app.models.candle import Candle
-from app.backtest.errors import StrategyInvalidError
+from app.backtest.candle_frame import CandleFrame, as_candle_frame
 from app.backtest.catalogue import lookup as catalogue_lookup
-from app.backtest.catalogue.types import BlockContext
+from app.backtest.catalogue.types import ArrayContext, SeriesArray, compute_arrays
+from app.backtest.execution_plan import (
+    CACHEABLE_CATEGORIES,
+    ExecutionPlan,
+    normalized_params,
+    output_of,
+    params_key,
+    plan_for,
+)
+from app.backtest.indicator_cache import (
+    IndicatorCache,
+    compute_period_batches,
+    read_through,
+    shared_indicator_cache,
+)
 from app.backtest.types import TakeProfitLevel, ValidatedStrategy  # noqa: F401  (re-exported for backward compat)
 
-_ENTRY_SIGNAL_TYPES: frozenset[str] = frozenset({"entry_signal"})
-_EXIT_SIGNAL_TYPES: frozenset[str] = frozenset({"exit_signal"})
+
+def indicator_cache_key(block: dict) -> Optional[tuple[str, str]]:
+    """Return the IndicatorCache key prefix for ``block``, or None if it is not shareable."""
+    handler = catalogue_lookup(block["type"])
+    if handler is None or handler.spec.category not in CACHEABLE_CATEGORIES:
+        return None
+    return block["type"], params_key(normalized_params(handler.spec, block.get("params", {})))
 
 
-@dataclass
+@dataclass(eq=False)
 class StrategySignals:
-    """Output of strategy interpretation."""
+    """Output of strategy interpretation.
+
+    ``entry_long`` and ``exit_long`` are boolean arrays with one flag per
+    candle (the Engine also accepts plain lists); equality compares them
+    element-wise.
+    """
 
-    entry_long: list[bool]
-    exit_long: list[bool]
+    entry_long: np.ndarray
+    exit_long: np.ndarray
     position_size_pct: float
     take_profit_levels: Optional[list[TakeProfitLevel]]
     stop_loss_pct: Optional[float]
@@ -25,155 +51,132 @@ class StrategySignals:
     time_exit_bars: Optional[int] = None
     trailing_stop_pct: Optional[float] = None
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, StrategySignals):
+            return NotImplemented
+        return all(
+            np.array_equal(getattr(self, f.name), getattr(other, f.name))
+            if f.name in ("entry_long", "exit_long")
+            else getattr(self, f.name) == getattr(other, f.name)
+            for f in fields(self)
+        )
+
 
 def interpret_strategy(
     strategy: ValidatedStrategy,
-    candles: list[Candle],
+    candles: Union[CandleFrame, Sequence[Candle]],
+    indicator_cache: Optional[IndicatorCache] = None,
 ) -> StrategySignals:
     """
     Compute indicators and evaluate logic blocks from a pre-validated strategy,
     returning entry/exit signals for each candle.
+
+    ``indicator_cache`` lets callers that evaluate many strategy variants over
+    the SAME candles (parameter sweeps) share input/indicator block outputs
+    keyed by block type, params and port. Cached series are treated as
+    read-only.
+
+    Without one, indicator outputs are read through the process-wide
+    cross-run cache (see indicator_cache).
+
+    The block graph is compiled once per definition (see execution_plan).
     """
-    blocks = strategy.blocks
-    connections = strategy.connections
-
-    if not blocks:
-        raise StrategyInvalidError("Strategy has no blocks", "Invalid strategy: no blocks defined.")
-
-    # Build block lookup
-    block_map = {b["id"]: b for b in blocks}
-
-    # Build connection graph: to_block_id -> {port -> (from_block_id, from_port)}
-    # Connections are already normalized to from_port/to_port format.
-    input_map: dict[str, dict[str, tuple[str, str]]] = {}
-    for conn in connections:
-        from_block = conn["from_port"]["block_id"]
-        from_port = conn["from_port"]["port"]
-        to_block = conn["to_port"]["block_id"]
-        to_port = conn["to_port"]["port"]
-
-        if to_block not in input_map:
-            input_map[to_block] = {}
-        input_map[to_block][to_port] = (from_block, from_port)
-
-    # Extract candle data arrays
-    n = len(candles)
-    opens = [c.open for c in candles]
-    highs = [c.high for c in candles]
-    lows = [c.low for c in candles]
-    closes = [c.close for c in candles]
-    volumes = [c.volume for c in candles]
-
-    # Previous close: None for first candle, then close[t-1]
-    prev_closes = [None] + closes[:-1]
-
-    candle_data = {
-        "open": opens,
-        "high": highs,
-        "low": lows,
-        "close": closes,
-        "prev_close": prev_closes,
-        "volume": volumes,
-    }
-
-    # Compute all block outputs using topological evaluation
-    block_outputs: dict[str, dict[str, list[Any]]] = {}
-
-    def get_block_output(block_id: str, port: str = "output") -> list[Any]:
-        """Recursively compute block output."""
-        if block_id in block_outputs and port in block_outputs[block_id]:
-            return block_outputs[block_id][port]
-
-        block = block_map.get(block_id)
-        if not block:
-            raise StrategyInvalidError(
-                f"Block not found: {block_id}",
-                "Invalid strategy: missing block reference.",
-            )
-
-        block_type = block["type"]
-        params = block.get("params", {})
-
-        # Get inputs for this block
-        inputs = input_map.get(block_id, {})
-
-        if block_id not in block_outputs:
-            block_outputs[block_id] = {}
-
-        # Evaluate based on block type
-        if (catalogue_handler := catalogue_lookup(block_type)) is not None:
-            resolved_inputs = {
-                port: get_block_output(*src)
-                for port, src in inputs.items()
-            }
-            ctx = BlockContext(candle_data=candle_data, params=params, inputs=resolved_inputs, n=n)
-            block_outputs[block_id] = catalogue_handler.compute(ctx)
-
-        elif block_type in ("position_size", "take_profit", "stop_loss", "max_drawdown", "time_exit", "trailing_stop"):
+    frame = as_candle_frame(candles)
+    if indicator_cache is None:
+        indicator_cache = shared_indicator_cache().view(frame)
+    return execute_plan(plan_for(strategy), frame, indicator_cache)
+
+
+@dataclass(frozen=True)
+class PlanOutputs:
+    """Every step's output series from one run of a plan, addressable by any block id it covers."""
+
+    plan: ExecutionPlan
+    outputs: dict[str, dict[str, SeriesArray]]  # step block_id -> port -> series
+    n: int
+
+    def series(self, block_id: str, port: str = "output") -> SeriesArray:
+        """``port`` of ``block_id``; unreachable blocks and unknown ports have no valid bar."""
+        step_id = self.plan.step_ids.get(block_id)
+        if step_id is None:
+            return _invalid(self.n)
+        return output_of(self.outputs[step_id], port, _invalid(self.n))
+
+    def is_true(self, block_id: str, idx: int) -> bool:
+        """Whether ``block_id``'s output is valid and truthy at bar ``idx``."""
+        if not 0 <= idx < self.n:
+            return False
+        series = self.series(block_id)
+        return bool(series.valid[idx] and series.values[idx])
+
+
+def evaluate_plan(
+    plan: ExecutionPlan,
+    frame: CandleFrame,
+    indicator_cache: Optional[IndicatorCache] = None,
+) -> PlanOutputs:
+    """Run a compiled plan's steps in order over ``frame``, keeping every step's outputs."""
+    # Candle columns are shared zero-copy with every handler via ArrayContext
+    n = len(frame)
+    candle_data = frame.candle_data()
+    if indicator_cache is not None:
+        # e.g. an SMA(20)/SMA(50) crossover: both periods in one pass
+        compute_period_batches(
+            indicator_cache, frame, ((step.block_type, step.params) for step in plan.steps if step.cache_key)
+        )
+
+    block_outputs: dict[str, dict[str, SeriesArray]] = {}
+    for step in plan.steps:
+        if step.handler is None:
             # Risk blocks don't produce time series output
-            block_outputs[block_id]["output"] = [None] * n
+            block_outputs[step.block_id] = {"output": _invalid(n)}
+            continue
 
+        resolved_inputs = {
+            port: output_of(block_outputs[source_id], source_port, _invalid(n))
+            for port, source_id, source_port in step.inputs
+        }
+
+        def run(ports: frozenset[str], step=step, inputs=resolved_inputs) -> dict[str, SeriesArray]:
+            ctx = ArrayContext(candle_data=candle_data, params=step.params, inputs=inputs, n=n, ports=ports)
+            return compute_arrays(step.handler, ctx)
+
+        if step.cache_key is not None and indicator_cache is not None:
+            block_outputs[step.block_id] = read_through(indicator_cache, step.cache_key, step.ports, run)
         else:
-            raise StrategyInvalidError(
-                f"Unknown block type: {block_type}",
-                f"Invalid strategy: unsupported block type '{block_type}'.",
-            )
-
-        return block_outputs[block_id].get(port, block_outputs[block_id].get("output", [None] * n))
-
-    # Find entry and exit signal blocks
-    entry_blocks = []
-    exit_blocks = []
-    for block in blocks:
-        block_type = block["type"]
-        if block_type in _ENTRY_SIGNAL_TYPES:
-            entry_blocks.append(block["id"])
-        elif block_type in _EXIT_SIGNAL_TYPES:
-            exit_blocks.append(block["id"])
-
-    # Read risk parameters from pre-extracted ValidatedStrategy risk_params
-    risk = strategy.risk_params
-    position_size_pct = risk.position_size_pct
-    take_profit_levels: Optional[list[TakeProfitLevel]] = (
-        list(risk.take_profit_levels) if risk.take_profit_levels else None
-    )
-    stop_loss_pct = risk.stop_loss_pct
-    max_drawdown_pct = risk.max_drawdown_pct
-    time_exit_bars = risk.time_exit_bars
-    trailing_stop_pct = risk.trailing_stop_pct
-
-    # Compute OR of all entry signals
-    entry_signals_list = [get_block_output(block_id) for block_id in entry_blocks]
-    entry_signals = [False] * n
-    if entry_signals_list:
-        for i in range(n):
-            entry_signals[i] = any(_to_bool(signals[i]) for signals in entry_signals_list)
-
-    # Compute OR of all exit signals
-    exit_signals_list = [get_block_output(block_id) for block_id in exit_blocks]
-    exit_signals = [False] * n
-    if exit_signals_list:
-        for i in range(n):
-            exit_signals[i] = any(_to_bool(signals[i]) for signals in exit_signals_list)
+            block_outputs[step.block_id] = run(step.ports)
+
+    return PlanOutputs(plan=plan, outputs=block_outputs, n=n)
 
+
+def execute_plan(
+    plan: ExecutionPlan,
+    frame: CandleFrame,
+    indicator_cache: Optional[IndicatorCache] = None,
+) -> StrategySignals:
+    """Run a compiled plan's steps in order over ``frame`` and OR its signals."""
+    outputs = evaluate_plan(plan, frame, indicator_cache)
+    n = outputs.n
+    risk = plan.risk_params
     return StrategySignals(
-        entry_long=entry_signals,
-        exit_long=exit_signals,
-        position_size_pct=position_size_pct,
-        take_profit_levels=take_profit_levels,
-        stop_loss_pct=stop_loss_pct,
-        max_drawdown_pct=max_drawdown_pct,
-        time_exit_bars=time_exit_bars,
-        trailing_stop_pct=trailing_stop_pct,
+        entry_long=_any_signal([outputs.series(b) for b in plan.entry_outputs], n),
+        exit_long=_any_signal([outputs.series(b) for b in plan.exit_outputs], n),
+        position_size_pct=risk.position_size_pct,
+        take_profit_levels=list(risk.take_profit_levels) if risk.take_profit_levels else None,
+        stop_loss_pct=risk.stop_loss_pct,
+        max_drawdown_pct=risk.max_drawdown_pct,
+        time_exit_bars=risk.time_exit_bars,
+        trailing_stop_pct=risk.trailing_stop_pct,
     )
 
 
-def _to_bool(value: Any) -> bool:
-    """Convert value to boolean."""
-    if value is None:
-        return False
-    if isinstance(value, bool):
-        return value
-    if isinstance(value, (int, float)):
-        return value != 0
-    return bool(value)
+def _invalid(n: int) -> SeriesArray:
+    """A series with no valid bar (risk blocks, unknown ports)."""
+    return SeriesArray(np.full(n, np.nan), np.zeros(n, dtype=bool))
+
+
+def _any_signal(series: list[SeriesArray], n: int) -> np.ndarray:
+    """Per-bar OR of signal series."""
+    if not series:
+        return np.zeros(n, dtype=bool)
+    return np.logical_or.reduce([s.truthy() for s in series])
@@ -0,0 +1,292 @@
+"""Vectorised risk and benchmark metrics over equity arrays.
+
+Every function takes float arrays (equity values, benchmark values, trade
+PnLs) and works in whole-array NumPy passes. Scalar metrics are returned
+unrounded; the Engine's ``compute_risk_metrics`` / ``compute_benchmark_metrics``
+wrappers apply the 2-decimal rounding persisted on the run row.
+
+Definitions mirror the historical pure-Python implementations exactly:
+population (ddof=0) variance, Sortino downside deviation over *all* periods,
+returns skipped where the previous equity is not positive.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from app.backtest.indicator_kernels import rolling_extreme
+
+# Timeframe to periods-per-year mapping used to annualise per-bar returns.
+PERIODS_PER_YEAR: dict[str, float] = {
+    "1h": 365.25 * 24,  # 8766 hours/year
+    "4h": 365.25 * 6,   # 2191.5 periods/year
+    "1d": 365.25,       # 365.25 days/year
+}
+
+
+def annualization_factor(timeframe: str) -> float:
+    return PERIODS_PER_YEAR.get(timeframe, 365.25)
+
+
+def as_float_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+# ---------------------------------------------------------------------------
+# Returns
+# ---------------------------------------------------------------------------
+
+
+def period_returns(equity: np.ndarray) -> np.ndarray:
+    """Simple per-bar returns, dropping bars whose previous equity is <= 0."""
+    equity = as_float_array(equity)
+    if equity.size < 2:
+        return np.empty(0)
+    prev = equity[:-1]
+    curr = equity[1:]
+    valid = prev > 0
+    return (curr[valid] - prev[valid]) / prev[valid]
+
+
+def ratio_returns(values: np.ndarray) -> np.ndarray:
+    """``values[i] / values[i-1] - 1`` for every bar (the beta return definition)."""
+    values = as_float_array(values)
+    if values.size < 2:
+        return np.empty(0)
+    return values[1:] / values[:-1] - 1
+
+
+# ---------------------------------------------------------------------------
+# Scalar metrics
+# ---------------------------------------------------------------------------
+
+
+def sharpe_ratio(returns: np.ndarray, periods_per_year: float) -> float:
+    """Annualised Sharpe ratio (risk-free rate 0); 0.0 when undefined."""
+    if returns.size == 0:
+        return 0.0
+    mean_return = returns.mean()
+    std_dev = np.sqrt(np.mean((returns - mean_return) ** 2))
+    if std_dev <= 0:
+        return 0.0
+    return float((mean_return * periods_per_year) / (std_dev * periods_per_year ** 0.5))
+
+
+def sortino_ratio(returns: np.ndarray, periods_per_year: float) -> float:
+    """Annualised Sortino ratio; downside deviation is averaged over all periods."""
+    if returns.size == 0:
+        return 0.0
+    negative = returns[returns < 0]
+    if negative.size == 0:
+        return 0.0
+    downside_dev = np.sqrt(np.sum(negative ** 2) / returns.size)
+    if downside_dev <= 0:
+        return 0.0
+    mean_return = returns.mean()
+    return float((mean_return * periods_per_year) / (downside_dev * periods_per_year ** 0.5))
+
+
+def calmar_ratio(cagr_pct: float, max_drawdown_pct: float) -> float:
+    if max_drawdown_pct > 0:
+        return cagr_pct / max_drawdown_pct
+    return 0.0
+
+
+def max_consecutive_losses(pnls: np.ndarray) -> int:
+    """Longest run of strictly negative PnL values."""
+    losses = as_float_array(pnls) < 0
+    if not losses.any():
+        return 0
+    # Run lengths of True: distance between the boundaries of each loss streak.
+    padded = np.concatenate(([False], losses, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return int((edges[1::2] - edges[::2]).max())
+
+
+def beta(strategy_equity: np.ndarray, benchmark_equity: np.ndarray) -> float:
+    """Population beta of strategy vs benchmark per-bar returns; 0.0 when undefined."""
+    strategy_equity = as_float_array(strategy_equity)
+    benchmark_equity = as_float_array(benchmark_equity)
+    if strategy_equity.size < 2 or benchmark_equity.size < 2:
+        return 0.0
+    m = min(strategy_equity.size, benchmark_equity.size)
+    s_ret = ratio_returns(strategy_equity[:m])
+    b_ret = ratio_returns(benchmark_equity[:m])
+    s_dev = s_ret - s_ret.mean()
+    b_dev = b_ret - b_ret.mean()
+    covariance = np.mean(s_dev * b_dev)
+    variance = np.mean(b_dev ** 2)
+    return float(covariance / variance) if variance > 0 else 0.0
+
+
+def total_return_pct(equity: np.ndarray, initial_balance: float) -> float:
+    return float((equity[-1] - initial_balance) / initial_balance * 100)
+
+
+def alpha(strategy_equity: np.ndarray, benchmark_equity: np.ndarray, initial_balance: float) -> float:
+    """Excess total return (percentage points) of strategy over benchmark."""
+    return total_return_pct(as_float_array(strategy_equity), initial_balance) - total_return_pct(
+        as_float_array(benchmark_equity), initial_balance
+    )
+
+
+# ---------------------------------------------------------------------------
+# Series metrics
+# ---------------------------------------------------------------------------
+
+
+def drawdown_series(equity: np.ndarray, initial_peak: float | None = None) -> np.ndarray:
+    """Percentage drawdown from the running peak at every bar.
+
+    ``initial_peak`` seeds the running maximum (the Engine seeds it with the
+    initial balance so a losing first bar already counts as drawdown).
+    """
+    equity = as_float_array(equity)
+    if equity.size == 0:
+        return np.empty(0)
+    peak = np.maximum.accumulate(equity)
+    if initial_peak is not None:
+        peak = np.maximum(peak, initial_peak)
+    return (peak - equity) / peak * 100
+
+
+def max_drawdown_pct(equity: np.ndarray, initial_peak: float | None = None) -> float:
+    dd = drawdown_series(equity, initial_peak)
+    return float(dd.max()) if dd.size else 0.0
+
+
+def _window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """Sum of each trailing ``window``-length slice, aligned to the slice end."""
+    csum = np.concatenate(([0.0], np.cumsum(values)))
+    return csum[window:] - csum[:-window]
+
+
+# Returns closer than this are equal up to the rounding of ``curr / prev - 1``
+_EQUAL_RETURNS_SPREAD = 1e-12
+
+
+def _pad_leading(values: np.ndarray, n: int) -> np.ndarray:
+    out = np.full(n, np.nan)
+    if values.size:
+        out[n - values.size:] = values
+    return out
+
+
+def _period_returns_at_ends(equity: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """``period_returns`` and, for each, the index of the equity bar it ends on."""
+    return period_returns(equity), np.flatnonzero(equity[:-1] > 0) + 1
+
+
+def _equal_returns(returns: np.ndarray, window: int) -> np.ndarray:
+    """Per window (aligned to its last return): are its returns equal up to rounding?"""
+    spread = rolling_extreme(returns, window, largest=True) - rolling_extreme(returns, window, largest=False)
+    return spread[window - 1:] <= _EQUAL_RETURNS_SPREAD
+
+
+def rolling_sharpe(equity: np.ndarray, window: int, periods_per_year: float) -> np.ndarray:
+    """Annualised Sharpe over each trailing window of ``window`` returns.
+
+    The returns are ``period_returns``, as for the scalar Sharpe, each aligned
+    to the bar it ends on; NaN during warm-up and where undefined. The
+    variance is ``E[r^2] - E[r]^2`` from window sums of returns centred on
+    their mean, which keeps the subtraction from cancelling, and a window
+    whose returns are equal up to rounding has none.
+    """
+    equity = as_float_array(equity)
+    out = np.full(equity.size, np.nan)
+    returns, ends = _period_returns_at_ends(equity)
+    if window < 1 or returns.size < window:
+        return out
+    centre = returns.mean()
+    centred = returns - centre
+    mean = _window_sums(centred, window) / window
+    variance = np.maximum(_window_sums(centred * centred, window) / window - mean * mean, 0.0)
+    variance[_equal_returns(returns, window)] = 0.0
+    std = np.sqrt(variance)
+    mean = mean + centre
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(std > 0, mean * periods_per_year / (std * periods_per_year ** 0.5), np.nan)
+    out[ends[window - 1:]] = ratio
+    return out
+
+
+def rolling_sortino(equity: np.ndarray, window: int, periods_per_year: float) -> np.ndarray:
+    """Annualised Sortino over each trailing window of ``window`` returns.
+
+    Built on ``period_returns`` like the scalar Sortino and aligned like
+    ``rolling_sharpe``, so a non-positive equity bar drops one return instead
+    of poisoning every later window.
+    """
+    equity = as_float_array(equity)
+    out = np.full(equity.size, np.nan)
+    returns, ends = _period_returns_at_ends(equity)
+    if window < 1 or returns.size < window:
+        return out
+    mean = _window_sums(returns, window) / window
+    downside = np.sqrt(_window_sums(np.minimum(returns, 0.0) ** 2, window) / window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(downside > 0, mean * periods_per_year / (downside * periods_per_year ** 0.5), np.nan)
+    out[ends[window - 1:]] = ratio
+    return out
+
+
+def rolling_beta(strategy_equity: np.ndarray, benchmark_equity: np.ndarray, window: int) -> np.ndarray:
+    """Population beta over each trailing window of ``window`` returns.
+
+    Same returns as the scalar ``beta``. Both series are centred before the
+    window sums, as in ``rolling_sharpe``; a window whose benchmark returns
+    are equal up to rounding has no beta (NaN).
+    """
+    strategy_equity = as_float_array(strategy_equity)
+    benchmark_equity = as_float_array(benchmark_equity)
+    m = min(strategy_equity.size, benchmark_equity.size)
+    s_ret = ratio_returns(strategy_equity[:m])
+    b_ret = ratio_returns(benchmark_equity[:m])
+    if window < 1 or s_ret.size < window:
+        return np.full(m, np.nan)
+    s_dev = s_ret - s_ret.mean()
+    b_dev = b_ret - b_ret.mean()
+    mean_s = _window_sums(s_dev, window) / window
+    mean_b = _window_sums(b_dev, window) / window
+    covariance = _window_sums(s_dev * b_dev, window) / window - mean_s * mean_b
+    variance = np.maximum(_window_sums(b_dev * b_dev, window) / window - mean_b * mean_b, 0.0)
+    variance[_equal_returns(b_ret, window)] = 0.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(variance > 0, covariance / variance, np.nan)
+    return _pad_leading(ratio, m)
+
+
+def rolling_max_drawdown(equity: np.ndarray, window: int) -> np.ndarray:
+    """Worst peak-to-trough drawdown (%) inside each trailing ``window`` bars, in O(n) memory.
+
+    Blocks of ``window`` bars, as in ``rolling_extreme``: a window that does
+    not start a block is the suffix of one block plus the prefix of the next.
+    Its worst drawdown is the worst of three: inside the suffix (a reverse
+    running max of each bar's fall to the lowest bar after it), inside the
+    prefix (a running max of the fall from the running peak), and from the
+    suffix's peak to the prefix's trough.
+    """
+    equity = as_float_array(equity)
+    n = equity.size
+    if window < 1 or n < window:
+        return np.full(n, np.nan)
+    pad = -n % window
+    blocks = np.pad(equity, (0, pad), mode="edge").reshape(-1, window)
+    flipped = blocks[:, ::-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Suffixes, indexed by their first bar
+        suffix_min = np.minimum.accumulate(flipped, axis=1)
+        suffix_max = np.maximum.accumulate(flipped, axis=1)[:, ::-1].ravel()
+        suffix_dd = np.maximum.accumulate((flipped - suffix_min) / flipped, axis=1)[:, ::-1].ravel()
+        # Prefixes, indexed by their last bar
+        peaks = np.maximum.accumulate(blocks, axis=1)
+        prefix_dd = np.maximum.accumulate((peaks - blocks) / peaks, axis=1).ravel()
+        prefix_min = np.minimum.accumulate(blocks, axis=1).ravel()
+
+        starts = np.arange(n - window + 1)
+        stops = starts + window - 1
+        across = (suffix_max[starts] - prefix_min[stops]) / suffix_max[starts]
+    worst = np.maximum(np.maximum(suffix_dd[starts], prefix_dd[stops]), across)
+    # A window that starts a block is that whole block: its suffix alone
+    aligned = starts % window == 0
+    worst[aligned] = suffix_dd[starts[aligned]]
+    return _pad_leading(worst * 100, n)
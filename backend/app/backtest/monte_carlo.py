@@ -0,0 +1,167 @@
+"""Monte Carlo robustness analysis over a completed run's trades.
+
+The run's trade sequence is re-ordered many times to see how much of its
+result is down to luck of ordering:
+
+- ``shuffle``   — every path is a permutation of the trades (same trades,
+  different order: final equity is fixed, drawdown and losing streaks vary);
+- ``bootstrap`` — every path draws the same number of trades with
+  replacement (final equity varies too).
+
+Trades are replayed as returns on the equity they were opened with, so paths
+compound like the original run. Every simulation is a whole-matrix NumPy
+pass (paths x trades); paths are only chunked to bound memory.
+
+Pure: takes position PnLs, returns percentiles. Documented in CONTEXT.md
+(term: Monte Carlo analysis).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+from app.backtest import metrics
+from app.backtest.errors import BacktestError
+from app.backtest.position_manager import Trade
+
+PERCENTILES: tuple[int, ...] = (5, 25, 50, 75, 95)
+METHODS: tuple[str, ...] = ("shuffle", "bootstrap")
+
+# Paths x trades cells simulated at once (~2 MB per float matrix): bounds
+# memory and keeps the row-wise accumulations cache-resident.
+_MAX_CELLS = 262_144
+
+
+@dataclass(frozen=True)
+class MonteCarloDistribution:
+    """Percentiles (keyed ``"p5"`` ... ``"p95"``) of one resampling method."""
+
+    method: str
+    final_equity: dict[str, float]
+    max_drawdown_pct: dict[str, float]
+    max_consecutive_losses: dict[str, float]
+    probability_of_loss: float  # share of paths ending below the initial balance
+
+
+@dataclass(frozen=True)
+class MonteCarloResult:
+    num_trades: int
+    num_simulations: int
+    shuffle: MonteCarloDistribution
+    bootstrap: MonteCarloDistribution
+
+
+def position_pnls(trades: Sequence[Trade]) -> list[float]:
+    """Net PnL of each position, in order.
+
+    Take-profit ladders close a position in several Trade records that share
+    its entry; they are summed so a position is resampled as one unit.
+    """
+    pnls: list[float] = []
+    entry = None
+    for trade in trades:
+        if pnls and (trade.entry_time, trade.entry_price) == entry:
+            pnls[-1] += trade.pnl
+        else:
+            pnls.append(trade.pnl)
+            entry = (trade.entry_time, trade.entry_price)
+    return pnls
+
+
+def trade_returns(pnls: Sequence[float], initial_balance: float) -> np.ndarray:
+    """Each position's PnL as a fraction of the equity it was opened with.
+
+    ``pnls`` are per position (see ``position_pnls``). Positions never
+    overlap, so the equity before position ``i`` is the initial balance plus
+    every earlier PnL. Positions opened on non-positive equity contribute a
+    zero return.
+    """
+    pnls = metrics.as_float_array(pnls)
+    equity_before = initial_balance + np.concatenate(([0.0], np.cumsum(pnls)[:-1]))
+    returns = np.zeros_like(pnls)
+    np.divide(pnls, equity_before, out=returns, where=equity_before > 0)
+    return returns
+
+
+def path_metrics(returns: np.ndarray, initial_balance: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Final equity, max drawdown (%) and longest losing streak of every row.
+
+    ``returns`` is a (paths, trades) matrix; each row is one trade sequence.
+    """
+    equity = initial_balance * np.cumprod(1.0 + returns, axis=1)
+    peak = np.maximum(np.maximum.accumulate(equity, axis=1), initial_balance)
+    max_drawdown = (1.0 - (equity / peak).min(axis=1)) * 100
+
+    # Losing streak length at every trade: distance to the last non-loss.
+    position = np.arange(1, returns.shape[1] + 1, dtype=np.int32)
+    last_win = np.maximum.accumulate(np.where(returns < 0, 0, position), axis=1)
+    max_losses = (position - last_win).max(axis=1)
+
+    return equity[:, -1], max_drawdown, max_losses
+
+
+def run_monte_carlo(
+    pnls: Sequence[float],
+    initial_balance: float,
+    num_simulations: int = 10_000,
+    seed: Optional[int] = None,
+) -> MonteCarloResult:
+    """Simulate ``num_simulations`` shuffled and bootstrapped paths.
+
+    Raises BacktestError when there are no trades, ValueError for a
+    non-positive simulation count. The same ``seed`` gives the same result.
+    """
+    if num_simulations < 1:
+        raise ValueError("num_simulations must be at least 1")
+    returns = trade_returns(pnls, initial_balance)
+    if not returns.size:
+        raise BacktestError(
+            "No trades to simulate",
+            "Monte Carlo analysis needs a run with at least one trade.",
+        )
+
+    rng = np.random.default_rng(seed)
+    return MonteCarloResult(
+        num_trades=int(returns.size),
+        num_simulations=num_simulations,
+        shuffle=_simulate("shuffle", returns, initial_balance, num_simulations, rng),
+        bootstrap=_simulate("bootstrap", returns, initial_balance, num_simulations, rng),
+    )
+
+
+def _simulate(
+    method: str,
+    returns: np.ndarray,
+    initial_balance: float,
+    num_simulations: int,
+    rng: np.random.Generator,
+) -> MonteCarloDistribution:
+    n = returns.size
+    rows_per_chunk = max(1, _MAX_CELLS // n)
+    final_equity, max_drawdown, max_losses = [], [], []
+    for start in range(0, num_simulations, rows_per_chunk):
+        rows = min(rows_per_chunk, num_simulations - start)
+        if method == "shuffle":
+            paths = rng.permuted(np.broadcast_to(returns, (rows, n)), axis=1)
+        else:
+            paths = returns[rng.integers(0, n, size=(rows, n))]
+        final, drawdown, losses = path_metrics(paths, initial_balance)
+        final_equity.append(final)
+        max_drawdown.append(drawdown)
+        max_losses.append(losses)
+
+    final = np.concatenate(final_equity)
+    return MonteCarloDistribution(
+        method=method,
+        final_equity=_percentiles(final),
+        max_drawdown_pct=_percentiles(np.concatenate(max_drawdown)),
+        max_consecutive_losses=_percentiles(np.concatenate(max_losses), method="lower"),
+        probability_of_loss=round(float(np.mean(final < initial_balance)), 4),
+    )
+
+
+def _percentiles(values: np.ndarray, method: str = "linear") -> dict[str, float]:
+    points = np.percentile(values, PERCENTILES, method=method)
+    return {f"p{q}": round(float(v), 2) for q, v in zip(PERCENTILES, points)}
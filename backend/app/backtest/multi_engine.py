@@ -0,0 +1,318 @@
+"""Multi-strategy Engine kernel — N strategies, one pass over the candles.
+
+``run_backtests`` simulates many strategies over the SAME candles (the
+nightly auto-update batch: same asset, timeframe and range) and returns the
+BacktestResult each separate ``run_backtest`` call would have returned,
+bit for bit.
+
+The per-strategy position state — the fields of ``PositionManager`` — is
+held struct-of-arrays in a ``PositionBook``: one NumPy vector per field,
+one slot per strategy. On every candle excursions, the full-exit checks
+(stop loss, trailing stop, max drawdown, time exit, signal — same priority
+as ``EXIT_PRIORITY_SEQUENCE``) and the take-profit ladder are evaluated for
+all strategies at once. Only the strategies that actually trade on a candle
+drop to Python to build their Trade records via ``_create_trade``, so every
+float goes through the exact operations of the single-strategy path.
+
+Documented in CONTEXT.md (term: Engine).
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Sequence, Union
+
+import numpy as np
+
+from app.backtest.candle_frame import CandleFrame, as_candle_frame
+from app.backtest.engine import BacktestResult, empty_result, summarize
+from app.backtest.interpreter import StrategySignals
+from app.backtest.position_manager import TPLevelState, Trade, _create_trade
+from app.models.candle import Candle
+
+RateArg = Union[float, Sequence[float]]
+
+_NO_EXIT, _SL, _TRAILING, _MAX_DD, _TIME, _SIGNAL = range(6)
+_REASONS = {_SL: "sl", _TRAILING: "trailing_stop", _MAX_DD: "max_dd", _TIME: "time_exit", _SIGNAL: "signal"}
+
+
+def _optional(values: Sequence) -> np.ndarray:
+    """Float vector with NaN for None (NaN compares False, like a None guard)."""
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+class PositionBook:
+    """Struct-of-arrays position state for N strategies, one slot each.
+
+    Mirrors ``PositionManager`` field for field; ``None`` thresholds are NaN,
+    missing timestamps are index -1 and the TP ladder is padded to the longest
+    ladder with ``+inf`` prices. Same deliberate mutability exception as
+    PositionManager: private to ``run_backtests``, never aliased.
+    """
+
+    def __init__(self, signals: Sequence[StrategySignals], fee_rate: np.ndarray,
+                 slippage_rate: np.ndarray, spread_rate: np.ndarray) -> None:
+        n = len(signals)
+        self.fee_rate = fee_rate
+        self.slippage_rate = slippage_rate
+        self.spread_rate = spread_rate
+
+        # Static per-strategy risk configuration
+        self.position_size_pct = np.array([s.position_size_pct for s in signals], dtype=np.float64)
+        self.stop_loss_pct = _optional([s.stop_loss_pct for s in signals])
+        self.max_dd_threshold = _optional([s.max_drawdown_pct for s in signals])
+        self.time_exit_threshold = _optional([s.time_exit_bars for s in signals])
+        self.trailing_stop_threshold = _optional([s.trailing_stop_pct for s in signals])
+        ladders = [s.take_profit_levels or [] for s in signals]
+        width = max((len(ladder) for ladder in ladders), default=0)
+        self.tp_profit_pct = np.full((n, width), np.inf)
+        self.tp_close_pct = np.zeros((n, width), dtype=np.int64)
+        # Ladder slots in ascending profit_pct order (stable, like sorted()); -1 pads.
+        self.tp_order = np.full((n, width), -1, dtype=np.int64)
+        for s, ladder in enumerate(ladders):
+            for k, level in enumerate(ladder):
+                self.tp_profit_pct[s, k] = level.profit_pct
+                self.tp_close_pct[s, k] = level.close_pct
+            order = sorted(range(len(ladder)), key=lambda k: ladder[k].profit_pct)
+            self.tp_order[s, : len(order)] = order
+
+        # Per-position state
+        self.is_open = np.zeros(n, dtype=bool)
+        self.entry_price = np.zeros(n)
+        self.entry_index = np.full(n, -1, dtype=np.int64)
+        self.position_size = np.zeros(n)
+        self.initial_qty = np.zeros(n)
+        self.sl_price = np.full(n, np.nan)
+        self.tp_price = np.full((n, width), np.inf)
+        self.tp_triggered = np.zeros((n, width), dtype=bool)
+        self.peak_high = np.zeros(n)
+        self.peak_high_index = np.full(n, -1, dtype=np.int64)
+        self.trough_low = np.full(n, np.inf)
+        self.trough_low_index = np.full(n, -1, dtype=np.int64)
+        self.bars_in_trade = np.zeros(n, dtype=np.int64)
+        self.highest_close_since_entry = np.zeros(n)
+
+    def enter(self, mask: np.ndarray, price: np.ndarray, qty: np.ndarray, index: int) -> None:
+        """``PositionManager.enter`` for every strategy in ``mask``."""
+        self.is_open[mask] = True
+        self.entry_price[mask] = price[mask]
+        self.entry_index[mask] = index
+        self.position_size[mask] = qty[mask]
+        self.initial_qty[mask] = qty[mask]
+        self.peak_high[mask] = 0.0
+        self.peak_high_index[mask] = -1
+        self.trough_low[mask] = np.inf
+        self.trough_low_index[mask] = -1
+        self.bars_in_trade[mask] = 0
+        self.highest_close_since_entry[mask] = 0.0
+        self.tp_price[mask] = price[mask, None] * (1 + self.tp_profit_pct[mask] / 100)
+        self.tp_triggered[mask] = False
+        self.sl_price[mask] = price[mask] * (1 - self.stop_loss_pct[mask] / 100)
+
+    def update_excursions(self, high: float, low: float, close: float, index: int) -> None:
+        """``PositionManager.update_excursions`` for every open strategy."""
+        is_open = self.is_open
+        self.bars_in_trade[is_open] += 1
+        np.copyto(self.highest_close_since_entry, close,
+                  where=is_open & (close > self.highest_close_since_entry))
+        peak = is_open & (high > self.peak_high)
+        self.peak_high[peak] = high
+        self.peak_high_index[peak] = index
+        trough = is_open & (low < self.trough_low)
+        self.trough_low[trough] = low
+        self.trough_low_index[trough] = index
+
+    def full_exits(self, low: float, close: float, index: int, exit_signal: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """First full-exit condition per strategy, in ``EXIT_PRIORITY_SEQUENCE`` order.
+
+        Returns ``(reason, exit_price_raw)``; reason is ``_NO_EXIT`` for
+        strategies that are flat, on their entry candle, or stay in.
+        """
+        eligible = self.is_open & (index > self.entry_index)
+        trailing_price = self.highest_close_since_entry * (1 - self.trailing_stop_threshold / 100)
+        with np.errstate(divide="ignore", invalid="ignore"):  # flat slots have entry_price 0
+            trade_drawdown = (self.entry_price - close) / self.entry_price * 100
+        conditions = [
+            eligible & (low <= self.sl_price),
+            eligible & (low <= trailing_price),
+            eligible & (trade_drawdown >= self.max_dd_threshold),
+            eligible & (self.bars_in_trade >= self.time_exit_threshold),
+            eligible & exit_signal,
+        ]
+        reason = np.select(conditions, [_SL, _TRAILING, _MAX_DD, _TIME, _SIGNAL], default=_NO_EXIT)
+        price = np.select(conditions[:2], [self.sl_price, trailing_price], default=close)
+        return reason, price
+
+    def ladder_partials(self, high: float, candidates: np.ndarray) -> list[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """``apply_take_profit_ladder`` for every strategy in ``candidates``.
+
+        Returns one ``(hit_mask, level_index, qty)`` triple per ladder rank, in
+        ascending profit order — the order the partials are realised in.
+        """
+        rows = np.arange(self.is_open.size)
+        running = self.position_size.copy()
+        active = candidates.copy()
+        steps = []
+        for rank in range(self.tp_order.shape[1]):
+            level = self.tp_order[:, rank]
+            slot = np.maximum(level, 0)
+            hit = (active & (level >= 0) & ~self.tp_triggered[rows, slot]
+                   & ~(high < self.tp_price[rows, slot]))
+            if not hit.any():
+                continue
+            qty = np.minimum(self.initial_qty * self.tp_close_pct[rows, slot] / 100, running)
+            active &= ~(hit & (qty <= 0))
+            take = hit & (qty > 0)
+            running[take] -= qty[take]
+            active &= ~(take & (running <= 0))
+            steps.append((take, level, qty))
+        return steps
+
+    def realize(self, s: int, qty: float, price: float, reason: str, stamps: list[datetime], index: int) -> Trade:
+        """Build the Trade for ``qty`` of strategy ``s`` exiting at ``price`` on candle ``index``."""
+        ladder = [
+            TPLevelState(profit_pct=0.0, close_pct=0, price=float(self.tp_price[s, k]))
+            for k in range(int((self.tp_order[s] >= 0).sum()))
+        ]
+        peak_index = int(self.peak_high_index[s])
+        trough_index = int(self.trough_low_index[s])
+        trade, _ = _create_trade(
+            qty=qty,
+            exit_price_raw=price,
+            exit_reason=reason,
+            entry_price=float(self.entry_price[s]),
+            entry_time=stamps[self.entry_index[s]],
+            exit_timestamp=stamps[index],
+            sl_price=None if np.isnan(self.sl_price[s]) else float(self.sl_price[s]),
+            tp_levels=ladder,
+            peak_high=float(self.peak_high[s]),
+            peak_high_ts=stamps[peak_index] if peak_index >= 0 else None,
+            trough_low=float(self.trough_low[s]),
+            trough_low_ts=stamps[trough_index] if trough_index >= 0 else None,
+            slippage_rate=float(self.slippage_rate[s]),
+            fee_rate=float(self.fee_rate[s]),
+            spread_rate=float(self.spread_rate[s]),
+        )
+        return trade
+
+    def reset(self, s: int) -> None:
+        self.is_open[s] = False
+        self.position_size[s] = 0.0
+        self.initial_qty[s] = 0.0
+        self.entry_price[s] = 0.0
+        self.entry_index[s] = -1
+        self.sl_price[s] = np.nan
+
+
+def run_backtests(
+    candles: Union[CandleFrame, Sequence[Candle]],
+    signals: Sequence[StrategySignals],
+    initial_balance: RateArg,
+    fee_rate: RateArg,
+    slippage_rate: RateArg,
+    spread_rate: RateArg = 0.0002,
+    timeframe: str = "1d",
+) -> list[BacktestResult]:
+    """Simulate every strategy in ``signals`` over the same candles in one pass.
+
+    Balance and cost rates are either one value for all strategies or one
+    value per strategy. Result ``k`` equals ``run_backtest(candles,
+    signals[k], ...)`` with strategy ``k``'s balance and rates.
+    """
+    frame = as_candle_frame(candles)
+    count = len(signals)
+    balances, fees, slippages, spreads = (
+        np.broadcast_to(np.asarray(v, dtype=np.float64), (count,)).copy()
+        for v in (initial_balance, fee_rate, slippage_rate, spread_rate)
+    )
+    if not len(frame):
+        return [empty_result(float(b)) for b in balances]
+    if not count:
+        return []
+
+    n = len(frame)
+    entry_long = np.zeros((n, count), dtype=bool)
+    exit_long = np.zeros((n, count), dtype=bool)
+    for s, sig in enumerate(signals):
+        entry_long[: len(sig.entry_long[:n]), s] = sig.entry_long[:n]
+        exit_long[: len(sig.exit_long[:n]), s] = sig.exit_long[:n]
+
+    book = PositionBook(signals, fees, slippages, spreads)
+    equity = balances.copy()
+    trades: list[list[Trade]] = [[] for _ in range(count)]
+    curve = np.empty((n, count))
+    peak_equity = balances.copy()
+    max_drawdown = np.zeros(count)
+
+    opens = frame.open.tolist()
+    highs = frame.high.tolist()
+    lows = frame.low.tolist()
+    closes = frame.close.tolist()
+    stamps = [frame.timestamp_at(i) for i in range(n)]
+
+    for i in range(n):
+        if book.is_open.any():
+            book.update_excursions(highs[i], lows[i], closes[i], i)
+            reason, exit_price = book.full_exits(lows[i], closes[i], i, exit_long[i])
+            full = reason != _NO_EXIT
+            steps = book.ladder_partials(highs[i], book.is_open & (i > book.entry_index) & ~full)
+
+            for take, level, qty in steps:
+                for s in np.flatnonzero(take).tolist():
+                    if not book.is_open[s]:
+                        continue
+                    k = int(level[s])
+                    trade = book.realize(s, float(qty[s]), float(book.tp_price[s, k]), "tp", stamps, i)
+                    trades[s].append(trade)
+                    equity[s] += trade.pnl
+                    book.position_size[s] -= qty[s]
+                    book.tp_triggered[s, k] = True
+                    if book.position_size[s] <= 0:
+                        book.reset(s)
+
+            for s in np.flatnonzero(full).tolist():
+                trade = book.realize(
+                    s, float(book.position_size[s]), float(exit_price[s]), _REASONS[int(reason[s])], stamps, i
+                )
+                trades[s].append(trade)
+                equity[s] += trade.pnl
+                book.reset(s)
+
+        # Entry signal on candle i means we enter at candle i+1 open
+        if i + 1 < n:
+            entering = ~book.is_open & entry_long[i]
+            if entering.any():
+                effective_entry = opens[i + 1] * (1 + slippages) * (1 + fees) * (1 + spreads / 2)
+                qty = equity * (book.position_size_pct / 100) / effective_entry
+                book.enter(entering, effective_entry, qty, i + 1)
+
+        current = np.where(book.is_open, equity + (closes[i] - book.entry_price) * book.position_size, equity)
+        curve[i] = current
+        np.maximum(peak_equity, current, out=peak_equity)
+        np.maximum(max_drawdown, (peak_equity - current) / peak_equity * 100, out=max_drawdown)
+
+    iso_timestamps = frame.iso_timestamps()
+    results = []
+    for s in range(count):
+        equity_curve = [
+            {"timestamp": ts, "equity": round(value, 2)}
+            for ts, value in zip(iso_timestamps, curve[:, s].tolist())
+        ]
+        # Force-close any open position at end of data
+        if book.is_open[s]:
+            trade = book.realize(s, float(book.position_size[s]), closes[-1], "end_of_data", stamps, n - 1)
+            trades[s].append(trade)
+            equity[s] += trade.pnl
+            book.reset(s)
+            equity_curve[-1]["equity"] = round(float(equity[s]), 2)
+        results.append(
+            summarize(
+                frame,
+                float(balances[s]),
+                float(equity[s]),
+                equity_curve,
+                trades[s],
+                float(max_drawdown[s]),
+                timeframe,
+            )
+        )
+    return results
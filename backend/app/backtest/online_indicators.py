@@ -0,0 +1,579 @@
+"""Online (incremental) indicators — the ``indicators`` module one candle at a time.
+
+Each class is the online form of a function in app/backtest/indicators.py.
+Feed it the candles of a series in order and ``update`` returns what that
+function returns for the last bar of the series so far — bit for bit with
+the pandas-ta backend, to rounding with the default NumPy kernels.
+``replay`` feeds a history; every candle after that costs O(1), so alerts
+and live signals never recompute years of history.
+
+Bit for bit means repeating pandas-ta's arithmetic operation for operation:
+- pandas' rolling mean keeps Kahan-compensated running sums (``RollingMean``);
+- ``ewm(adjust=False)`` renormalises every step by ``old_wt + new_wt`` (``Ewm``);
+- SMA seeds are taken with the same ``mean`` pandas-ta calls (``SeededEwm``);
+- rolling max/min are exact, so a monotonic deque (``RollingExtreme``) matches.
+
+One pandas-ta quirk is not causal. ``non_zero_range`` adds float epsilon to
+*every* bar's range once any bar of the series has a zero range, so a batch
+ATR, ADX or Stochastic rewrites its past when a flat candle arrives. The
+online forms add epsilon from the first zero-range bar on, and are exact on
+series without one.
+
+Block handlers expose these through ``init_state``/``update`` — see
+OnlineBlockHandler in catalogue/types.py.
+"""
+from __future__ import annotations
+
+import math
+import sys
+from collections import deque
+from typing import Iterable, Optional, Protocol
+
+import numpy as np
+
+from app.backtest.errors import StrategyInvalidError
+from app.backtest.indicator_kernels import FIBONACCI_RATIOS
+
+# pandas-ta's ``sflt.epsilon``
+_EPSILON = sys.float_info.epsilon
+_NAN = math.nan
+
+PRICE_SOURCES: tuple[str, ...] = ("open", "high", "low", "close", "prev_close", "volume")
+
+
+class CandleLike(Protocol):
+    """A ``Candle`` row or a CandleFrame ``Bar``."""
+
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+def _value(x: float) -> Optional[float]:
+    """The list contract: NaN becomes None."""
+    return None if x != x else x
+
+
+def _divide(a: float, b: float) -> float:
+    """``a / b`` with NumPy's semantics for a zero divisor (inf or NaN, no exception)."""
+    if b != 0:
+        return a / b
+    if a == 0 or a != a:
+        return _NAN
+    return math.copysign(math.inf, a) * math.copysign(1.0, b)
+
+
+def _rma_com(length: int) -> float:
+    """Centre of mass pandas derives from pandas-ta's Wilder ``alpha = 1 / length``."""
+    alpha = 1.0 / length
+    return (1 - alpha) / alpha
+
+
+# ── Building blocks ──────────────────────────────────────────────────────────
+
+
+class RollingMean:
+    """``Series.rolling(window).mean()``: pandas' compensated add/remove sums."""
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self._values: deque[float] = deque()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._values.clear()
+        self._nobs = 0
+        self._neg_ct = 0
+        self._sum = 0.0
+        self._add_compensation = 0.0
+        self._remove_compensation = 0.0
+        self._same_run = 0
+        self._prev = _NAN
+
+    def update(self, value: float) -> float:
+        # pandas restarts the sums whenever consecutive windows do not overlap
+        if self.window <= 1:
+            self._reset()
+        elif len(self._values) == self.window:
+            self._remove(self._values.popleft())
+        self._values.append(value)
+        self._add(value)
+
+        if self._nobs < self.window or self._nobs == 0:
+            return _NAN
+        if self._same_run >= self._nobs:
+            return self._prev
+        result = self._sum / self._nobs
+        if self._neg_ct == 0 and result < 0:
+            return 0.0
+        if self._neg_ct == self._nobs and result > 0:
+            return 0.0
+        return result
+
+    def _add(self, value: float) -> None:
+        if value != value:
+            return
+        self._nobs += 1
+        y = value - self._add_compensation
+        t = self._sum + y
+        self._add_compensation = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, value) < 0:
+            self._neg_ct += 1
+        # pandas returns the value itself for a window of one repeated value
+        self._same_run = self._same_run + 1 if value == self._prev else 1
+        self._prev = value
+
+    def _remove(self, value: float) -> None:
+        if value != value:
+            return
+        self._nobs -= 1
+        y = -value - self._remove_compensation
+        t = self._sum + y
+        self._remove_compensation = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, value) < 0:
+            self._neg_ct -= 1
+
+
+class RollingExtreme:
+    """``Series.rolling(window).max()`` (or ``.min()``) over a monotonic deque."""
+
+    def __init__(self, window: int, largest: bool) -> None:
+        self.window = window
+        self._largest = largest
+        self._candidates: deque[tuple[int, float]] = deque()
+        self._valid: deque[bool] = deque()
+        self._nobs = 0
+        self._i = 0
+
+    def update(self, value: float) -> float:
+        i = self._i
+        self._i += 1
+        if len(self._valid) == self.window:
+            self._nobs -= self._valid.popleft()
+        while self._candidates and self._candidates[0][0] <= i - self.window:
+            self._candidates.popleft()
+
+        observed = value == value
+        self._valid.append(observed)
+        if observed:
+            self._nobs += 1
+            while self._candidates and (
+                self._candidates[-1][1] <= value if self._largest else self._candidates[-1][1] >= value
+            ):
+                self._candidates.pop()
+            self._candidates.append((i, value))
+        return self._candidates[0][1] if self._nobs >= self.window else _NAN
+
+
+class Ewm:
+    """``Series.ewm(com=com, adjust=False).mean()``, one value at a time."""
+
+    def __init__(self, com: float) -> None:
+        alpha = 1.0 / (1.0 + com)
+        self._old_wt_factor = 1.0 - alpha
+        self._new_wt = alpha
+        self._old_wt = 1.0
+        self._weighted = _NAN
+
+    def update(self, value: float) -> float:
+        weighted = self._weighted
+        if weighted == weighted:
+            self._old_wt *= self._old_wt_factor
+            if value == value:
+                # pandas skips the update on a constant series to avoid drift
+                if weighted != value:
+                    weighted = self._old_wt * weighted + self._new_wt * value
+                    weighted /= self._old_wt + self._new_wt
+                    self._weighted = weighted
+                self._old_wt = 1.0
+        elif value == value:
+            self._weighted = value
+        return self._weighted
+
+
+class SeededEwm:
+    """pandas-ta's SMA-seeded ``ewm`` (``ema``, ``rma``): the mean of the first ``length`` values, then ``Ewm``."""
+
+    def __init__(self, length: int, com: float) -> None:
+        self._length = length
+        self._head: Optional[list[float]] = []
+        self._ewm = Ewm(com)
+
+    def update(self, value: float) -> float:
+        if self._head is None:
+            return self._ewm.update(value)
+        self._head.append(value)
+        if len(self._head) < self._length:
+            return _NAN
+        import pandas as pd  # once per state; kept out of module import
+
+        seed = float(pd.Series(self._head, dtype=float).mean())
+        self._head = None
+        return self._ewm.update(seed)
+
+
+class _AlignedEma:
+    """pandas-ta's MACD EMA: seeded with the mean of the ``period`` values up to bar ``seed_at``."""
+
+    def __init__(self, period: int, seed_at: int) -> None:
+        self._k = 2.0 / (period + 1)
+        self._seed_at = seed_at
+        self._window: Optional[deque[float]] = deque(maxlen=period)
+        self._i = 0
+        self._ema = _NAN
+
+    def update(self, value: float) -> float:
+        i = self._i
+        self._i += 1
+        if self._window is None:
+            self._ema = self._k * value + (1 - self._k) * self._ema
+            return self._ema
+        self._window.append(value)
+        if i < self._seed_at:
+            return _NAN
+        self._ema = float(np.array(self._window).mean())
+        self._window = None
+        return self._ema
+
+
+class _Shift:
+    """``Series.shift(periods)``."""
+
+    def __init__(self, periods: int) -> None:
+        self._values: deque[float] = deque(maxlen=periods + 1)
+
+    def update(self, value: float) -> float:
+        self._values.append(value)
+        return self._values[0] if len(self._values) == self._values.maxlen else _NAN
+
+
+class _Prices:
+    """One price source per candle; ``prev_close`` remembers the previous candle."""
+
+    def __init__(self, source: str) -> None:
+        if source not in PRICE_SOURCES:
+            raise StrategyInvalidError(
+                f"Unknown price source: {source!r}",
+                f"Invalid strategy: unknown price source '{source}'. Use one of: open, high, low, close, prev_close, volume.",
+            )
+        self._source = source
+        self._prev_close = _NAN
+
+    def __call__(self, candle: CandleLike) -> float:
+        if self._source == "prev_close":
+            value, self._prev_close = self._prev_close, float(candle.close)
+            return value
+        return float(getattr(candle, self._source))
+
+
+class _TrueRange:
+    """pandas-ta ``true_range`` (drift 1); NaN on the first bar."""
+
+    def __init__(self) -> None:
+        self._prev_close = _NAN
+        self._flat_seen = False
+
+    def update(self, candle: CandleLike) -> float:
+        high, low = float(candle.high), float(candle.low)
+        high_low = high - low
+        if high_low == 0:
+            self._flat_seen = True
+        if self._flat_seen:
+            high_low += _EPSILON
+        prev_close, self._prev_close = self._prev_close, float(candle.close)
+        if prev_close != prev_close:
+            return _NAN
+        return max(abs(high_low), abs(high - prev_close), abs(prev_close - low))
+
+
+# ── Indicators ───────────────────────────────────────────────────────────────
+
+
+class OnlineIndicator:
+    """Base of the online forms; ``update`` returns what its batch function returns."""
+
+    def update(self, candle: CandleLike):
+        raise NotImplementedError
+
+    def replay(self, history: Iterable[CandleLike]) -> "OnlineIndicator":
+        """Feed ``history`` in order; returns self, ready for the next candle."""
+        for candle in history:
+            self.update(candle)
+        return self
+
+
+class Sma(OnlineIndicator):
+    """``indicators.sma``."""
+
+    def __init__(self, period: int, source: str = "close") -> None:
+        self._price = _Prices(source)
+        self._mean = RollingMean(period if period > 0 else 10)
+
+    def update(self, candle: CandleLike) -> Optional[float]:
+        return _value(self._mean.update(self._price(candle)))
+
+
+class Ema(OnlineIndicator):
+    """``indicators.ema``."""
+
+    def __init__(self, period: int, source: str = "close") -> None:
+        length = period if period > 0 else 10
+        self._price = _Prices(source)
+        self._ema = SeededEwm(length, com=(length - 1) / 2)
+
+    def update(self, candle: CandleLike) -> Optional[float]:
+        return _value(self._ema.update(self._price(candle)))
+
+
+class Rsi(OnlineIndicator):
+    """``indicators.rsi``."""
+
+    def __init__(self, period: int, source: str = "close") -> None:
+        length = period if period > 0 else 14
+        self._price = _Prices(source)
+        self._gain = SeededEwm(length, _rma_com(length))
+        self._loss = SeededEwm(length, _rma_com(length))
+        self._prev = _NAN
+
+    def update(self, candle: CandleLike) -> Optional[float]:
+        price = self._price(candle)
+        change = price - self._prev
+        self._prev = price
+        gain = self._gain.update(0.0 if change < 0 else change)
+        loss = self._loss.update(0.0 if change > 0 else change)
+        return _value(_divide(100.0 * gain, gain + abs(loss)))
+
+
+class Atr(OnlineIndicator):
+    """``indicators.atr``."""
+
+    def __init__(self, period: int) -> None:
+        length = period if period > 0 else 14
+        self._true_range = _TrueRange()
+        self._rma = SeededEwm(length, _rma_com(length))
+
+    def update(self, candle: CandleLike) -> Optional[float]:
+        return _value(self._rma.update(self._true_range.update(candle)))
+
+
+class Obv(OnlineIndicator):
+    """``indicators.obv``."""
+
+    def __init__(self) -> None:
+        self._prev_close: Optional[float] = None
+        self._total = 0.0
+
+    def update(self, candle: CandleLike) -> Optional[float]:
+        close = float(candle.close)
+        if self._prev_close is None:
+            sign = 1.0
+        else:
+            change = close - self._prev_close
+            sign = 1.0 if change > 0 else -1.0 if change < 0 else change
+        self._prev_close = close
+        signed_volume = sign * float(candle.volume)
+        if signed_volume != signed_volume:
+            return None
+        self._total += signed_volume
+        return self._total
+
+
+class PriceVariationPct(OnlineIndicator):
+    """``indicators.price_variation_pct`` of the close."""
+
+    def __init__(self) -> None:
+        self._prev_close: Optional[float] = None
+
+    def update(self, candle: CandleLike) -> Optional[float]:
+        close, prev = float(candle.close), self._prev_close
+        self._prev_close = close
+        if prev is None or prev == 0:
+            return None
+        return _value(((close - prev) / prev) * 100)
+
+
+class Macd(OnlineIndicator):
+    """``indicators.macd``: (macd, signal, histogram)."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9, source: str = "close") -> None:
+        fast = fast if fast > 0 else 12
+        slow = slow if slow > 0 else 26
+        signal = signal if signal > 0 else 9
+        if slow < fast:
+            fast, slow = slow, fast
+        self._min_bars = max(fast, slow, signal)
+        self._bars = 0
+        self._price = _Prices(source)
+        self._fast = _AlignedEma(fast, seed_at=fast - 1)
+        self._slow = _AlignedEma(slow, seed_at=slow - 1)
+        self._signal = _AlignedEma(signal, seed_at=slow + signal - 2)
+
+    def update(self, candle: CandleLike) -> tuple[Optional[float], Optional[float], Optional[float]]:
+        self._bars += 1
+        price = self._price(candle)
+        macd_line = self._fast.update(price) - self._slow.update(price)
+        signal_line = self._signal.update(macd_line)
+        if self._bars < self._min_bars:
+            return None, None, None
+        return _value(macd_line), _value(signal_line), _value(macd_line - signal_line)
+
+
+class Bollinger(OnlineIndicator):
+    """``indicators.bollinger``: (upper, middle, lower).
+
+    The middle band is a running mean. The deviation is pandas-ta's two-pass
+    ``var`` over the window, which no running sum reproduces to the last
+    bit, so it costs O(period) in NumPy per candle.
+    """
+
+    def __init__(self, period: int = 20, std_dev: float = 2.0, source: str = "close") -> None:
+        length = period if period > 1 else 5
+        self._std = std_dev if std_dev > 0 else 2.0
+        self._price = _Prices(source)
+        self._middle = RollingMean(length)
+        self._window: deque[float] = deque(maxlen=length)
+
+    def update(self, candle: CandleLike) -> tuple[Optional[float], Optional[float], Optional[float]]:
+        price = self._price(candle)
+        middle = self._middle.update(price)
+        self._window.append(price)
+        if len(self._window) < self._window.maxlen:
+            return None, None, None
+        deviation = self._std * math.sqrt(np.array(self._window).var())
+        return _value(middle + deviation), _value(middle), _value(middle - deviation)
+
+
+class Stochastic(OnlineIndicator):
+    """``indicators.stochastic``: (%K, %D)."""
+
+    def __init__(self, k_period: int = 14, d_period: int = 3, smooth: int = 3) -> None:
+        self._min_bars = max(k_period, d_period, smooth)
+        self._d_period = d_period
+        self._smooth = smooth
+        self._bars = 0
+        self._highest = RollingExtreme(k_period, largest=True)
+        self._lowest = RollingExtreme(k_period, largest=False)
+        self._flat_seen = False
+        # pandas-ta smooths from the first valid value of each line on
+        self._k = RollingMean(smooth)
+        self._d = RollingMean(d_period)
+        self._raw_bars = 0
+        self._k_bars = 0
+
+    def update(self, candle: CandleLike) -> tuple[Optional[float], Optional[float]]:
+        self._bars += 1
+        highest = self._highest.update(float(candle.high))
+        lowest = self._lowest.update(float(candle.low))
+        spread = highest - lowest
+        if spread == 0:
+            self._flat_seen = True
+        if self._flat_seen:
+            spread += _EPSILON
+        raw = _divide(100 * (float(candle.close) - lowest), spread)
+
+        k_line = d_line = _NAN
+        if self._raw_bars or raw == raw:
+            self._raw_bars += 1
+            k_line = self._k.update(raw)
+            if self._k_bars or k_line == k_line:
+                self._k_bars += 1
+                d_line = self._d.update(k_line)
+        if self._bars < self._min_bars or self._raw_bars < self._smooth or self._k_bars < self._d_period:
+            return None, None
+        return _value(k_line), _value(d_line)
+
+
+class Adx(OnlineIndicator):
+    """``indicators.adx``: (adx, plus_di, minus_di)."""
+
+    def __init__(self, period: int = 14) -> None:
+        length = period if period > 0 else 14
+        self._length = length
+        self._bars = 0
+        self._true_range = _TrueRange()
+        self._atr = SeededEwm(length, _rma_com(length))
+        self._plus = SeededEwm(length, _rma_com(length))
+        self._minus = SeededEwm(length, _rma_com(length))
+        self._adx = SeededEwm(length, _rma_com(length))
+        self._prev_high = _NAN
+        self._prev_low = _NAN
+
+    @staticmethod
+    def _move(move: float, other: float) -> float:
+        directional = move if move > other and move > 0 else 0.0 * move
+        return 0.0 if abs(directional) < _EPSILON else directional
+
+    def update(self, candle: CandleLike) -> tuple[Optional[float], Optional[float], Optional[float]]:
+        self._bars += 1
+        high, low = float(candle.high), float(candle.low)
+        atr = self._atr.update(self._true_range.update(candle))
+        up = high - self._prev_high
+        down = self._prev_low - low
+        self._prev_high, self._prev_low = high, low
+
+        k = _divide(100.0, atr)
+        plus_di = k * self._plus.update(self._move(up, down))
+        minus_di = k * self._minus.update(self._move(down, up))
+        dx = _divide(100.0 * abs(plus_di - minus_di), plus_di + minus_di)
+        adx = self._adx.update(dx)
+        if self._bars < self._length:
+            return None, None, None
+        return _value(adx), _value(plus_di), _value(minus_di)
+
+
+class _Midprice:
+    """pandas-ta ``midprice``: half the rolling high plus the rolling low."""
+
+    def __init__(self, length: int) -> None:
+        self._highest = RollingExtreme(length, largest=True)
+        self._lowest = RollingExtreme(length, largest=False)
+
+    def update(self, high: float, low: float) -> float:
+        lowest = self._lowest.update(low)
+        return 0.5 * (lowest + self._highest.update(high))
+
+
+class Ichimoku(OnlineIndicator):
+    """``indicators.ichimoku``: (conversion, base, span_a, span_b)."""
+
+    def __init__(self, conversion: int = 9, base: int = 26, span_b: int = 52, displacement: int = 26) -> None:
+        self._min_bars = max(conversion, base, span_b)
+        self._bars = 0
+        self._conversion = _Midprice(conversion)
+        self._base = _Midprice(base)
+        self._span_b = _Midprice(span_b)
+        self._span_a_shift = _Shift(base)
+        self._span_b_shift = _Shift(base)
+
+    def update(self, candle: CandleLike) -> tuple[Optional[float], Optional[float], Optional[float], Optional[float]]:
+        self._bars += 1
+        high, low = float(candle.high), float(candle.low)
+        conversion = self._conversion.update(high, low)
+        base = self._base.update(high, low)
+        span_a = self._span_a_shift.update(0.5 * (conversion + base))
+        span_b = self._span_b_shift.update(self._span_b.update(high, low))
+        if self._bars < self._min_bars:
+            return None, None, None, None
+        return _value(conversion), _value(base), _value(span_a), _value(span_b)
+
+
+class Fibonacci(OnlineIndicator):
+    """``indicators.fibonacci_retracements``: levels 23.6, 38.2, 50, 61.8 and 78.6%."""
+
+    RATIOS: tuple[float, ...] = tuple(FIBONACCI_RATIOS.values())
+
+    def __init__(self, lookback: int = 50) -> None:
+        self._highest = RollingExtreme(lookback, largest=True)
+        self._lowest = RollingExtreme(lookback, largest=False)
+
+    def update(self, candle: CandleLike) -> tuple[Optional[float], ...]:
+        highest = self._highest.update(float(candle.high))
+        lowest = self._lowest.update(float(candle.low))
+        if highest != highest or lowest != lowest:
+            return (None,) * len(self.RATIOS)
+        range_val = highest - lowest
+        return tuple(lowest if range_val == 0 else highest - range_val * ratio for ratio in self.RATIOS)
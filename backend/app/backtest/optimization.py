@@ -0,0 +1,255 @@
+"""Parameter sweep — many variants of one strategy over one candle set.
+
+Pure, like the Backtest pipeline: no DB, object storage, Redis or candle-fetch
+I/O. The caller hands in already-validated strategy variants (one per
+parameter combination) plus a single candle range; every variant runs through
+``run_pipeline`` and the sweep returns a table of scalar RunOutcome metrics
+ranked by one of them. Artifact payloads are dropped — a sweep never uploads.
+
+Variants whose input/indicator blocks are identical form one group and share
+one indicator cache, so e.g. a grid over stop-loss levels computes the RSI
+once. Blocks with a batch contract (SMA, EMA, RSI) group regardless of their
+period, and a chunk computes all the periods it needs in one pass. Groups are
+spread across a process pool; the candle frame is shipped to each worker once
+via the pool initializer.
+
+Documented in CONTEXT.md (term: Parameter sweep).
+"""
+from __future__ import annotations
+
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from typing import Any, Mapping, Optional, Sequence, Union
+
+from app.backtest.candle_frame import CandleFrame, as_candle_frame
+from app.backtest.errors import BacktestError
+from app.backtest.execution_plan import plan_for
+from app.backtest.indicator_cache import compute_period_batches, period_batch_key
+from app.backtest.interpreter import IndicatorCache, indicator_cache_key
+from app.backtest.pipeline import BacktestParams, RunOutcome, run_pipeline
+from app.backtest.types import ValidatedStrategy
+from app.models.candle import Candle
+
+# RunOutcome fields that are artifact payloads, not metrics.
+_PAYLOAD_FIELDS: frozenset[str] = frozenset(
+    {"equity_curve_payload", "benchmark_curve_payload", "trades_payload"}
+)
+
+# Numeric RunOutcome metrics a sweep can be ranked by.
+RANKABLE_METRICS: tuple[str, ...] = tuple(
+    f.name
+    for f in fields(RunOutcome)
+    if f.name not in _PAYLOAD_FIELDS and f.name != "used_backup_data"
+)
+
+# Metrics where a smaller value ranks higher.
+_LOWER_IS_BETTER: frozenset[str] = frozenset(
+    {
+        "max_drawdown_pct",
+        "max_consecutive_losses",
+        "total_fees_usd",
+        "total_slippage_usd",
+        "total_spread_usd",
+        "total_costs_usd",
+        "cost_pct_gross_return",
+        "avg_cost_per_trade_usd",
+    }
+)
+
+
+@dataclass(frozen=True)
+class SweepVariant:
+    """One parameter combination and the strategy it produces."""
+
+    overrides: dict[str, Any]
+    strategy: ValidatedStrategy
+
+
+@dataclass(frozen=True)
+class SweepRow:
+    """One ranked line of the sweep table.
+
+    ``rank`` is 1-based; failed variants carry ``rank=None``, no metrics and
+    the BacktestError's user_message.
+    """
+
+    rank: Optional[int]
+    overrides: dict[str, Any]
+    metrics: Optional[dict[str, Any]]
+    error_message: Optional[str] = None
+
+
+def expand_grid(grid: Mapping[str, Sequence[Any]]) -> list[dict[str, Any]]:
+    """Cartesian product of a ``{override_key: [values...]}`` grid, in key order."""
+    if not grid:
+        return []
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def outcome_metrics(outcome: RunOutcome) -> dict[str, Any]:
+    """Scalar fields of a RunOutcome (everything except the artifact payloads)."""
+    return {f.name: getattr(outcome, f.name) for f in fields(outcome) if f.name not in _PAYLOAD_FIELDS}
+
+
+def run_sweep(
+    variants: Sequence[SweepVariant],
+    candles: Union[CandleFrame, Sequence[Candle]],
+    params: BacktestParams,
+    rank_by: str = "sharpe_ratio",
+    max_workers: int = 1,
+) -> list[SweepRow]:
+    """Run every variant over ``candles`` and return rows ranked by ``rank_by``.
+
+    ``max_workers <= 1`` (or a single indicator group) runs in-process; larger
+    values fan groups out to a ProcessPoolExecutor. Results do not depend on
+    the worker count.
+
+    Raises BacktestError for empty candles and ValueError for an unknown
+    ``rank_by`` metric.
+    """
+    if rank_by not in RANKABLE_METRICS:
+        raise ValueError(f"Unknown sweep metric: {rank_by!r}")
+
+    frame = as_candle_frame(candles)
+    if not len(frame):
+        raise BacktestError(
+            "No candles found for the specified period",
+            "No price data available for the selected date range.",
+        )
+
+    chunks = _plan_chunks(variants, max_workers)
+    if max_workers <= 1 or len(chunks) <= 1:
+        evaluated = [_run_chunk(frame, params, chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers, len(chunks)),
+            initializer=_init_worker,
+            initargs=(frame, params),
+        ) as pool:
+            evaluated = list(pool.map(_run_chunk_in_worker, chunks))
+
+    results: dict[int, tuple[Optional[dict[str, Any]], Optional[str]]] = {
+        index: (metrics, error) for chunk in evaluated for index, metrics, error in chunk
+    }
+    return rank_results(variants, results, rank_by)
+
+
+# ---------------------------------------------------------------------------
+# Scheduling
+# ---------------------------------------------------------------------------
+
+_Chunk = list[tuple[int, ValidatedStrategy]]
+
+
+def _indicator_signature(strategy: ValidatedStrategy) -> tuple:
+    keys = (
+        period_batch_key(block["type"], block.get("params", {})) or indicator_cache_key(block)
+        for block in strategy.blocks
+    )
+    return tuple(sorted(set(key for key in keys if key is not None)))
+
+
+def _batchable_blocks(chunk: _Chunk) -> list[tuple[str, dict]]:
+    """Cacheable steps of every variant in ``chunk`` that compiles."""
+    blocks = []
+    for _, strategy in chunk:
+        try:
+            plan = plan_for(strategy)
+        except BacktestError:
+            continue
+        blocks.extend((step.block_type, step.params) for step in plan.steps if step.cache_key)
+    return blocks
+
+
+def _plan_chunks(variants: Sequence[SweepVariant], max_workers: int) -> list[_Chunk]:
+    """Group variants by indicator signature, then split groups to fill the pool.
+
+    Each chunk gets its own indicator cache, so splitting trades a little
+    recomputation for parallelism; chunks never mix indicator groups.
+    """
+    groups: dict[tuple, _Chunk] = {}
+    for index, variant in enumerate(variants):
+        groups.setdefault(_indicator_signature(variant.strategy), []).append((index, variant.strategy))
+
+    chunk_size = max(1, math.ceil(len(variants) / max(1, max_workers)))
+    return [
+        group[start:start + chunk_size]
+        for group in groups.values()
+        for start in range(0, len(group), chunk_size)
+    ]
+
+
+def _run_chunk(
+    frame: CandleFrame,
+    params: BacktestParams,
+    chunk: _Chunk,
+) -> list[tuple[int, Optional[dict[str, Any]], Optional[str]]]:
+    cache: IndicatorCache = {}
+    compute_period_batches(cache, frame, _batchable_blocks(chunk))
+    out = []
+    for index, strategy in chunk:
+        try:
+            outcome = run_pipeline(strategy, frame, params, indicator_cache=cache)
+        except BacktestError as e:
+            out.append((index, None, e.user_message))
+            continue
+        out.append((index, outcome_metrics(outcome), None))
+    return out
+
+
+_worker_frame: Optional[CandleFrame] = None
+_worker_params: Optional[BacktestParams] = None
+
+
+def _init_worker(frame: CandleFrame, params: BacktestParams) -> None:
+    global _worker_frame, _worker_params
+    _worker_frame = frame
+    _worker_params = params
+
+
+def _run_chunk_in_worker(chunk: _Chunk) -> list[tuple[int, Optional[dict[str, Any]], Optional[str]]]:
+    return _run_chunk(_worker_frame, _worker_params, chunk)
+
+
+# ---------------------------------------------------------------------------
+# Ranking
+# ---------------------------------------------------------------------------
+
+
+def ranked_indices(
+    results: Mapping[int, tuple[Optional[dict[str, Any]], Optional[str]]],
+    rank_by: str,
+) -> list[int]:
+    """Indices of the successful results, best first (ties keep input order)."""
+    sign = 1.0 if rank_by in _LOWER_IS_BETTER else -1.0
+
+    def sort_key(index: int) -> tuple[bool, float]:
+        value = results[index][0][rank_by]
+        # None (e.g. cost_pct_gross_return with no gross return) sorts last.
+        return value is None, sign * value if value is not None else 0.0
+
+    return sorted((i for i in sorted(results) if results[i][0] is not None), key=sort_key)
+
+
+def rank_results(
+    variants: Sequence[SweepVariant],
+    results: Mapping[int, tuple[Optional[dict[str, Any]], Optional[str]]],
+    rank_by: str,
+) -> list[SweepRow]:
+    """Turn ``{variant index: (metrics, error)}`` into ranked SweepRows.
+
+    Failed variants follow the ranked ones in their original order.
+    """
+    rows = [
+        SweepRow(rank=position, overrides=variants[i].overrides, metrics=results[i][0])
+        for position, i in enumerate(ranked_indices(results, rank_by), start=1)
+    ]
+    rows.extend(
+        SweepRow(rank=None, overrides=variants[i].overrides, metrics=None, error_message=results[i][1])
+        for i in range(len(variants))
+        if results[i][0] is None
+    )
+    return rows
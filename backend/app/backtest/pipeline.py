@@ -8,16 +8,20 @@ Documented in CONTEXT.md (terms: Backtest pipeline, RunOutcome).
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Optional, Sequence, Union
 
+from app.backtest.candle_frame import CandleFrame, as_candle_frame
+from app.backtest.checkpoint import EngineCheckpoint
 from app.backtest.engine import (
     compute_benchmark_curve,
     compute_benchmark_metrics,
     run_backtest,
 )
 from app.backtest.errors import BacktestError
-from app.backtest.interpreter import interpret_strategy
+from app.backtest.engine import BacktestResult
+from app.backtest.interpreter import IndicatorCache, StrategySignals, interpret_strategy
+from app.backtest.multi_engine import run_backtests
 from app.backtest.trades_artifact import dump_trades
 from app.backtest.types import ValidatedStrategy
 from app.models.candle import Candle
@@ -77,11 +81,17 @@ class RunOutcome:
     benchmark_curve_payload: list  # list[dict] — each {timestamp, equity}
     trades_payload: list  # list[dict] — serialized via dump_trades
 
+    # Engine state to resume from next time (only when requested)
+    checkpoint: Optional[EngineCheckpoint] = field(default=None, compare=False, repr=False)
+
 
 def run_pipeline(
     strategy: ValidatedStrategy,
-    candles: list[Candle],
+    candles: Union[CandleFrame, Sequence[Candle]],
     params: BacktestParams,
+    indicator_cache: Optional[IndicatorCache] = None,
+    resume_from: Optional[EngineCheckpoint] = None,
+    capture_checkpoint: bool = False,
 ) -> RunOutcome:
     """Assemble and execute a complete backtest, returning an immutable RunOutcome.
 
@@ -89,29 +99,90 @@ def run_pipeline(
     Receives an already-validated strategy so validation failures are caught
     before any candle fetch in the worker.
 
+    Accepts a CandleFrame (the worker path) or a list of Candle rows, which is
+    converted once up front so every stage below shares the same columns.
+
+    ``indicator_cache`` is forwarded to the Interpreter; callers running many
+    variants over one candle set (parameter sweeps) pass a shared dict.
+
+    ``resume_from`` / ``capture_checkpoint`` are forwarded to the Engine so a
+    re-run over the same candles plus new ones only simulates the new bars.
+
     Raises BacktestError for empty candles.
     """
-    if not candles:
+    frame = as_candle_frame(candles)
+    if not len(frame):
         raise BacktestError(
             "No candles found for the specified period",
             "No price data available for the selected date range.",
         )
 
-    used_backup_data = any(c.source != "cryptocompare" for c in candles)
+    signals = interpret_strategy(strategy, frame, indicator_cache=indicator_cache)
+    return build_outcome(
+        frame, signals, params, resume_from=resume_from, capture_checkpoint=capture_checkpoint
+    )
+
 
-    signals = interpret_strategy(strategy, candles)
+def build_outcome(
+    frame: CandleFrame,
+    signals: StrategySignals,
+    params: BacktestParams,
+    resume_from: Optional[EngineCheckpoint] = None,
+    capture_checkpoint: bool = False,
+) -> RunOutcome:
+    """Run the Engine and benchmark over ``frame`` with precomputed signals.
 
+    The second half of ``run_pipeline``. Walk-forward analysis calls it
+    directly with a slice of the frame and the matching slice of signals that
+    were interpreted once over the whole range.
+    """
     result = run_backtest(
-        candles=candles,
+        candles=frame,
         signals=signals,
         initial_balance=params.initial_balance,
         fee_rate=params.fee_rate,
         slippage_rate=params.slippage_rate,
         spread_rate=params.spread_rate,
         timeframe=params.timeframe,
+        resume_from=resume_from,
+        capture_checkpoint=capture_checkpoint,
     )
+    return _assemble_outcome(frame, result, params)
+
+
+def build_outcomes(
+    frame: CandleFrame,
+    signals: Sequence[StrategySignals],
+    params: Sequence[BacktestParams],
+) -> list[RunOutcome]:
+    """``build_outcome`` for many strategies over the same candles, one Engine pass.
+
+    Uses the multi-strategy kernel; outcome ``k`` equals
+    ``build_outcome(frame, signals[k], params[k])``. Every ``params`` entry
+    must share the frame's timeframe.
+    """
+    if not len(frame):
+        raise BacktestError(
+            "No candles found for the specified period",
+            "No price data available for the selected date range.",
+        )
+    if len({p.timeframe for p in params}) > 1:
+        raise ValueError("build_outcomes needs a single timeframe")
+
+    results = run_backtests(
+        frame,
+        signals,
+        initial_balance=[p.initial_balance for p in params],
+        fee_rate=[p.fee_rate for p in params],
+        slippage_rate=[p.slippage_rate for p in params],
+        spread_rate=[p.spread_rate for p in params],
+        timeframe=params[0].timeframe if params else "1d",
+    )
+    return [_assemble_outcome(frame, result, p) for result, p in zip(results, params)]
+
 
-    benchmark_equity = compute_benchmark_curve(candles, params.initial_balance)
+def _assemble_outcome(frame: CandleFrame, result: BacktestResult, params: BacktestParams) -> RunOutcome:
+    benchmark_equity = compute_benchmark_curve(frame, params.initial_balance)
     benchmark_return_pct, alpha, beta = compute_benchmark_metrics(
         result.equity_curve,
         benchmark_equity,
@@ -142,8 +213,9 @@ def run_pipeline(
         benchmark_return_pct=benchmark_return_pct,
         alpha=alpha,
         beta=beta,
-        used_backup_data=used_backup_data,
+        used_backup_data=frame.used_backup_data,
         equity_curve_payload=result.equity_curve,
         benchmark_curve_payload=benchmark_equity,
         trades_payload=trades_payload,
+        checkpoint=result.checkpoint,
     )
@@ -1,7 +1,7 @@
 """Trade lifecycle types, position state machine, and trade record creation."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
@@ -9,6 +9,7 @@ from app.backtest.types import TakeProfitLevel
 
 if TYPE_CHECKING:
     from app.models.candle import Candle
+    from app.backtest.candle_frame import Bar
     from app.backtest.exit_conditions import CandleExit, PartialExit
 
 
@@ -71,6 +72,32 @@ class RiskConfig:
     trailing_stop_pct: float | None
 
 
+@dataclass
+class PositionSnapshot:
+    """Every field of a PositionManager, for Engine checkpoints."""
+
+    fee_rate: float
+    slippage_rate: float
+    spread_rate: float
+    is_open: bool
+    entry_price: float
+    entry_time: Optional[datetime]
+    entry_index: Optional[int]
+    position_size: float
+    initial_qty: float
+    sl_price: Optional[float]
+    tp_levels: list[TPLevelState]
+    max_dd_threshold: Optional[float]
+    time_exit_threshold: Optional[int]
+    trailing_stop_threshold: Optional[float]
+    peak_high: float
+    peak_high_ts: Optional[datetime]
+    trough_low: float
+    trough_low_ts: Optional[datetime]
+    bars_in_trade: int
+    highest_close_since_entry: float
+
+
 def _create_trade(
     qty: float,
     exit_price_raw: float,
@@ -211,6 +238,57 @@ class PositionManager:
     def position_size(self) -> float:
         return self._position_size
 
+    # ------------------------------------------------------------------
+    # Checkpoints
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> PositionSnapshot:
+        """Copy of the full state; ``restore`` rebuilds an equal manager from it."""
+        return PositionSnapshot(
+            fee_rate=self._fee_rate,
+            slippage_rate=self._slippage_rate,
+            spread_rate=self._spread_rate,
+            is_open=self._is_open,
+            entry_price=self._entry_price,
+            entry_time=self._entry_time,
+            entry_index=self._entry_index,
+            position_size=self._position_size,
+            initial_qty=self._initial_qty,
+            sl_price=self._sl_price,
+            tp_levels=[replace(level) for level in self._tp_levels],
+            max_dd_threshold=self._max_dd_threshold,
+            time_exit_threshold=self._time_exit_threshold,
+            trailing_stop_threshold=self._trailing_stop_threshold,
+            peak_high=self._peak_high,
+            peak_high_ts=self._peak_high_ts,
+            trough_low=self._trough_low,
+            trough_low_ts=self._trough_low_ts,
+            bars_in_trade=self._bars_in_trade,
+            highest_close_since_entry=self._highest_close_since_entry,
+        )
+
+    @classmethod
+    def restore(cls, snapshot: PositionSnapshot) -> "PositionManager":
+        pm = cls(snapshot.fee_rate, snapshot.slippage_rate, snapshot.spread_rate)
+        pm._is_open = snapshot.is_open
+        pm._entry_price = snapshot.entry_price
+        pm._entry_time = snapshot.entry_time
+        pm._entry_index = snapshot.entry_index
+        pm._position_size = snapshot.position_size
+        pm._initial_qty = snapshot.initial_qty
+        pm._sl_price = snapshot.sl_price
+        pm._tp_levels = [replace(level) for level in snapshot.tp_levels]
+        pm._max_dd_threshold = snapshot.max_dd_threshold
+        pm._time_exit_threshold = snapshot.time_exit_threshold
+        pm._trailing_stop_threshold = snapshot.trailing_stop_threshold
+        pm._peak_high = snapshot.peak_high
+        pm._peak_high_ts = snapshot.peak_high_ts
+        pm._trough_low = snapshot.trough_low
+        pm._trough_low_ts = snapshot.trough_low_ts
+        pm._bars_in_trade = snapshot.bars_in_trade
+        pm._highest_close_since_entry = snapshot.highest_close_since_entry
+        return pm
+
     # ------------------------------------------------------------------
     # Lifecycle
     # ------------------------------------------------------------------
@@ -262,7 +340,7 @@ class PositionManager:
         self._time_exit_threshold = risk.time_exit_bars
         self._trailing_stop_threshold = risk.trailing_stop_pct
 
-    def update_excursions(self, candle: "Candle") -> None:
+    def update_excursions(self, candle: "Candle | Bar") -> None:
         """Update MFE/MAE excursions and per-candle position counters."""
         self._bars_in_trade += 1
         if candle.close > self._highest_close_since_entry:
@@ -276,7 +354,7 @@ class PositionManager:
 
     def check_exits(
         self,
-        candle: "Candle",
+        candle: "Candle | Bar",
         index: int,
         exit_signal: bool = False,
     ) -> "CandleExit":
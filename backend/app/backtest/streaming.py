@@ -0,0 +1,275 @@
+"""Event-driven Engine — feed candles one at a time, get trade events back.
+
+``StreamingBacktest`` owns the PositionManager, the account (balance, peak
+equity, max drawdown) and the trades and equity curve so far. Each
+``on_candle`` call advances it by one closed candle and returns the entry,
+partial take-profit and exit events that candle produced; ``finish`` closes
+any open position at the end of the data. ``run_backtest`` is a loop over
+it, so alerts, paper trading and resumed re-backtests share its exact rules.
+
+An entry signal on candle ``i`` fills at the open of candle ``i + 1``, so the
+engine holds it as a pending entry until the next candle arrives. Candle
+``i``'s equity point is marked against the position filled at ``i + 1``
+(matching the batch Engine), so it is only recorded then — or by ``finish``,
+which drops an entry that never got a next candle.
+
+Signals come from the Interpreter; the caller passes each candle's entry
+and exit flags alongside it. While flat, a candle without an entry signal
+only records an equity point, so ``skip_flat`` advances over a run of them
+at once.
+
+Documented in CONTEXT.md (term: StreamingBacktest).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Literal, Optional, Sequence
+
+from app.backtest.candle_frame import Bar
+from app.backtest.position_manager import PositionManager, PositionSnapshot, RiskConfig, Trade
+
+if TYPE_CHECKING:
+    from app.backtest.interpreter import StrategySignals
+    from app.models.candle import Candle
+
+
+@dataclass(frozen=True)
+class EngineEvent:
+    """One position change produced by a candle."""
+
+    kind: Literal["entry", "partial_exit", "exit"]
+    index: int  # candle index within the stream
+    timestamp: datetime
+    price: float  # effective entry price, or raw exit price
+    qty: float
+    trade: Optional[Trade] = None  # realised trade for exits
+
+
+@dataclass
+class EngineSnapshot:
+    """Every field of a StreamingBacktest, for Engine checkpoints."""
+
+    position_size_pct: float
+    risk: RiskConfig
+    fee_rate: float
+    slippage_rate: float
+    spread_rate: float
+    position: PositionSnapshot
+    equity: float
+    peak_equity: float
+    max_drawdown: float
+    trades: list[Trade]
+    equity_curve: list[dict]
+    index: int
+    last_bar: Optional[Bar]
+    pending_entry: Optional[tuple[str, float]]
+
+
+class StreamingBacktest:
+    """Incremental Engine over a stream of closed candles.
+
+    Mutable and single-owner like PositionManager; copy it with
+    ``copy.deepcopy`` (see EngineCheckpoint), or ``snapshot`` it to store.
+    """
+
+    def __init__(
+        self,
+        position_size_pct: float,
+        risk: RiskConfig,
+        initial_balance: float,
+        fee_rate: float,
+        slippage_rate: float,
+        spread_rate: float = 0.0002,
+    ) -> None:
+        self._position_size_pct = position_size_pct
+        self._risk = risk
+        self._fee_rate = fee_rate
+        self._slippage_rate = slippage_rate
+        self._spread_rate = spread_rate
+        self.position = PositionManager(fee_rate=fee_rate, slippage_rate=slippage_rate, spread_rate=spread_rate)
+        self.equity = initial_balance
+        self.peak_equity = initial_balance
+        self.max_drawdown = 0.0
+        self.trades: list[Trade] = []
+        self.equity_curve: list[dict] = []
+        self.index = 0  # index of the next candle
+        self._last_bar: Optional["Bar | Candle"] = None
+        # (timestamp, close) of the candle whose entry signal waits for the next open
+        self._pending_entry: Optional[tuple[str, float]] = None
+
+    @classmethod
+    def for_signals(
+        cls,
+        signals: "StrategySignals",
+        initial_balance: float,
+        fee_rate: float,
+        slippage_rate: float,
+        spread_rate: float = 0.0002,
+    ) -> "StreamingBacktest":
+        """Engine with the sizing and risk settings of interpreted signals."""
+        risk = RiskConfig(
+            take_profit_levels=signals.take_profit_levels or None,
+            stop_loss_pct=signals.stop_loss_pct,
+            max_drawdown_pct=signals.max_drawdown_pct,
+            time_exit_bars=signals.time_exit_bars,
+            trailing_stop_pct=signals.trailing_stop_pct,
+        )
+        return cls(signals.position_size_pct, risk, initial_balance, fee_rate, slippage_rate, spread_rate)
+
+    def snapshot(self) -> EngineSnapshot:
+        """Copy of the full state; ``restore`` rebuilds an equal engine from it."""
+        last = self._last_bar
+        return EngineSnapshot(
+            position_size_pct=self._position_size_pct,
+            risk=self._risk,
+            fee_rate=self._fee_rate,
+            slippage_rate=self._slippage_rate,
+            spread_rate=self._spread_rate,
+            position=self.position.snapshot(),
+            equity=self.equity,
+            peak_equity=self.peak_equity,
+            max_drawdown=self.max_drawdown,
+            trades=list(self.trades),
+            equity_curve=[dict(point) for point in self.equity_curve],
+            index=self.index,
+            last_bar=None if last is None else Bar(
+                last.timestamp, last.open, last.high, last.low, last.close, last.volume
+            ),
+            pending_entry=self._pending_entry,
+        )
+
+    @classmethod
+    def restore(cls, snapshot: EngineSnapshot) -> "StreamingBacktest":
+        engine = cls(
+            snapshot.position_size_pct,
+            snapshot.risk,
+            snapshot.equity,
+            snapshot.fee_rate,
+            snapshot.slippage_rate,
+            snapshot.spread_rate,
+        )
+        engine.position = PositionManager.restore(snapshot.position)
+        engine.peak_equity = snapshot.peak_equity
+        engine.max_drawdown = snapshot.max_drawdown
+        engine.trades = list(snapshot.trades)
+        engine.equity_curve = [dict(point) for point in snapshot.equity_curve]
+        engine.index = snapshot.index
+        engine._last_bar = snapshot.last_bar
+        engine._pending_entry = snapshot.pending_entry
+        return engine
+
+    def on_candle(
+        self,
+        candle: "Bar | Candle",
+        entry_signal: bool = False,
+        exit_signal: bool = False,
+        iso_timestamp: Optional[str] = None,
+    ) -> list[EngineEvent]:
+        """Advance by one closed candle; return the events it produced.
+
+        ``iso_timestamp`` labels the candle's equity point and defaults to
+        ``candle.timestamp.isoformat()``.
+        """
+        i = self.index
+        pm = self.position
+        events: list[EngineEvent] = []
+
+        if self._pending_entry is not None:
+            signal_timestamp, signal_close = self._pending_entry
+            self._pending_entry = None
+            effective_entry = (
+                candle.open * (1 + self._slippage_rate) * (1 + self._fee_rate) * (1 + self._spread_rate / 2)
+            )
+            qty = self.equity * (self._position_size_pct / 100) / effective_entry
+            pm.enter(price=effective_entry, qty=qty, timestamp=candle.timestamp, index=i, risk=self._risk)
+            events.append(EngineEvent("entry", i, candle.timestamp, effective_entry, qty))
+            self._mark(signal_timestamp, signal_close)
+
+        if pm.is_open:
+            pm.update_excursions(candle)
+            candle_exit = pm.check_exits(candle, i, exit_signal)
+
+            for partial in candle_exit.partials:
+                trade = pm.apply_partial(partial, candle.timestamp)
+                self._realize(trade)
+                events.append(EngineEvent("partial_exit", i, candle.timestamp, partial.exit_price_raw, trade.qty, trade))
+                if not pm.is_open:
+                    break
+
+            if candle_exit.full is not None and pm.is_open:
+                trade = pm.close(candle_exit.full.exit_price_raw, candle_exit.full.reason, candle.timestamp)
+                self._realize(trade)
+                events.append(EngineEvent("exit", i, candle.timestamp, candle_exit.full.exit_price_raw, trade.qty, trade))
+
+        timestamp = iso_timestamp if iso_timestamp is not None else candle.timestamp.isoformat()
+        if not pm.is_open and entry_signal:
+            self._pending_entry = (timestamp, candle.close)
+        else:
+            self._mark(timestamp, candle.close)
+
+        self._last_bar = candle
+        self.index = i + 1
+        return events
+
+    @property
+    def is_flat(self) -> bool:
+        """No open position and no entry waiting for the next open."""
+        return not self.position.is_open and self._pending_entry is None
+
+    def skip_flat(self, iso_timestamps: Sequence[str], last_candle: "Bar | Candle") -> None:
+        """Advance over candles without an entry signal while ``is_flat``.
+
+        Same state as calling ``on_candle`` for each (exit signals do nothing
+        while flat); ``last_candle`` is the last of them.
+        """
+        if not self.is_flat:
+            raise ValueError("skip_flat needs a flat engine")
+        if not iso_timestamps:
+            return
+        equity = round(self.equity, 2)
+        self.equity_curve.extend({"timestamp": ts, "equity": equity} for ts in iso_timestamps)
+        self._track_drawdown(self.equity)
+        self._last_bar = last_candle
+        self.index += len(iso_timestamps)
+
+    def finish(self) -> list[EngineEvent]:
+        """End of data: drop a pending entry and close any open position.
+
+        The stream is complete afterwards; take a checkpoint before calling it
+        to continue later.
+        """
+        if self._pending_entry is not None:
+            self._mark(*self._pending_entry)
+            self._pending_entry = None
+
+        if not self.position.is_open:
+            return []
+        last = self._last_bar
+        trade = self.position.close(last.close, "end_of_data", last.timestamp)
+        self._realize(trade)
+        self.equity_curve[-1]["equity"] = round(self.equity, 2)
+        return [EngineEvent("exit", self.index - 1, last.timestamp, last.close, trade.qty, trade)]
+
+    def _realize(self, trade: Trade) -> None:
+        self.trades.append(trade)
+        self.equity += trade.pnl
+
+    def _mark(self, timestamp: str, close: float) -> None:
+        """Record a candle's equity point and update the drawdown."""
+        current_equity = self.equity
+        if self.position.is_open:
+            current_equity = self.equity + self.position.unrealized_pnl(close)
+
+        self.equity_curve.append({
+            "timestamp": timestamp,
+            "equity": round(current_equity, 2),
+        })
+        self._track_drawdown(current_equity)
+
+    def _track_drawdown(self, current_equity: float) -> None:
+        if current_equity > self.peak_equity:
+            self.peak_equity = current_equity
+        drawdown = (self.peak_equity - current_equity) / self.peak_equity * 100
+        if drawdown > self.max_drawdown:
+            self.max_drawdown = drawdown
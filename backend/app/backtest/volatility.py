@@ -1,6 +1,17 @@
-"""Volatility calculations for market data."""
+"""Volatility calculations for market data.
+
+The percentile rank compares the latest window's volatility with every
+window of the last year. ``rolling_stddev_volatility`` produces all of
+them from running sums of the log returns and their squares — O(n), not
+one ``calculate_stddev_volatility`` per window — and
+``calculate_volatility_percentiles`` ranks many assets in one pass.
+"""
 import math
-from typing import Optional
+from typing import Mapping, Optional, Sequence
+
+import numpy as np
+
+from app.backtest.indicator_kernels import rolling_extreme
 
 
 def calculate_log_returns(closes: list[float]) -> list[float]:
@@ -49,6 +60,29 @@ def calculate_stddev_volatility(closes: list[float], window: int = 30) -> Option
     return math.sqrt(variance)
 
 
+def calculate_atr(
+    highs: list[float],
+    lows: list[float],
+    closes: list[float],
+    window: int = 30
+) -> Optional[float]:
+    """Calculate the latest ATR over window, in price units.
+
+    Returns:
+        The most recent ATR value, or None if insufficient data
+    """
+    from app.backtest.indicators import atr
+
+    if len(closes) < window:
+        return None
+
+    # Calculate ATR using existing utility
+    atr_values = atr(highs, lows, closes, period=window)
+
+    # Get the last ATR value (most recent)
+    return atr_values[-1] if atr_values else None
+
+
 def calculate_atr_pct(
     highs: list[float],
     lows: list[float],
@@ -68,16 +102,10 @@ def calculate_atr_pct(
     Returns:
         ATR / current_price * 100, or None if insufficient data
     """
-    from app.backtest.indicators import atr
-
-    if len(closes) < window or current_price <= 0:
+    if current_price <= 0:
         return None
 
-    # Calculate ATR using existing utility
-    atr_values = atr(highs, lows, closes, period=window)
-
-    # Get the last ATR value (most recent)
-    current_atr = atr_values[-1] if atr_values else None
+    current_atr = calculate_atr(highs, lows, closes, window)
 
     if current_atr is None:
         return None
@@ -85,6 +113,46 @@ def calculate_atr_pct(
     return (current_atr / current_price) * 100
 
 
+def rolling_stddev_volatility(closes: Sequence[float], window: int = 30) -> np.ndarray:
+    """``calculate_stddev_volatility`` of the ``window`` closes ending at every bar.
+
+    NaN until the first full window (and throughout when ``window < 3``).
+    """
+    return _rolling_stddev_volatilities(np.asarray(closes, dtype=np.float64).reshape(1, -1), window)[0]
+
+
+def _rolling_stddev_volatilities(closes: np.ndarray, window: int) -> np.ndarray:
+    """``rolling_stddev_volatility`` for each row of ``closes`` (assets x bars).
+
+    A window of closes holds ``window - 1`` returns. Their population
+    variance is ``E[r^2] - E[r]^2`` from window sums of two cumulative sums;
+    the returns are first centred on their row mean, which leaves every
+    variance unchanged and keeps the subtraction from cancelling.
+    """
+    rows, n = closes.shape
+    out = np.full((rows, n), np.nan)
+    count = window - 1
+    if count < 2 or n < window:
+        return out
+    previous, current = closes[:, :-1], closes[:, 1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.where(previous > 0, np.log(current / np.where(previous > 0, previous, 1.0)), 0.0)
+    centred = returns - returns.mean(axis=1, keepdims=True)
+    mean = _window_sums(centred, count) / count
+    variance = np.maximum(_window_sums(centred * centred, count) / count - mean * mean, 0.0)
+    # Equal returns (a flat or steadily trending window) have no variance, not a rounding residue
+    for row in range(rows):
+        flat = rolling_extreme(returns[row], count, largest=True) == rolling_extreme(returns[row], count, largest=False)
+        variance[row, flat[count - 1:]] = 0.0
+    out[:, window - 1:] = np.sqrt(variance)
+    return out
+
+
+def _window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    sums = np.concatenate((np.zeros((values.shape[0], 1)), np.cumsum(values, axis=1)), axis=1)
+    return sums[:, window:] - sums[:, :-window]
+
+
 def calculate_volatility_percentile(
     closes: list[float],
     window: int = 30,
@@ -100,32 +168,34 @@ def calculate_volatility_percentile(
     Returns:
         Percentile rank (0-100), or None if insufficient data
     """
-    # Need at least history_days for comparison
-    if len(closes) < history_days:
-        return None
+    return calculate_volatility_percentiles({"": closes}, window, history_days)[""]
 
-    # Calculate current volatility (last 30 days)
-    current_vol = calculate_stddev_volatility(closes[-window:], window)
-    if current_vol is None:
-        return None
-
-    # Calculate rolling volatilities over the past year
-    historical_vols = []
-    # Start from window size and go through the history
-    for i in range(len(closes) - history_days, len(closes) - window + 1):
-        if i < 0:
-            continue
-        subset = closes[i:i + window]
-        if len(subset) >= window:
-            vol = calculate_stddev_volatility(subset, window)
-            if vol is not None:
-                historical_vols.append(vol)
 
-    if not historical_vols:
-        return None
-
-    # Calculate percentile: how many historical values are below current?
-    below_count = sum(1 for v in historical_vols if v <= current_vol)
-    percentile = (below_count / len(historical_vols)) * 100
+def calculate_volatility_percentiles(
+    closes_by_asset: Mapping[str, Sequence[float]],
+    window: int = 30,
+    history_days: int = 365,
+) -> dict[str, Optional[float]]:
+    """``calculate_volatility_percentile`` for every asset, one vectorised pass per series length.
 
-    return round(percentile, 1)
+    The history is every window ending in the last ``history_days`` closes,
+    current one included; the rank is the share of them at or below the
+    current volatility.
+    """
+    percentiles: dict[str, Optional[float]] = {asset: None for asset in closes_by_asset}
+    by_length: dict[int, list[str]] = {}
+    for asset, closes in closes_by_asset.items():
+        # Need at least history_days for comparison
+        if len(closes) >= history_days:
+            by_length.setdefault(len(closes), []).append(asset)
+
+    for n, assets in by_length.items():
+        vols = _rolling_stddev_volatilities(np.array([closes_by_asset[a] for a in assets], dtype=np.float64), window)
+        history = vols[:, n - history_days + window - 1:]
+        current = vols[:, -1:]
+        if history.shape[1] == 0 or np.isnan(current).any():
+            continue
+        below = (history <= current).sum(axis=1).tolist()
+        for asset, below_count in zip(assets, below):
+            percentiles[asset] = round((below_count / history.shape[1]) * 100, 1)
+    return percentiles
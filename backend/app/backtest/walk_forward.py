@@ -0,0 +1,283 @@
+"""Walk-forward analysis — rolling in-sample optimisation, out-of-sample check.
+
+The candle range is split into rolling windows: ``in_sample_days`` of history
+followed by ``out_of_sample_days``; the next window starts one out-of-sample
+span later. On every window the sweep variants are ranked on the in-sample
+slice, the winner is re-run on the out-of-sample slice, and the out-of-sample
+equity curves are stitched (compounded) into one curve.
+
+Pure, like the Backtest pipeline. One candle frame, one indicator cache:
+every variant is interpreted ONCE over the whole range and windows only
+slice its signals, so indicators on a window's first bars are warmed up by
+the preceding (strictly earlier) candles. Windows run in parallel on a
+process pool.
+
+Documented in CONTEXT.md (term: Walk-forward analysis).
+"""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Any, Optional, Sequence, Union
+
+import numpy as np
+
+from app.backtest import metrics
+from app.backtest.candle_frame import CandleFrame, as_candle_frame
+from app.backtest.errors import BacktestError
+from app.backtest.interpreter import IndicatorCache, StrategySignals, interpret_strategy
+from app.backtest.optimization import RANKABLE_METRICS, SweepVariant, outcome_metrics, ranked_indices
+from app.backtest.pipeline import BacktestParams, build_outcome
+from app.models.candle import Candle
+
+
+@dataclass(frozen=True)
+class WalkForwardWindow:
+    """Bar-index ranges of one window over the frame."""
+
+    index: int
+    in_sample: slice
+    out_of_sample: slice
+
+
+@dataclass(frozen=True)
+class WindowResult:
+    """Outcome of one window: the in-sample winner and how it fared out of sample.
+
+    ``overrides`` is None when every variant failed in sample; the window then
+    contributes a flat stretch to the stitched curve.
+    """
+
+    index: int
+    in_sample_start: datetime
+    in_sample_end: datetime
+    out_of_sample_start: datetime
+    out_of_sample_end: datetime
+    overrides: Optional[dict[str, Any]]
+    in_sample_metrics: Optional[dict[str, Any]]
+    out_of_sample_metrics: Optional[dict[str, Any]]
+    equity_curve: list[dict]  # out-of-sample, starting at the initial balance
+    error_message: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class WalkForwardResult:
+    """Per-window results plus the stitched out-of-sample curve and its metrics."""
+
+    windows: list[WindowResult]
+    equity_curve: list[dict]
+    total_return_pct: float
+    max_drawdown_pct: float
+    sharpe_ratio: float
+    num_trades: int
+
+
+def split_windows(
+    frame: CandleFrame,
+    in_sample_days: int,
+    out_of_sample_days: int,
+) -> list[WalkForwardWindow]:
+    """Rolling windows anchored at the first candle.
+
+    The last out-of-sample slice may be shorter than ``out_of_sample_days``;
+    windows with no in-sample or no out-of-sample bars are dropped.
+    """
+    if in_sample_days < 1 or out_of_sample_days < 1:
+        raise ValueError("Walk-forward window lengths must be at least one day")
+
+    n = len(frame)
+    if not n:
+        return []
+    timestamps = frame.timestamps
+    in_span = np.timedelta64(in_sample_days, "D")
+    out_span = np.timedelta64(out_of_sample_days, "D")
+
+    windows: list[WalkForwardWindow] = []
+    start = timestamps[0]
+    while True:
+        is_start, is_end, oos_end = np.searchsorted(
+            timestamps, [start, start + in_span, start + in_span + out_span]
+        ).tolist()
+        if is_end >= n:
+            break
+        if is_end > is_start and oos_end > is_end:
+            windows.append(
+                WalkForwardWindow(
+                    index=len(windows),
+                    in_sample=slice(is_start, is_end),
+                    out_of_sample=slice(is_end, oos_end),
+                )
+            )
+        start = start + out_span
+    return windows
+
+
+def run_walk_forward(
+    variants: Sequence[SweepVariant],
+    candles: Union[CandleFrame, Sequence[Candle]],
+    params: BacktestParams,
+    in_sample_days: int,
+    out_of_sample_days: int,
+    rank_by: str = "sharpe_ratio",
+    max_workers: int = 1,
+) -> WalkForwardResult:
+    """Optimise on each in-sample window and stitch the out-of-sample runs.
+
+    Raises BacktestError for empty candles or a range too short for a single
+    window, ValueError for an unknown ``rank_by`` metric.
+    """
+    if rank_by not in RANKABLE_METRICS:
+        raise ValueError(f"Unknown sweep metric: {rank_by!r}")
+
+    frame = as_candle_frame(candles)
+    if not len(frame):
+        raise BacktestError(
+            "No candles found for the specified period",
+            "No price data available for the selected date range.",
+        )
+
+    windows = split_windows(frame, in_sample_days, out_of_sample_days)
+    if not windows:
+        raise BacktestError(
+            "Date range too short for one walk-forward window",
+            "The date range is too short for the chosen in-sample and out-of-sample windows.",
+        )
+
+    cache: IndicatorCache = {}
+    signals: list[Union[StrategySignals, str]] = []
+    for variant in variants:
+        try:
+            signals.append(interpret_strategy(variant.strategy, frame, indicator_cache=cache))
+        except BacktestError as e:
+            signals.append(e.user_message)
+
+    task = _WindowTask(frame=frame, params=params, variants=tuple(variants), signals=tuple(signals), rank_by=rank_by)
+    if max_workers <= 1 or len(windows) <= 1:
+        results = [task.run(window) for window in windows]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers, len(windows)),
+            initializer=_init_worker,
+            initargs=(task,),
+        ) as pool:
+            results = list(pool.map(_run_window_in_worker, windows))
+
+    return _stitch(results, params)
+
+
+# ---------------------------------------------------------------------------
+# Per-window evaluation
+# ---------------------------------------------------------------------------
+
+
+def _slice_signals(signals: StrategySignals, bars: slice) -> StrategySignals:
+    return replace(signals, entry_long=signals.entry_long[bars], exit_long=signals.exit_long[bars])
+
+
+@dataclass(frozen=True)
+class _WindowTask:
+    """Everything a worker needs to evaluate any window; shipped once per worker."""
+
+    frame: CandleFrame
+    params: BacktestParams
+    variants: tuple[SweepVariant, ...]
+    signals: tuple[Union[StrategySignals, str], ...]  # str = interpretation error
+    rank_by: str
+
+    def run(self, window: WalkForwardWindow) -> WindowResult:
+        in_frame = self.frame[window.in_sample]
+        out_frame = self.frame[window.out_of_sample]
+
+        results: dict[int, tuple[Optional[dict[str, Any]], Optional[str]]] = {}
+        for index, signals in enumerate(self.signals):
+            if isinstance(signals, str):
+                results[index] = (None, signals)
+                continue
+            try:
+                outcome = build_outcome(in_frame, _slice_signals(signals, window.in_sample), self.params)
+            except BacktestError as e:
+                results[index] = (None, e.user_message)
+                continue
+            results[index] = (outcome_metrics(outcome), None)
+
+        bounds = dict(
+            index=window.index,
+            in_sample_start=in_frame.timestamp_at(0),
+            in_sample_end=in_frame.timestamp_at(len(in_frame) - 1),
+            out_of_sample_start=out_frame.timestamp_at(0),
+            out_of_sample_end=out_frame.timestamp_at(len(out_frame) - 1),
+        )
+        ranked = ranked_indices(results, self.rank_by)
+        if not ranked:
+            errors = [error for _, error in results.values() if error]
+            return WindowResult(
+                **bounds,
+                overrides=None,
+                in_sample_metrics=None,
+                out_of_sample_metrics=None,
+                equity_curve=[
+                    {"timestamp": ts, "equity": self.params.initial_balance}
+                    for ts in out_frame.iso_timestamps()
+                ],
+                error_message=errors[0] if errors else None,
+            )
+
+        best = ranked[0]
+        outcome = build_outcome(out_frame, _slice_signals(self.signals[best], window.out_of_sample), self.params)
+        return WindowResult(
+            **bounds,
+            overrides=self.variants[best].overrides,
+            in_sample_metrics=results[best][0],
+            out_of_sample_metrics=outcome_metrics(outcome),
+            equity_curve=outcome.equity_curve_payload,
+        )
+
+
+_worker_task: Optional[_WindowTask] = None
+
+
+def _init_worker(task: _WindowTask) -> None:
+    global _worker_task
+    _worker_task = task
+
+
+def _run_window_in_worker(window: WalkForwardWindow) -> WindowResult:
+    return _worker_task.run(window)
+
+
+# ---------------------------------------------------------------------------
+# Stitching
+# ---------------------------------------------------------------------------
+
+
+def _stitch(results: list[WindowResult], params: BacktestParams) -> WalkForwardResult:
+    """Compound consecutive out-of-sample curves into one equity curve.
+
+    Each window's curve starts at the initial balance; it is rescaled so it
+    starts where the previous window ended.
+    """
+    initial = params.initial_balance
+    balance = initial
+    curve: list[dict] = []
+    for result in results:
+        scale = balance / initial
+        for point in result.equity_curve:
+            curve.append({"timestamp": point["timestamp"], "equity": round(point["equity"] * scale, 2)})
+        if result.equity_curve:
+            balance = result.equity_curve[-1]["equity"] * scale
+
+    equity = metrics.as_float_array([point["equity"] for point in curve])
+    return WalkForwardResult(
+        windows=results,
+        equity_curve=curve,
+        total_return_pct=round(metrics.total_return_pct(equity, initial), 2) if equity.size else 0.0,
+        max_drawdown_pct=round(metrics.max_drawdown_pct(equity, initial_peak=initial), 2),
+        sharpe_ratio=round(
+            metrics.sharpe_ratio(metrics.period_returns(equity), metrics.annualization_factor(params.timeframe)),
+            2,
+        ),
+        num_trades=sum(
+            result.out_of_sample_metrics["num_trades"] for result in results if result.out_of_sample_metrics
+        ),
+    )
@@ -32,6 +32,33 @@ class Settings(BaseSettings):
     default_spread_rate: float = 0.0002
     max_gap_candles: int = 5
 
+    # Parameter sweeps and walk-forward analyses (app/api/backtest_sweeps.py)
+    max_sweep_combinations: int = 200
+    sweep_max_workers: int = 4
+    max_walk_forward_windows: int = 52
+
+    # Monte Carlo analyses of completed runs (app/api/backtest_monte_carlo.py)
+    monte_carlo_simulations: int = 10_000
+
+    # Indicator maths (app/backtest/indicators.py): "numpy" kernels, or the
+    # "pandas_ta" reference implementation
+    indicator_backend: str = "numpy"
+
+    # Cross-run indicator cache (app/backtest/indicator_cache.py)
+    indicator_cache_max_mb: int = 256  # in-process tier, per process
+    indicator_cache_redis_enabled: bool = False
+    indicator_cache_redis_ttl_seconds: int = 24 * 3600
+    # Local memory-mapped archive of closed candles (app/backtest/candle_archive.py),
+    # one per worker host; empty disables it
+    candle_archive_dir: str = ""
+    # Backtest admission control (app/backtest/cost_estimate.py)
+    backtest_heavy_queue: str = "heavy"
+    # Calibrated with cost_estimate: a year of 1h bars estimates ~0.6s, five ~0.95s
+    # and ten (the premium maximum) ~1.4s, at most ~100 MB, for every template.
+    backtest_heavy_cpu_seconds: float = 0.75  # beyond ~3 years of 1h goes to the heavy queue
+    backtest_max_cpu_seconds: float = 5.0  # ~3.5x the costliest template at the plan maximum
+    backtest_max_memory_mb: float = 512.0  # ~5x the largest template at the plan maximum
+
     # Scheduler settings
     scheduler_hour_utc: int = 2  # 02:00 UTC default
     scheduler_enabled: bool = True
@@ -8,12 +8,14 @@ from fastapi.responses import JSONResponse
 from app.core.config import settings, validate_strategy_drafter_config
 from app.core.logging import setup_logging, correlation_id_var, generate_correlation_id
 from app.services.exceptions import DomainError
+from app.services.indicator_cache_store import configure_indicator_cache
 
 setup_logging()
 
 logger = logging.getLogger(__name__)
 
 validate_strategy_drafter_config(settings)
+configure_indicator_cache()
 
 from app.api.alerts import router as alerts_router
 from app.api.track import router as track_router
@@ -22,6 +24,8 @@ from app.api.lesson_completion import router as lesson_completion_router
 from app.api.auth import router as auth_router
 from app.api.backtests import router as backtests_router
 from app.api.backtest_batches import router as backtest_batches_router
+from app.api.backtest_sweeps import router as backtest_sweeps_router
+from app.api.backtest_monte_carlo import router as backtest_monte_carlo_router
 from app.api.backtest_compare import router as backtest_compare_router
 from app.api.backtest_coach import router as backtest_coach_router
 from app.api.backtest_data_quality import router as backtest_data_quality_router
@@ -107,6 +111,8 @@ app.include_router(backtests_router)
 app.include_router(backtest_compare_router)
 app.include_router(backtest_coach_router)
 app.include_router(backtest_batches_router)
+app.include_router(backtest_sweeps_router)
+app.include_router(backtest_monte_carlo_router)
 app.include_router(notifications_router)
 app.include_router(alerts_router)
 app.include_router(market_router)
@@ -0,0 +1,20 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlmodel import Field, SQLModel
+
+
+class AnalysisRun(SQLModel, table=True):
+    """Usage row for a queued parameter sweep or walk-forward analysis.
+
+    The analyses themselves live in Redis (app/services/sweep_store.py);
+    this row is what the daily backtest limit counts. ``id`` is the record's
+    sweep_id.
+    """
+
+    __tablename__ = "analysis_runs"
+
+    id: UUID = Field(primary_key=True)
+    user_id: UUID = Field(foreign_key="users.id", index=True)
+    kind: str = Field(max_length=20)  # "sweep" or "walk_forward"
+    created_at: datetime = Field(default_factory=datetime.utcnow)
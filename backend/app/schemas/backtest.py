@@ -1,9 +1,9 @@
 """Pydantic schemas for backtest endpoints."""
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 
 class BacktestCreateRequest(BaseModel):
@@ -52,6 +52,7 @@ class BacktestCreateResponse(BaseModel):
 
     run_id: UUID
     status: str
+    estimated_seconds: Optional[float] = None  # static compute estimate, excludes queue wait
 
 
 class BacktestSummary(BaseModel):
@@ -371,6 +372,7 @@ class BatchRunResult(BaseModel):
     run_id: Optional[UUID] = None
     status: str  # "pending" or "skipped"
     skip_reason: Optional[str] = None
+    estimated_seconds: Optional[float] = None
 
 
 class BatchBacktestCreateResponse(BaseModel):
@@ -385,3 +387,167 @@ class BatchStatusResponse(BaseModel):
 
     batch_id: UUID
     runs: list[BacktestStatusResponse]
+
+
+class SweepCreateRequest(BaseModel):
+    """Request body for a parameter sweep over one strategy and date range.
+
+    Provide either ``grid`` (``{"block_id.param": [values...]}``, expanded to
+    its cartesian product) or an explicit list of ``combinations``.
+    """
+
+    strategy_id: UUID
+    date_from: datetime
+    date_to: datetime
+    fee_rate: Optional[float] = None
+    slippage_rate: Optional[float] = None
+    spread_rate: Optional[float] = None
+    grid: dict[str, list[Any]] = Field(default_factory=dict)
+    combinations: list[dict[str, Any]] = Field(default_factory=list)
+    rank_by: str = "sharpe_ratio"
+
+    @field_validator("date_to")
+    @classmethod
+    def sweep_date_to_after_date_from(cls, v: datetime, info) -> datetime:
+        date_from = info.data.get("date_from")
+        if date_from and v <= date_from:
+            raise ValueError("date_to must be after date_from")
+        return v
+
+    @field_validator("fee_rate", "slippage_rate", "spread_rate")
+    @classmethod
+    def validate_sweep_rates(cls, v: Optional[float], info) -> Optional[float]:
+        if v is not None and (v < 0 or v > 0.1):
+            raise ValueError(f"{info.field_name} must be between 0 and 0.1 (10%)")
+        return v
+
+    @model_validator(mode="after")
+    def grid_or_combinations(self) -> "SweepCreateRequest":
+        if bool(self.grid) == bool(self.combinations):
+            raise ValueError("Provide exactly one of grid or combinations.")
+        if any(not values for values in self.grid.values()):
+            raise ValueError("Every grid parameter needs at least one value.")
+        return self
+
+
+class SweepCreateResponse(BaseModel):
+    """Response after enqueueing a parameter sweep."""
+
+    sweep_id: UUID
+    status: str
+    num_combinations: int
+
+
+class SweepRowResponse(BaseModel):
+    """One ranked combination of a sweep; failed combinations have no rank."""
+
+    rank: Optional[int] = None
+    overrides: dict[str, Any]
+    metrics: Optional[dict[str, Any]] = None
+    error_message: Optional[str] = None
+
+
+class SweepStatusResponse(BaseModel):
+    """Response for the sweep status polling endpoint."""
+
+    sweep_id: UUID
+    strategy_id: UUID
+    status: str
+    asset: str
+    timeframe: str
+    date_from: datetime
+    date_to: datetime
+    rank_by: str
+    num_combinations: int
+    rows: list[SweepRowResponse]
+    error_message: Optional[str] = None
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+
+
+class WalkForwardCreateRequest(SweepCreateRequest):
+    """Request body for a walk-forward analysis: a sweep re-run on rolling windows."""
+
+    in_sample_days: int = Field(ge=1)
+    out_of_sample_days: int = Field(ge=1)
+
+    @model_validator(mode="after")
+    def range_fits_one_window(self) -> "WalkForwardCreateRequest":
+        if (self.date_to - self.date_from).days <= self.in_sample_days:
+            raise ValueError("The date range must be longer than the in-sample window.")
+        return self
+
+
+class WalkForwardCreateResponse(BaseModel):
+    """Response after enqueueing a walk-forward analysis."""
+
+    walk_forward_id: UUID
+    status: str
+    num_combinations: int
+
+
+class WalkForwardWindowResponse(BaseModel):
+    """One walk-forward window: the in-sample winner and its out-of-sample result."""
+
+    index: int
+    in_sample_start: datetime
+    in_sample_end: datetime
+    out_of_sample_start: datetime
+    out_of_sample_end: datetime
+    overrides: Optional[dict[str, Any]] = None
+    in_sample_metrics: Optional[dict[str, Any]] = None
+    out_of_sample_metrics: Optional[dict[str, Any]] = None
+    error_message: Optional[str] = None
+
+
+class WalkForwardStatusResponse(BaseModel):
+    """Response for the walk-forward polling endpoint.
+
+    ``equity_curve`` is the stitched out-of-sample curve; the summary fields
+    are its metrics and stay null until the analysis completes.
+    """
+
+    walk_forward_id: UUID
+    strategy_id: UUID
+    status: str
+    asset: str
+    timeframe: str
+    date_from: datetime
+    date_to: datetime
+    rank_by: str
+    in_sample_days: int
+    out_of_sample_days: int
+    num_combinations: int
+    windows: list[WalkForwardWindowResponse]
+    equity_curve: list[EquityCurvePoint]
+    total_return_pct: Optional[float] = None
+    max_drawdown_pct: Optional[float] = None
+    sharpe_ratio: Optional[float] = None
+    num_trades: Optional[int] = None
+    error_message: Optional[str] = None
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+
+
+class MonteCarloDistributionResponse(BaseModel):
+    """Percentiles (keys ``p5`` ... ``p95``) of one resampling method."""
+
+    method: str  # shuffle | bootstrap
+    final_equity: dict[str, float]
+    max_drawdown_pct: dict[str, float]
+    max_consecutive_losses: dict[str, float]
+    probability_of_loss: float
+
+
+class MonteCarloStatusResponse(BaseModel):
+    """Response for the Monte Carlo endpoints; distributions are null until completed."""
+
+    run_id: UUID
+    status: str
+    num_simulations: int
+    num_trades: Optional[int] = None
+    shuffle: Optional[MonteCarloDistributionResponse] = None
+    bootstrap: Optional[MonteCarloDistributionResponse] = None
+    error_message: Optional[str] = None
+    created_at: datetime
+    completed_at: Optional[datetime] = None
@@ -9,14 +9,24 @@ from uuid import UUID
 
 from sqlmodel import Session, select, func
 
+from app.backtest.cost_estimate import RunCostEstimate, estimate_run_cost
+from app.backtest.errors import StrategyInvalidError
 from app.core.config import settings
 from app.core.plans import get_effective_limits
+from app.models.analysis_run import AnalysisRun
 from app.models.backtest_run import BacktestRun
 from app.models.notification import Notification
 from app.models.strategy import Strategy
 from app.models.strategy_version import StrategyVersion
 from app.models.user import User
-from app.services.exceptions import DailyLimitReached, HistoryDepthExceeded, StrategyHasNoVersions
+from app.schemas.strategy import StrategyDefinitionValidate
+from app.services.exceptions import (
+    DailyLimitReached,
+    HistoryDepthExceeded,
+    RunTooExpensive,
+    StrategyHasNoVersions,
+)
+from app.services.strategy_validation import validate_strategy
 
 logger = logging.getLogger(__name__)
 
@@ -34,17 +44,41 @@ class JobSpec:
     correlation_id: str | None
 
 
+@dataclass(frozen=True)
+class Admission:
+    # None when the definition does not validate; the worker reports why
+    estimate: RunCostEstimate | None
+    heavy: bool = False
+
+    @property
+    def eta_seconds(self) -> float | None:
+        return round(self.estimate.cpu_seconds, 1) if self.estimate is not None else None
+
+
 def _today_start() -> datetime:
     return datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
 
 
-def _count_today_backtests(user: User, session: Session) -> int:
-    return session.exec(
+def count_today_backtests(user_id: UUID, session: Session) -> int:
+    """Runs the daily limit counts for today (UTC): backtests plus sweep / walk-forward analyses."""
+    today_start = _today_start()
+    runs = session.exec(
         select(func.count(BacktestRun.id)).where(
-            BacktestRun.user_id == user.id,
-            BacktestRun.created_at >= _today_start(),
+            BacktestRun.user_id == user_id,
+            BacktestRun.created_at >= today_start,
+        )
+    ).one()
+    analyses = session.exec(
+        select(func.count(AnalysisRun.id)).where(
+            AnalysisRun.user_id == user_id,
+            AnalysisRun.created_at >= today_start,
         )
     ).one()
+    return runs + analyses
+
+
+def _count_today_backtests(user: User, session: Session) -> int:
+    return count_today_backtests(user.id, session)
 
 
 def check_daily_limit(user: User, session: Session, projected_count: int = 0) -> LimitState:
@@ -110,6 +144,32 @@ def enforce_history_depth(user: User, date_from: datetime, date_to: datetime) ->
         raise HistoryDepthExceeded(limit_days=effective_limits["max_history_days"])
 
 
+def admit_run(version: StrategyVersion, timeframe: str, date_from: datetime, date_to: datetime) -> Admission:
+    """Estimate a run's cost; raise RunTooExpensive over the limits, else say if it is heavy.
+
+    Heavy runs are enqueued on ``settings.backtest_heavy_queue`` so they do
+    not hold up cheap ones.
+    """
+    try:
+        definition = StrategyDefinitionValidate.model_validate(version.definition_json or {})
+        validation = validate_strategy(definition)
+        if validation.errors:
+            return Admission(estimate=None)
+        estimate = estimate_run_cost(validation.strategy, timeframe, date_from, date_to)
+    except (ValueError, StrategyInvalidError):
+        return Admission(estimate=None)
+
+    if estimate.cpu_seconds > settings.backtest_max_cpu_seconds:
+        raise RunTooExpensive(
+            f"estimated {estimate.cpu_seconds:.0f}s of compute, limit {settings.backtest_max_cpu_seconds:.0f}s"
+        )
+    if estimate.peak_memory_mb > settings.backtest_max_memory_mb:
+        raise RunTooExpensive(
+            f"estimated {estimate.peak_memory_mb:.0f} MB of memory, limit {settings.backtest_max_memory_mb:.0f} MB"
+        )
+    return Admission(estimate=estimate, heavy=estimate.cpu_seconds > settings.backtest_heavy_cpu_seconds)
+
+
 def latest_version(strategy: Strategy, session: Session) -> StrategyVersion:
     """Return the latest StrategyVersion, or raise StrategyHasNoVersions."""
     version = session.exec(
@@ -0,0 +1,36 @@
+"""Shared revisions of the local candle archive (app/backtest/candle_archive.py).
+
+Each worker host keeps its own segment files; one Redis counter per
+(asset, timeframe) tells every host whether its copy is still current.
+"""
+from pathlib import Path
+
+from redis import Redis
+
+from app.backtest.candle_archive import CandleArchive, set_candle_archive
+from app.core.config import settings
+
+
+class RedisArchiveRevisions:
+    KEY_PREFIX = "candle_archive:revision:"
+
+    def __init__(self, redis: Redis) -> None:
+        self._redis = redis
+
+    def get(self, asset: str, timeframe: str) -> int:
+        return int(self._redis.get(self._key(asset, timeframe)) or 0)
+
+    def bump(self, asset: str, timeframe: str) -> None:
+        self._redis.incr(self._key(asset, timeframe))
+
+    def _key(self, asset: str, timeframe: str) -> str:
+        return f"{self.KEY_PREFIX}{asset}:{timeframe}"
+
+
+def configure_candle_archive() -> bool:
+    """Install this process's candle archive when a directory is set; returns whether it is enabled."""
+    if not settings.candle_archive_dir:
+        return False
+    revisions = RedisArchiveRevisions(Redis.from_url(settings.redis_url))
+    set_candle_archive(CandleArchive(Path(settings.candle_archive_dir), revisions))
+    return True
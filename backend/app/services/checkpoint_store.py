@@ -0,0 +1,71 @@
+"""Redis-backed Engine checkpoints for recurring re-backtests.
+
+One checkpoint per (strategy version, asset, timeframe, start date, cost
+params): the next alert run over the same window extended by new candles
+resumes from it. A missing, expired or stale checkpoint only costs a full run.
+
+Checkpoints are stored as JSON of an explicit schema — the EngineSnapshot
+and PositionSnapshot fields — never as pickled objects. ``SCHEMA_VERSION``
+is part of the key: bump it whenever those fields change, and checkpoints
+written by an older deploy are simply never read.
+"""
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, ValidationError
+from redis import Redis
+
+from app.backtest.checkpoint import EngineCheckpoint
+from app.backtest.streaming import EngineSnapshot, StreamingBacktest
+from app.models.backtest_run import BacktestRun
+
+SCHEMA_VERSION = 1
+
+
+class CheckpointDocument(BaseModel):
+    """A stored EngineCheckpoint."""
+
+    # An untouched excursion trough is +inf
+    model_config = ConfigDict(ser_json_inf_nan="constants")
+
+    next_index: int
+    fingerprint: str
+    engine: EngineSnapshot
+
+
+class EngineCheckpointStore:
+    KEY_PREFIX = f"engine_checkpoint:v{SCHEMA_VERSION}:"
+    TTL = 2 * 24 * 3600  # seconds; windows start at UTC midnight, so a day's runs share one
+
+    def __init__(self, redis: Redis) -> None:
+        self._redis = redis
+
+    def _key(self, run: BacktestRun) -> str:
+        date_from = run.date_from.isoformat() if isinstance(run.date_from, datetime) else str(run.date_from)
+        return (
+            f"{self.KEY_PREFIX}{run.strategy_version_id}:{run.asset}:{run.timeframe}:{date_from}:"
+            f"{run.initial_balance!r}:{run.fee_rate!r}:{run.slippage_rate!r}:{run.spread_rate!r}"
+        )
+
+    def read(self, run: BacktestRun) -> EngineCheckpoint | None:
+        """The stored checkpoint, or None when there is none or it does not match the schema."""
+        raw = self._redis.get(self._key(run))
+        if raw is None:
+            return None
+        try:
+            document = CheckpointDocument.model_validate_json(raw)
+        except ValidationError:
+            return None
+        return EngineCheckpoint(
+            next_index=document.next_index,
+            fingerprint=document.fingerprint,
+            engine=StreamingBacktest.restore(document.engine),
+        )
+
+    def write(self, run: BacktestRun, checkpoint: EngineCheckpoint) -> None:
+        """Persist the checkpoint, replacing the previous one for the same window."""
+        document = CheckpointDocument(
+            next_index=checkpoint.next_index,
+            fingerprint=checkpoint.fingerprint,
+            engine=checkpoint.engine.snapshot(),
+        )
+        self._redis.set(self._key(run), document.model_dump_json(), ex=self.TTL)
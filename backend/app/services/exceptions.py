@@ -57,6 +57,22 @@ class HistoryDepthExceeded(DomainError):
         }
 
 
+class RunTooExpensive(DomainError):
+    status_code = 422
+
+    def __init__(self, reason: str) -> None:
+        self.reason = reason
+        super().__init__(f"Backtest over the admission limits: {reason}")
+
+    def detail(self) -> dict:
+        return {
+            "detail": (
+                f"This backtest is too large to run ({self.reason}). "
+                "Shorten the date range, use a longer timeframe or remove blocks."
+            )
+        }
+
+
 class StrategyHasNoVersions(DomainError):
     status_code = 400
 
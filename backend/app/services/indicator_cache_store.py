@@ -0,0 +1,37 @@
+"""Redis tier of the cross-run indicator cache.
+
+Series are stored as the compact binary of ``encode_series`` under one key
+per output port, so the API and every worker process share what any of them
+computed. Keys embed the candle fingerprint and never go stale; the TTL only
+bounds memory.
+"""
+from typing import Optional, Sequence
+
+from redis import Redis
+
+from app.backtest.indicator_cache import shared_indicator_cache
+from app.core.config import settings
+
+
+class RedisIndicatorTier:
+    KEY_PREFIX = "indicator_cache:"
+
+    def __init__(self, redis: Redis, ttl: int = 24 * 3600) -> None:
+        self._redis = redis
+        self.ttl = ttl
+
+    def read(self, keys: Sequence[str]) -> list[Optional[bytes]]:
+        return self._redis.mget([self.KEY_PREFIX + key for key in keys])
+
+    def write(self, entries: dict[str, bytes]) -> None:
+        pipe = self._redis.pipeline(transaction=False)
+        for key, blob in entries.items():
+            pipe.set(self.KEY_PREFIX + key, blob, ex=self.ttl)
+        pipe.execute()
+
+
+def configure_indicator_cache() -> None:
+    """Attach the Redis tier to this process's shared cache when enabled in settings."""
+    if settings.indicator_cache_redis_enabled:
+        tier = RedisIndicatorTier(Redis.from_url(settings.redis_url), ttl=settings.indicator_cache_redis_ttl_seconds)
+        shared_indicator_cache().attach_remote(tier)
@@ -0,0 +1,94 @@
+"""Parameter sweep variants — apply per-combination overrides to a strategy.
+
+An override key is ``"<block_id>.<param>"`` and works for catalogue blocks and
+risk blocks alike. Every combination is re-run through ``validate_strategy``
+so catalogue range checks apply and RiskParams are re-extracted from the
+overridden risk blocks. Zero I/O.
+"""
+from __future__ import annotations
+
+from typing import Any, Mapping, Sequence
+
+from app.backtest.catalogue import lookup as catalogue_lookup
+from app.backtest.optimization import SweepVariant
+from app.backtest.types import ValidatedStrategy, ValidationResult
+from app.schemas.strategy import Block, Connection, StrategyDefinitionValidate, ValidationError
+from app.services.exceptions import StrategyValidationError
+from app.services.strategy_validation import validate_strategy
+from app.validation.error_messages import get_error_message
+
+# Overridable params of the non-catalogue risk blocks (see _extract_risk_params).
+_RISK_BLOCK_PARAMS: dict[str, frozenset[str]] = {
+    "position_size": frozenset({"value"}),
+    "take_profit": frozenset({"take_profit_pct", "levels"}),
+    "stop_loss": frozenset({"stop_loss_pct"}),
+    "max_drawdown": frozenset({"max_drawdown_pct"}),
+    "time_exit": frozenset({"bars"}),
+    "trailing_stop": frozenset({"trail_pct"}),
+}
+
+
+def _allowed_params(block_type: str) -> frozenset[str]:
+    handler = catalogue_lookup(block_type)
+    if handler is not None:
+        return frozenset(p.name for p in handler.spec.params)
+    return _RISK_BLOCK_PARAMS.get(block_type, frozenset())
+
+
+def _override_error(key: str, block_id: str | None = None) -> ValidationError:
+    user_msg, help_link = get_error_message("INVALID_OVERRIDE", key=key)
+    return ValidationError(
+        block_id=block_id,
+        code="INVALID_OVERRIDE",
+        message=f"Override key does not match a block parameter: {key}",
+        user_message=user_msg,
+        help_link=help_link,
+    )
+
+
+def apply_overrides(strategy: ValidatedStrategy, overrides: Mapping[str, Any]) -> ValidationResult:
+    """Return the validation result of ``strategy`` with ``overrides`` applied."""
+    blocks = {b["id"]: {**b, "params": dict(b.get("params", {}))} for b in strategy.blocks}
+    errors: list[ValidationError] = []
+
+    for key, value in overrides.items():
+        block_id, _, param = key.rpartition(".")
+        block = blocks.get(block_id)
+        if block is None or param not in _allowed_params(block["type"]):
+            errors.append(_override_error(key, block_id or None))
+            continue
+        block["params"][param] = value
+        # A flat take-profit override must win over a configured ladder.
+        if block["type"] == "take_profit" and param == "take_profit_pct":
+            block["params"].pop("levels", None)
+
+    if errors:
+        return ValidationResult(errors=tuple(errors))
+
+    definition = StrategyDefinitionValidate(
+        blocks=[Block.model_validate(b) for b in blocks.values()],
+        connections=[Connection.model_validate(c) for c in strategy.connections],
+    )
+    return validate_strategy(definition)
+
+
+def build_sweep_variants(
+    strategy: ValidatedStrategy,
+    combinations: Sequence[Mapping[str, Any]],
+) -> list[SweepVariant]:
+    """Validate every combination up front; one invalid combination rejects the sweep.
+
+    Raises StrategyValidationError carrying the errors of every failing
+    combination.
+    """
+    variants: list[SweepVariant] = []
+    errors: list[ValidationError] = []
+    for overrides in combinations:
+        result = apply_overrides(strategy, overrides)
+        if result.errors:
+            errors.extend(result.errors)
+            continue
+        variants.append(SweepVariant(overrides=dict(overrides), strategy=result.strategy))
+    if errors:
+        raise StrategyValidationError(errors)
+    return variants
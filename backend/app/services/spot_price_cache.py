@@ -1,10 +1,16 @@
-"""Single-writer spot-price cache backed by Redis."""
+"""Single-writer spot-price cache backed by Redis.
+
+Next to the prices sits the volatility snapshot: per asset the 30-day
+stddev volatility, the 30-day ATR in price units and the one-year
+percentile rank, computed by the worker from daily candles. ATR% depends
+on the live price, so ``read_tickers`` derives it when merging.
+"""
 import json
 from datetime import datetime, timezone
 
 from redis import Redis
 
-from app.schemas.market import TickerListResponse
+from app.schemas.market import TickerItem, TickerListResponse
 
 
 class SpotPriceCache:
@@ -12,6 +18,7 @@ class SpotPriceCache:
     LAST_VIEWED_KEY = "spot:last_viewed"
     REFRESH_PENDING_KEY = "spot:refresh_pending"
     REFRESH_PENDING_TTL = 5  # seconds
+    VOLATILITY_KEY = "spot:volatility"
 
     def __init__(self, redis: Redis) -> None:
         self._redis = redis
@@ -25,6 +32,22 @@ class SpotPriceCache:
         data["as_of"] = datetime.fromisoformat(data["as_of"])
         return TickerListResponse(**data)
 
+    def read_tickers(self) -> TickerListResponse | None:
+        """Return last-known prices merged with the volatility snapshot, or None on cold cache.
+
+        One MGET for both keys; assets missing from the snapshot (or no
+        snapshot yet) carry None volatility fields.
+        """
+        raw_prices, raw_volatility = self._redis.mget([self.PRICES_KEY, self.VOLATILITY_KEY])
+        if raw_prices is None:
+            return None
+        data = json.loads(raw_prices)
+        metrics = json.loads(raw_volatility)["assets"] if raw_volatility is not None else {}
+        return TickerListResponse(
+            items=[_with_volatility(item, metrics.get(item["pair"])) for item in data["items"]],
+            as_of=datetime.fromisoformat(data["as_of"]),
+        )
+
     def write(self, response: TickerListResponse) -> None:
         """Persist prices with a fresh asOf timestamp. No TTL — persists forever."""
         as_of = datetime.now(timezone.utc)
@@ -32,6 +55,15 @@ class SpotPriceCache:
         data["as_of"] = as_of.isoformat()
         self._redis.set(self.PRICES_KEY, json.dumps(data))
 
+    def write_volatility(self, metrics: dict[str, dict]) -> None:
+        """Persist the volatility snapshot (asset -> volatility_stddev, atr, volatility_percentile_1y)."""
+        data = {"assets": metrics, "as_of": datetime.now(timezone.utc).isoformat()}
+        self._redis.set(self.VOLATILITY_KEY, json.dumps(data))
+
+    def has_volatility(self) -> bool:
+        """True once the worker has written a volatility snapshot."""
+        return bool(self._redis.exists(self.VOLATILITY_KEY))
+
     def mark_viewed(self) -> None:
         """Record that the ticker endpoint was just viewed."""
         self._redis.set(self.LAST_VIEWED_KEY, datetime.now(timezone.utc).isoformat())
@@ -57,3 +89,19 @@ class SpotPriceCache:
             ex=self.REFRESH_PENDING_TTL,
         )
         return result is True
+
+
+_NO_VOLATILITY = {"volatility_stddev": None, "volatility_atr_pct": None, "volatility_percentile_1y": None}
+
+
+def _with_volatility(item: dict, metrics: dict | None) -> TickerItem:
+    """A cached price item with the snapshot's volatility; ATR% against the item's price."""
+    if metrics is None:
+        return TickerItem(**{**item, **_NO_VOLATILITY})
+    atr, price = metrics["atr"], item["price"]
+    return TickerItem(**{
+        **item,
+        "volatility_stddev": metrics["volatility_stddev"],
+        "volatility_atr_pct": (atr / price) * 100 if atr is not None and price > 0 else None,
+        "volatility_percentile_1y": metrics["volatility_percentile_1y"],
+    })
@@ -9,17 +9,16 @@ positions, which remain the `GraphCompiler`'s responsibility.
 
 `StrategyDrafter` is the seam later slices and providers swap into —
 sibling of the Price Provider seam (ADR-0003).
+
+The provider SDKs (`anthropic`, `openai`, `instructor`) are imported when a
+client is built or a provider error is caught, not with this module — they
+are most of the API's import time and the stub drafter never needs them.
 """
 from __future__ import annotations
 
 import logging
 from typing import Any, Protocol
 
-import anthropic
-import instructor
-import openai
-from instructor.core import InstructorRetryException
-
 from app.core.config import STRATEGY_DRAFTER_PROVIDER_KEYS, settings
 from app.schemas.strategy import ValidationError
 from app.schemas.strategy_draft_ir import (
@@ -44,7 +43,12 @@ _INFRA_FAILURE_MESSAGE = "Couldn't draft a strategy right now. Please try again
 # distinct from a `declined` refusal. `anthropic.APIError` and
 # `openai.APIError` (which OpenRouter also raises, via the OpenAI SDK) cover
 # the full provider-error class for their respective SDKs.
-_INFRA_FAILURE_EXCEPTIONS = (anthropic.APIError, openai.APIError, InstructorRetryException)
+def _infra_failure_exceptions() -> tuple[type[BaseException], ...]:
+    import anthropic
+    import openai
+    from instructor.core import InstructorRetryException
+
+    return (anthropic.APIError, openai.APIError, InstructorRetryException)
 
 
 class StrategyDrafterError(Exception):
@@ -200,7 +204,7 @@ class LLMStrategyDrafter:
                 ],
             )
             return result, _token_usage_from_completion(completion)
-        except _INFRA_FAILURE_EXCEPTIONS as exc:
+        except _infra_failure_exceptions() as exc:
             logger.error("Strategy drafter call failed: %s", exc, exc_info=True)
             raise StrategyDrafterError(_INFRA_FAILURE_MESSAGE) from exc
 
@@ -220,7 +224,7 @@ class LLMStrategyDrafter:
                 ],
             )
             return result, _token_usage_from_completion(completion)
-        except _INFRA_FAILURE_EXCEPTIONS as exc:
+        except _infra_failure_exceptions() as exc:
             logger.error("Strategy drafter repair call failed: %s", exc, exc_info=True)
             raise StrategyDrafterError(_INFRA_FAILURE_MESSAGE) from exc
 
@@ -229,6 +233,10 @@ _OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 
 
 def _build_instructor_client(provider: str, api_key: str) -> Any:
+    import anthropic
+    import instructor
+    import openai
+
     base_url = settings.strategy_drafter_base_url or None
 
     if provider == "anthropic":
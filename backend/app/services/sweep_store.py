@@ -0,0 +1,124 @@
+"""Redis-backed records for parameter sweeps, walk-forward and Monte Carlo analyses.
+
+None has a BacktestRun row or S3 artifacts of its own: the request, status and
+result live in one JSON document per analysis that expires after a week.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, ClassVar, Generic, Optional, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+from redis import Redis
+
+from app.core.config import settings
+
+
+class SweepRecord(BaseModel):
+    """Everything the worker needs to run a sweep, plus its ranked table."""
+
+    sweep_id: UUID
+    user_id: UUID
+    strategy_id: UUID
+    strategy_version_id: UUID
+    asset: str
+    timeframe: str
+    date_from: datetime
+    date_to: datetime
+    initial_balance: float
+    fee_rate: float
+    slippage_rate: float
+    spread_rate: float
+    combinations: list[dict[str, Any]]
+    rank_by: str
+    status: str = "pending"  # pending | running | completed | failed
+    rows: list[dict[str, Any]] = Field(default_factory=list)
+    error_message: Optional[str] = None
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+
+
+class WalkForwardRecord(SweepRecord):
+    """A sweep re-run per rolling window; ``rows`` stays empty.
+
+    ``windows`` holds one dict per WindowResult (minus its equity curve) and
+    ``summary`` the stitched out-of-sample metrics.
+    """
+
+    in_sample_days: int
+    out_of_sample_days: int
+    windows: list[dict[str, Any]] = Field(default_factory=list)
+    equity_curve: list[dict[str, Any]] = Field(default_factory=list)
+    summary: Optional[dict[str, Any]] = None
+
+
+class MonteCarloRecord(BaseModel):
+    """Monte Carlo analysis of one completed run, cached under the run id.
+
+    The run's trades never change, so one record per run serves every later
+    request; ``result`` holds the MonteCarloResult as a dict.
+    """
+
+    run_id: UUID
+    user_id: UUID
+    num_simulations: int
+    status: str = "pending"  # pending | running | completed | failed
+    result: Optional[dict[str, Any]] = None
+    error_message: Optional[str] = None
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+
+
+RecordT = TypeVar("RecordT", bound=BaseModel)
+
+
+class _RecordStore(Generic[RecordT]):
+    KEY_PREFIX: ClassVar[str]
+    RECORD: ClassVar[type[BaseModel]]
+    ID_FIELD: ClassVar[str] = "sweep_id"
+    TTL = 7 * 24 * 3600  # seconds
+
+    def __init__(self, redis: Redis) -> None:
+        self._redis = redis
+
+    def _key(self, record_id: UUID) -> str:
+        return f"{self.KEY_PREFIX}{record_id}"
+
+    def read(self, record_id: UUID) -> RecordT | None:
+        raw = self._redis.get(self._key(record_id))
+        if raw is None:
+            return None
+        return self.RECORD.model_validate_json(raw)
+
+    def write(self, record: RecordT) -> None:
+        """Persist the record, refreshing its TTL."""
+        self._redis.set(self._key(getattr(record, self.ID_FIELD)), record.model_dump_json(), ex=self.TTL)
+
+
+class SweepStore(_RecordStore[SweepRecord]):
+    KEY_PREFIX = "sweep:"
+    RECORD = SweepRecord
+
+
+class WalkForwardStore(_RecordStore[WalkForwardRecord]):
+    KEY_PREFIX = "walk_forward:"
+    RECORD = WalkForwardRecord
+
+
+class MonteCarloStore(_RecordStore[MonteCarloRecord]):
+    KEY_PREFIX = "monte_carlo:"
+    RECORD = MonteCarloRecord
+    ID_FIELD = "run_id"
+
+
+def get_sweep_store() -> SweepStore:
+    return SweepStore(Redis.from_url(settings.redis_url))
+
+
+def get_walk_forward_store() -> WalkForwardStore:
+    return WalkForwardStore(Redis.from_url(settings.redis_url))
+
+
+def get_monte_carlo_store() -> MonteCarloStore:
+    return MonteCarloStore(Redis.from_url(settings.redis_url))
@@ -68,6 +68,10 @@ ERROR_MESSAGES = {
         "message": "Time Exit bars must be at least 1.",
         "help_link": "/strategy-guide#risk-management",
     },
+    "INVALID_OVERRIDE": {
+        "message": "Sweep parameter '{key}' doesn't match any block setting in this strategy. Use the form block_id.setting.",
+        "help_link": None,
+    },
 }
 
 
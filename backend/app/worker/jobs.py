@@ -1,8 +1,9 @@
 """RQ job functions for backtest processing."""
 import logging
 import time
+from dataclasses import asdict
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Callable, Sequence
 from uuid import UUID
 
 import httpx
@@ -23,16 +24,36 @@ from app.models.notification import Notification
 from app.models.strategy import Strategy
 from app.models.strategy_version import StrategyVersion
 from app.models.user import User
+from app.backtest.candle_reader import read_candles
 from app.backtest.candles import fetch_candles
 from app.backtest.data_quality import compute_daily_metrics, check_has_issues
-from app.backtest.pipeline import BacktestParams, run_pipeline
-from app.backtest.storage import upload_json, generate_results_key
+from app.backtest.pipeline import BacktestParams, RunOutcome, build_outcomes, run_pipeline
+from app.backtest.storage import download_json, upload_json, generate_results_key
 from app.backtest.errors import BacktestError, StrategyInvalidError
-from app.schemas.strategy import StrategyDefinitionValidate
+from app.backtest.candle_frame import CandleFrame
+from app.backtest.monte_carlo import position_pnls, run_monte_carlo
+from app.backtest.indicator_cache import shared_indicator_cache
+from app.backtest.interpreter import StrategySignals, interpret_strategy
+from app.backtest.optimization import SweepVariant, run_sweep
+from app.backtest.types import ValidatedStrategy
+from app.backtest.trades_artifact import load_trades
+from app.backtest.walk_forward import run_walk_forward
+from app.schemas.strategy import StrategyDefinitionValidate, ValidationError
 from app.services.alert_evaluator import evaluate_alerts_for_run
+from app.services.backtest_service import count_today_backtests
 from app.services.candle_boundary import last_closed_candle_ts
+from app.services.checkpoint_store import EngineCheckpointStore
 from app.services.run_finalization import finalize_run
+from app.services.exceptions import StrategyValidationError
+from app.services.parameter_sweep import build_sweep_variants
 from app.services.spot_price_cache import SpotPriceCache
+from app.services.sweep_store import (
+    MonteCarloStore,
+    SweepRecord,
+    SweepStore,
+    WalkForwardRecord,
+    WalkForwardStore,
+)
 from app.services.analytics import track_backend_event, flush_backend_events
 from app.services.strategy_validation import validate_strategy
 from app.models.alert_rule import AlertType
@@ -49,6 +70,121 @@ def _as_utc_datetime(value: datetime | None) -> datetime | None:
     return value.astimezone(timezone.utc)
 
 
+def _validated_strategy(definition: dict | None) -> ValidatedStrategy:
+    """Parse and validate a frozen definition, raising StrategyInvalidError.
+
+    Pure CPU — called before any candle fetch so invalid strategies fail fast.
+    """
+    if not definition:
+        raise BacktestError(
+            "Strategy definition is empty",
+            "Invalid strategy: no block configuration found.",
+        )
+
+    try:
+        parsed = StrategyDefinitionValidate.model_validate(definition)
+    except Exception:
+        raise StrategyInvalidError(
+            "Strategy definition structure is malformed",
+            "Strategy validation failed: definition structure is malformed.",
+        )
+
+    validation_result = validate_strategy(parsed)
+    if validation_result.errors:
+        raise _strategy_invalid(validation_result.errors)
+    return validation_result.strategy
+
+
+def _strategy_invalid(errors: Sequence[ValidationError]) -> StrategyInvalidError:
+    first = errors[0]
+    extra = len(errors) - 1
+    user_msg = (
+        f"{first.user_message} (+{extra} more issues)"
+        if extra > 0
+        else first.user_message
+    )
+    return StrategyInvalidError(
+        f"Strategy validation failed: {first.message}",
+        user_msg,
+    )
+
+
+def _store_outcome(run: BacktestRun, outcome: RunOutcome) -> None:
+    """Upload the outcome's artifacts and copy its metrics onto the run row.
+
+    Marks the run completed; the caller adds it to the session and commits.
+    """
+    # Persist used_backup_data flag determined by pipeline
+    if outcome.used_backup_data:
+        run.used_backup_data = True
+
+    # Upload artifact payloads and capture S3 keys
+    equity_curve_key = generate_results_key(run.id, "equity_curve.json")
+    upload_json(equity_curve_key, outcome.equity_curve_payload)
+
+    benchmark_curve_key = generate_results_key(run.id, "benchmark_equity_curve.json")
+    upload_json(benchmark_curve_key, outcome.benchmark_curve_payload)
+
+    trades_key = generate_results_key(run.id, "trades.json")
+    upload_json(trades_key, outcome.trades_payload)
+
+    # Copy metrics from outcome onto the run row
+    run.status = "completed"
+    run.total_return = outcome.total_return_pct
+    run.cagr = outcome.cagr_pct
+    run.max_drawdown = outcome.max_drawdown_pct
+    run.num_trades = outcome.num_trades
+    run.win_rate = outcome.win_rate_pct
+    run.benchmark_return = outcome.benchmark_return_pct
+    run.alpha = outcome.alpha
+    run.beta = outcome.beta
+    run.sharpe_ratio = outcome.sharpe_ratio
+    run.sortino_ratio = outcome.sortino_ratio
+    run.calmar_ratio = outcome.calmar_ratio
+    run.max_consecutive_losses = outcome.max_consecutive_losses
+    run.gross_return_usd = outcome.gross_return_usd
+    run.gross_return_pct = outcome.gross_return_pct
+    run.total_fees_usd = outcome.total_fees_usd
+    run.total_slippage_usd = outcome.total_slippage_usd
+    run.total_spread_usd = outcome.total_spread_usd
+    run.total_costs_usd = outcome.total_costs_usd
+    run.cost_pct_gross_return = outcome.cost_pct_gross_return
+    run.avg_cost_per_trade_usd = outcome.avg_cost_per_trade_usd
+    run.equity_curve_key = equity_curve_key
+    run.benchmark_equity_curve_key = benchmark_curve_key
+    run.trades_key = trades_key
+    run.updated_at = datetime.now(timezone.utc)
+
+
+def _run_checkpointed(
+    run: BacktestRun,
+    strategy: ValidatedStrategy,
+    candles: CandleFrame,
+    params: BacktestParams,
+) -> RunOutcome:
+    """run_pipeline resuming from the checkpoint the previous run over this window left.
+
+    Recurring alert runs re-test the same window extended by the candles that
+    closed since, so only those are simulated. The checkpoint store is a
+    cache: if Redis is unavailable the run simply starts from the first bar.
+    """
+    store = EngineCheckpointStore(Redis.from_url(settings.redis_url))
+    try:
+        checkpoint = store.read(run)
+    except Exception as exc:
+        logger.warning("engine_checkpoint_read_failed", extra={"error": str(exc)})
+        checkpoint = None
+
+    outcome = run_pipeline(strategy, candles, params, resume_from=checkpoint, capture_checkpoint=True)
+
+    if outcome.checkpoint is not None:
+        try:
+            store.write(run, outcome.checkpoint)
+        except Exception as exc:
+            logger.warning("engine_checkpoint_write_failed", extra={"error": str(exc)})
+    return outcome
+
+
 def run_backtest_job(
     run_id: str,
     force_refresh_prices: bool = False,
@@ -134,37 +270,8 @@ def run_backtest_job(
                         "Invalid strategy configuration.",
                     )
 
-                definition = version.definition_json
-                if not definition:
-                    raise BacktestError(
-                        "Strategy definition is empty",
-                        "Invalid strategy: no block configuration found.",
-                    )
-
                 # Validate before fetching candles (pure CPU — no I/O cost)
-                try:
-                    parsed = StrategyDefinitionValidate.model_validate(definition)
-                except Exception:
-                    raise StrategyInvalidError(
-                        "Strategy definition structure is malformed",
-                        "Strategy validation failed: definition structure is malformed.",
-                    )
-
-                validation_result = validate_strategy(parsed)
-                if validation_result.errors:
-                    first = validation_result.errors[0]
-                    extra = len(validation_result.errors) - 1
-                    user_msg = (
-                        f"{first.user_message} (+{extra} more issues)"
-                        if extra > 0
-                        else first.user_message
-                    )
-                    raise StrategyInvalidError(
-                        f"Strategy validation failed: {first.message}",
-                        user_msg,
-                    )
-
-                validated_strategy = validation_result.strategy
+                validated_strategy = _validated_strategy(version.definition_json)
 
                 logger.info(
                     "backtest_processing",
@@ -196,7 +303,10 @@ def run_backtest_job(
                     spread_rate=run.spread_rate,
                     timeframe=run.timeframe,
                 )
-                outcome = run_pipeline(validated_strategy, candles, params)
+                if run.triggered_by == "alert":
+                    outcome = _run_checkpointed(run, validated_strategy, candles, params)
+                else:
+                    outcome = run_pipeline(validated_strategy, candles, params)
 
                 logger.info(
                     "backtest_pipeline_complete",
@@ -205,50 +315,11 @@ def run_backtest_job(
                         "total_return_pct": outcome.total_return_pct,
                         "used_backup_data": outcome.used_backup_data,
                         "benchmark_return_pct": outcome.benchmark_return_pct,
+                        "indicator_cache": shared_indicator_cache().stats(),
                     },
                 )
 
-                # Persist used_backup_data flag determined by pipeline
-                if outcome.used_backup_data:
-                    run.used_backup_data = True
-                    session.add(run)
-
-                # Upload artifact payloads and capture S3 keys
-                equity_curve_key = generate_results_key(run.id, "equity_curve.json")
-                upload_json(equity_curve_key, outcome.equity_curve_payload)
-
-                benchmark_curve_key = generate_results_key(run.id, "benchmark_equity_curve.json")
-                upload_json(benchmark_curve_key, outcome.benchmark_curve_payload)
-
-                trades_key = generate_results_key(run.id, "trades.json")
-                upload_json(trades_key, outcome.trades_payload)
-
-                # Copy metrics from outcome onto the run row
-                run.status = "completed"
-                run.total_return = outcome.total_return_pct
-                run.cagr = outcome.cagr_pct
-                run.max_drawdown = outcome.max_drawdown_pct
-                run.num_trades = outcome.num_trades
-                run.win_rate = outcome.win_rate_pct
-                run.benchmark_return = outcome.benchmark_return_pct
-                run.alpha = outcome.alpha
-                run.beta = outcome.beta
-                run.sharpe_ratio = outcome.sharpe_ratio
-                run.sortino_ratio = outcome.sortino_ratio
-                run.calmar_ratio = outcome.calmar_ratio
-                run.max_consecutive_losses = outcome.max_consecutive_losses
-                run.gross_return_usd = outcome.gross_return_usd
-                run.gross_return_pct = outcome.gross_return_pct
-                run.total_fees_usd = outcome.total_fees_usd
-                run.total_slippage_usd = outcome.total_slippage_usd
-                run.total_spread_usd = outcome.total_spread_usd
-                run.total_costs_usd = outcome.total_costs_usd
-                run.cost_pct_gross_return = outcome.cost_pct_gross_return
-                run.avg_cost_per_trade_usd = outcome.avg_cost_per_trade_usd
-                run.equity_curve_key = equity_curve_key
-                run.benchmark_equity_curve_key = benchmark_curve_key
-                run.trades_key = trades_key
-                run.updated_at = datetime.now(timezone.utc)
+                _store_outcome(run, outcome)
                 session.add(run)
 
                 session.commit()
@@ -324,6 +395,389 @@ def run_backtest_job(
         flush_backend_events(shutdown=True)
 
 
+def run_backtest_group_job(
+    run_ids: list[str],
+    correlation_id: str | None = None,
+) -> None:
+    """
+    Job function for pending runs that share asset, timeframe and date range
+    (the nightly auto-update batch, see auto_update_strategies_daily).
+
+    Candles are fetched once, indicators are shared across the strategies and
+    the Engine simulates every strategy in a single pass over the candles
+    (build_outcomes). Each run is then stored and finalized exactly as
+    run_backtest_job would; a strategy that fails validation or
+    interpretation fails only its own run.
+    """
+    cid_token = correlation_id_var.set(correlation_id or ",".join(run_ids))
+
+    try:
+        with Session(engine) as session:
+            loaded = {
+                run.id: run
+                for run in session.exec(
+                    select(BacktestRun).where(BacktestRun.id.in_([UUID(r) for r in run_ids]))
+                ).all()
+            }
+            runs = [
+                loaded[UUID(r)] for r in run_ids if UUID(r) in loaded and loaded[UUID(r)].status == "pending"
+            ]
+            if not runs:
+                logger.info("backtest_group_skipped", extra={"run_ids": run_ids})
+                return
+
+            for run in runs:
+                run.status = "running"
+                run.started_at = datetime.now(timezone.utc)
+                run.updated_at = run.started_at
+                session.add(run)
+            session.commit()
+            started_at = time.monotonic()
+            first = runs[0]
+
+            def fail(run: BacktestRun, message: str) -> None:
+                run.status = "failed"
+                run.error_message = message
+                run.updated_at = datetime.now(timezone.utc)
+                session.add(run)
+
+            try:
+                candles = fetch_candles(
+                    asset=first.asset,
+                    timeframe=first.timeframe,
+                    date_from=first.date_from,
+                    date_to=first.date_to,
+                    session=session,
+                )
+                cache = shared_indicator_cache().view(candles)
+                ready: list[tuple[BacktestRun, StrategySignals]] = []
+                for run in runs:
+                    try:
+                        version = session.get(StrategyVersion, run.strategy_version_id)
+                        if not version:
+                            raise BacktestError(
+                                "Strategy version not found",
+                                "Invalid strategy configuration.",
+                            )
+                        strategy = _validated_strategy(version.definition_json)
+                        ready.append((run, interpret_strategy(strategy, candles, indicator_cache=cache)))
+                    except BacktestError as e:
+                        logger.error("backtest_error", extra={"run_id": str(run.id), "error": e.message})
+                        fail(run, e.user_message)
+
+                outcomes = build_outcomes(
+                    candles,
+                    [signals for _, signals in ready],
+                    [
+                        BacktestParams(
+                            initial_balance=run.initial_balance,
+                            fee_rate=run.fee_rate,
+                            slippage_rate=run.slippage_rate,
+                            spread_rate=run.spread_rate,
+                            timeframe=run.timeframe,
+                        )
+                        for run, _ in ready
+                    ],
+                )
+                for (run, _), outcome in zip(ready, outcomes):
+                    _store_outcome(run, outcome)
+                    session.add(run)
+                session.commit()
+
+            except BacktestError as e:
+                logger.error("backtest_group_error", extra={"error": e.message})
+                for run in runs:
+                    if run.status == "running":
+                        fail(run, e.user_message)
+                session.commit()
+
+            except Exception:
+                logger.exception("backtest_group_unexpected_error")
+                for run in runs:
+                    if run.status != "failed":
+                        fail(run, "An unexpected error occurred during backtest processing.")
+                session.commit()
+
+            duration_ms = int((time.monotonic() - started_at) * 1000)
+            logger.info(
+                "backtest_group_completed",
+                extra={
+                    "num_runs": len(runs),
+                    "num_completed": sum(run.status == "completed" for run in runs),
+                    "duration_ms": duration_ms,
+                },
+            )
+            for run in runs:
+                event_user = session.get(User, run.user_id)
+                track_backend_event(
+                    "backtest_job_completed" if run.status == "completed" else "backtest_job_failed",
+                    user_id=run.user_id,
+                    strategy_id=run.strategy_id,
+                    correlation_id=run.id,
+                    duration_ms=duration_ms,
+                    consent_declined=event_user is not None and event_user.analytics_consent is False,
+                )
+
+            for run in runs:
+                if run.status != "completed":
+                    continue
+                try:
+                    finalize_run(run, session)
+                except Exception:
+                    logger.exception(
+                        "run_finalization_failed",
+                        extra={
+                            "run_id": str(run.id),
+                            "user_id": str(run.user_id),
+                            "strategy_id": str(run.strategy_id),
+                        },
+                    )
+    finally:
+        correlation_id_var.reset(cid_token)
+        flush_backend_events(shutdown=True)
+
+
+def run_parameter_sweep_job(
+    sweep_id: str,
+    correlation_id: str | None = None,
+) -> None:
+    """
+    Job function for a parameter sweep (POST /backtests/sweeps).
+
+    Runs every combination over one candle fetch and stores the ranked table
+    on the Redis sweep record. Nothing is written to the database or S3.
+    """
+
+    def compute(record: SweepRecord, variants: list[SweepVariant], candles: CandleFrame, params: BacktestParams) -> None:
+        rows = run_sweep(
+            variants,
+            candles,
+            params,
+            rank_by=record.rank_by,
+            max_workers=settings.sweep_max_workers,
+        )
+        record.rows = [
+            {
+                "rank": row.rank,
+                "overrides": row.overrides,
+                "metrics": row.metrics,
+                "error_message": row.error_message,
+            }
+            for row in rows
+        ]
+
+    _run_sweep_record(
+        SweepStore(Redis.from_url(settings.redis_url)), sweep_id, correlation_id, "parameter_sweep", compute,
+    )
+
+
+def run_walk_forward_job(
+    walk_forward_id: str,
+    correlation_id: str | None = None,
+) -> None:
+    """
+    Job function for a walk-forward analysis (POST /backtests/walk-forward).
+
+    One candle fetch and one indicator cache serve every window; windows run
+    in parallel workers. Results land on the Redis walk-forward record.
+    """
+
+    def compute(
+        record: WalkForwardRecord, variants: list[SweepVariant], candles: CandleFrame, params: BacktestParams,
+    ) -> None:
+        result = run_walk_forward(
+            variants,
+            candles,
+            params,
+            in_sample_days=record.in_sample_days,
+            out_of_sample_days=record.out_of_sample_days,
+            rank_by=record.rank_by,
+            max_workers=settings.sweep_max_workers,
+        )
+        record.windows = [
+            {
+                "index": w.index,
+                "in_sample_start": w.in_sample_start.isoformat(),
+                "in_sample_end": w.in_sample_end.isoformat(),
+                "out_of_sample_start": w.out_of_sample_start.isoformat(),
+                "out_of_sample_end": w.out_of_sample_end.isoformat(),
+                "overrides": w.overrides,
+                "in_sample_metrics": w.in_sample_metrics,
+                "out_of_sample_metrics": w.out_of_sample_metrics,
+                "error_message": w.error_message,
+            }
+            for w in result.windows
+        ]
+        record.equity_curve = result.equity_curve
+        record.summary = {
+            "total_return_pct": result.total_return_pct,
+            "max_drawdown_pct": result.max_drawdown_pct,
+            "sharpe_ratio": result.sharpe_ratio,
+            "num_trades": result.num_trades,
+        }
+
+    _run_sweep_record(
+        WalkForwardStore(Redis.from_url(settings.redis_url)), walk_forward_id, correlation_id, "walk_forward", compute,
+    )
+
+
+def _run_sweep_record(
+    store: SweepStore | WalkForwardStore,
+    record_id: str,
+    correlation_id: str | None,
+    event: str,
+    compute: Callable[[Any, list[SweepVariant], CandleFrame, BacktestParams], None],
+) -> None:
+    """Shared lifecycle of the Redis-record analysis jobs.
+
+    pending -> running -> completed | failed. Loads and validates the frozen
+    strategy version, builds the sweep variants and fetches candles once,
+    then hands them to ``compute``, which fills the result fields in place.
+    """
+    cid_token = correlation_id_var.set(correlation_id or record_id)
+
+    try:
+        record = store.read(UUID(record_id))
+        if record is None:
+            logger.error(f"{event}_not_found", extra={"record_id": record_id})
+            return
+        if record.status != "pending":
+            logger.info(f"{event}_skipped", extra={"status": record.status})
+            return
+
+        record.status = "running"
+        store.write(record)
+        started_at = time.monotonic()
+
+        try:
+            with Session(engine) as session:
+                version = session.get(StrategyVersion, record.strategy_version_id)
+                if not version:
+                    raise BacktestError(
+                        "Strategy version not found",
+                        "Invalid strategy configuration.",
+                    )
+                strategy = _validated_strategy(version.definition_json)
+                try:
+                    variants = build_sweep_variants(strategy, record.combinations)
+                except StrategyValidationError as e:
+                    raise _strategy_invalid(e.errors)
+
+                candles = fetch_candles(
+                    asset=record.asset,
+                    timeframe=record.timeframe,
+                    date_from=record.date_from,
+                    date_to=record.date_to,
+                    session=session,
+                )
+
+            params = BacktestParams(
+                initial_balance=record.initial_balance,
+                fee_rate=record.fee_rate,
+                slippage_rate=record.slippage_rate,
+                spread_rate=record.spread_rate,
+                timeframe=record.timeframe,
+            )
+            compute(record, variants, candles, params)
+
+            record.status = "completed"
+            logger.info(
+                f"{event}_completed",
+                extra={
+                    "record_id": record_id,
+                    "num_combinations": len(variants),
+                    "duration_ms": int((time.monotonic() - started_at) * 1000),
+                },
+            )
+
+        except BacktestError as e:
+            logger.error(f"{event}_error", extra={"record_id": record_id, "error": e.message})
+            record.status = "failed"
+            record.error_message = e.user_message
+
+        except Exception:
+            logger.exception(f"{event}_unexpected_error", extra={"record_id": record_id})
+            record.status = "failed"
+            record.error_message = "An unexpected error occurred during the analysis."
+
+        record.completed_at = datetime.now(timezone.utc)
+        store.write(record)
+    finally:
+        correlation_id_var.reset(cid_token)
+
+
+def run_monte_carlo_job(
+    run_id: str,
+    correlation_id: str | None = None,
+) -> None:
+    """
+    Job function for a Monte Carlo analysis (POST /backtests/{run_id}/monte-carlo).
+
+    Replays the run's trades.json as shuffled and bootstrapped paths and stores
+    the percentiles on the Redis record cached under the run id. The RNG is
+    seeded from the run id, so a recomputed analysis matches the cached one.
+    """
+    cid_token = correlation_id_var.set(correlation_id or run_id)
+    store = MonteCarloStore(Redis.from_url(settings.redis_url))
+
+    try:
+        record = store.read(UUID(run_id))
+        if record is None:
+            logger.error("monte_carlo_not_found", extra={"run_id": run_id})
+            return
+        if record.status != "pending":
+            logger.info("monte_carlo_skipped", extra={"status": record.status})
+            return
+
+        record.status = "running"
+        store.write(record)
+        started_at = time.monotonic()
+
+        try:
+            with Session(engine) as session:
+                run = session.get(BacktestRun, record.run_id)
+                if not run or run.status != "completed":
+                    raise BacktestError(
+                        "Backtest run not found or not completed",
+                        "Monte Carlo analysis needs a completed backtest run.",
+                    )
+                initial_balance = run.initial_balance
+                trades_key = run.trades_key
+
+            trades = load_trades(download_json(trades_key)) if trades_key else []
+            result = run_monte_carlo(
+                position_pnls(trades),
+                initial_balance,
+                num_simulations=record.num_simulations,
+                seed=record.run_id.int,
+            )
+            record.result = asdict(result)
+            record.status = "completed"
+            logger.info(
+                "monte_carlo_completed",
+                extra={
+                    "run_id": run_id,
+                    "num_trades": result.num_trades,
+                    "duration_ms": int((time.monotonic() - started_at) * 1000),
+                },
+            )
+
+        except BacktestError as e:
+            logger.error("monte_carlo_error", extra={"run_id": run_id, "error": e.message})
+            record.status = "failed"
+            record.error_message = e.user_message
+
+        except Exception:
+            logger.exception("monte_carlo_unexpected_error", extra={"run_id": run_id})
+            record.status = "failed"
+            record.error_message = "An unexpected error occurred during the analysis."
+
+        record.completed_at = datetime.now(timezone.utc)
+        store.write(record)
+    finally:
+        correlation_id_var.reset(cid_token)
+
+
 def _dispatch_performance_alerts(
     timeframes: list[str], label: str, now: datetime | None = None
 ) -> None:
@@ -405,7 +859,11 @@ def _dispatch_performance_alerts(
             if not user:
                 continue
 
-            date_from = cutoff_ts - timedelta(days=strategy.auto_update_lookback_days)
+            # Start at UTC midnight so every run on the same day shares its
+            # start date and resumes from the previous run's Engine checkpoint.
+            date_from = (cutoff_ts - timedelta(days=strategy.auto_update_lookback_days)).replace(
+                hour=0, minute=0, second=0, microsecond=0
+            )
 
             run = BacktestRun(
                 user_id=alert.user_id,
@@ -479,7 +937,9 @@ def auto_update_strategies_daily() -> None:
        - Count user's backtests today (check limits)
        - Check for existing pending/running auto-runs (idempotency)
        - If OK, create BacktestRun with triggered_by='auto'
-       - Enqueue job
+    3. Enqueue one job per (asset, timeframe, date range) group: a lone run
+       gets run_backtest_job, a larger group one run_backtest_group_job that
+       simulates all its strategies in a single pass over the candles.
     """
     if not settings.scheduler_enabled:
         logger.info("Scheduler is disabled, skipping auto_update_strategies_daily")
@@ -506,20 +966,17 @@ def auto_update_strategies_daily() -> None:
         }
 
         # Count today's backtests per user
-        today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
         user_backtest_counts: dict[str, int] = {}
         for user_id in user_ids:
-            count = session.exec(
-                select(func.count(BacktestRun.id)).where(
-                    BacktestRun.user_id == user_id,
-                    BacktestRun.created_at >= today_start,
-                )
-            ).one()
-            user_backtest_counts[str(user_id)] = count
+            user_backtest_counts[str(user_id)] = count_today_backtests(user_id, session)
 
         enqueued = 0
         skipped_limit = 0
         skipped_existing = 0
+        # One date range for the whole batch so strategies with the same
+        # lookback land in the same group.
+        now = datetime.now(timezone.utc)
+        groups: dict[tuple[str, str, int], list[BacktestRun]] = {}
 
         for strategy in strategies:
             user = users.get(strategy.user_id)
@@ -561,7 +1018,6 @@ def auto_update_strategies_daily() -> None:
                 continue
 
             # Calculate date range
-            now = datetime.now(timezone.utc)
             date_to = now
             date_from = now - timedelta(days=strategy.auto_update_lookback_days)
 
@@ -586,21 +1042,33 @@ def auto_update_strategies_daily() -> None:
 
             # Increment user count for next iteration
             user_backtest_counts[user_id_str] = current_count + 1
+            groups.setdefault(
+                (strategy.asset, strategy.timeframe, strategy.auto_update_lookback_days), []
+            ).append(run)
 
-            # Enqueue job
+        for runs in groups.values():
             try:
-                queue.enqueue(
-                    "app.worker.jobs.run_backtest_job",
-                    str(run.id),
-                    job_timeout=300,
-                )
-                enqueued += 1
-                logger.info(f"Enqueued auto-backtest for strategy {strategy.id}, run {run.id}")
+                if len(runs) == 1:
+                    queue.enqueue(
+                        "app.worker.jobs.run_backtest_job",
+                        str(runs[0].id),
+                        job_timeout=300,
+                    )
+                else:
+                    queue.enqueue(
+                        "app.worker.jobs.run_backtest_group_job",
+                        [str(run.id) for run in runs],
+                        job_timeout=300 + 60 * len(runs),
+                    )
+                enqueued += len(runs)
+                for run in runs:
+                    logger.info(f"Enqueued auto-backtest for strategy {run.strategy_id}, run {run.id}")
             except Exception as e:
-                logger.error(f"Failed to enqueue job for strategy {strategy.id}: {e}")
-                run.status = "failed"
-                run.error_message = "Failed to queue backtest job"
-                session.add(run)
+                logger.error(f"Failed to enqueue job for runs {[str(run.id) for run in runs]}: {e}")
+                for run in runs:
+                    run.status = "failed"
+                    run.error_message = "Failed to queue backtest job"
+                    session.add(run)
                 session.commit()
 
     logger.info(f"auto_update_strategies_daily completed: {enqueued} enqueued, {skipped_limit} skipped (limit), {skipped_existing} skipped (existing)")
@@ -950,6 +1418,7 @@ def refresh_spot_prices() -> None:
 
     Runs every 120 seconds. Skipped when there are no active price alerts AND
     the ticker endpoint has not been viewed in the last 240 seconds (gate).
+    Writes the first volatility snapshot when none exists yet.
     """
     if not settings.scheduler_enabled:
         logger.info("Scheduler disabled, skipping refresh_spot_prices")
@@ -983,6 +1452,120 @@ def refresh_spot_prices() -> None:
         f"({len(items)} fresh this cycle)"
     )
 
+    if not cache.has_volatility():
+        _write_volatility_snapshot(cache)
+
+
+VOLATILITY_WINDOW = 30  # daily candles per stddev / ATR window
+VOLATILITY_HISTORY_DAYS = 365
+
+
+def _daily_candles(session: Session, asset: str) -> CandleFrame:
+    """Up to a year of daily candles for an asset, oldest first (empty on error)."""
+    try:
+        return read_candles(session, asset, "1d", newest_first=True, limit=VOLATILITY_HISTORY_DAYS)
+    except Exception as exc:
+        logger.error("Failed to fetch daily candles for %s: %s", asset, exc)
+        return CandleFrame.empty()
+
+
+def _compute_volatility_metrics(session: Session, assets: Sequence[str]) -> dict[str, dict]:
+    """Volatility snapshot entries for ``assets`` from stored daily candles.
+
+    Per asset: volatility_stddev, atr (price units; the cache derives ATR%
+    from the live price) and volatility_percentile_1y, each None when there
+    is too little history. Assets with fewer than VOLATILITY_WINDOW candles
+    are left out. The percentile ranks come from one vectorised pass.
+    """
+    from app.backtest.volatility import (
+        calculate_atr,
+        calculate_stddev_volatility,
+        calculate_volatility_percentiles,
+    )
+
+    candles_by_asset = {asset: _daily_candles(session, asset) for asset in assets}
+    candles_by_asset = {a: c for a, c in candles_by_asset.items() if len(c) >= VOLATILITY_WINDOW}
+    closes_by_asset = {asset: candles.close.tolist() for asset, candles in candles_by_asset.items()}
+
+    try:
+        percentiles = calculate_volatility_percentiles(
+            closes_by_asset, window=VOLATILITY_WINDOW, history_days=VOLATILITY_HISTORY_DAYS
+        )
+    except Exception as exc:
+        logger.error("Failed to calculate volatility percentiles: %s", exc)
+        percentiles = {}
+
+    metrics: dict[str, dict] = {}
+    for asset, candles in candles_by_asset.items():
+        closes = closes_by_asset[asset]
+        try:
+            metrics[asset] = {
+                "volatility_stddev": calculate_stddev_volatility(closes, window=VOLATILITY_WINDOW),
+                "atr": calculate_atr(
+                    candles.high.tolist(), candles.low.tolist(), closes, window=VOLATILITY_WINDOW
+                ),
+                "volatility_percentile_1y": percentiles.get(asset),
+            }
+        except Exception as exc:
+            logger.error("Failed to calculate volatility for %s: %s", asset, exc)
+    return metrics
+
+
+def _write_volatility_snapshot(cache: SpotPriceCache) -> None:
+    """Compute the volatility snapshot for every allowed asset and store it in ``cache``."""
+    from app.schemas.strategy import ALLOWED_ASSETS
+
+    with Session(engine) as session:
+        metrics = _compute_volatility_metrics(session, ALLOWED_ASSETS)
+    cache.write_volatility(metrics)
+    logger.info(f"refresh_volatility_snapshot: wrote volatility for {len(metrics)} assets")
+
+
+def refresh_volatility_snapshot() -> None:
+    """Recompute the volatility snapshot the ticker endpoint merges with spot prices.
+
+    Runs daily after the candle update; refresh_spot_prices also writes one
+    when none exists yet, so a fresh deployment does not wait a day.
+    """
+    if not settings.scheduler_enabled:
+        logger.info("Scheduler disabled, skipping refresh_volatility_snapshot")
+        return
+
+    from app.services.spot_price_cache import SpotPriceCache
+
+    _write_volatility_snapshot(SpotPriceCache(Redis.from_url(settings.redis_url)))
+
+
+def sync_candle_archive() -> int:
+    """Bring this host's candle archive segments up to the stored closed candles.
+
+    Runs at worker start. Only segments already on disk are synced (the
+    rest are built on first use by fetch_candles), and archives are per
+    host, so this is not a scheduled job. Returns the candles written.
+    """
+    from app.backtest.candle_archive import candle_archive
+    from app.backtest.candles import sync_archived_candles
+    from app.schemas.strategy import ALLOWED_ASSETS, ALLOWED_TIMEFRAMES
+
+    archive = candle_archive()
+    if archive is None:
+        return 0
+    written = 0
+    with Session(engine) as session:
+        for asset in ALLOWED_ASSETS:
+            for timeframe in ALLOWED_TIMEFRAMES:
+                if not archive.path(asset, timeframe).exists():
+                    continue
+                try:
+                    written += sync_archived_candles(archive, session, asset, timeframe)
+                except Exception as exc:
+                    logger.warning(
+                        "candle_archive_failed",
+                        extra={"asset": asset, "timeframe": timeframe, "error": str(exc)},
+                    )
+    logger.info("Synced candle archive: %d candles written", written)
+    return written
+
 
 def _merge_with_cached(fresh: list[Any], cached: Any) -> list[Any]:
     """Overlay freshly fetched ticker items on top of the cached snapshot.
@@ -8,6 +8,8 @@ from rq_scheduler import Scheduler
 
 from app.core.config import settings
 from app.core.logging import setup_logging
+from app.services.candle_archive_store import configure_candle_archive
+from app.services.indicator_cache_store import configure_indicator_cache
 
 setup_logging()
 logger = logging.getLogger(__name__)
@@ -17,12 +19,23 @@ redis_conn = Redis.from_url(settings.redis_url)
 SPOT_REFRESH_INTERVAL_SECONDS = 120
 SPOT_REFRESH_JOB_ID = "spot_price_refresh"
 PRICE_ALERTS_INTERVAL_SECONDS = 120
+VOLATILITY_SNAPSHOT_JOB_ID = "volatility_snapshot_daily"
 PRICE_ALERTS_JOB_ID = "price_alerts_monitor"
 
 
-def run_worker():
-    """Run the RQ worker to process jobs."""
-    queues = [Queue("default", connection=redis_conn)]
+def run_worker(queue_names: tuple[str, ...] = ("default", settings.backtest_heavy_queue)):
+    """Run the RQ worker to process jobs.
+
+    Queues are served in order, so a default worker only takes heavy
+    backtests when the default queue is empty; ``heavy`` workers take
+    nothing else.
+    """
+    configure_indicator_cache()
+    if configure_candle_archive():
+        from app.worker.jobs import sync_candle_archive
+
+        sync_candle_archive()
+    queues = [Queue(name, connection=redis_conn) for name in queue_names]
     worker = Worker(queues)
     worker.work()
 
@@ -40,6 +53,7 @@ def run_scheduler():
         "performance_alerts_daily",
         "performance_alerts_sub_daily",
         "price_alerts_monitor",
+        VOLATILITY_SNAPSHOT_JOB_ID,
         SPOT_REFRESH_JOB_ID,
     }
     for job in scheduler.get_jobs():
@@ -66,6 +80,15 @@ def run_scheduler():
     )
     logger.info("Registered data_quality_daily cron job at 03:00 UTC")
 
+    # Schedule the ticker volatility snapshot at 03:30 UTC (after the daily candles are in)
+    scheduler.cron(
+        "30 3 * * *",
+        func="app.worker.jobs.refresh_volatility_snapshot",
+        queue_name="default",
+        id=VOLATILITY_SNAPSHOT_JOB_ID,
+    )
+    logger.info(f"Registered {VOLATILITY_SNAPSHOT_JOB_ID} cron job at 03:30 UTC")
+
     # Schedule performance alert dispatcher daily at 04:00 UTC (after candles are settled)
     scheduler.cron(
         "0 4 * * *",
@@ -124,5 +147,7 @@ if __name__ == "__main__":
 
     if mode == "scheduler":
         run_scheduler()
+    elif mode == "heavy":
+        run_worker((settings.backtest_heavy_queue,))
     else:
         run_worker()
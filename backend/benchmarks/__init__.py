@@ -0,0 +1,13 @@
+"""Backtest performance benchmarks.
+
+Times each stage of the Backtest pipeline for every strategy template over
+deterministic synthetic candles and compares the result to a stored
+baseline. Run from the backend directory:
+
+    python -m benchmarks                   # 1k, 10k, 100k bars vs baseline.json
+    python -m benchmarks --sizes 1000000   # add the 1M-bar run
+    python -m benchmarks --update-baseline
+    python -m benchmarks.imports           # cold-start import profile
+
+Not collected by pytest; tests/test_benchmarks.py covers the harness itself.
+"""
@@ -0,0 +1,94 @@
+"""Command-line entry point: ``python -m benchmarks --help``."""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from benchmarks import baseline, calibration
+from benchmarks.candles import SIZES, synthetic_frame
+from benchmarks.stages import template_strategies, time_template
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES[:3]), help="bar counts to run")
+    parser.add_argument("--templates", nargs="+", help="only templates whose name contains one of these")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage; the best is kept")
+    parser.add_argument("--baseline", type=Path, default=baseline.DEFAULT_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before flagging")
+    parser.add_argument(
+        "--memory-tolerance", type=float, default=0.25, help="allowed peak memory growth before flagging"
+    )
+    parser.add_argument("--update-baseline", action="store_true", help="store these timings as the baseline")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit 1 if any stage regressed")
+    parser.add_argument("--calibrate", action="store_true", help="compare the run cost estimate with measurements")
+    args = parser.parse_args(argv)
+
+    strategies = [
+        (name, strategy)
+        for name, strategy in template_strategies()
+        if not args.templates or any(part.lower() in name.lower() for part in args.templates)
+    ]
+
+    if args.calibrate:
+        return _calibrate(args.sizes, strategies, args.repeat)
+
+    timings = []
+    for bars in args.sizes:
+        frame = synthetic_frame(bars)
+        for name, strategy in strategies:
+            timings.extend(time_template(name, strategy, frame, repeat=args.repeat))
+
+    comparisons = baseline.compare(
+        timings, baseline.load(args.baseline), args.tolerance, args.memory_tolerance
+    )
+    print(
+        f"{'template':<34} {'bars':>9} {'stage':<16} {'ms':>10} {'bars/s':>12} {'peak MiB':>9} "
+        f"{'vs base':>8} {'mem vs':>8}"
+    )
+    for c in comparisons:
+        t = c.timing
+        ratio = f"{c.ratio:.2f}x" if c.ratio is not None else "-"
+        memory_ratio = f"{c.memory_ratio:.2f}x" if c.memory_ratio is not None else "-"
+        flags = [label for label, hit in (("SLOWER", c.slower), ("MORE MEMORY", c.more_memory)) if hit]
+        flag = f"  {', '.join(flags)}" if flags else ""
+        print(
+            f"{t.template[:34]:<34} {t.bars:>9} {t.stage:<16} {t.seconds * 1000:>10.2f} "
+            f"{t.bars_per_second:>12,.0f} {t.peak_bytes / 2**20:>9.2f} {ratio:>8} {memory_ratio:>8}{flag}"
+        )
+
+    regressions = [c for c in comparisons if c.regressed]
+    if args.update_baseline:
+        baseline.save(timings, args.baseline)
+        print(f"baseline written to {args.baseline}")
+    elif regressions:
+        slower = sum(c.slower for c in comparisons)
+        larger = sum(c.more_memory for c in comparisons)
+        print(
+            f"{slower} stage(s) more than {args.tolerance:.0%} slower and {larger} more than "
+            f"{args.memory_tolerance:.0%} larger than the baseline"
+        )
+    return 1 if regressions and args.fail_on_regression and not args.update_baseline else 0
+
+
+def _calibrate(sizes: list[int], strategies: list, repeat: int) -> int:
+    """Print measured block costs, then estimated vs measured cost per template."""
+    print(f"{'block':<22} {'ns/bar':>9} {'B/bar':>8}   ({max(sizes):,} bars)")
+    for block in calibration.block_costs(synthetic_frame(max(sizes)), repeat=repeat):
+        print(f"{block.block_type:<22} {block.ns_per_bar:>9,.0f} {block.bytes_per_bar:>8,.0f}")
+
+    print(f"\n{'template':<34} {'bars':>9} {'est s':>9} {'meas s':>9} {'est MiB':>9} {'meas MiB':>9}")
+    for bars in sizes:
+        frame = synthetic_frame(bars)
+        for name, strategy in strategies:
+            c = calibration.template_cost(name, strategy, frame, repeat=repeat)
+            print(
+                f"{c.template[:34]:<34} {c.bars:>9} {c.estimated_seconds:>9.3f} {c.measured_seconds:>9.3f} "
+                f"{c.estimated_mb:>9.1f} {c.measured_mb:>9.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
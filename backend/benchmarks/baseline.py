@@ -0,0 +1,108 @@
+"""Stored baseline timings and memory, and regression comparison.
+
+The baseline is a JSON file mapping ``"<template>|<bars>|<stage>"`` to
+seconds and to peak traced bytes, plus the interpreter/NumPy versions and
+machine it was recorded on. Timings only compare meaningfully on the same
+machine: record a baseline before a change, then run again after it. Peak
+memory depends much less on the machine, but is only flagged like timings.
+"""
+from __future__ import annotations
+
+import json
+import platform
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+
+from benchmarks.stages import StageTiming
+
+DEFAULT_PATH = Path(__file__).with_name("baseline.json")
+
+# Stages faster or smaller than these are noise and never flagged.
+NOISE_FLOOR_SECONDS = 0.002
+NOISE_FLOOR_BYTES = 256 * 1024
+
+
+@dataclass(frozen=True)
+class Baseline:
+    seconds: dict[str, float] = field(default_factory=dict)
+    peak_bytes: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class Comparison:
+    timing: StageTiming
+    baseline_seconds: Optional[float]
+    baseline_peak_bytes: Optional[int]
+    slower: bool
+    more_memory: bool
+
+    @property
+    def regressed(self) -> bool:
+        return self.slower or self.more_memory
+
+    @property
+    def ratio(self) -> Optional[float]:
+        if not self.baseline_seconds:
+            return None
+        return self.timing.seconds / self.baseline_seconds
+
+    @property
+    def memory_ratio(self) -> Optional[float]:
+        if not self.baseline_peak_bytes:
+            return None
+        return self.timing.peak_bytes / self.baseline_peak_bytes
+
+
+def _key(timing: StageTiming) -> str:
+    return f"{timing.template}|{timing.bars}|{timing.stage}"
+
+
+def load(path: Path = DEFAULT_PATH) -> Baseline:
+    if not path.exists():
+        return Baseline()
+    document = json.loads(path.read_text())
+    return Baseline(document["timings"], document.get("peak_bytes", {}))
+
+
+def save(timings: Sequence[StageTiming], path: Path = DEFAULT_PATH) -> None:
+    """Write ``timings`` over the matching entries of the baseline at ``path``."""
+    stored = load(path)
+    seconds = {**stored.seconds, **{_key(t): round(t.seconds, 6) for t in timings}}
+    peak_bytes = {**stored.peak_bytes, **{_key(t): t.peak_bytes for t in timings}}
+    document = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "timings": dict(sorted(seconds.items())),
+        "peak_bytes": dict(sorted(peak_bytes.items())),
+    }
+    path.write_text(json.dumps(document, indent=2) + "\n")
+
+
+def compare(
+    timings: Sequence[StageTiming],
+    baseline: Baseline,
+    tolerance: float = 0.25,
+    memory_tolerance: float = 0.25,
+) -> list[Comparison]:
+    """Flag stages more than ``tolerance`` slower, or ``memory_tolerance`` larger, than the baseline."""
+    comparisons = []
+    for timing in timings:
+        key = _key(timing)
+        seconds = baseline.seconds.get(key)
+        peak_bytes = baseline.peak_bytes.get(key)
+        slower = (
+            seconds is not None
+            and timing.seconds > NOISE_FLOOR_SECONDS
+            and timing.seconds > seconds * (1 + tolerance)
+        )
+        more_memory = (
+            peak_bytes is not None
+            and timing.peak_bytes > NOISE_FLOOR_BYTES
+            and timing.peak_bytes > peak_bytes * (1 + memory_tolerance)
+        )
+        comparisons.append(Comparison(timing, seconds, peak_bytes, slower, more_memory))
+    return comparisons
@@ -0,0 +1,93 @@
+"""Measurements behind the run cost estimate (app/backtest/cost_estimate.py).
+
+``block_costs`` times every catalogue block on its own; ``template_costs``
+sets the estimate for each template against the timed pipeline. Copy
+measured block costs into ``BLOCK_COSTS`` when a kernel changes.
+"""
+from __future__ import annotations
+
+import time
+import tracemalloc
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.backtest.candle_frame import CandleFrame
+from app.backtest.catalogue import CATALOGUE
+from app.backtest.catalogue.types import ArrayContext, SeriesArray, compute_arrays
+from app.backtest.cost_estimate import JOB_OVERHEAD_SECONDS, estimate_plan_cost
+from app.backtest.execution_plan import plan_for
+from app.backtest.types import ValidatedStrategy
+from benchmarks.stages import PARAMS, _stages, time_template
+
+
+@dataclass(frozen=True)
+class BlockTiming:
+    block_type: str
+    ns_per_bar: float
+    bytes_per_bar: float  # tracemalloc peak, outputs included
+
+
+@dataclass(frozen=True)
+class TemplateCost:
+    template: str
+    bars: int
+    estimated_seconds: float  # without JOB_OVERHEAD_SECONDS, which the stages do not include
+    measured_seconds: float
+    estimated_mb: float
+    measured_mb: float  # tracemalloc peak of one run through every stage
+
+
+def block_costs(frame: CandleFrame, repeat: int = 5) -> list[BlockTiming]:
+    """Every catalogue block with default params and all ports over ``frame``."""
+    n = len(frame)
+    candle_data = frame.candle_data()
+    rng = np.random.default_rng(0)
+    # Logic and signal blocks read their inputs as truthy numbers
+    series = SeriesArray.floats(rng.random(n) - 0.5)
+
+    timings = []
+    for block_type, handler in CATALOGUE.items():
+        ctx = ArrayContext(
+            candle_data=candle_data,
+            params={param.name: param.default for param in handler.spec.params},
+            inputs={port.name: series for port in handler.spec.inputs},
+            n=n,
+        )
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            compute_arrays(handler, ctx)
+            best = min(best, time.perf_counter() - started)
+        tracemalloc.start()
+        try:
+            compute_arrays(handler, ctx)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        timings.append(BlockTiming(block_type, best / n * 1e9, peak / n))
+    return timings
+
+
+def template_cost(name: str, strategy: ValidatedStrategy, frame: CandleFrame, repeat: int = 3) -> TemplateCost:
+    """The estimate for ``strategy`` over ``frame`` against the timed pipeline."""
+    estimate = estimate_plan_cost(plan_for(strategy), len(frame))
+    timings = time_template(name, strategy, frame, repeat=repeat)
+
+    state: dict = {}
+    tracemalloc.start()
+    try:
+        for stage in _stages(strategy, frame[:], PARAMS):
+            stage(state)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return TemplateCost(
+        template=name,
+        bars=len(frame),
+        estimated_seconds=estimate.cpu_seconds - JOB_OVERHEAD_SECONDS,
+        measured_seconds=sum(t.seconds for t in timings),
+        estimated_mb=estimate.peak_memory_mb,
+        measured_mb=peak / 2**20,
+    )
@@ -0,0 +1,135 @@
+"""Cold-start import profile for the API and worker processes.
+
+Imports a module in a fresh interpreter under ``-X importtime`` and reports
+wall time, peak RSS, the slowest imports and whether any of the heavy
+packages that are meant to load on first use came in with it. Run from the
+backend directory:
+
+    python -m benchmarks.imports                # app.main and app.worker.main
+    python -m benchmarks.imports app.main --top 40
+
+The command exits non-zero when a module is over its ``BUDGETS`` entry.
+tests/test_cold_start.py checks only the eager imports and the RSS bound,
+because wall time varies with machine load.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Packages only some requests or jobs need: indicator maths, LLM drafting, billing.
+LAZY_PACKAGES: tuple[str, ...] = ("pandas", "pandas_ta_classic", "anthropic", "openai", "instructor", "stripe")
+
+
+@dataclass(frozen=True)
+class Budget:
+    seconds: float
+    rss_mb: float
+
+
+# Measured at about 1.3 s / 130 MiB (API) and 0.3 s / 60 MiB (worker); the
+# headroom absorbs slower machines, not new eager imports.
+BUDGETS: dict[str, Budget] = {
+    "app.main": Budget(seconds=2.5, rss_mb=190),
+    "app.worker.main": Budget(seconds=1.5, rss_mb=120),
+}
+
+# VmHWM rather than ru_maxrss where there is /proc: Linux carries ru_maxrss
+# over exec, so a probe started from a large process (pytest) reports its size.
+_PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+__import__(sys.argv[1])
+seconds = time.perf_counter() - start
+try:
+    with open("/proc/self/status") as status:
+        rss_kb = next(int(line.split()[1]) for line in status if line.startswith("VmHWM:"))
+except OSError:
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({
+    "seconds": seconds,
+    "rss_kb": rss_kb,
+    "packages": sorted({name.partition(".")[0] for name in sys.modules}),
+}))
+"""
+
+
+@dataclass(frozen=True)
+class ColdImport:
+    module: str
+    seconds: float
+    rss_mb: float
+    packages: frozenset[str]
+    slowest: tuple[tuple[str, float], ...]  # (module, cumulative seconds), slowest first
+
+    @property
+    def lazy_loaded(self) -> list[str]:
+        """Packages from LAZY_PACKAGES that the import pulled in."""
+        return [p for p in LAZY_PACKAGES if p in self.packages]
+
+
+def cold_import(module: str, top: int = 20) -> ColdImport:
+    """Import ``module`` in a fresh interpreter and measure it."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE, module],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr[-2000:]}")
+    probe = json.loads(proc.stdout.strip().splitlines()[-1])
+    return ColdImport(
+        module=module,
+        seconds=probe["seconds"],
+        rss_mb=probe["rss_kb"] / 1024,
+        packages=frozenset(probe["packages"]),
+        slowest=_slowest(proc.stderr, module, top),
+    )
+
+
+def _slowest(importtime: str, module: str, top: int) -> tuple[tuple[str, float], ...]:
+    """Parse ``-X importtime`` lines (``import time: self | cumulative | name``)."""
+    entries = []
+    for line in importtime.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        if cumulative.strip().isdigit() and name != module:
+            entries.append((name, int(cumulative) / 1e6))
+    entries.sort(key=lambda e: e[1], reverse=True)
+    return tuple(entries[:top])
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.imports", description=__doc__)
+    parser.add_argument("modules", nargs="*", default=list(BUDGETS), help="modules to import cold")
+    parser.add_argument("--top", type=int, default=20, help="slowest imports to list")
+    args = parser.parse_args(argv)
+
+    over = False
+    for module in args.modules:
+        result = cold_import(module, args.top)
+        budget = BUDGETS.get(module)
+        limit = f" (budget {budget.seconds:.1f} s / {budget.rss_mb:.0f} MiB)" if budget else ""
+        print(f"{module}: {result.seconds:.2f} s, {result.rss_mb:.0f} MiB peak RSS{limit}")
+        if result.lazy_loaded:
+            print(f"  loaded eagerly: {', '.join(result.lazy_loaded)}")
+        for name, seconds in result.slowest:
+            print(f"  {seconds * 1000:>9.1f} ms  {name}")
+        if budget and (result.seconds > budget.seconds or result.rss_mb > budget.rss_mb):
+            print("  OVER BUDGET")
+            over = True
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
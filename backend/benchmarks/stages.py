@@ -0,0 +1,134 @@
+"""Per-stage timing of the Backtest pipeline.
+
+``run_pipeline`` is split into the stages below and each is timed on its
+own, so a regression points at the component that caused it:
+
+- ``interpret``        Interpreter: strategy graph → entry/exit signals
+- ``simulate``         Engine: ``run_backtest``, including its summary metrics
+- ``benchmark_curve``  buy-and-hold equity curve
+- ``metrics``          risk metrics plus benchmark return / alpha / beta
+- ``dump_trades``      trades artifact serialisation
+"""
+from __future__ import annotations
+
+import copy
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from app.backtest.candle_frame import CandleFrame
+from app.backtest.engine import (
+    compute_benchmark_curve,
+    compute_benchmark_metrics,
+    compute_risk_metrics,
+    run_backtest,
+)
+from app.backtest.interpreter import interpret_strategy
+from app.backtest.pipeline import BacktestParams
+from app.backtest.trades_artifact import dump_trades
+from app.backtest.types import ValidatedStrategy
+from app.data.strategy_templates import TEMPLATES
+from app.schemas.strategy import StrategyDefinitionValidate
+from app.services.strategy_validation import validate_strategy
+
+STAGES = ("interpret", "simulate", "benchmark_curve", "metrics", "dump_trades")
+
+PARAMS = BacktestParams(initial_balance=10000.0, fee_rate=0.001, slippage_rate=0.0005, timeframe="1h")
+
+
+@dataclass(frozen=True)
+class StageTiming:
+    template: str
+    bars: int
+    stage: str
+    seconds: float  # best of the repeats
+    peak_bytes: int  # tracemalloc peak above the memory held before the stage, one extra run
+
+    @property
+    def bars_per_second(self) -> float:
+        return self.bars / self.seconds if self.seconds > 0 else float("inf")
+
+
+def template_strategies() -> list[tuple[str, ValidatedStrategy]]:
+    """Every strategy template, validated; a template that fails validation raises."""
+    strategies = []
+    for template in TEMPLATES:
+        definition = StrategyDefinitionValidate.model_validate(copy.deepcopy(template["definition_json"]))
+        validation = validate_strategy(definition)
+        if validation.errors:
+            raise ValueError(f"template {template['name']!r} is invalid: {validation.errors[0].message}")
+        strategies.append((template["name"], validation.strategy))
+    return strategies
+
+
+def _stages(strategy: ValidatedStrategy, frame: CandleFrame, params: BacktestParams) -> list[Callable[[dict], Any]]:
+    """One callable per stage; each reads earlier stages' outputs from ``state``."""
+
+    def interpret(state: dict) -> None:
+        # A per-run cache keeps the shared indicator cache from serving repeats warm
+        state["signals"] = interpret_strategy(strategy, frame, indicator_cache={})
+
+    def simulate(state: dict) -> None:
+        state["result"] = run_backtest(
+            frame,
+            state["signals"],
+            params.initial_balance,
+            params.fee_rate,
+            params.slippage_rate,
+            spread_rate=params.spread_rate,
+            timeframe=params.timeframe,
+        )
+
+    def benchmark_curve(state: dict) -> None:
+        state["benchmark"] = compute_benchmark_curve(frame, params.initial_balance)
+
+    def metrics(state: dict) -> None:
+        result = state["result"]
+        compute_risk_metrics(
+            result.equity_curve, result.trades, params.timeframe, result.cagr_pct, result.max_drawdown_pct
+        )
+        compute_benchmark_metrics(result.equity_curve, state["benchmark"], params.initial_balance)
+
+    def trades(state: dict) -> None:
+        dump_trades(state["result"].trades)
+
+    return [interpret, simulate, benchmark_curve, metrics, trades]
+
+
+def time_template(
+    name: str,
+    strategy: ValidatedStrategy,
+    frame: CandleFrame,
+    repeat: int = 3,
+    params: BacktestParams = PARAMS,
+) -> list[StageTiming]:
+    """Time every stage for one template over ``frame``.
+
+    Each repeat runs on a fresh view of the frame so per-frame caches start
+    cold, as they do for a worker job.
+    """
+    best = [float("inf")] * len(STAGES)
+    for _ in range(repeat):
+        state: dict = {}
+        for k, stage in enumerate(_stages(strategy, frame[:], params)):
+            started = time.perf_counter()
+            stage(state)
+            best[k] = min(best[k], time.perf_counter() - started)
+
+    peaks = []
+    state = {}
+    tracemalloc.start()
+    try:
+        for stage in _stages(strategy, frame[:], params):
+            tracemalloc.reset_peak()
+            retained = tracemalloc.get_traced_memory()[0]
+            stage(state)
+            peaks.append(tracemalloc.get_traced_memory()[1] - retained)
+    finally:
+        tracemalloc.stop()
+
+    return [
+        StageTiming(name, len(frame), stage, seconds, peak)
+        for stage, seconds, peak in zip(STAGES, best, peaks)
+    ]
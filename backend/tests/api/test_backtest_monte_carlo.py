@@ -0,0 +1,136 @@
+"""API + worker tests for Monte Carlo analyses of completed runs."""
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import fakeredis
+import pytest
+
+from app.api import backtest_monte_carlo
+from app.main import app
+from app.services.sweep_store import MonteCarloStore, get_monte_carlo_store
+from app.worker import jobs
+
+_TRADES = [
+    {"entry_time": f"2024-01-{day:02d}T00:00:00Z", "exit_time": f"2024-01-{day:02d}T12:00:00Z", "pnl": pnl}
+    for day, pnl in enumerate([120.0, -40.0, -60.0, 200.0, -30.0, 75.0], start=1)
+]
+
+
+class _FakeQueue:
+    def __init__(self) -> None:
+        self.enqueued: list[tuple] = []
+
+    def enqueue(self, func, *args, **kwargs):
+        self.enqueued.append((func, args))
+
+
+class _BrokenQueue:
+    def enqueue(self, func, *args, **kwargs):
+        raise ConnectionError("redis down")
+
+
+@pytest.fixture
+def fake_redis():
+    return fakeredis.FakeRedis()
+
+
+@pytest.fixture
+def queue(client, fake_redis, monkeypatch):
+    fake_queue = _FakeQueue()
+    app.dependency_overrides[get_monte_carlo_store] = lambda: MonteCarloStore(fake_redis)
+    monkeypatch.setattr("app.api.backtest_monte_carlo.get_redis_queue", lambda: fake_queue)
+    return fake_queue
+
+
+def test_monte_carlo_job_completes_and_result_is_cached_per_run(
+    client, auth_headers, seeded_objects, queue, fake_redis, engine, monkeypatch
+):
+    run_id = str(seeded_objects["run"].id)
+
+    res = client.post(f"/backtests/{run_id}/monte-carlo", headers=auth_headers)
+
+    assert res.status_code == 202
+    assert res.json()["status"] == "pending"
+    [(func, args)] = queue.enqueued
+    assert func == "app.worker.jobs.run_monte_carlo_job"
+    assert args[0] == run_id
+
+    monkeypatch.setattr(jobs, "engine", engine)
+    monkeypatch.setattr(jobs.Redis, "from_url", lambda url: fake_redis)
+    monkeypatch.setattr(jobs, "download_json", lambda key: _TRADES)
+    jobs.run_monte_carlo_job(run_id)
+
+    body = client.get(f"/backtests/{run_id}/monte-carlo", headers=auth_headers).json()
+    assert body["status"] == "completed"
+    assert body["num_trades"] == 6
+    assert body["shuffle"]["final_equity"]["p50"] == pytest.approx(10265.0)
+    assert set(body["bootstrap"]["max_drawdown_pct"]) == {"p5", "p25", "p50", "p75", "p95"}
+
+    again = client.post(f"/backtests/{run_id}/monte-carlo", headers=auth_headers)
+    assert again.json() == body
+    assert len(queue.enqueued) == 1
+
+
+def test_monte_carlo_job_fails_cleanly_without_trades(
+    client, auth_headers, seeded_objects, queue, fake_redis, engine, monkeypatch
+):
+    run_id = str(seeded_objects["run"].id)
+    client.post(f"/backtests/{run_id}/monte-carlo", headers=auth_headers)
+
+    monkeypatch.setattr(jobs, "engine", engine)
+    monkeypatch.setattr(jobs.Redis, "from_url", lambda url: fake_redis)
+    monkeypatch.setattr(jobs, "download_json", lambda key: [])
+    jobs.run_monte_carlo_job(run_id)
+
+    body = client.get(f"/backtests/{run_id}/monte-carlo", headers=auth_headers).json()
+    assert body["status"] == "failed"
+    assert body["error_message"] == "Monte Carlo analysis needs a run with at least one trade."
+    # A failed analysis is retried on the next request.
+    assert client.post(f"/backtests/{run_id}/monte-carlo", headers=auth_headers).json()["status"] == "pending"
+    assert len(queue.enqueued) == 2
+
+
+def test_monte_carlo_requires_completed_owned_run(client, auth_headers, seeded_objects, queue, session):
+    run = seeded_objects["run"]
+    run.status = "running"
+    session.add(run)
+    session.commit()
+
+    assert client.post(f"/backtests/{run.id}/monte-carlo", headers=auth_headers).status_code == 400
+    assert client.post(f"/backtests/{uuid4()}/monte-carlo", headers=auth_headers).status_code == 404
+    assert client.get(f"/backtests/{uuid4()}/monte-carlo", headers=auth_headers).status_code == 404
+    assert queue.enqueued == []
+
+
+def test_failed_enqueue_leaves_a_retryable_record(
+    client, auth_headers, seeded_objects, queue, fake_redis, monkeypatch
+):
+    run_id = seeded_objects["run"].id
+    monkeypatch.setattr("app.api.backtest_monte_carlo.get_redis_queue", lambda: _BrokenQueue())
+
+    assert client.post(f"/backtests/{run_id}/monte-carlo", headers=auth_headers).status_code == 500
+    assert MonteCarloStore(fake_redis).read(run_id).status == "failed"
+
+    monkeypatch.setattr("app.api.backtest_monte_carlo.get_redis_queue", lambda: queue)
+    assert client.post(f"/backtests/{run_id}/monte-carlo", headers=auth_headers).json()["status"] == "pending"
+    assert len(queue.enqueued) == 1
+
+
+def test_stale_pending_record_is_replaced(client, auth_headers, seeded_objects, queue, fake_redis):
+    run_id = seeded_objects["run"].id
+    client.post(f"/backtests/{run_id}/monte-carlo", headers=auth_headers)
+    store = MonteCarloStore(fake_redis)
+    record = store.read(run_id)
+
+    # A fresh pending record is returned as-is
+    client.post(f"/backtests/{run_id}/monte-carlo", headers=auth_headers)
+    assert len(queue.enqueued) == 1
+
+    record.status = "running"
+    record.created_at = datetime.now(timezone.utc) - backtest_monte_carlo.STALE_AFTER - timedelta(minutes=1)
+    store.write(record)
+    body = client.post(f"/backtests/{run_id}/monte-carlo", headers=auth_headers).json()
+
+    assert body["status"] == "pending"
+    assert len(queue.enqueued) == 2
+    assert store.read(run_id).created_at > record.created_at
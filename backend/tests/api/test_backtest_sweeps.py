@@ -0,0 +1,226 @@
+"""API + worker tests for parameter sweeps and walk-forward analyses."""
+import copy
+from uuid import uuid4
+
+import fakeredis
+import pytest
+from sqlmodel import select
+
+from app.core.config import settings
+from app.data.strategy_templates import TEMPLATES
+from app.main import app
+from app.models.analysis_run import AnalysisRun
+from app.models.strategy import Strategy
+from app.services import backtest_service
+from app.services import working_copy
+from app.services.sweep_store import SweepStore, WalkForwardStore, get_sweep_store, get_walk_forward_store
+from app.worker import jobs
+
+_DATES = {"date_from": "2023-01-01T00:00:00Z", "date_to": "2023-09-01T00:00:00Z"}
+
+
+class _FakeQueue:
+    def __init__(self) -> None:
+        self.enqueued: list[tuple] = []
+
+    def enqueue(self, func, *args, **kwargs):
+        self.enqueued.append((func, args))
+
+
+class _BrokenQueue:
+    def enqueue(self, func, *args, **kwargs):
+        raise ConnectionError("redis down")
+
+
+@pytest.fixture
+def fake_redis():
+    return fakeredis.FakeRedis()
+
+
+@pytest.fixture
+def queue(client, fake_redis, monkeypatch):
+    fake_queue = _FakeQueue()
+    app.dependency_overrides[get_sweep_store] = lambda: SweepStore(fake_redis)
+    app.dependency_overrides[get_walk_forward_store] = lambda: WalkForwardStore(fake_redis)
+    monkeypatch.setattr("app.api.backtest_sweeps.get_redis_queue", lambda: fake_queue)
+    return fake_queue
+
+
+@pytest.fixture
+def rsi_strategy(session, user):
+    strategy = Strategy(id=uuid4(), user_id=user.id, name="RSI", asset="BTC/USDT", timeframe="1d")
+    session.add(strategy)
+    session.commit()
+    definition = copy.deepcopy(next(t for t in TEMPLATES if t["name"] == "RSI Oversold Bounce")["definition_json"])
+    working_copy.create(strategy, session, definition=definition)
+    session.commit()
+    return strategy
+
+
+def test_create_sweep_stores_record_and_enqueues_one_job(client, auth_headers, rsi_strategy, queue, fake_redis):
+    res = client.post(
+        "/backtests/sweeps",
+        headers=auth_headers,
+        json={"strategy_id": str(rsi_strategy.id), **_DATES, "grid": {"rsi-1.period": [7, 14, 21]}},
+    )
+
+    assert res.status_code == 201
+    body = res.json()
+    assert body["status"] == "pending"
+    assert body["num_combinations"] == 3
+    [(func, args)] = queue.enqueued
+    assert func == "app.worker.jobs.run_parameter_sweep_job"
+    assert args[0] == body["sweep_id"]
+    record = SweepStore(fake_redis).read(body["sweep_id"])
+    assert record.combinations == [{"rsi-1.period": 7}, {"rsi-1.period": 14}, {"rsi-1.period": 21}]
+
+
+def test_sweep_counts_toward_the_daily_limit(client, auth_headers, session, user, rsi_strategy, queue):
+    res = client.post(
+        "/backtests/sweeps",
+        headers=auth_headers,
+        json={"strategy_id": str(rsi_strategy.id), **_DATES, "grid": {"rsi-1.period": [7, 14]}},
+    )
+
+    assert res.status_code == 201
+    assert backtest_service.count_today_backtests(user.id, session) == 1
+    [usage] = session.exec(select(AnalysisRun)).all()
+    assert (str(usage.id), usage.kind) == (res.json()["sweep_id"], "sweep")
+
+
+def test_failed_enqueue_charges_nothing_and_marks_the_record_failed(
+    client, auth_headers, session, user, rsi_strategy, fake_redis, monkeypatch
+):
+    app.dependency_overrides[get_sweep_store] = lambda: SweepStore(fake_redis)
+    monkeypatch.setattr("app.api.backtest_sweeps.get_redis_queue", lambda: _BrokenQueue())
+    limits = backtest_service.get_effective_limits(user.plan_tier, user.user_tier)
+    monkeypatch.setattr(
+        backtest_service, "get_effective_limits", lambda *args: {**limits, "max_backtests_per_day": 0}
+    )
+    user.backtest_credit_balance = 3
+    session.add(user)
+    session.commit()
+
+    res = client.post(
+        "/backtests/sweeps",
+        headers=auth_headers,
+        json={"strategy_id": str(rsi_strategy.id), **_DATES, "grid": {"rsi-1.period": [7, 14]}},
+    )
+
+    assert res.status_code == 500
+    session.refresh(user)
+    assert user.backtest_credit_balance == 3
+    assert backtest_service.count_today_backtests(user.id, session) == 0
+    [key] = fake_redis.keys(f"{SweepStore.KEY_PREFIX}*")
+    record = SweepStore(fake_redis).read(key.decode().removeprefix(SweepStore.KEY_PREFIX))
+    assert record.status == "failed"
+
+
+def test_create_sweep_rejects_invalid_overrides(client, auth_headers, rsi_strategy, queue):
+    res = client.post(
+        "/backtests/sweeps",
+        headers=auth_headers,
+        json={"strategy_id": str(rsi_strategy.id), **_DATES, "combinations": [{"rsi-1.window": 3}]},
+    )
+
+    assert res.status_code == 400
+    assert res.json()["errors"][0]["code"] == "INVALID_OVERRIDE"
+    assert queue.enqueued == []
+
+
+def test_create_sweep_enforces_combination_cap_and_metric(client, auth_headers, rsi_strategy, queue, monkeypatch):
+    monkeypatch.setattr(settings, "max_sweep_combinations", 2)
+    payload = {"strategy_id": str(rsi_strategy.id), **_DATES, "grid": {"rsi-1.period": [7, 14, 21]}}
+
+    assert client.post("/backtests/sweeps", headers=auth_headers, json=payload).status_code == 400
+    payload["grid"] = {"rsi-1.period": [7]}
+    payload["rank_by"] = "trades_payload"
+    assert client.post("/backtests/sweeps", headers=auth_headers, json=payload).status_code == 400
+    payload.pop("rank_by")
+    payload["combinations"] = [{"rsi-1.period": 7}]
+    assert client.post("/backtests/sweeps", headers=auth_headers, json=payload).status_code == 422
+
+
+def test_sweep_job_completes_and_get_returns_ranked_rows(
+    client, auth_headers, rsi_strategy, queue, fake_redis, engine, synthetic_ohlcv_candles, monkeypatch
+):
+    res = client.post(
+        "/backtests/sweeps",
+        headers=auth_headers,
+        json={
+            "strategy_id": str(rsi_strategy.id),
+            **_DATES,
+            "grid": {"rsi-1.period": [7, 14], "const-oversold.value": [30, 40]},
+            "rank_by": "total_return_pct",
+        },
+    )
+    sweep_id = res.json()["sweep_id"]
+
+    monkeypatch.setattr(jobs, "engine", engine)
+    monkeypatch.setattr(jobs.Redis, "from_url", lambda url: fake_redis)
+    monkeypatch.setattr(jobs, "fetch_candles", lambda **kw: synthetic_ohlcv_candles)
+    monkeypatch.setattr(settings, "sweep_max_workers", 1)
+    jobs.run_parameter_sweep_job(sweep_id)
+
+    status_res = client.get(f"/backtests/sweeps/{sweep_id}", headers=auth_headers)
+    assert status_res.status_code == 200
+    body = status_res.json()
+    assert body["status"] == "completed"
+    assert [row["rank"] for row in body["rows"]] == [1, 2, 3, 4]
+    returns = [row["metrics"]["total_return_pct"] for row in body["rows"]]
+    assert returns == sorted(returns, reverse=True)
+
+
+def test_get_sweep_is_scoped_to_owner(client, auth_headers, queue):
+    assert client.get(f"/backtests/sweeps/{uuid4()}", headers=auth_headers).status_code == 404
+
+
+def test_walk_forward_job_stitches_out_of_sample_windows(
+    client, auth_headers, rsi_strategy, queue, fake_redis, engine, synthetic_ohlcv_candles, monkeypatch
+):
+    res = client.post(
+        "/backtests/walk-forward",
+        headers=auth_headers,
+        json={
+            "strategy_id": str(rsi_strategy.id),
+            **_DATES,
+            "grid": {"rsi-1.period": [7, 14]},
+            "in_sample_days": 90,
+            "out_of_sample_days": 30,
+        },
+    )
+    assert res.status_code == 201
+    walk_forward_id = res.json()["walk_forward_id"]
+    assert queue.enqueued[0][0] == "app.worker.jobs.run_walk_forward_job"
+
+    monkeypatch.setattr(jobs, "engine", engine)
+    monkeypatch.setattr(jobs.Redis, "from_url", lambda url: fake_redis)
+    monkeypatch.setattr(jobs, "fetch_candles", lambda **kw: synthetic_ohlcv_candles)
+    monkeypatch.setattr(settings, "sweep_max_workers", 1)
+    jobs.run_walk_forward_job(walk_forward_id)
+
+    body = client.get(f"/backtests/walk-forward/{walk_forward_id}", headers=auth_headers).json()
+    assert body["status"] == "completed"
+    assert len(body["windows"]) == 6
+    assert all(w["overrides"] in ({"rsi-1.period": 7}, {"rsi-1.period": 14}) for w in body["windows"])
+    assert len(body["equity_curve"]) == 252 - 90
+    assert body["num_trades"] is not None
+
+
+def test_walk_forward_rejects_too_many_windows(client, auth_headers, rsi_strategy, queue, monkeypatch):
+    monkeypatch.setattr(settings, "max_walk_forward_windows", 3)
+
+    res = client.post(
+        "/backtests/walk-forward",
+        headers=auth_headers,
+        json={
+            "strategy_id": str(rsi_strategy.id),
+            **_DATES,
+            "grid": {"rsi-1.period": [7]},
+            "in_sample_days": 90,
+            "out_of_sample_days": 30,
+        },
+    )
+
+    assert res.status_code == 400
+    assert queue.enqueued == []
@@ -38,6 +38,9 @@ def _mock_market_dependencies(monkeypatch):
                 return seeded
             return None
 
+        def mget(self, keys):
+            return [self.get(key) for key in keys]
+
         def set(self, key, value, nx=False, ex=None):
             if nx:
                 return None  # flag already set — no dedup enqueue
@@ -80,7 +83,7 @@ def test_checkout_session_interval_uses_expected_price_id(client, auth_headers,
     monkeypatch.setitem(PRICE_IDS, ("premium", "annual"), "price_premium_annual")
     monkeypatch.setitem(PRICE_IDS, ("pro", "monthly"), "price_pro_monthly")
 
-    monkeypatch.setattr("app.api.billing.stripe.Customer.create", lambda **kwargs: SimpleNamespace(id="cus_test"))
+    monkeypatch.setattr("stripe.Customer.create", lambda **kwargs: SimpleNamespace(id="cus_test"))
 
     captured = {}
 
@@ -88,7 +91,7 @@ def test_checkout_session_interval_uses_expected_price_id(client, auth_headers,
         captured.update(kwargs)
         return SimpleNamespace(url="https://stripe.test/session")
 
-    monkeypatch.setattr("app.api.billing.stripe.checkout.Session.create", _fake_create)
+    monkeypatch.setattr("stripe.checkout.Session.create", _fake_create)
 
     response = client.post("/billing/checkout-session", headers=auth_headers, json=payload)
 
@@ -293,3 +296,48 @@ def test_market_tickers_includes_as_of_and_volatility_fields(client, auth_header
     assert "as_of" in body
     assert isinstance(body["items"], list)
     assert {"pair", "price", "change_24h_pct", "volume_24h", "volatility_stddev", "volatility_atr_pct", "volatility_percentile_1y"}.issubset(body["items"][0].keys())
+
+
+def test_market_tickers_merge_the_worker_volatility_snapshot(client, auth_headers, session, monkeypatch):
+    import fakeredis
+
+    from app.backtest.volatility import (
+        calculate_atr_pct,
+        calculate_stddev_volatility,
+        calculate_volatility_percentile,
+    )
+    from app.models.candle import Candle
+    from app.schemas.market import TickerItem, TickerListResponse
+    from app.worker.jobs import _compute_volatility_metrics
+
+    _mock_market_dependencies(monkeypatch)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    closes = [50000.0 * (1 + 0.02 * ((i * 7919) % 13 - 6) / 6) ** (i % 5) for i in range(365)]
+    for i, close in enumerate(closes):
+        session.add(Candle(
+            asset="BTC/USDT", timeframe="1d", timestamp=start + timedelta(days=i),
+            open=close, high=close * 1.01, low=close * 0.99, close=close, volume=1.0,
+        ))
+    session.commit()
+
+    redis = fakeredis.FakeRedis()
+    cache = SpotPriceCache(redis)
+    cache.write(TickerListResponse(
+        items=[
+            TickerItem(pair="BTC/USDT", price=51000.0, change_24h_pct=1.2, volume_24h=1.0),
+            TickerItem(pair="ETH/USDT", price=3000.0, change_24h_pct=0.4, volume_24h=1.0),
+        ],
+        as_of=datetime.now(timezone.utc),
+    ))
+    cache.write_volatility(_compute_volatility_metrics(session, ["BTC/USDT", "ETH/USDT"]))
+    monkeypatch.setattr("app.api.market._get_redis", lambda: redis)
+
+    btc, eth = client.get("/market/tickers", headers=auth_headers).json()["items"]
+
+    assert btc["volatility_percentile_1y"] == calculate_volatility_percentile(closes)
+    assert btc["volatility_percentile_1y"] is not None
+    assert btc["volatility_stddev"] == pytest.approx(calculate_stddev_volatility(closes))
+    assert btc["volatility_atr_pct"] == pytest.approx(
+        calculate_atr_pct([c * 1.01 for c in closes], [c * 0.99 for c in closes], closes, 51000.0)
+    )
+    assert eth["volatility_stddev"] is None and eth["volatility_atr_pct"] is None  # no stored candles
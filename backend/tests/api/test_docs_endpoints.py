@@ -152,6 +152,8 @@ def test_other_domain_endpoints(client, auth_headers, seeded_objects, monkeypatc
             if key == SpotPriceCache.PRICES_KEY:
                 return _seeded
             return None
+        def mget(self, keys):
+            return [self.get(key) for key in keys]
         def set(self, key, value, nx=False, ex=None):
             return None if nx else True
         def setex(self, key, ttl, val): return None
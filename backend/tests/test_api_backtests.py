@@ -12,8 +12,10 @@ os.environ["DATABASE_URL"] = "sqlite://"
 os.environ["JWT_SECRET_KEY"] = "test-secret-key-for-testing"
 os.environ["REDIS_URL"] = "redis://localhost:6379/15"
 
+from app.core.config import settings
 from app.core.database import get_session
 from app.core.security import hash_password
+from app.data.strategy_templates import TEMPLATES
 from app.main import app
 from app.models.strategy import Strategy
 from app.models.strategy_draft import StrategyDraft
@@ -92,7 +94,7 @@ def _create_strategy_with_version(session: Session, user_id):
     return strategy
 
 
-def _create_strategy_with_working_copy_only(session: Session, user_id):
+def _create_strategy_with_working_copy_only(session: Session, user_id, definition_json: dict | None = None):
     """Create a strategy that has a working copy but NO frozen StrategyVersion yet."""
     strategy = Strategy(
         id=uuid4(),
@@ -107,7 +109,7 @@ def _create_strategy_with_working_copy_only(session: Session, user_id):
 
     draft = StrategyDraft(
         strategy_id=strategy.id,
-        definition_json={"blocks": [], "connections": [], "meta": {}},
+        definition_json=definition_json or {"blocks": [], "connections": [], "meta": {}},
     )
     session.add(draft)
     session.commit()
@@ -220,6 +222,100 @@ def test_backtest_enqueue_forwards_request_correlation_id(
     assert kwargs["job_timeout"] == 300
 
 
+def _ma_crossover() -> dict:
+    return next(t for t in TEMPLATES if t["name"] == "MA Crossover")["definition_json"]
+
+
+def test_heavy_backtest_is_enqueued_on_heavy_queue(client: TestClient, session: Session, monkeypatch):
+    user = _create_user(session, "heavy@example.com", UserTier.BETA)
+    strategy = _create_strategy_with_working_copy_only(session, user.id, _ma_crossover())
+    token = _login_and_get_token(client, user.email)
+
+    queues = []
+
+    class FakeQueue:
+        def __init__(self, name):
+            self.name = name
+            queues.append(self)
+
+        def enqueue(self, *args, **kwargs):
+            pass
+
+    monkeypatch.setattr("app.api.backtests.get_redis_queue", lambda name="default": FakeQueue(name))
+    monkeypatch.setattr(settings, "backtest_heavy_cpu_seconds", 0.0)
+
+    response = client.post(
+        "/backtests/",
+        headers={"Authorization": f"Bearer {token}"},
+        json={
+            "strategy_id": str(strategy.id),
+            "date_from": "2026-01-01T00:00:00Z",
+            "date_to": "2026-01-10T23:59:59Z",
+        },
+    )
+
+    assert response.status_code == 201
+    assert response.json()["estimated_seconds"] > 0
+    assert [q.name for q in queues] == [settings.backtest_heavy_queue]
+
+
+def test_backtest_over_cost_limit_is_rejected_before_queueing(
+    client: TestClient, session: Session, monkeypatch
+):
+    user = _create_user(session, "too-big@example.com", UserTier.BETA)
+    strategy = _create_strategy_with_working_copy_only(session, user.id, _ma_crossover())
+    token = _login_and_get_token(client, user.email)
+
+    def no_queue(*args, **kwargs):
+        raise AssertionError("a rejected run must not be queued")
+
+    monkeypatch.setattr("app.api.backtests.get_redis_queue", no_queue)
+    monkeypatch.setattr(settings, "backtest_max_cpu_seconds", 0.1)
+
+    response = client.post(
+        "/backtests/",
+        headers={"Authorization": f"Bearer {token}"},
+        json={
+            "strategy_id": str(strategy.id),
+            "date_from": "2026-01-01T00:00:00Z",
+            "date_to": "2026-01-10T23:59:59Z",
+        },
+    )
+
+    assert response.status_code == 422
+    assert "too large" in response.json()["detail"]
+
+
+def test_batch_backtest_skips_periods_over_cost_limit(client: TestClient, session: Session, monkeypatch):
+    user = _create_user(session, "batch-too-big@example.com", UserTier.STANDARD)
+    strategy = _create_strategy_with_working_copy_only(session, user.id, _ma_crossover())
+    token = _login_and_get_token(client, user.email)
+
+    monkeypatch.setattr(
+        "app.api.backtest_batches.get_effective_limits",
+        lambda *args, **kwargs: {
+            "max_backtests_per_day": 50,
+            "max_history_days": 3650,
+        },
+    )
+    monkeypatch.setattr(settings, "backtest_max_cpu_seconds", 0.1)
+
+    response = client.post(
+        "/backtests/batch",
+        headers={"Authorization": f"Bearer {token}"},
+        json={
+            "strategy_id": str(strategy.id),
+            "periods": ["30d"],
+        },
+    )
+
+    assert response.status_code == 201
+    body = response.json()
+    assert body["batch_id"] is None
+    assert body["runs"][0]["status"] == "skipped"
+    assert "too large" in body["runs"][0]["skip_reason"]
+
+
 def test_batch_backtest_all_skipped_returns_null_batch_id(
     client: TestClient, session: Session, monkeypatch
 ):
@@ -0,0 +1,63 @@
+"""Tests for the benchmark harness (benchmarks/), not for performance itself."""
+import numpy as np
+
+from benchmarks import baseline
+from benchmarks.candles import synthetic_frame
+from benchmarks.stages import STAGES, StageTiming, template_strategies, time_template
+
+
+def test_synthetic_frame_is_deterministic_and_consistent():
+    frame = synthetic_frame(2_000, seed=3)
+
+    assert np.array_equal(frame.close, synthetic_frame(2_000, seed=3).close)
+    assert not np.array_equal(frame.close, synthetic_frame(2_000, seed=4).close)
+    assert (frame.high >= np.maximum(frame.open, frame.close)).all()
+    assert (frame.low <= np.minimum(frame.open, frame.close)).all()
+    assert (np.diff(frame.timestamps) == np.timedelta64(1, "h")).all()
+
+
+def test_every_template_is_timed_per_stage():
+    frame = synthetic_frame(500)
+    strategies = template_strategies()
+    name, strategy = strategies[0]
+
+    timings = time_template(name, strategy, frame, repeat=1)
+
+    assert len(strategies) >= 12
+    assert [t.stage for t in timings] == list(STAGES)
+    assert all(t.bars == 500 and t.seconds > 0 and t.peak_bytes >= 0 for t in timings)
+
+
+def test_compare_flags_only_slowdowns_beyond_tolerance(tmp_path):
+    path = tmp_path / "baseline.json"
+    before = [StageTiming("MA", 1000, "simulate", 0.100, 0), StageTiming("MA", 1000, "interpret", 0.001, 0)]
+    baseline.save(before, path)
+    after = [
+        StageTiming("MA", 1000, "simulate", 0.130, 0),
+        StageTiming("MA", 1000, "interpret", 0.002, 0),  # doubled, but below the noise floor
+        StageTiming("MA", 10000, "simulate", 1.0, 0),  # no baseline entry
+    ]
+
+    comparisons = baseline.compare(after, baseline.load(path), tolerance=0.25)
+
+    assert [c.regressed for c in comparisons] == [True, False, False]
+    assert comparisons[0].ratio == 1.3
+    assert comparisons[2].ratio is None
+    assert not any(c.regressed for c in baseline.compare(after[:1], baseline.load(path), tolerance=0.5))
+
+
+def test_compare_flags_peak_memory_growth_beyond_tolerance(tmp_path):
+    path = tmp_path / "baseline.json"
+    mib = 2**20
+    before = [StageTiming("MA", 1000, "simulate", 0.1, 10 * mib), StageTiming("MA", 1000, "metrics", 0.1, 1000)]
+    baseline.save(before, path)
+    after = [
+        StageTiming("MA", 1000, "simulate", 0.1, 13 * mib),
+        StageTiming("MA", 1000, "metrics", 0.1, 100_000),  # 100x, but below the noise floor
+    ]
+
+    comparisons = baseline.compare(after, baseline.load(path), memory_tolerance=0.25)
+
+    assert [(c.slower, c.more_memory, c.regressed) for c in comparisons] == [(False, True, True), (False, False, False)]
+    assert comparisons[0].memory_ratio == 1.3
+    assert baseline.load(path).peak_bytes["MA|1000|simulate"] == 10 * mib
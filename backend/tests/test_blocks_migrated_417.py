@@ -3,6 +3,8 @@ from __future__ import annotations
 
 from typing import Any
 
+import numpy as np
+
 
 # ── helpers ───────────────────────────────────────────────────────────────────
 
@@ -364,7 +366,7 @@ def test_interpreter_dispatches_macd_via_catalogue():
         risk_params=RiskParams(),
     )
     signals = interpret_strategy(strategy, candles)
-    assert isinstance(signals.entry_long, list)
+    assert isinstance(signals.entry_long, np.ndarray)
 
 
 def test_interpreter_dispatches_bollinger_via_catalogue():
@@ -406,4 +408,4 @@ def test_interpreter_dispatches_bollinger_via_catalogue():
         risk_params=RiskParams(),
     )
     signals = interpret_strategy(strategy, candles)
-    assert isinstance(signals.entry_long, list)
+    assert isinstance(signals.entry_long, np.ndarray)
@@ -231,7 +231,7 @@ class TestInterpreterDispatch:
 
         strategy = self._to_validated(self._minimal_strategy("entry_signal"))
         signals = interpret_strategy(strategy, self._candles(3))
-        assert signals.entry_long == [True, True, True]
+        assert signals.entry_long.tolist() == [True, True, True]
 
     def test_exit_signal_dispatched_via_catalogue(self):
         from app.backtest.interpreter import interpret_strategy
@@ -254,7 +254,7 @@ class TestInterpreterDispatch:
             ],
         })
         signals = interpret_strategy(strategy, self._candles(3))
-        assert signals.exit_long == [True, True, True]
+        assert signals.exit_long.tolist() == [True, True, True]
 
     def test_entry_signal_false_when_no_input(self):
         """Unconnected entry_signal must output all-False (default)."""
@@ -268,5 +268,5 @@ class TestInterpreterDispatch:
             "connections": [],
         })
         signals = interpret_strategy(strategy, self._candles(2))
-        assert signals.entry_long == [False, False]
-        assert signals.exit_long == [False, False]
+        assert signals.entry_long.tolist() == [False, False]
+        assert signals.exit_long.tolist() == [False, False]
@@ -0,0 +1,122 @@
+"""Tests for the memory-mapped candle archive (app.backtest.candle_archive)."""
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from sqlmodel import select
+
+from app.backtest.candle_archive import CandleArchive, set_candle_archive
+from app.backtest.candle_reader import read_candles
+from app.backtest.candles import fetch_candles, sync_archived_candles
+from app.models.candle import Candle
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class _Revisions:
+    def __init__(self) -> None:
+        self.values: dict[tuple[str, str], int] = {}
+
+    def get(self, asset: str, timeframe: str) -> int:
+        return self.values.get((asset, timeframe), 0)
+
+    def bump(self, asset: str, timeframe: str) -> None:
+        self.values[(asset, timeframe)] = self.get(asset, timeframe) + 1
+
+
+def _candles(start: int, stop: int, source: str = "cryptocompare") -> list[Candle]:
+    return [
+        Candle(
+            asset="BTC/USDT", timeframe="1h", timestamp=START + timedelta(hours=i),
+            open=100.0 + i, high=101.0 + i, low=99.0 + i, close=100.5 + i, volume=10.0 + i,
+            source="binance" if i == 7 else source,
+        )
+        for i in range(start, stop)
+    ]
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = CandleArchive(tmp_path, _Revisions())
+    set_candle_archive(archive)
+    yield archive
+    set_candle_archive(None)
+
+
+@pytest.fixture
+def hourly(session):
+    session.add_all(_candles(0, 300))
+    session.commit()
+
+
+def test_sync_builds_a_segment_that_reads_like_the_table(session, hourly, archive):
+    assert sync_archived_candles(archive, session, "BTC/USDT", "1h") == 300
+
+    archived = archive.read("BTC/USDT", "1h")
+
+    assert archived.frame.fingerprint == read_candles(session, "BTC/USDT", "1h").fingerprint
+    assert archived.frame.used_backup_data is True
+    assert archived.until == START + timedelta(hours=299, microseconds=1)
+
+
+def test_range_reads_are_views_of_the_mapping(session, hourly, archive):
+    sync_archived_candles(archive, session, "BTC/USDT", "1h")
+    date_from, date_to = START + timedelta(hours=10), START + timedelta(hours=20)
+
+    frame = archive.read("BTC/USDT", "1h", date_from, date_to).frame
+
+    assert frame.fingerprint == read_candles(session, "BTC/USDT", "1h", date_from, date_to).fingerprint
+    assert frame.used_backup_data is False
+    assert not frame.close.flags.owndata and not frame.close.flags.writeable
+
+
+def test_extend_appends_and_outgrows_the_capacity(session, archive):
+    session.add_all(_candles(0, 1000))
+    session.commit()
+    sync_archived_candles(archive, session, "BTC/USDT", "1h")
+    session.add_all(_candles(1000, 2500))
+    session.commit()
+
+    assert sync_archived_candles(archive, session, "BTC/USDT", "1h") == 1500
+    assert sync_archived_candles(archive, session, "BTC/USDT", "1h") == 0
+    assert archive.read("BTC/USDT", "1h").frame.fingerprint == read_candles(session, "BTC/USDT", "1h").fingerprint
+
+
+def test_fetch_serves_the_archive_and_the_db_tail(session, hourly, archive):
+    sync_archived_candles(archive, session, "BTC/USDT", "1h")
+    session.add_all(_candles(300, 400))
+    session.commit()
+
+    frame = fetch_candles("BTC/USDT", "1h", START, START + timedelta(hours=399), session)
+
+    assert frame.fingerprint == read_candles(session, "BTC/USDT", "1h").fingerprint
+    assert len(archive.read("BTC/USDT", "1h").frame) == 400  # closed tail appended on the way
+
+
+def test_fetch_builds_a_missing_segment(session, hourly, archive):
+    frame = fetch_candles("BTC/USDT", "1h", START, START + timedelta(hours=299), session)
+
+    assert frame.fingerprint == read_candles(session, "BTC/USDT", "1h").fingerprint
+    assert archive.path("BTC/USDT", "1h").exists()
+
+
+def test_a_bumped_revision_makes_the_segment_stale(session, hourly, archive):
+    sync_archived_candles(archive, session, "BTC/USDT", "1h")
+    candle = session.exec(select(Candle).where(Candle.timestamp == START + timedelta(hours=5))).one()
+    candle.close = 1.0
+    session.commit()
+
+    archive.revisions.bump("BTC/USDT", "1h")
+
+    assert archive.read("BTC/USDT", "1h") is None
+    sync_archived_candles(archive, session, "BTC/USDT", "1h")
+    np.testing.assert_array_equal(archive.read("BTC/USDT", "1h").frame.close[5], 1.0)
+
+
+def test_invalidate_drops_the_segment_and_bumps_the_revision(session, hourly, archive):
+    sync_archived_candles(archive, session, "BTC/USDT", "1h")
+
+    archive.invalidate("BTC/USDT", "1h")
+
+    assert not archive.path("BTC/USDT", "1h").exists()
+    assert archive.revision("BTC/USDT", "1h") == 1
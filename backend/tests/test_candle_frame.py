@@ -0,0 +1,126 @@
+"""Tests for CandleFrame — the columnar candle input of the Backtest pipeline."""
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from app.backtest.candle_frame import Bar, CandleFrame, as_candle_frame
+from app.backtest.engine import compute_benchmark_curve, run_backtest
+from app.backtest.interpreter import interpret_strategy
+from app.backtest.types import RiskParams, ValidatedStrategy
+from app.models.candle import Candle
+
+
+def _candles(n: int = 5, tz: timezone | None = timezone.utc, source: str = "cryptocompare") -> list[Candle]:
+    start = datetime(2024, 1, 1, tzinfo=tz)
+    return [
+        Candle(
+            asset="BTC/USDT",
+            timeframe="1d",
+            timestamp=start + timedelta(days=i),
+            open=100.0 + i,
+            high=101.0 + i,
+            low=99.0 + i,
+            close=100.5 + i,
+            volume=1000.0 + i,
+            source=source,
+        )
+        for i in range(n)
+    ]
+
+
+def test_from_candles_builds_contiguous_float_columns():
+    frame = CandleFrame.from_candles(_candles())
+
+    assert len(frame) == 5
+    for column in (frame.open, frame.high, frame.low, frame.close, frame.volume):
+        assert column.dtype == np.float64
+        assert column.flags["C_CONTIGUOUS"]
+        assert not column.flags["WRITEABLE"]
+    assert frame.close.tolist() == [100.5, 101.5, 102.5, 103.5, 104.5]
+
+
+def test_bar_round_trips_candle_fields():
+    candles = _candles()
+    bar = CandleFrame.from_candles(candles)[2]
+
+    assert isinstance(bar, Bar)
+    assert bar.timestamp == candles[2].timestamp
+    assert (bar.open, bar.high, bar.low, bar.close, bar.volume) == (102.0, 103.0, 101.0, 102.5, 1002.0)
+
+
+@pytest.mark.parametrize("tz", [timezone.utc, None])
+def test_iso_timestamps_match_candle_isoformat(tz):
+    candles = _candles(tz=tz)
+    frame = CandleFrame.from_candles(candles)
+
+    assert frame.iso_timestamps() == [c.timestamp.isoformat() for c in candles]
+    assert frame.timestamp_at(0) == candles[0].timestamp
+
+
+def test_non_utc_timestamps_are_normalised_to_utc():
+    plus_two = timezone(timedelta(hours=2))
+    candles = _candles(n=1, tz=plus_two)
+
+    assert CandleFrame.from_candles(candles).timestamp_at(0) == candles[0].timestamp
+
+
+def test_candle_data_prev_close_is_shifted_with_leading_nan():
+    prev_close = CandleFrame.from_candles(_candles(n=3)).candle_data()["prev_close"]
+
+    assert np.isnan(prev_close[0])
+    assert prev_close[1:].tolist() == [100.5, 101.5]
+
+
+def test_used_backup_data_reflects_any_non_primary_source():
+    assert CandleFrame.from_candles(_candles()).used_backup_data is False
+    candles = _candles()
+    candles[3].source = "binance"
+    assert CandleFrame.from_candles(candles).used_backup_data is True
+
+
+def test_slice_returns_frame_view():
+    frame = CandleFrame.from_candles(_candles())
+    tail = frame[2:]
+
+    assert isinstance(tail, CandleFrame)
+    assert len(tail) == 3
+    assert tail.timestamp_at(0) == frame.timestamp_at(2)
+
+
+def test_as_candle_frame_passes_frames_through():
+    frame = CandleFrame.from_candles(_candles())
+
+    assert as_candle_frame(frame) is frame
+    assert len(as_candle_frame([])) == 0
+
+
+def test_engine_results_identical_for_frame_and_candle_list(synthetic_ohlcv_candles):
+    strategy = ValidatedStrategy(
+        blocks=(
+            {"id": "price", "type": "price", "params": {"source": "close"}},
+            {"id": "sma", "type": "sma", "params": {"period": 10}},
+            {"id": "cmp", "type": "compare", "params": {"operator": ">"}},
+            {"id": "not", "type": "not", "params": {}},
+            {"id": "entry", "type": "entry_signal", "params": {}},
+            {"id": "exit", "type": "exit_signal", "params": {}},
+        ),
+        connections=(
+            {"from_port": {"block_id": "price", "port": "output"}, "to_port": {"block_id": "cmp", "port": "left"}},
+            {"from_port": {"block_id": "sma", "port": "output"}, "to_port": {"block_id": "cmp", "port": "right"}},
+            {"from_port": {"block_id": "cmp", "port": "output"}, "to_port": {"block_id": "entry", "port": "signal"}},
+            {"from_port": {"block_id": "cmp", "port": "output"}, "to_port": {"block_id": "not", "port": "input"}},
+            {"from_port": {"block_id": "not", "port": "output"}, "to_port": {"block_id": "exit", "port": "signal"}},
+        ),
+        risk_params=RiskParams(stop_loss_pct=3.0),
+    )
+    frame = CandleFrame.from_candles(synthetic_ohlcv_candles)
+
+    from_list = run_backtest(
+        synthetic_ohlcv_candles, interpret_strategy(strategy, synthetic_ohlcv_candles), 10000.0, 0.001, 0.0005
+    )
+    from_frame = run_backtest(frame, interpret_strategy(strategy, frame), 10000.0, 0.001, 0.0005)
+
+    assert from_frame.num_trades > 0
+    assert from_frame == from_list
+    assert compute_benchmark_curve(frame, 10000.0) == compute_benchmark_curve(synthetic_ohlcv_candles, 10000.0)
@@ -0,0 +1,92 @@
+"""Tests for the ORM-free candle reader (app.backtest.candle_reader)."""
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from sqlmodel import select
+
+from app.backtest.candle_frame import CandleFrame
+from app.backtest.candle_reader import iter_candles, read_candles
+from app.backtest.candles import _detect_gaps
+from app.models.candle import Candle
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def hourly(session):
+    """500 hourly BTC candles, one of them from a backup provider, plus an ETH candle."""
+    closes = 100 * np.exp(np.cumsum(np.random.default_rng(3).normal(0, 0.01, 500)))
+    session.add_all([
+        Candle(
+            asset="BTC/USDT", timeframe="1h", timestamp=START + timedelta(hours=i),
+            open=c, high=c * 1.01, low=c * 0.99, close=c, volume=10.0 + i,
+            source="binance" if i == 321 else "cryptocompare",
+        )
+        for i, c in enumerate(closes.tolist())
+    ])
+    session.add(Candle(asset="ETH/USDT", timeframe="1h", timestamp=START, open=1, high=1, low=1, close=1, volume=1))
+    session.commit()
+
+
+def _orm_frame(session, **where) -> CandleFrame:
+    stmt = select(Candle).where(Candle.asset == "BTC/USDT", Candle.timeframe == "1h")
+    if "date_from" in where:
+        stmt = stmt.where(Candle.timestamp >= where["date_from"], Candle.timestamp <= where["date_to"])
+    return CandleFrame.from_candles(session.exec(stmt.order_by(Candle.timestamp)).all())
+
+
+@pytest.mark.parametrize("capacity", [None, 1, 500, 10_000])
+def test_read_matches_the_orm_rows(session, hourly, capacity):
+    frame = read_candles(session, "BTC/USDT", "1h", capacity=capacity)
+    expected = _orm_frame(session)
+
+    assert len(frame) == 500
+    assert frame.fingerprint == expected.fingerprint
+    assert frame.iso_timestamps() == expected.iso_timestamps()
+    assert (frame.tz_aware, frame.used_backup_data) == (expected.tz_aware, True)
+    assert (frame.asset, frame.timeframe) == ("BTC/USDT", "1h")
+
+
+def test_read_bounds_are_inclusive_and_flag_backup_per_range(session, hourly):
+    date_from, date_to = START + timedelta(hours=10), START + timedelta(hours=20)
+
+    frame = read_candles(session, "BTC/USDT", "1h", date_from, date_to)
+
+    assert frame.fingerprint == _orm_frame(session, date_from=date_from, date_to=date_to).fingerprint
+    assert len(frame) == 11 and frame.used_backup_data is False
+
+
+def test_newest_first_with_limit_reads_the_latest_candles_oldest_first(session, hourly):
+    frame = read_candles(session, "BTC/USDT", "1h", newest_first=True, limit=30)
+
+    assert frame.fingerprint == _orm_frame(session)[-30:].fingerprint
+
+
+def test_empty_range_is_an_empty_frame(session, hourly):
+    frame = read_candles(session, "SOL/USDT", "1h", newest_first=True, limit=30)
+    assert len(frame) == 0 and frame.used_backup_data is False
+
+
+def test_streamed_chunks_concatenate_to_the_whole_range(session, hourly):
+    chunks = list(iter_candles(session, "BTC/USDT", "1h", chunk_size=128))
+    whole = read_candles(session, "BTC/USDT", "1h")
+
+    assert [len(c) for c in chunks] == [128, 128, 128, 116]
+    for column in ("timestamps", "open", "high", "low", "close", "volume"):
+        np.testing.assert_array_equal(np.concatenate([getattr(c, column) for c in chunks]), getattr(whole, column))
+    assert [c.used_backup_data for c in chunks] == [False, False, True, False]
+
+
+def test_gaps_are_found_on_frames_as_on_rows(session, hourly):
+    for hour in (40, 41, 42, 300):
+        session.delete(session.exec(select(Candle).where(Candle.timestamp == START + timedelta(hours=hour))).one())
+    session.commit()
+    rows = session.exec(
+        select(Candle).where(Candle.asset == "BTC/USDT").order_by(Candle.timestamp)
+    ).all()
+
+    gaps = _detect_gaps(read_candles(session, "BTC/USDT", "1h"), "1h", max_gap_candles=0)
+
+    assert gaps == _detect_gaps(rows, "1h", max_gap_candles=0)
+    assert [(b - a) // timedelta(hours=1) for a, b in gaps] == [4, 2]
@@ -5,6 +5,7 @@ from unittest.mock import MagicMock, patch
 
 import fakeredis
 import pytest
+from sqlmodel import select
 
 from app.market_data.circuit_breaker import CircuitBreaker, FailureKind
 from app.market_data.protocol import CandleData, ProviderQuotaError
@@ -151,7 +152,9 @@ def test_fetch_candles_stores_binance_source(session, monkeypatch):
     )
 
     assert len(candles) == 1
-    assert candles[0].source == "binance"
+    assert candles.used_backup_data is True
+    stored = session.exec(select(Candle).where(Candle.asset == "ETH/USDT")).one()
+    assert stored.source == "binance"
 
 
 def test_fetch_candles_stores_cryptocompare_source_by_default(session, monkeypatch):
@@ -177,7 +180,9 @@ def test_fetch_candles_stores_cryptocompare_source_by_default(session, monkeypat
     )
 
     assert len(candles) == 1
-    assert candles[0].source == "cryptocompare"
+    assert candles.used_backup_data is False
+    stored = session.exec(select(Candle).where(Candle.asset == "BNB/USDT")).one()
+    assert stored.source == "cryptocompare"
 
 
 # ---------------------------------------------------------------------------
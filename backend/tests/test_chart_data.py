@@ -12,6 +12,7 @@ os.environ["DATABASE_URL"] = "sqlite://"
 os.environ["JWT_SECRET_KEY"] = "test-secret-key-for-testing"
 os.environ["REDIS_URL"] = "redis://localhost:6379/15"
 
+from app.backtest.indicator_cache import shared_indicator_cache
 from app.core.database import get_session
 from app.core.security import hash_password
 from app.main import app
@@ -290,3 +291,28 @@ def test_feat_100_bollinger_returns_three_series(client: TestClient, session: Se
         "bollinger_upper", "bollinger_middle", "bollinger_lower"
     ]
     assert all(s["pane"] == "price" for s in series)
+
+
+# --- Indicator series are shared through the cross-run cache ---------------
+
+
+def test_chart_data_reads_indicators_through_shared_cache(client: TestClient, session: Session):
+    user = _seed_user(session)
+    _seed_candles(session, count=40)
+    token = _login(client, user.email)
+    cache = shared_indicator_cache()
+    cache.clear()
+    cache.reset_stats()
+
+    bodies = [
+        client.get(
+            "/market/chart-data",
+            params={"asset": "BTC/USDT", "timeframe": "1d", "indicators": "ema:20,macd"},
+            headers={"Authorization": f"Bearer {token}"},
+        ).json()
+        for _ in range(2)
+    ]
+
+    assert bodies[0]["indicators"] == bodies[1]["indicators"]
+    stats = client.get("/health/indicator-cache").json()
+    assert (stats["misses"], stats["memory_hits"]) == (4, 4)  # ema + the three MACD ports
@@ -0,0 +1,18 @@
+"""Cold-start budget: importing the API or worker entry point in a fresh interpreter.
+
+Only the deterministic parts of the budget run here: no lazy package is
+imported eagerly, and peak RSS stays bounded. Wall time depends on machine
+load, so ``python -m benchmarks.imports`` checks it instead.
+"""
+import pytest
+
+from benchmarks.imports import BUDGETS, cold_import
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS))
+def test_cold_import_stays_within_budget(module):
+    result = cold_import(module)
+    budget = BUDGETS[module]
+
+    assert result.lazy_loaded == [], f"{module} imports {result.lazy_loaded} eagerly"
+    assert result.rss_mb <= budget.rss_mb, result.slowest[:10]
@@ -0,0 +1,142 @@
+"""Tests for the static run cost estimate (app.backtest.cost_estimate) and admission."""
+import copy
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.backtest.cost_estimate import estimate_bars, estimate_plan_cost, estimate_run_cost
+from app.backtest.execution_plan import plan_for
+from app.backtest.types import RiskParams, ValidatedStrategy
+from app.core.config import settings
+from app.data.strategy_templates import TEMPLATES
+from app.models.strategy_version import StrategyVersion
+from app.services.backtest_service import admit_run
+from app.services.exceptions import RunTooExpensive
+
+START = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+def _template(name: str) -> dict:
+    return copy.deepcopy(next(t for t in TEMPLATES if t["name"] == name)["definition_json"])
+
+
+def _strategy(definition: dict) -> ValidatedStrategy:
+    return ValidatedStrategy(
+        blocks=tuple(definition["blocks"]),
+        connections=tuple(definition["connections"]),
+        risk_params=RiskParams(),
+    )
+
+
+def _fibonacci(lookback: int) -> ValidatedStrategy:
+    """RSI Oversold Bounce with the RSI swapped for a Fibonacci level."""
+    definition = _template("RSI Oversold Bounce")
+    block = next(b for b in definition["blocks"] if b["id"] == "rsi-1")
+    block["type"] = "fibonacci"
+    block["params"] = {"lookback": lookback}
+    return _strategy(definition)
+
+
+def _block(block_id: str, block_type: str, **params) -> dict:
+    return {"id": block_id, "type": block_type, "label": block_id, "position": {"x": 0, "y": 0}, "params": params}
+
+
+def _wire(source: str, source_port: str, target: str, target_port: str) -> dict:
+    return {"from_port": {"block_id": source, "port": source_port}, "to_port": {"block_id": target, "port": target_port}}
+
+
+def _stacked_macd_filters(filters: int) -> dict:
+    """MACD + ADX Dual Filter with ``filters`` more MACDs ANDed into the entry."""
+    definition = _template("MACD + ADX Dual Filter")
+    entry = next(c for c in definition["connections"] if c["to_port"]["block_id"] == "entry-1")
+    for i in range(filters):
+        definition["blocks"] += [
+            _block(f"macd-f{i}", "macd", fast_period=12, slow_period=27 + i, signal_period=9),
+            _block(f"compare-f{i}", "compare", operator=">"),
+            _block(f"and-f{i}", "and"),
+        ]
+        definition["connections"] += [
+            _wire(f"macd-f{i}", "macd", f"compare-f{i}", "left"),
+            _wire("const-zero", "output", f"compare-f{i}", "right"),
+            _wire(entry["from_port"]["block_id"], entry["from_port"]["port"], f"and-f{i}", "a"),
+            _wire(f"compare-f{i}", "output", f"and-f{i}", "b"),
+        ]
+        entry["from_port"] = {"block_id": f"and-f{i}", "port": "output"}
+    return definition
+
+
+def test_estimate_bars_follows_timeframe():
+    end = START + timedelta(days=10)
+    assert estimate_bars("1d", START, end) == 11
+    assert estimate_bars("1h", START, end) == 241
+    assert estimate_bars("1d", end, START) == 0
+
+
+def test_estimate_scales_with_bars_and_blocks():
+    light = plan_for(_strategy(_template("RSI Oversold Bounce")))
+    heavy = plan_for(_strategy(_template("MACD + ADX Dual Filter")))
+
+    small, large = estimate_plan_cost(light, 10_000), estimate_plan_cost(light, 100_000)
+    assert large.cpu_seconds > small.cpu_seconds
+    assert large.peak_memory_mb == pytest.approx(small.peak_memory_mb * 10)
+
+    assert estimate_plan_cost(heavy, 100_000).cpu_seconds > large.cpu_seconds
+
+
+def test_fibonacci_cost_does_not_grow_with_lookback():
+    short = estimate_plan_cost(plan_for(_fibonacci(20)), 100_000)
+    long = estimate_plan_cost(plan_for(_fibonacci(400)), 100_000)
+    assert long.cpu_seconds == short.cpu_seconds
+
+
+def test_estimate_run_cost_uses_date_range():
+    strategy = _strategy(_template("MA Crossover"))
+    year = estimate_run_cost(strategy, "1h", START, START + timedelta(days=365))
+    month = estimate_run_cost(strategy, "1h", START, START + timedelta(days=30))
+    assert year.bars == 8761
+    assert year.cpu_seconds > month.cpu_seconds
+
+
+def test_admit_run_routes_heavy_and_rejects_over_limit(monkeypatch):
+    version = StrategyVersion(definition_json=_template("MA Crossover"))
+    end = START + timedelta(days=365)
+
+    admission = admit_run(version, "1d", START, end)
+    assert not admission.heavy
+    assert admission.eta_seconds is not None
+
+    monkeypatch.setattr(settings, "backtest_heavy_cpu_seconds", 0.0)
+    assert admit_run(version, "1d", START, end).heavy
+
+    monkeypatch.setattr(settings, "backtest_max_cpu_seconds", 0.1)
+    with pytest.raises(RunTooExpensive):
+        admit_run(version, "1d", START, end)
+
+
+def test_admit_run_leaves_invalid_definitions_to_the_worker(monkeypatch):
+    monkeypatch.setattr(settings, "backtest_max_cpu_seconds", 0.0)
+    admission = admit_run(StrategyVersion(definition_json={"nodes": [], "edges": []}), "1d", START, START)
+    assert admission.estimate is None and not admission.heavy
+
+
+@pytest.mark.parametrize("name", ["MACD + ADX Dual Filter", "Bollinger + RSI Reversal"])
+def test_default_thresholds_route_long_hourly_runs_to_heavy(name):
+    version = StrategyVersion(definition_json=_template(name))
+
+    assert admit_run(version, "1h", START, START + timedelta(days=5 * 365)).heavy
+    assert not admit_run(version, "1h", START, START + timedelta(days=365)).heavy
+    assert not admit_run(version, "1d", START, START + timedelta(days=10 * 365)).heavy
+
+
+def test_default_thresholds_admit_every_template_at_the_plan_maximum():
+    end = START + timedelta(days=10 * 365)
+    for template in TEMPLATES:
+        admit_run(StrategyVersion(definition_json=_template(template["name"])), "1h", START, end)
+
+
+def test_default_thresholds_reject_pathological_strategies():
+    end = START + timedelta(days=10 * 365)
+
+    assert admit_run(StrategyVersion(definition_json=_stacked_macd_filters(100)), "1h", START, end).heavy
+    with pytest.raises(RunTooExpensive):
+        admit_run(StrategyVersion(definition_json=_stacked_macd_filters(150)), "1h", START, end)
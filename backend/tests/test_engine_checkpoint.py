@@ -0,0 +1,96 @@
+"""Tests for resuming the Engine from a checkpoint (app.backtest.checkpoint)."""
+from dataclasses import replace
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import fakeredis
+import pytest
+
+from app.backtest.candle_frame import CandleFrame
+from app.backtest.checkpoint import input_fingerprint
+from app.backtest.engine import run_backtest
+from app.services.checkpoint_store import EngineCheckpointStore
+from tests.test_multi_engine import _random_signals
+
+
+@pytest.fixture
+def frame(synthetic_ohlcv_candles) -> CandleFrame:
+    return CandleFrame.from_candles(synthetic_ohlcv_candles)
+
+
+def _prefix(signals, bars: int):
+    return replace(signals, entry_long=signals.entry_long[:bars], exit_long=signals.exit_long[:bars])
+
+
+def _run(frame, signals, bars: int, **kwargs):
+    return run_backtest(frame[:bars], _prefix(signals, bars), 10000.0, 0.001, 0.0005, **kwargs)
+
+
+@pytest.mark.parametrize("new_bars", [0, 1, 7])
+def test_resumed_run_equals_full_run(frame, new_bars):
+    n = len(frame)
+    for signals in _random_signals(n, seed=5):
+        previous = _run(frame, signals, n - 40, capture_checkpoint=True)
+        assert previous.checkpoint.next_index == n - 40
+
+        bars = n - 40 + new_bars
+        checkpoint = previous.checkpoint
+        assert checkpoint.fingerprint == input_fingerprint(
+            frame[:bars], _prefix(signals, bars), checkpoint.next_index, 10000.0, 0.001, 0.0005, 0.0002
+        )
+        resumed = _run(frame, signals, bars, resume_from=checkpoint, capture_checkpoint=True)
+
+        assert resumed == _run(frame, signals, bars)
+        assert resumed.checkpoint.next_index == bars
+        # The checkpoint it resumed from is left untouched for reuse
+        assert previous == _run(frame, signals, n - 40)
+
+
+def test_checkpoint_for_other_inputs_is_ignored(frame):
+    signals = _random_signals(len(frame), seed=3)[4]
+    checkpoint = _run(frame, signals, 200, capture_checkpoint=True).checkpoint
+
+    changed = replace(signals, exit_long=[not flag for flag in signals.exit_long])
+    assert _run(frame, changed, 210, resume_from=checkpoint) == _run(frame, changed, 210)
+    fee_changed = run_backtest(frame[:210], _prefix(signals, 210), 10000.0, 0.002, 0.0005, resume_from=checkpoint)
+    assert fee_changed == run_backtest(frame[:210], _prefix(signals, 210), 10000.0, 0.002, 0.0005)
+    # Candle history starting later: the checkpoint's bars no longer line up
+    shifted = run_backtest(frame[1:210], _prefix(signals, 209), 10000.0, 0.001, 0.0005, resume_from=checkpoint)
+    assert shifted == run_backtest(frame[1:210], _prefix(signals, 209), 10000.0, 0.001, 0.0005)
+    # Fewer candles than the checkpoint covers
+    assert _run(frame, signals, 150, resume_from=checkpoint) == _run(frame, signals, 150)
+
+
+def _store_key_run():
+    return SimpleNamespace(
+        strategy_version_id=uuid4(), asset="BTC/USDT", timeframe="1d",
+        date_from=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        initial_balance=10000.0, fee_rate=0.001, slippage_rate=0.0005, spread_rate=0.0002,
+    )
+
+
+def test_stored_checkpoint_resumes_like_the_original(frame):
+    n = len(frame)
+    store = EngineCheckpointStore(fakeredis.FakeRedis())
+    for signals in _random_signals(n, seed=5):
+        run = _store_key_run()
+        checkpoint = _run(frame, signals, n - 40, capture_checkpoint=True).checkpoint
+        store.write(run, checkpoint)
+
+        stored = store.read(run)
+
+        assert (stored.next_index, stored.fingerprint) == (checkpoint.next_index, checkpoint.fingerprint)
+        assert stored.engine.snapshot() == checkpoint.engine.snapshot()
+        for bars in (n - 40, n):
+            assert _run(frame, signals, bars, resume_from=stored) == _run(frame, signals, bars)
+
+
+def test_unreadable_checkpoint_is_a_miss(frame):
+    redis = fakeredis.FakeRedis()
+    store = EngineCheckpointStore(redis)
+    run = _store_key_run()
+    redis.set(store._key(run), b'{"next_index": 3, "fingerprint": "x", "engine": {"equity": 1.0}}')
+
+    assert store.read(run) is None
+    assert store._key(run).startswith("engine_checkpoint:v1:")
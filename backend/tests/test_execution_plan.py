@@ -0,0 +1,105 @@
+"""Tests for compiled strategy execution plans (app.backtest.execution_plan)."""
+import copy
+
+import pytest
+
+from app.backtest.candle_frame import CandleFrame
+from app.backtest.errors import StrategyInvalidError
+from app.backtest.execution_plan import compile_strategy, plan_for
+from app.backtest.indicator_cache import SharedIndicatorCache
+from app.backtest.interpreter import interpret_strategy
+from app.backtest.types import RiskParams, ValidatedStrategy
+from app.data.strategy_templates import TEMPLATES
+
+
+def _strategy(definition: dict) -> ValidatedStrategy:
+    return ValidatedStrategy(
+        blocks=tuple(definition["blocks"]),
+        connections=tuple(definition["connections"]),
+        risk_params=RiskParams(),
+    )
+
+
+def _template(name: str) -> dict:
+    return copy.deepcopy(next(t for t in TEMPLATES if t["name"] == name)["definition_json"])
+
+
+def _ma_crossover() -> dict:
+    return _template("MA Crossover")
+
+
+def _connect(definition: dict, from_block: str, to_block: str, to_port: str) -> None:
+    definition["connections"].append(
+        {"from_port": {"block_id": from_block, "port": "output"}, "to_port": {"block_id": to_block, "port": to_port}}
+    )
+
+
+def test_duplicate_blocks_merge_and_dead_blocks_drop(synthetic_ohlcv_candles):
+    definition = _ma_crossover()
+    # A second, identical slow SMA feeding the exit crossover
+    duplicate = dict(definition["blocks"][1], id="sma-slow-2", params={"source": "close", "period": 30})
+    definition["blocks"].append(duplicate)
+    for conn in definition["connections"]:
+        if conn["to_port"] == {"block_id": "crossover-exit", "port": "slow"}:
+            conn["from_port"]["block_id"] = "sma-slow-2"
+    # Blocks no signal depends on, one of a type the catalogue does not know
+    definition["blocks"].append({"id": "rsi-unused", "type": "rsi", "params": {"period": 14}})
+    definition["blocks"].append({"id": "mystery", "type": "not_a_block", "params": {}})
+
+    plan = compile_strategy(_strategy(definition))
+
+    assert [s.block_type for s in plan.steps] == ["sma", "sma", "crossover", "entry_signal", "crossover", "exit_signal"]
+    assert [s.block_id for s in plan.steps][:2] == ["sma-fast", "sma-slow"]
+    frame = CandleFrame.from_candles(synthetic_ohlcv_candles)
+    assert interpret_strategy(_strategy(definition), frame) == interpret_strategy(_strategy(_ma_crossover()), frame)
+
+
+def test_plans_are_cached_by_content():
+    definition = _ma_crossover()
+    moved = _ma_crossover()
+    for block in moved["blocks"]:
+        block["position"] = {"x": 0, "y": 0}
+        block["label"] = "renamed"
+    retuned = _ma_crossover()
+    retuned["blocks"][0]["params"]["period"] = 12
+
+    plan = plan_for(_strategy(definition))
+
+    assert plan_for(_strategy(moved)) is plan
+    assert plan_for(_strategy(retuned)) is not plan
+    assert plan_for(_strategy(retuned)).steps[0].params["period"] == 12
+
+
+def test_reachable_defects_raise():
+    cyclic = _ma_crossover()
+    _connect(cyclic, "crossover-entry", "sma-fast", "input")
+    with pytest.raises(StrategyInvalidError, match="Cycle"):
+        compile_strategy(_strategy(cyclic))
+
+    unknown = _ma_crossover()
+    unknown["blocks"][0]["type"] = "not_a_block"
+    with pytest.raises(StrategyInvalidError, match="Unknown block type"):
+        compile_strategy(_strategy(unknown))
+
+    with pytest.raises(StrategyInvalidError, match="no blocks"):
+        compile_strategy(_strategy({"blocks": [], "connections": []}))
+
+
+def test_steps_evaluate_only_consumed_ports(synthetic_ohlcv_candles):
+    plan = compile_strategy(_strategy(_template("MACD + ADX Dual Filter")))
+    ports = {s.block_type: s.ports for s in plan.steps}
+    assert ports["macd"] == {"histogram"} and ports["adx"] == {"adx"}
+    assert ports["entry_signal"] == {"output"}
+
+    # The ports a strategy skipped are computed on demand and match a full evaluation.
+    frame = CandleFrame.from_candles(synthetic_ohlcv_candles)
+    cache = SharedIndicatorCache(max_bytes=2**24)
+    interpret_strategy(_strategy(_template("MACD + ADX Dual Filter")), frame, indicator_cache=cache.view(frame))
+    assert cache.stats()["misses"] == 2
+
+    params = {"fast_period": 12, "slow_period": 26, "signal_period": 9}
+    lines = cache.view(frame).compute("macd", params, ("macd", "signal", "histogram"))
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["misses"]) == (1, 4)
+    full = SharedIndicatorCache(max_bytes=2**24).view(frame).compute("macd", params, ("macd", "signal", "histogram"))
+    assert {port: s.to_list() for port, s in lines.items()} == {port: s.to_list() for port, s in full.items()}
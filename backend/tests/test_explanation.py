@@ -10,6 +10,7 @@ from app.backtest.explanation import (
     _build_input_map,
     _compute_indicator_series,
 )
+from app.backtest.indicator_cache import shared_indicator_cache
 from app.models.candle import Candle
 
 
@@ -472,3 +473,65 @@ def test_build_trade_explanation_uses_signal_candle_for_entry_conditions():
     )
 
     assert any(cond.startswith("Close crossed above 100") for cond in entry_exp.conditions)
+
+
+def _bollinger_break_definition() -> dict:
+    return {
+        "blocks": [
+            {"id": "price", "type": "price", "params": {"source": "close"}},
+            {"id": "bb", "type": "bollinger", "params": {"period": 5, "stddev": 1.0}},
+            {"id": "cmp", "type": "compare", "params": {"operator": "<"}},
+            {"id": "entry-1", "type": "entry_signal", "params": {}},
+        ],
+        "connections": [
+            {"from_port": {"block_id": "price", "port": "output"}, "to_port": {"block_id": "cmp", "port": "left"}},
+            {"from_port": {"block_id": "bb", "port": "lower"}, "to_port": {"block_id": "cmp", "port": "right"}},
+            {"from_port": {"block_id": "cmp", "port": "output"}, "to_port": {"block_id": "entry-1", "port": "signal"}},
+        ],
+    }
+
+
+def _closes(closes: list[float]) -> list[Candle]:
+    return [
+        Candle(asset="BTC/USDT", timeframe="1d", timestamp=datetime(2025, 1, i + 1),
+               open=close, high=close + 1.0, low=close - 1.0, close=close, volume=1000.0)
+        for i, close in enumerate(closes)
+    ]
+
+
+def test_build_trade_explanation_evaluates_any_catalogue_block():
+    """Conditions on blocks beyond the basic indicators are checked at the signal candle."""
+    candles = _closes([100.0] * 9 + [90.0, 91.0])
+
+    entry_exp, _, _ = build_trade_explanation(
+        definition=_bollinger_break_definition(),
+        candles=candles,
+        trade_entry_idx=10,
+        trade_exit_idx=10,
+        exit_reason="signal",
+        sl_price=None,
+        tp_price=None,
+    )
+
+    assert entry_exp.conditions == ["Close < BB Lower(5) ✓"]
+
+
+def test_build_trade_explanation_overlays_reuse_evaluated_series():
+    """The overlay reads the band the conditions already computed instead of recomputing it."""
+    cache = shared_indicator_cache()
+    cache.clear()
+    cache.reset_stats()
+
+    _, _, overlays = build_trade_explanation(
+        definition=_bollinger_break_definition(),
+        candles=_closes([100.0] * 9 + [90.0, 91.0]),
+        trade_entry_idx=10,
+        trade_exit_idx=10,
+        exit_reason="signal",
+        sl_price=None,
+        tp_price=None,
+    )
+
+    assert [s.port for s in overlays] == ["upper", "middle", "lower"]
+    # One lookup per band: "lower" for the condition, then only the two bands it lacked.
+    assert cache.stats()["misses"] == 3 and cache.stats()["entries"] == 3
@@ -3104,3 +3104,61 @@ class TestMacdAdxDualFilterLookAhead:
         )
 
         assert_prefix_unchanged(golden_result, mutated_result, cut_timestamp)
+
+
+# ---------------------------------------------------------------------------
+# Vectorised metrics engine golden
+# ---------------------------------------------------------------------------
+
+# (result builder, timeframe, benchmark_return_pct, alpha, beta, sharpe, sortino, calmar)
+# Captured from the pure-Python compute_risk_metrics / compute_benchmark_metrics
+# before they were moved onto app.backtest.metrics.
+_METRICS_GOLDEN = [
+    (_rsi_oversold_bounce_result,        "1d", -13.0,  29.15, 0.7,   4.17,  11.44,  26.14),
+    (_ma_crossover_result,               "1d",   7.5, -13.24, 0.43, -1.84,  -2.34,  -1.3),
+    (_bollinger_breakout_result,         "4h",  18.0, -18.64, 0.39,  0.18,   0.26,  -1.22),
+    (_ema_trend_following_result,        "1d",  10.0,  14.65, 0.43,  6.36,  12.06,   9.75),
+    (_macd_histogram_cross_result,       "1d",  2.33,   5.18, 0.59,  9.39,  21.03,  21.59),
+    (_stochastic_oversold_bounce_result, "1d", -10.0,  -2.15, 0.48, -2.59,  -4.49,  -2.81),
+    (_adx_directional_filter_result,     "1d",   0.0,  76.64, 0.34,  9.55,  22.53,  32.63),
+    (_price_variation_momentum_result,   "1d",  2.77,  -3.43, 0.36, -1.41,  -1.5,   -6.87),
+    (_stoch_rsi_double_oversold_result,  "1d",   0.0,   7.85, 0.47,  1.97,   4.77,   4.97),
+    (_bollinger_rsi_reversal_result,     "1d",  -5.0,  -7.46, 0.59, -3.55,  -4.72,  -3.48),
+    (_ema_rsi_confirmation_result,       "1d", -7.33,   9.97, 0.02,  4.64,  20.35,  52.87),
+    (_macd_adx_dual_filter_result,       "1d",   0.5,   7.73, 0.6,   8.69,  18.84,  13.5),
+]
+
+
+@pytest.mark.parametrize(
+    "build, timeframe, bench_return, alpha, beta, sharpe, sortino, calmar",
+    _METRICS_GOLDEN,
+    ids=[row[0].__name__.strip("_").removesuffix("_result") for row in _METRICS_GOLDEN],
+)
+class TestMetricsEngineGolden:
+    """app.backtest.metrics reproduces the historical rounded metric outputs."""
+
+    def test_pipeline_metrics_unchanged(self, build, timeframe, bench_return, alpha, beta, sharpe, sortino, calmar):
+        result = build()
+
+        assert result.benchmark_return_pct == bench_return
+        assert result.alpha                == alpha
+        assert result.beta                 == beta
+        assert result.sharpe_ratio         == sharpe
+        assert result.sortino_ratio        == sortino
+        assert result.calmar_ratio         == calmar
+
+    def test_metrics_module_on_arrays(self, build, timeframe, bench_return, alpha, beta, sharpe, sortino, calmar):
+        from app.backtest import metrics
+
+        result = build()
+        initial = _RUN_CONFIG["initial_balance"]
+        equity = metrics.as_float_array([pt["equity"] for pt in result.equity_curve])
+        benchmark = metrics.as_float_array([pt["equity"] for pt in result.benchmark_curve_payload])
+        returns = metrics.period_returns(equity)
+        ppy = metrics.annualization_factor(timeframe)
+
+        assert round(metrics.total_return_pct(benchmark, initial), 2) == bench_return
+        assert round(metrics.alpha(equity, benchmark, initial), 2)    == alpha
+        assert round(metrics.beta(equity, benchmark), 2)              == beta
+        assert round(metrics.sharpe_ratio(returns, ppy), 2)           == sharpe
+        assert round(metrics.sortino_ratio(returns, ppy), 2)          == sortino
@@ -0,0 +1,153 @@
+"""Tests for the cross-run indicator cache (app.backtest.indicator_cache)."""
+import copy
+import json
+
+import fakeredis
+import numpy as np
+
+from app.backtest.candle_frame import CandleFrame
+from app.backtest.catalogue import CATALOGUE
+from app.backtest.catalogue.types import ArrayContext, SeriesArray, compute_arrays
+from app.backtest.execution_plan import normalized_params, params_key
+from app.backtest.indicator_cache import (
+    SharedIndicatorCache,
+    compute_period_batches,
+    decode_series,
+    encode_series,
+)
+from app.backtest.interpreter import interpret_strategy
+from app.backtest.types import RiskParams, ValidatedStrategy
+from app.data.strategy_templates import TEMPLATES
+from app.services.indicator_cache_store import RedisIndicatorTier
+
+
+def _strategy(name: str) -> ValidatedStrategy:
+    definition = copy.deepcopy(next(t for t in TEMPLATES if t["name"] == name)["definition_json"])
+    return ValidatedStrategy(
+        blocks=tuple(definition["blocks"]),
+        connections=tuple(definition["connections"]),
+        risk_params=RiskParams(),
+    )
+
+
+def _frame(candles) -> CandleFrame:
+    return CandleFrame.from_candles(candles)
+
+
+def test_series_survive_the_binary_encoding():
+    numeric = SeriesArray.from_list([None, 1.5, -2.25, None, 3.0], 5)
+    signal = SeriesArray.from_list([True, None, False, True, True, False, True, False, True], 9)
+
+    for series in (numeric, signal):
+        decoded = decode_series(encode_series(series))
+        assert decoded.values.dtype == series.values.dtype
+        assert decoded.to_list() == series.to_list()
+
+
+def test_equal_candles_share_indicator_outputs_across_runs(synthetic_ohlcv_candles):
+    cache = SharedIndicatorCache(max_bytes=2**24)
+    strategy = _strategy("MA Crossover")
+
+    frame = _frame(synthetic_ohlcv_candles)
+    first = interpret_strategy(strategy, frame, indicator_cache=cache.view(frame))
+    assert cache.stats()["misses"] == 2 and cache.stats()["memory_hits"] == 0
+
+    # A new frame over the same candles (another user's run) hits; other candles miss.
+    again = _frame(synthetic_ohlcv_candles)
+    second = interpret_strategy(strategy, again, indicator_cache=cache.view(again))
+    shorter = _frame(synthetic_ohlcv_candles)[:-1]
+    interpret_strategy(strategy, shorter, indicator_cache=cache.view(shorter))
+
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["misses"]) == (2, 4)
+    assert second == first == interpret_strategy(strategy, again, indicator_cache={})
+
+
+def test_remote_tier_serves_other_processes(synthetic_ohlcv_candles):
+    redis = fakeredis.FakeRedis()
+    strategy = _strategy("MACD + ADX Dual Filter")
+    writer = SharedIndicatorCache(max_bytes=2**24, remote=RedisIndicatorTier(redis))
+    reader = SharedIndicatorCache(max_bytes=2**24, remote=RedisIndicatorTier(redis))
+    frame = _frame(synthetic_ohlcv_candles)
+
+    expected = interpret_strategy(strategy, frame, indicator_cache=writer.view(frame))
+    assert redis.keys("indicator_cache:*")
+
+    assert interpret_strategy(strategy, frame, indicator_cache=reader.view(frame)) == expected
+    assert reader.stats()["remote_hits"] >= 1
+    assert reader.stats()["misses"] == 0
+
+
+def test_remote_failures_fall_back_to_computing(synthetic_ohlcv_candles):
+    class DownTier:
+        def read(self, keys):
+            raise ConnectionError("redis down")
+
+        def write(self, entries):
+            raise ConnectionError("redis down")
+
+    cache = SharedIndicatorCache(max_bytes=2**24, remote=DownTier())
+    frame = _frame(synthetic_ohlcv_candles)
+    strategy = _strategy("MA Crossover")
+
+    assert interpret_strategy(strategy, frame, indicator_cache=cache.view(frame)) == interpret_strategy(
+        strategy, frame, indicator_cache={}
+    )
+    assert cache.stats()["remote_errors"] > 0
+
+
+def test_in_process_tier_evicts_least_recently_used_bytes(synthetic_ohlcv_candles):
+    frame = _frame(synthetic_ohlcv_candles)
+    n = len(frame)
+    one_entry = np.zeros(n).nbytes + np.zeros(n, dtype=bool).nbytes
+    cache = SharedIndicatorCache(max_bytes=2 * one_entry)
+    view = cache.view(frame)
+
+    for period in (10, 20, 30):
+        view.compute("sma", {"period": period})
+    cache.view(frame).compute("sma", {"period": 30})
+    cache.view(frame).compute("sma", {"period": 10})
+
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["bytes"] <= 2 * one_entry
+    assert stats["evictions"] == 2
+    assert (stats["memory_hits"], stats["misses"]) == (1, 4)
+
+
+def test_normalised_params_share_one_entry(synthetic_ohlcv_candles):
+    cache = SharedIndicatorCache(max_bytes=2**24)
+    frame = _frame(synthetic_ohlcv_candles)
+
+    explicit = cache.view(frame).compute("ema", {"period": 20.0, "source": "close"})
+    implicit = cache.view(frame).compute("ema", {"period": 20})
+
+    assert implicit["output"] is explicit["output"]
+    assert cache.stats()["memory_hits"] == 1
+
+
+def test_periods_of_one_block_are_computed_in_one_batch(monkeypatch, synthetic_ohlcv_candles):
+    frame = _frame(synthetic_ohlcv_candles)
+    handler = CATALOGUE["sma"]
+    batches = []
+    compute_periods = handler.compute_periods
+    monkeypatch.setattr(
+        handler, "compute_periods", lambda ctx, periods: batches.append(list(periods)) or compute_periods(ctx, periods)
+    )
+    blocks = [
+        ("sma", {"period": 10}),
+        ("sma", {"period": 50.0, "source": "close"}),
+        ("sma", {"period": 20, "source": "open"}),  # alone in its group
+        ("ema", {"period": 20}),
+    ]
+    cache: dict = {}
+
+    compute_period_batches(cache, frame, blocks)
+    compute_period_batches(cache, frame, blocks)  # everything batchable is cached now
+
+    assert batches == [[10, 50]]
+    assert sorted(key[:2] for key in cache) == [
+        ("sma", params_key(normalized_params(handler.spec, {"period": period}))) for period in (10, 50)
+    ]
+    for (block_type, key, port), series in cache.items():
+        ctx = ArrayContext(candle_data=frame.candle_data(), params=json.loads(key), inputs={}, n=len(frame))
+        np.testing.assert_array_equal(series.values, compute_arrays(handler, ctx)[port].values)
@@ -0,0 +1,172 @@
+"""Parity tests: the NumPy indicator kernels against the pandas_ta backend (app.backtest.indicator_kernels)."""
+import numpy as np
+import pytest
+
+from app.backtest import indicator_kernels as kernels
+from app.backtest import indicators as ind
+from app.core.config import settings
+
+
+def _ohlcv(n: int, seed: int = 7, price: float = 100.0):
+    rng = np.random.default_rng(seed)
+    closes = price * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    spread = rng.uniform(0.002, 0.02, n)
+    highs, lows = closes * (1 + spread), closes * (1 - spread)
+    volumes = rng.uniform(1_000, 5_000, n)
+    return highs.tolist(), lows.tolist(), closes.tolist(), volumes.tolist()
+
+
+CALLS = {
+    "sma": lambda h, l, c, v, period=20: ind.sma(c, period),
+    "ema": lambda h, l, c, v, period=20: ind.ema(c, period),
+    "rsi": lambda h, l, c, v, period=14: ind.rsi(c, period),
+    "macd": lambda h, l, c, v, **p: ind.macd(c, **p),
+    "bollinger": lambda h, l, c, v, **p: ind.bollinger(c, **p),
+    "atr": lambda h, l, c, v, **p: ind.atr(h, l, c, **p),
+    "stochastic": lambda h, l, c, v, **p: ind.stochastic(h, l, c, **p),
+    "adx": lambda h, l, c, v, **p: ind.adx(h, l, c, **p),
+    "ichimoku": lambda h, l, c, v, **p: ind.ichimoku(h, l, c, **p),
+    "obv": lambda h, l, c, v, **p: ind.obv(c, v),
+}
+
+CASES = [(name, {}) for name in CALLS] + [
+    ("sma", {"period": 1}),
+    ("ema", {"period": 1}),
+    ("rsi", {"period": 2}),
+    ("macd", {"fast": 26, "slow": 12, "signal": 5}),
+    ("bollinger", {"period": 50, "std_dev": 1.5}),
+    ("atr", {"period": 1}),
+    ("stochastic", {"k_period": 5, "d_period": 8, "smooth": 2}),
+    ("adx", {"period": 7}),
+    ("ichimoku", {"conversion": 3, "base": 5, "span_b": 7}),
+]
+
+
+def _both(monkeypatch, name: str, params: dict, data) -> tuple[list, list]:
+    lines = []
+    for backend in ("pandas_ta", "numpy"):
+        monkeypatch.setattr(settings, "indicator_backend", backend)
+        result = CALLS[name](*data, **params)
+        lines.append(list(result) if isinstance(result, tuple) else [result])
+    return lines[0], lines[1]
+
+
+def _assert_same(reference: list, kernel: list) -> None:
+    assert len(kernel) == len(reference)
+    for ref_line, kernel_line in zip(reference, kernel):
+        assert [v is None for v in kernel_line] == [v is None for v in ref_line]
+        ref_values = [v for v in ref_line if v is not None]
+        kernel_values = [v for v in kernel_line if v is not None]
+        assert kernel_values == pytest.approx(ref_values, rel=1e-9, abs=1e-9)
+
+
+@pytest.mark.parametrize(
+    "name,params",
+    CASES,
+    ids=lambda v: v if isinstance(v, str) else ",".join(f"{k}={x}" for k, x in v.items()) or "defaults",
+)
+@pytest.mark.parametrize("n", [300, 2_000])
+def test_kernels_match_pandas_ta(monkeypatch, name, params, n):
+    reference, kernel = _both(monkeypatch, name, params, _ohlcv(n))
+    _assert_same(reference, kernel)
+
+
+@pytest.mark.parametrize("name", sorted(CALLS))
+def test_series_shorter_than_the_period_is_all_none(monkeypatch, name):
+    reference, kernel = _both(monkeypatch, name, {}, _ohlcv(5))
+    _assert_same(reference, kernel)
+
+
+@pytest.mark.parametrize("name", ["sma", "ema", "rsi", "macd", "bollinger"])
+def test_missing_head_matches_pandas_ta(monkeypatch, name):
+    """prev_close starts with None; pandas-ta skips it when seeding."""
+    highs, lows, closes, volumes = _ohlcv(300)
+    reference, kernel = _both(monkeypatch, name, {}, (highs, lows, [None] + closes[1:], volumes))
+    _assert_same(reference, kernel)
+
+
+@pytest.mark.parametrize("name", ["atr", "stochastic", "adx"])
+def test_flat_candle_matches_pandas_ta(monkeypatch, name):
+    highs, lows, closes, volumes = _ohlcv(300)
+    highs[150] = lows[150] = closes[150]
+    reference, kernel = _both(monkeypatch, name, {}, (highs, lows, closes, volumes))
+    _assert_same(reference, kernel)
+
+
+@pytest.mark.parametrize("name", ["macd", "bollinger", "ichimoku"])
+def test_kernels_hold_parity_at_high_prices(monkeypatch, name):
+    reference, kernel = _both(monkeypatch, name, {}, _ohlcv(5_000, seed=3, price=60_000.0))
+    _assert_same(reference, kernel)
+
+
+def test_unwanted_lines_are_not_computed(monkeypatch):
+    monkeypatch.setattr(settings, "indicator_backend", "numpy")
+    highs, lows, closes, _ = _ohlcv(300)
+
+    upper, middle, lower = ind.bollinger(closes, outputs={"middle"})
+    assert upper is None and lower is None and middle is not None
+
+    conversion, base, span_a, span_b = ind.ichimoku(highs, lows, closes, outputs={"span_b"})
+    assert conversion is None and base is None and span_a is None and span_b is not None
+
+
+def test_rolling_sum_stays_exact_over_a_long_series():
+    values = np.full(1_000_000, 0.1) + np.arange(1_000_000) * 1e-3
+    window = 20
+    expected = np.array([values[i - window + 1 : i + 1].sum() for i in range(window - 1, len(values), 997)])
+    assert kernels.rolling_sum(values, window)[window - 1 :: 997] == pytest.approx(expected, rel=1e-13)
+
+
+@pytest.mark.parametrize("window", [1, 3, 64, 257])
+def test_rolling_extreme_matches_a_window_scan(window):
+    values = np.random.default_rng(1).normal(size=1_000)
+    highest = kernels.rolling_extreme(values, window, largest=True)
+    lowest = kernels.rolling_extreme(values, window, largest=False)
+
+    assert np.isnan(highest[: window - 1]).all()
+    for i in range(window - 1, len(values)):
+        assert highest[i] == values[i - window + 1 : i + 1].max()
+        assert lowest[i] == values[i - window + 1 : i + 1].min()
+
+
+@pytest.mark.parametrize("lookback", [10, 50, 500])
+def test_fibonacci_matches_a_window_scan(lookback):
+    highs, lows, _, _ = _ohlcv(2_000)
+    highs[100:160] = lows[100:160] = [highs[100]] * 60  # flat range: every level at the low
+    levels = ind.fibonacci_retracements(highs, lows, lookback)
+
+    for i in range(len(highs)):
+        if i < lookback - 1:
+            assert all(line[i] is None for line in levels)
+            continue
+        highest, lowest = max(highs[i - lookback + 1 : i + 1]), min(lows[i - lookback + 1 : i + 1])
+        range_val = highest - lowest
+        assert [line[i] for line in levels] == [
+            lowest if range_val == 0 else highest - range_val * ratio
+            for ratio in kernels.FIBONACCI_RATIOS.values()
+        ]
+
+
+@pytest.mark.parametrize("name", ["sma", "ema", "rsi"])
+@pytest.mark.parametrize("n", [0, 5, 300, 3_000])
+def test_batches_equal_the_single_period_kernels(name, n):
+    _, _, closes, _ = _ohlcv(n)
+    periods = [1, 2, 7, 14, 20, 50, 200]
+    for values in (np.array(closes), np.array([np.nan] + closes[1:])):
+        batch = getattr(kernels, f"{name}_batch")(values, periods)
+        assert batch.shape == (len(periods), len(values))
+        for row, period in zip(batch, periods):
+            np.testing.assert_array_equal(row, getattr(kernels, name)(values, period))
+
+
+@pytest.mark.parametrize("backend", ["numpy", "pandas_ta"])
+@pytest.mark.parametrize("name", ["sma", "ema", "rsi"])
+def test_indicator_batches_stack_the_single_period_lists(monkeypatch, backend, name):
+    monkeypatch.setattr(settings, "indicator_backend", backend)
+    _, _, closes, _ = _ohlcv(300)
+    periods = [5, 14, 50]
+
+    batch = getattr(ind, f"{name}_batch")(closes, periods)
+
+    for row, period in zip(batch, periods):
+        assert [None if v != v else v for v in row.tolist()] == getattr(ind, name)(closes, period)
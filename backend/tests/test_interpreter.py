@@ -6,6 +6,7 @@ decoupled from the validation pipeline.
 from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
+import numpy as np
 import pytest
 
 from app.backtest.interpreter import interpret_strategy
@@ -108,7 +109,7 @@ def test_interpret_strategy_accepts_validated_strategy_and_returns_signals():
 
     signals = interpret_strategy(strategy, candles)
 
-    assert isinstance(signals.entry_long, list)
+    assert isinstance(signals.entry_long, np.ndarray)
     assert len(signals.entry_long) == len(candles)
     assert any(signals.entry_long)
 
@@ -272,7 +273,7 @@ def test_macd_signal_port_produces_entry_via_registry():
 
     signals = interpret_strategy(strategy, candles)
 
-    assert isinstance(signals.entry_long, list)
+    assert isinstance(signals.entry_long, np.ndarray)
     assert len(signals.entry_long) == len(candles)
 
 
@@ -295,7 +296,7 @@ def test_bollinger_lower_port_triggers_entry_on_price_below_band():
 
     signals = interpret_strategy(strategy, candles)
 
-    assert isinstance(signals.entry_long, list)
+    assert isinstance(signals.entry_long, np.ndarray)
     assert len(signals.entry_long) == len(candles)
 
 
@@ -307,7 +308,7 @@ def test_bollinger_lower_port_triggers_entry_on_price_below_band():
 # plus displacement=26, leaving data for the remaining candles.
 #
 # Assertions target *integration shape*, not numerical correctness:
-#   • entry_long and exit_long are lists of length n
+#   • entry_long and exit_long are boolean arrays of length n
 #   • risk fields default to their no-block values
 # ---------------------------------------------------------------------------
 
@@ -355,9 +356,9 @@ def test_indicator_full_strategy_chain_shape(
 
     signals = interpret_strategy(strategy, candles)
 
-    assert isinstance(signals.entry_long, list)
+    assert isinstance(signals.entry_long, np.ndarray)
     assert len(signals.entry_long) == n
-    assert isinstance(signals.exit_long, list)
+    assert isinstance(signals.exit_long, np.ndarray)
     assert len(signals.exit_long) == n
     assert signals.position_size_pct == 100.0
     assert signals.stop_loss_pct is None
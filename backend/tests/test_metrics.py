@@ -0,0 +1,156 @@
+"""Tests for app.backtest.metrics — vectorised risk and benchmark metrics."""
+import numpy as np
+import pytest
+
+from app.backtest import metrics
+
+
+def _reference_sharpe(equity: list[float], ppy: float) -> float:
+    returns = [(equity[i] - equity[i - 1]) / equity[i - 1] for i in range(1, len(equity)) if equity[i - 1] > 0]
+    mean = sum(returns) / len(returns)
+    std = (sum((r - mean) ** 2 for r in returns) / len(returns)) ** 0.5
+    return (mean * ppy) / (std * ppy ** 0.5)
+
+
+def test_period_returns_skips_non_positive_previous_equity():
+    returns = metrics.period_returns(np.array([100.0, 0.0, 50.0, 55.0]))
+
+    assert returns.tolist() == pytest.approx([-1.0, 0.1])
+
+
+def test_sharpe_matches_reference_loop():
+    rng = np.random.default_rng(7)
+    equity = 10000 * np.cumprod(1 + rng.normal(0.001, 0.02, 500))
+
+    got = metrics.sharpe_ratio(metrics.period_returns(equity), 365.25)
+
+    assert got == pytest.approx(_reference_sharpe(equity.tolist(), 365.25), rel=1e-12)
+
+
+def test_sharpe_and_sortino_zero_when_undefined():
+    flat = metrics.period_returns(np.full(10, 100.0))
+    rising = metrics.period_returns(np.arange(100.0, 110.0))
+
+    assert metrics.sharpe_ratio(flat, 365.25) == 0.0
+    assert metrics.sortino_ratio(rising, 365.25) == 0.0
+    assert metrics.sharpe_ratio(np.empty(0), 365.25) == 0.0
+
+
+def test_max_consecutive_losses_counts_longest_streak():
+    assert metrics.max_consecutive_losses(np.array([1.0, -1.0, -2.0, 0.0, -1.0, -1.0, -1.0, 5.0])) == 3
+    assert metrics.max_consecutive_losses(np.array([1.0, 0.0])) == 0
+    assert metrics.max_consecutive_losses(np.empty(0)) == 0
+
+
+def test_beta_of_benchmark_against_itself_is_one():
+    benchmark = np.array([100.0, 102.0, 99.0, 105.0, 104.0])
+
+    assert metrics.beta(benchmark, benchmark) == pytest.approx(1.0)
+    assert metrics.beta(np.full(5, 100.0), benchmark) == 0.0
+
+
+def test_drawdown_series_respects_initial_peak():
+    equity = np.array([90.0, 120.0, 60.0, 130.0])
+
+    assert metrics.drawdown_series(equity).tolist() == pytest.approx([0.0, 0.0, 50.0, 0.0])
+    assert metrics.drawdown_series(equity, initial_peak=100.0)[0] == pytest.approx(10.0)
+    assert metrics.max_drawdown_pct(equity) == pytest.approx(50.0)
+
+
+def test_rolling_sharpe_last_window_matches_scalar():
+    rng = np.random.default_rng(3)
+    equity = 10000 * np.cumprod(1 + rng.normal(0.0005, 0.01, 200))
+    window = 30
+
+    rolling = metrics.rolling_sharpe(equity, window, 365.25)
+
+    assert rolling.shape == equity.shape
+    assert np.isnan(rolling[:window]).all()
+    expected = metrics.sharpe_ratio(metrics.period_returns(equity[-(window + 1):]), 365.25)
+    assert rolling[-1] == pytest.approx(expected, rel=1e-9)
+
+
+def test_rolling_sharpe_is_undefined_for_constant_returns():
+    equity = 10000 * np.cumprod(np.full(200, 1.001))
+
+    assert np.isnan(metrics.rolling_sharpe(equity, 30, 365)).all()
+
+
+def test_rolling_sharpe_skips_returns_after_non_positive_equity():
+    rng = np.random.default_rng(6)
+    equity = 100 * np.cumprod(1 + rng.normal(0.001, 0.01, 60))
+    equity[20] = 0.0
+
+    rolling = metrics.rolling_sharpe(equity, 10, 365.25)
+
+    # The return out of the zero bar is dropped, so that bar's successor has no value
+    assert np.isnan(rolling[21]) and not np.isnan(rolling[20])
+    expected = metrics.sharpe_ratio(metrics.period_returns(equity[-11:]), 365.25)
+    assert rolling[-1] == pytest.approx(expected, rel=1e-9)
+
+
+def test_rolling_sortino_last_window_matches_scalar():
+    rng = np.random.default_rng(4)
+    equity = 10000 * np.cumprod(1 + rng.normal(0.0, 0.01, 120))
+    window = 20
+
+    rolling = metrics.rolling_sortino(equity, window, 8766.0)
+
+    expected = metrics.sortino_ratio(metrics.period_returns(equity[-(window + 1):]), 8766.0)
+    assert rolling[-1] == pytest.approx(expected, rel=1e-9)
+
+
+def test_rolling_sortino_skips_returns_after_non_positive_equity():
+    equity = np.array([100.0, 110.0, 0.0, 50.0, 55.0, 60.0, 58.0, 62.0, 61.0, 65.0])
+
+    rolling = metrics.rolling_sortino(equity, 3, 365.25)
+
+    assert np.isfinite(rolling[-4:]).all()
+    expected = metrics.sortino_ratio(metrics.period_returns(equity[-4:]), 365.25)
+    assert rolling[-1] == pytest.approx(expected, rel=1e-9)
+
+
+def test_rolling_beta_is_undefined_for_a_constant_return_benchmark():
+    benchmark = 100 * 1.001 ** np.arange(60)
+    strategy = 100 * np.cumprod(1 + np.random.default_rng(2).normal(0.0, 0.01, 60))
+
+    assert np.isnan(metrics.rolling_beta(strategy, benchmark, 20)).all()
+
+
+def test_rolling_beta_last_window_matches_scalar():
+    rng = np.random.default_rng(5)
+    benchmark = 100 * np.cumprod(1 + rng.normal(0.0, 0.02, 80))
+    strategy = 100 * np.cumprod(1 + 0.5 * np.diff(benchmark, prepend=benchmark[0]) / benchmark)
+    window = 25
+
+    rolling = metrics.rolling_beta(strategy, benchmark, window)
+
+    expected = metrics.beta(strategy[-(window + 1):], benchmark[-(window + 1):])
+    assert rolling[-1] == pytest.approx(expected, rel=1e-6)
+
+
+def test_rolling_max_drawdown_per_window():
+    equity = np.array([100.0, 110.0, 55.0, 60.0, 120.0, 118.0])
+
+    rolling = metrics.rolling_max_drawdown(equity, 3)
+
+    assert np.isnan(rolling[:2]).all()
+    assert rolling[2:].tolist() == pytest.approx([50.0, 50.0, 0.0, 1 / 60 * 100])
+
+
+def test_rolling_max_drawdown_matches_a_window_by_window_scan():
+    rng = np.random.default_rng(7)
+    equity = 100 * np.cumprod(1 + rng.normal(0.0, 0.03, 101))
+    window = 7
+
+    rolling = metrics.rolling_max_drawdown(equity, window)
+
+    expected = [metrics.max_drawdown_pct(equity[i - window + 1:i + 1]) for i in range(window - 1, equity.size)]
+    assert rolling[window - 1:] == pytest.approx(expected, rel=1e-12)
+
+
+def test_rolling_metrics_all_nan_when_series_shorter_than_window():
+    equity = np.array([100.0, 101.0])
+
+    assert np.isnan(metrics.rolling_sharpe(equity, 5, 365.25)).all()
+    assert np.isnan(metrics.rolling_max_drawdown(equity, 5)).all()
@@ -0,0 +1,78 @@
+"""Tests for the Monte Carlo robustness analysis (app.backtest.monte_carlo)."""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.backtest import metrics
+from app.backtest.errors import BacktestError
+from app.backtest.monte_carlo import path_metrics, position_pnls, run_monte_carlo, trade_returns
+from app.backtest.position_manager import Trade
+
+_PNLS = [100.0, -50.0, -25.0, 200.0, -80.0, 40.0, -10.0, -10.0, -10.0, 150.0]
+
+
+def _trade(entry_hour: int, pnl: float, exit_reason: str = "signal") -> Trade:
+    entry = datetime(2024, 1, 1) + timedelta(hours=entry_hour)
+    exit_ = entry + timedelta(hours=1)
+    return Trade(
+        entry_time=entry, entry_price=100.0, exit_time=exit_, exit_price=101.0, side="long",
+        pnl=pnl, pnl_pct=pnl / 100.0, qty=1.0, sl_price_at_entry=None, tp_price_at_entry=None,
+        exit_reason=exit_reason, mae_usd=0.0, mae_pct=0.0, mfe_usd=1.0, mfe_pct=1.0,
+        initial_risk_usd=None, r_multiple=None, peak_price=101.0, peak_ts=exit_,
+        trough_price=99.0, trough_ts=entry, duration_seconds=3600, fee_cost_usd=0.0,
+        slippage_cost_usd=0.0, spread_cost_usd=0.0, total_cost_usd=0.0, notional_usd=100.0,
+    )
+
+
+def test_position_pnls_sum_take_profit_partials():
+    trades = [
+        _trade(0, 30.0, "tp"), _trade(0, 20.0, "tp"), _trade(0, -5.0, "sl"),
+        _trade(5, -40.0, "sl"),
+        _trade(9, 10.0, "tp"), _trade(9, 15.0, "signal"),
+    ]
+
+    assert position_pnls(trades) == [45.0, -40.0, 25.0]
+
+
+def test_trade_returns_are_relative_to_equity_at_entry():
+    returns = trade_returns([100.0, -220.0, 50.0], 1000.0)
+
+    assert returns.tolist() == pytest.approx([0.1, -0.2, 50.0 / 880.0])
+
+
+def test_path_metrics_match_scalar_metrics_per_row():
+    rng = np.random.default_rng(7)
+    paths = rng.normal(0.001, 0.05, size=(20, 30))
+
+    final, drawdown, losses = path_metrics(paths, 1000.0)
+
+    for row, path in enumerate(paths):
+        equity = 1000.0 * np.cumprod(1.0 + path)
+        assert final[row] == pytest.approx(equity[-1])
+        assert drawdown[row] == pytest.approx(metrics.max_drawdown_pct(equity, initial_peak=1000.0))
+        assert losses[row] == metrics.max_consecutive_losses(path)
+
+
+def test_shuffle_keeps_final_equity_and_bootstrap_spreads_it():
+    result = run_monte_carlo(_PNLS, 1000.0, num_simulations=2000, seed=1)
+
+    original_final = 1000.0 + sum(_PNLS)
+    assert list(result.shuffle.final_equity.values()) == pytest.approx([original_final] * 5, abs=0.01)
+    assert result.bootstrap.final_equity["p5"] < original_final < result.bootstrap.final_equity["p95"]
+    for distribution in (result.shuffle, result.bootstrap):
+        percentiles = list(distribution.max_drawdown_pct.values())
+        assert percentiles == sorted(percentiles)
+        assert all(float(v).is_integer() for v in distribution.max_consecutive_losses.values())
+    assert result.num_trades == len(_PNLS)
+
+
+def test_same_seed_gives_same_result():
+    assert run_monte_carlo(_PNLS, 1000.0, 500, seed=42) == run_monte_carlo(_PNLS, 1000.0, 500, seed=42)
+
+
+def test_no_trades_raises():
+    with pytest.raises(BacktestError):
+        run_monte_carlo([], 1000.0)
+    with pytest.raises(ValueError):
+        run_monte_carlo(_PNLS, 1000.0, num_simulations=0)
@@ -0,0 +1,84 @@
+"""Tests for the multi-strategy Engine kernel (app.backtest.multi_engine)."""
+import copy
+
+import numpy as np
+import pytest
+
+from app.backtest.candle_frame import CandleFrame
+from app.backtest.engine import run_backtest
+from app.backtest.interpreter import StrategySignals, TakeProfitLevel, interpret_strategy
+from app.backtest.multi_engine import run_backtests
+from app.backtest.pipeline import BacktestParams, build_outcome, build_outcomes
+from app.data.strategy_templates import TEMPLATES
+from app.schemas.strategy import StrategyDefinitionValidate
+from app.services.strategy_validation import validate_strategy
+
+
+@pytest.fixture
+def frame(synthetic_ohlcv_candles) -> CandleFrame:
+    return CandleFrame.from_candles(synthetic_ohlcv_candles)
+
+
+def _random_signals(n: int, seed: int) -> list[StrategySignals]:
+    """Strategies covering every exit: SL, trailing, max DD, time, signal and TP ladders."""
+    rng = np.random.default_rng(seed)
+    ladders = [
+        None,
+        [TakeProfitLevel(profit_pct=3, close_pct=100)],
+        [TakeProfitLevel(profit_pct=4, close_pct=50), TakeProfitLevel(profit_pct=2, close_pct=25)],
+        [TakeProfitLevel(profit_pct=2, close_pct=50), TakeProfitLevel(profit_pct=2, close_pct=50)],
+    ]
+    signals = []
+    for k in range(24):
+        signals.append(
+            StrategySignals(
+                entry_long=(rng.random(n - k % 3) < 0.15).tolist(),  # some shorter than the frame
+                exit_long=(rng.random(n) < 0.08).tolist(),
+                position_size_pct=[100.0, 50.0, 20.0][k % 3],
+                take_profit_levels=ladders[k % 4],
+                stop_loss_pct=[None, 2.0, 5.0][k % 3],
+                max_drawdown_pct=[None, 4.0][k % 2],
+                time_exit_bars=[None, 5, None, 12][k % 4],
+                trailing_stop_pct=[None, None, 3.0][k % 3],
+            )
+        )
+    return signals
+
+
+def test_results_equal_separate_run_backtest_calls(frame):
+    signals = _random_signals(len(frame), seed=11)
+    fee_rates = [0.001, 0.0, 0.002] * 8
+
+    results = run_backtests(frame, signals, 10000.0, fee_rates, 0.0005, spread_rate=0.0002)
+
+    assert sum(r.num_trades for r in results) > 100
+    assert {t.exit_reason for r in results for t in r.trades} >= {
+        "sl", "trailing_stop", "max_dd", "time_exit", "signal", "tp", "end_of_data"
+    }
+    for strategy_signals, fee_rate, result in zip(signals, fee_rates, results):
+        assert result == run_backtest(frame, strategy_signals, 10000.0, fee_rate, 0.0005, spread_rate=0.0002)
+
+
+def test_empty_inputs(frame):
+    signals = _random_signals(len(frame), seed=1)[:2]
+
+    assert run_backtests(frame, [], 10000.0, 0.001, 0.0005) == []
+    empty = run_backtests([], signals, [1000.0, 2000.0], 0.001, 0.0005)
+    assert [r.final_balance for r in empty] == [1000.0, 2000.0]
+    assert empty[0] == run_backtest([], signals[0], 1000.0, 0.001, 0.0005)
+
+
+def test_build_outcomes_matches_build_outcome_for_templates(frame):
+    signals = []
+    for template in TEMPLATES[:6]:
+        definition = copy.deepcopy(template["definition_json"])
+        strategy = validate_strategy(StrategyDefinitionValidate.model_validate(definition)).strategy
+        signals.append(interpret_strategy(strategy, frame))
+    params = [
+        BacktestParams(initial_balance=10000.0, fee_rate=0.001 * k, slippage_rate=0.0005)
+        for k in range(len(signals))
+    ]
+
+    outcomes = build_outcomes(frame, signals, params)
+
+    assert outcomes == [build_outcome(frame, s, p) for s, p in zip(signals, params)]
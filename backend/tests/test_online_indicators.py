@@ -0,0 +1,122 @@
+"""Tests for the online indicator forms (app.backtest.online_indicators) behind OnlineBlockHandler."""
+import pytest
+
+from app.backtest.candle_frame import Bar, CandleFrame
+from app.backtest.catalogue import CATALOGUE
+from app.backtest.catalogue.types import ArrayContext, OnlineBlockHandler, compute_arrays
+from app.backtest.errors import StrategyInvalidError
+from app.core.config import settings
+
+INDICATORS = sorted(t for t, h in CATALOGUE.items() if h.spec.category == "indicator")
+
+PARAM_CASES = [
+    ("sma", {"period": 1}),
+    ("sma", {"period": 20, "source": "prev_close"}),
+    ("ema", {"period": 50, "source": "high"}),
+    ("rsi", {"period": 2, "source": "prev_close"}),
+    ("macd", {"fast_period": 26, "slow_period": 12, "signal_period": 5}),
+    ("bollinger", {"period": 50, "stddev": 1.5, "source": "low"}),
+    ("stochastic", {"k_period": 5, "d_period": 8, "smooth": 2}),
+    ("adx", {"period": 7}),
+    ("ichimoku", {"conversion": 3, "base": 5, "span_b": 7, "displacement": 5}),
+    ("fibonacci", {"lookback": 200}),
+]
+
+
+@pytest.fixture
+def pandas_ta_backend(monkeypatch):
+    """The online forms repeat pandas-ta's arithmetic; the NumPy kernels agree with them to rounding."""
+    monkeypatch.setattr(settings, "indicator_backend", "pandas_ta")
+
+
+def _batch(block_type: str, params: dict, frame: CandleFrame) -> dict[str, list]:
+    ctx = ArrayContext(candle_data=frame.candle_data(), params=params, inputs={}, n=len(frame))
+    return {port: series.to_list() for port, series in compute_arrays(CATALOGUE[block_type], ctx).items()}
+
+
+def _online(block_type: str, params: dict, candles: list, warm: int) -> dict[str, list]:
+    """Outputs for candles[warm:], after init_state over candles[:warm]."""
+    handler = CATALOGUE[block_type]
+    state = handler.init_state(params, candles[:warm])
+    lines: dict[str, list] = {}
+    for candle in candles[warm:]:
+        for port, value in handler.update(state, candle).items():
+            lines.setdefault(port, []).append(value)
+    return lines
+
+
+def test_every_indicator_has_an_online_form():
+    assert INDICATORS
+    for block_type in INDICATORS:
+        assert isinstance(CATALOGUE[block_type], OnlineBlockHandler), block_type
+
+
+@pytest.mark.parametrize(
+    "block_type,params",
+    [(t, {}) for t in INDICATORS] + PARAM_CASES,
+    ids=lambda v: v if isinstance(v, str) else ",".join(f"{k}={x}" for k, x in v.items()) or "defaults",
+)
+def test_update_matches_batch_bit_for_bit(pandas_ta_backend, synthetic_ohlcv_candles, block_type, params):
+    frame = CandleFrame.from_candles(synthetic_ohlcv_candles)
+    warm = 100
+
+    batch = _batch(block_type, params, frame)
+    online = _online(block_type, params, synthetic_ohlcv_candles, warm)
+
+    assert set(online) == {p.name for p in CATALOGUE[block_type].spec.outputs}
+    for port, values in online.items():
+        assert values == batch[port][warm:], port
+
+
+@pytest.mark.parametrize("block_type,params", [(t, {}) for t in INDICATORS] + PARAM_CASES)
+def test_update_matches_numpy_kernels_to_rounding(synthetic_ohlcv_candles, block_type, params):
+    frame = CandleFrame.from_candles(synthetic_ohlcv_candles)
+    warm = 100
+
+    batch = _batch(block_type, params, frame)
+    online = _online(block_type, params, synthetic_ohlcv_candles, warm)
+
+    for port, values in online.items():
+        assert values == pytest.approx(batch[port][warm:], rel=1e-9, abs=1e-9), port
+
+
+@pytest.mark.parametrize(
+    "block_type,params",
+    [
+        ("macd", {"fast_period": 3, "slow_period": 5, "signal_period": 9}),
+        ("stochastic", {"k_period": 5, "d_period": 8, "smooth": 2}),
+        ("ichimoku", {"conversion": 3, "base": 5, "span_b": 7, "displacement": 5}),
+        ("rsi", {"period": 14}),
+    ],
+)
+def test_warm_up_matches_batch_over_the_candles_so_far(pandas_ta_backend, synthetic_ohlcv_candles, block_type, params):
+    candles = synthetic_ohlcv_candles[:30]
+    online = _online(block_type, params, candles, warm=0)
+
+    for i in range(len(candles)):
+        batch = _batch(block_type, params, CandleFrame.from_candles(candles[: i + 1]))
+        assert {port: values[i] for port, values in online.items()} == {
+            port: values[-1] for port, values in batch.items()
+        }, i
+
+
+def test_flat_candle_adds_epsilon_from_that_bar_on(pandas_ta_backend, synthetic_ohlcv_candles):
+    """pandas-ta shifts every range by epsilon once a zero range appears; online forms cannot look back."""
+    candles = [
+        Bar(c.timestamp, c.open / 1000, c.high / 1000, c.low / 1000, c.close / 1000, c.volume)
+        for c in synthetic_ohlcv_candles[:120]
+    ]
+    flat = candles[80]
+    candles[80] = flat._replace(high=flat.close, low=flat.close)
+
+    online = _online("atr", {}, candles, warm=0)["output"]
+    batch = _batch("atr", {}, CandleFrame.from_candles(candles[:80]))["output"]
+    assert online[:80] == batch
+
+    full = _batch("atr", {}, CandleFrame.from_candles(candles))["output"]
+    assert online[80:] == pytest.approx(full[80:], rel=1e-9)
+
+
+def test_unknown_source_is_rejected():
+    with pytest.raises(StrategyInvalidError):
+        CATALOGUE["sma"].init_state({"period": 5, "source": "vwap"}, [])
@@ -0,0 +1,163 @@
+"""Tests for the parameter sweep (app.backtest.optimization) and its override layer."""
+import copy
+
+import pytest
+
+from app.backtest.candle_frame import CandleFrame
+from app.backtest.catalogue import CATALOGUE
+from app.backtest.errors import BacktestError
+from app.backtest.interpreter import interpret_strategy
+from app.backtest.optimization import (
+    RANKABLE_METRICS,
+    SweepVariant,
+    expand_grid,
+    outcome_metrics,
+    run_sweep,
+)
+from app.backtest.pipeline import BacktestParams, run_pipeline
+from app.backtest.types import RiskParams, ValidatedStrategy
+from app.data.strategy_templates import TEMPLATES
+from app.schemas.strategy import StrategyDefinitionValidate
+from app.services.exceptions import StrategyValidationError
+from app.services.parameter_sweep import apply_overrides, build_sweep_variants
+from app.services.strategy_validation import validate_strategy
+
+_PARAMS = BacktestParams(initial_balance=10000.0, fee_rate=0.001, slippage_rate=0.0005)
+
+
+def _rsi_strategy() -> ValidatedStrategy:
+    definition = copy.deepcopy(next(t for t in TEMPLATES if t["name"] == "RSI Oversold Bounce")["definition_json"])
+    definition["blocks"].append(
+        {
+            "id": "sl-1",
+            "type": "stop_loss",
+            "label": "Stop Loss",
+            "position": {"x": 0, "y": 0},
+            "params": {"stop_loss_pct": 5},
+        }
+    )
+    result = validate_strategy(StrategyDefinitionValidate.model_validate(definition))
+    assert not result.errors
+    return result.strategy
+
+
+def _grid_variants() -> list[SweepVariant]:
+    grid = {"rsi-1.period": [7, 14], "const-oversold.value": [30, 40], "sl-1.stop_loss_pct": [3, 8]}
+    return build_sweep_variants(_rsi_strategy(), expand_grid(grid))
+
+
+def test_expand_grid_is_cartesian_product_in_key_order():
+    assert expand_grid({"a.x": [1, 2], "b.y": ["p", "q"]}) == [
+        {"a.x": 1, "b.y": "p"},
+        {"a.x": 1, "b.y": "q"},
+        {"a.x": 2, "b.y": "p"},
+        {"a.x": 2, "b.y": "q"},
+    ]
+    assert expand_grid({}) == []
+
+
+def test_apply_overrides_updates_catalogue_and_risk_params():
+    result = apply_overrides(_rsi_strategy(), {"rsi-1.period": 21, "sl-1.stop_loss_pct": 2.5})
+
+    assert not result.errors
+    rsi = next(b for b in result.strategy.blocks if b["id"] == "rsi-1")
+    assert rsi["params"]["period"] == 21
+    assert result.strategy.risk_params.stop_loss_pct == 2.5
+
+
+def test_apply_overrides_rejects_unknown_keys_and_out_of_range_values():
+    unknown = apply_overrides(_rsi_strategy(), {"rsi-1.lookback": 5, "missing.period": 3})
+    out_of_range = apply_overrides(_rsi_strategy(), {"rsi-1.period": 0})
+
+    assert [e.code for e in unknown.errors] == ["INVALID_OVERRIDE", "INVALID_OVERRIDE"]
+    assert out_of_range.errors and out_of_range.strategy is None
+
+
+def test_build_sweep_variants_rejects_whole_sweep_on_any_invalid_combination():
+    with pytest.raises(StrategyValidationError):
+        build_sweep_variants(_rsi_strategy(), [{"rsi-1.period": 14}, {"rsi-1.period": -1}])
+
+
+def test_sweep_rows_match_individual_pipeline_runs(synthetic_ohlcv_candles):
+    variants = _grid_variants()
+
+    rows = run_sweep(variants, synthetic_ohlcv_candles, _PARAMS, rank_by="total_return_pct")
+
+    assert len(rows) == 8
+    assert [row.rank for row in rows] == list(range(1, 9))
+    returns = [row.metrics["total_return_pct"] for row in rows]
+    assert returns == sorted(returns, reverse=True)
+    by_overrides = {tuple(v.overrides.items()): v.strategy for v in variants}
+    for row in rows:
+        strategy = by_overrides[tuple(row.overrides.items())]
+        assert row.metrics == outcome_metrics(run_pipeline(strategy, synthetic_ohlcv_candles, _PARAMS))
+
+
+def test_lower_is_better_metrics_rank_ascending(synthetic_ohlcv_candles):
+    rows = run_sweep(_grid_variants(), synthetic_ohlcv_candles, _PARAMS, rank_by="max_drawdown_pct")
+
+    drawdowns = [row.metrics["max_drawdown_pct"] for row in rows]
+    assert drawdowns == sorted(drawdowns)
+
+
+def test_process_pool_matches_in_process_sweep(synthetic_ohlcv_candles):
+    variants = _grid_variants()
+    frame = CandleFrame.from_candles(synthetic_ohlcv_candles)
+
+    inline = run_sweep(variants, frame, _PARAMS, max_workers=1)
+    pooled = run_sweep(variants, frame, _PARAMS, max_workers=2)
+
+    assert pooled == inline
+
+
+def test_indicator_cache_is_shared_across_variants(synthetic_ohlcv_candles):
+    variants = build_sweep_variants(_rsi_strategy(), expand_grid({"sl-1.stop_loss_pct": [2, 4, 6]}))
+    frame = CandleFrame.from_candles(synthetic_ohlcv_candles)
+    cache: dict = {}
+
+    signals = [interpret_strategy(v.strategy, frame, indicator_cache=cache) for v in variants]
+
+    # One RSI plus two distinct constants — computed once for all three variants.
+    assert sorted(key[0] for key in cache) == ["constant", "constant", "rsi"]
+    assert signals[0].entry_long.tolist() == interpret_strategy(variants[0].strategy, frame).entry_long.tolist()
+
+
+def test_period_variants_are_computed_in_one_batch(monkeypatch, synthetic_ohlcv_candles):
+    variants = build_sweep_variants(_rsi_strategy(), expand_grid({"rsi-1.period": [7, 14, 21]}))
+    handler = CATALOGUE["rsi"]
+    batches = []
+    compute_periods = handler.compute_periods
+    monkeypatch.setattr(
+        handler, "compute_periods", lambda ctx, periods: batches.append(list(periods)) or compute_periods(ctx, periods)
+    )
+
+    rows = run_sweep(variants, synthetic_ohlcv_candles, _PARAMS, max_workers=1)
+
+    assert batches == [[7, 14, 21]]
+    by_overrides = {tuple(v.overrides.items()): v.strategy for v in variants}
+    for row in rows:
+        strategy = by_overrides[tuple(row.overrides.items())]
+        assert row.metrics == outcome_metrics(run_pipeline(strategy, synthetic_ohlcv_candles, _PARAMS))
+
+
+def test_failed_variants_are_reported_after_ranked_rows(synthetic_ohlcv_candles):
+    good = _grid_variants()[0]
+    broken = SweepVariant(
+        overrides={"note": "empty"},
+        strategy=ValidatedStrategy(blocks=(), connections=(), risk_params=RiskParams()),
+    )
+
+    rows = run_sweep([broken, good], synthetic_ohlcv_candles, _PARAMS)
+
+    assert rows[0].rank == 1 and rows[0].overrides == good.overrides
+    assert rows[1].rank is None
+    assert rows[1].metrics is None
+    assert rows[1].error_message == "Invalid strategy: no blocks defined."
+
+
+def test_run_sweep_rejects_unknown_metric_and_empty_candles(synthetic_ohlcv_candles):
+    assert "used_backup_data" not in RANKABLE_METRICS
+    with pytest.raises(ValueError):
+        run_sweep(_grid_variants(), synthetic_ohlcv_candles, _PARAMS, rank_by="equity_curve_payload")
+    with pytest.raises(BacktestError):
+        run_sweep(_grid_variants(), [], _PARAMS)
@@ -1,12 +1,17 @@
-"""Tests for refresh_spot_prices cache-poisoning protection and last-known-good merge."""
-from datetime import datetime, timezone
+"""Tests for refresh_spot_prices cache-poisoning protection, last-known-good merge and the volatility snapshot."""
+from datetime import datetime, timedelta, timezone
 from unittest.mock import patch
 
 import fakeredis
+import pytest
+
+from app.backtest.volatility import calculate_stddev_volatility
+from app.models.candle import Candle
 
 from app.schemas.market import TickerItem, TickerListResponse
 from app.services.spot_price_cache import SpotPriceCache
-from app.worker.jobs import _merge_with_cached, refresh_spot_prices
+from app.worker import jobs
+from app.worker.jobs import _merge_with_cached, refresh_spot_prices, refresh_volatility_snapshot
 
 
 def _item(pair, price, change=0.0, volume=0.0):
@@ -50,6 +55,11 @@ def test_merge_appends_new_pairs_not_in_cache():
 # --------------------------------------------------------------------------- #
 
 
+@pytest.fixture(autouse=True)
+def _test_engine(engine, monkeypatch):
+    monkeypatch.setattr(jobs, "engine", engine)
+
+
 def _run_refresh(redis, fetched_items):
     """Run refresh_spot_prices with the gate open and a stubbed fetch."""
     with patch("app.worker.jobs.Redis.from_url", return_value=redis), \
@@ -92,3 +102,59 @@ def test_refresh_never_writes_zero_prices():
     _run_refresh(redis, [_item("BTC/USDT", 51000.0)])
 
     assert all(i.price > 0 for i in cache.read().items)
+
+
+# --------------------------------------------------------------------------- #
+# volatility snapshot                                                           #
+# --------------------------------------------------------------------------- #
+
+
+def _seed_daily_candles(session, asset, closes):
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i, close in enumerate(closes):
+        session.add(Candle(
+            asset=asset, timeframe="1d", timestamp=start + timedelta(days=i),
+            open=close, high=close * 1.02, low=close * 0.98, close=close, volume=1.0,
+        ))
+    session.commit()
+
+
+def test_first_refresh_writes_the_volatility_snapshot(session):
+    closes = [50000.0 + 500.0 * ((i * 37) % 11 - 5) for i in range(60)]
+    _seed_daily_candles(session, "BTC/USDT", closes)
+    redis = fakeredis.FakeRedis()
+    cache = SpotPriceCache(redis)
+
+    _run_refresh(redis, [_item("BTC/USDT", 51000.0), _item("ETH/USDT", 3000.0)])
+
+    btc, eth = cache.read_tickers().items
+    assert btc.volatility_stddev == pytest.approx(calculate_stddev_volatility(closes))
+    assert btc.volatility_atr_pct is not None
+    assert btc.volatility_percentile_1y is None  # under a year of history
+    assert eth.volatility_stddev is None  # no stored candles
+
+
+def test_refresh_keeps_an_existing_snapshot(session):
+    redis = fakeredis.FakeRedis()
+    cache = SpotPriceCache(redis)
+    cache.write_volatility({"BTC/USDT": {"volatility_stddev": 0.05, "atr": 510.0, "volatility_percentile_1y": 90.0}})
+    _seed_daily_candles(session, "BTC/USDT", [50000.0] * 60)
+
+    _run_refresh(redis, [_item("BTC/USDT", 51000.0)])
+
+    item = cache.read_tickers().items[0]
+    assert (item.volatility_stddev, item.volatility_atr_pct) == (0.05, pytest.approx(1.0))
+
+
+def test_daily_job_replaces_the_snapshot(session):
+    redis = fakeredis.FakeRedis()
+    cache = SpotPriceCache(redis)
+    cache.write(TickerListResponse(items=[_item("BTC/USDT", 50000.0)], as_of=datetime.now(timezone.utc)))
+    cache.write_volatility({"BTC/USDT": {"volatility_stddev": 0.05, "atr": 510.0, "volatility_percentile_1y": 90.0}})
+    _seed_daily_candles(session, "BTC/USDT", [50000.0] * 60)
+
+    with patch("app.worker.jobs.Redis.from_url", return_value=redis):
+        refresh_volatility_snapshot()
+
+    item = cache.read_tickers().items[0]
+    assert (item.volatility_stddev, item.volatility_atr_pct) == (0.0, pytest.approx(4.0))  # flat closes, ±2% range
@@ -0,0 +1,99 @@
+"""Tests for the array-native block handler contract (SeriesArray, compute_arrays)."""
+import math
+
+import numpy as np
+import pytest
+
+from app.backtest.catalogue import lookup
+from app.backtest.catalogue.types import (
+    ArrayContext,
+    BlockContext,
+    SeriesArray,
+    compute_arrays,
+    compute_lists,
+)
+
+
+def _candle_data(closes: list[float]) -> dict[str, np.ndarray]:
+    column = np.asarray(closes, dtype=np.float64)
+    return {name: column for name in ("open", "high", "low", "close", "volume")}
+
+
+def test_series_array_round_trips_the_list_contract():
+    numeric = SeriesArray.from_list([None, 1.5, math.nan, 2.0], 5)
+    assert numeric.valid.tolist() == [False, True, False, True, False]
+    assert numeric.to_list() == [None, 1.5, None, 2.0, None]
+
+    signal = SeriesArray.from_list([None, True, False], 3)
+    assert signal.is_signal
+    assert signal.to_list() == [None, True, False]
+    assert signal.truthy().tolist() == [False, True, False]
+
+
+@pytest.mark.parametrize(
+    "block_type, params, inputs",
+    [
+        ("and", {}, {"a": [True, True, False, None], "b": [True, False, True, True]}),
+        ("or", {}, {"a": [None, False, 0.0, 2.0], "b": [False, False, False, False]}),
+        ("not", {}, {"input": [True, None, 0.0, math.nan]}),
+        ("entry_signal", {}, {"signal": [1.0, None, False, True]}),
+        ("compare", {"operator": ">"}, {"left": [None, 2.0, 3.0, 1.0], "right": [1.0, 1.0, None, 1.0]}),
+        ("compare", {"operator": "<="}, {"left": [1.0, 2.0, 3.0, 4.0]}),
+        ("crossover", {"direction": "crosses_above"}, {"fast": [1.0, 3.0, None, 3.0], "slow": [2.0, 2.0, 2.0, 2.0]}),
+        ("crossover", {"direction": "crosses_below"}, {"fast": [3.0, 1.0, 3.0, 1.0], "slow": [2.0, 2.0, 2.0, 2.0]}),
+    ],
+)
+def test_array_native_logic_blocks_match_their_list_contract(block_type, params, inputs):
+    handler = lookup(block_type)
+    n = 4
+    list_ctx = BlockContext(candle_data=_candle_data([1.0] * n), params=params, inputs=inputs, n=n)
+    array_ctx = ArrayContext(
+        candle_data=_candle_data([1.0] * n),
+        params=params,
+        inputs={port: SeriesArray.from_list(values, n) for port, values in inputs.items()},
+        n=n,
+    )
+
+    as_lists = handler.compute(list_ctx)
+    as_arrays = handler.compute_arrays(array_ctx)
+
+    assert as_lists == compute_lists(handler, list_ctx)
+    assert {port: series.to_list() for port, series in as_arrays.items()} == as_lists
+    assert all(isinstance(v, bool) for v in as_lists["output"])
+
+
+def test_compare_is_false_where_either_side_is_invalid():
+    handler = lookup("compare")
+    ctx = BlockContext(
+        candle_data=_candle_data([1.0] * 3),
+        params={"operator": "<"},
+        inputs={"left": [None, 1.0, math.nan], "right": [5.0, 5.0, 5.0]},
+        n=3,
+    )
+    assert handler.compute(ctx)["output"] == [False, True, False]
+
+
+def test_list_contract_handlers_run_through_the_shim():
+    class ScaleHandler:
+        """A first-generation handler: lists in, lists out."""
+
+        spec = lookup("sma").spec
+
+        def compute(self, ctx):
+            data = ctx.input("input")
+            return {"output": [None if v is None else v * 2 for v in data]}
+
+        def validate(self, params):
+            return []
+
+    n = 4
+    ctx = ArrayContext(
+        candle_data=_candle_data([1.0] * n),
+        params={},
+        inputs={"input": SeriesArray.from_list([None, 1.0, 2.0], n)},
+        n=n,
+    )
+    result = compute_arrays(ScaleHandler(), ctx)["output"]
+
+    assert result.valid.tolist() == [False, True, True, False]
+    assert result.to_list() == [None, 2.0, 4.0, None]
@@ -85,6 +85,34 @@ def test_cache_has_no_ttl_after_write(cache, redis):
     assert ttl == -1  # -1 means persistent (no expiry)
 
 
+# ── volatility snapshot ───────────────────────────────────────────────────────
+
+def test_read_tickers_is_none_on_cold_cache(cache):
+    cache.write_volatility({"BTC/USDT": {"volatility_stddev": 0.02, "atr": 1_000.0, "volatility_percentile_1y": 40.0}})
+    assert cache.read_tickers() is None
+
+
+def test_read_tickers_merges_the_snapshot_with_atr_pct_at_the_live_price(cache):
+    cache.write(_make_response(price=40_000.0))
+    cache.write_volatility({"BTC/USDT": {"volatility_stddev": 0.02, "atr": 1_000.0, "volatility_percentile_1y": 40.0}})
+
+    item = cache.read_tickers().items[0]
+
+    assert (item.price, item.volatility_stddev, item.volatility_percentile_1y) == (40_000.0, 0.02, 40.0)
+    assert item.volatility_atr_pct == pytest.approx(2.5)
+
+
+def test_read_tickers_leaves_volatility_empty_without_a_snapshot_entry(cache):
+    cache.write(_make_response())
+    assert not cache.has_volatility()
+    item = cache.read_tickers().items[0]
+    assert item.volatility_stddev is item.volatility_atr_pct is item.volatility_percentile_1y is None
+
+    cache.write_volatility({"ETH/USDT": {"volatility_stddev": 0.03, "atr": 90.0, "volatility_percentile_1y": 70.0}})
+    assert cache.has_volatility()
+    assert cache.read_tickers().items[0].volatility_stddev is None
+
+
 # ── viewed_recently ───────────────────────────────────────────────────────────
 
 def test_viewed_recently_returns_true_after_mark_viewed(cache):
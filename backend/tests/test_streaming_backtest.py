@@ -0,0 +1,92 @@
+"""Tests for the candle-at-a-time Engine (app.backtest.streaming)."""
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from app.backtest.candle_frame import CandleFrame
+from app.backtest.engine import run_backtest
+from app.backtest.interpreter import StrategySignals
+from app.backtest.streaming import StreamingBacktest
+from tests.test_multi_engine import _random_signals
+
+
+@pytest.fixture
+def frame(synthetic_ohlcv_candles) -> CandleFrame:
+    return CandleFrame.from_candles(synthetic_ohlcv_candles)
+
+
+def _signals(entry_long, exit_long) -> StrategySignals:
+    return StrategySignals(entry_long, exit_long, 100.0, None, None, None)
+
+
+def _stream(frame, signals):
+    engine = StreamingBacktest.for_signals(signals, 10000.0, 0.001, 0.0005)
+    events = []
+    for i, candle in enumerate(frame.bars):
+        entry = i < len(signals.entry_long) and signals.entry_long[i]
+        events += engine.on_candle(candle, entry, signals.exit_long[i])
+    return engine, events + engine.finish()
+
+
+def test_events_replay_the_batch_result(frame):
+    for signals in _random_signals(len(frame), seed=9):
+        engine, events = _stream(frame, signals)
+        result = run_backtest(frame, signals, 10000.0, 0.001, 0.0005)
+
+        assert engine.equity_curve == result.equity_curve
+        assert engine.trades == result.trades
+        assert [e.trade for e in events if e.kind != "entry"] == result.trades
+        entries = [e for e in events if e.kind == "entry"]
+        assert [e.timestamp for e in entries] == sorted({t.entry_time for t in result.trades})
+        for event in entries:
+            assert event.price == pytest.approx(frame.open[event.index] * 1.0005 * 1.001 * 1.0001)
+
+
+def test_entry_fills_on_the_next_candle(frame):
+    n = len(frame)
+    signals = _signals([i == 10 for i in range(n)], [i == 20 for i in range(n)])
+    engine = StreamingBacktest.for_signals(signals, 10000.0, 0.0, 0.0, spread_rate=0.0)
+    bars = frame.bars
+
+    for i in range(11):
+        assert engine.on_candle(bars[i], signals.entry_long[i]) == []
+    assert len(engine.equity_curve) == 10  # candle 10's point waits for the fill
+
+    [entry] = engine.on_candle(bars[11])
+    assert (entry.kind, entry.index, entry.price) == ("entry", 11, bars[11].open)
+    assert entry.qty == pytest.approx(10000.0 / bars[11].open)
+    assert len(engine.equity_curve) == 12
+
+
+def test_finish_drops_an_unfilled_entry(frame):
+    bars = frame.bars
+    signals = _signals([True], [False])
+    engine = StreamingBacktest.for_signals(signals, 10000.0, 0.001, 0.0005)
+
+    assert engine.on_candle(bars[0], True) == []
+    assert engine.finish() == []
+    assert engine.trades == []
+    assert engine.equity_curve == [{"timestamp": bars[0].timestamp.isoformat(), "equity": 10000.0}]
+
+
+def test_batch_skips_flat_stretches_of_sparse_signals(frame):
+    rng = np.random.default_rng(4)
+    n = len(frame)
+    for signals in _random_signals(n, seed=5):
+        sparse = replace(signals, entry_long=rng.random(n) < 0.01, exit_long=rng.random(n) < 0.01)
+        engine, _ = _stream(frame, sparse)
+        result = run_backtest(frame, sparse, 10000.0, 0.001, 0.0005)
+
+        assert engine.equity_curve == result.equity_curve
+        assert engine.trades == result.trades
+        assert engine.max_drawdown == pytest.approx(result.max_drawdown_pct, abs=0.005)
+
+
+def test_skip_flat_refuses_an_engine_holding_a_position(frame):
+    bars = frame.bars
+    engine = StreamingBacktest.for_signals(_signals([True], [False]), 10000.0, 0.0, 0.0)
+    engine.on_candle(bars[0], True)
+
+    with pytest.raises(ValueError):
+        engine.skip_flat([bars[1].timestamp.isoformat()], bars[1])
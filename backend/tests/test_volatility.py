@@ -0,0 +1,74 @@
+"""Tests for the market volatility metrics (app.backtest.volatility)."""
+import numpy as np
+import pytest
+
+from app.backtest.volatility import (
+    calculate_stddev_volatility,
+    calculate_volatility_percentile,
+    calculate_volatility_percentiles,
+    rolling_stddev_volatility,
+)
+
+
+def _closes(n: int, seed: int = 5, sigma: float = 0.03) -> list[float]:
+    rng = np.random.default_rng(seed)
+    return (30_000 * np.exp(np.cumsum(rng.normal(0, sigma, n)))).tolist()
+
+
+def _percentile_by_windows(closes: list[float], window: int, history_days: int):
+    """The definition: one calculate_stddev_volatility per window of the last history_days closes."""
+    if len(closes) < history_days:
+        return None
+    current = calculate_stddev_volatility(closes[-window:], window)
+    history = [
+        calculate_stddev_volatility(closes[i:i + window], window)
+        for i in range(len(closes) - history_days, len(closes) - window + 1)
+    ]
+    if current is None or not history:
+        return None
+    return round(sum(1 for v in history if v <= current) / len(history) * 100, 1)
+
+
+@pytest.mark.parametrize("window", [3, 10, 30])
+def test_rolling_volatility_matches_each_window(window):
+    closes = _closes(200)
+    rolling = rolling_stddev_volatility(closes, window)
+
+    assert np.isnan(rolling[: window - 1]).all()
+    for end in range(window - 1, len(closes)):
+        expected = calculate_stddev_volatility(closes[end - window + 1 : end + 1], window)
+        assert rolling[end] == pytest.approx(expected, rel=1e-12)
+
+
+@pytest.mark.parametrize("n,window,history_days", [(365, 30, 365), (400, 30, 365), (120, 14, 100), (200, 30, 20)])
+def test_percentile_matches_the_window_by_window_definition(n, window, history_days):
+    for seed in range(5):
+        closes = _closes(n, seed=seed)
+        assert calculate_volatility_percentile(closes, window, history_days) == _percentile_by_windows(
+            closes, window, history_days
+        )
+
+
+def test_flat_windows_have_exactly_zero_volatility():
+    closes = _closes(365)
+    closes[100:200] = [closes[100]] * 100
+    closes[-40:] = [closes[-40]] * 40
+
+    rolling = rolling_stddev_volatility(closes, 30)
+
+    assert (rolling[129:200] == 0.0).all() and rolling[-1] == 0.0
+    assert calculate_volatility_percentile(closes) == _percentile_by_windows(closes, 30, 365)
+
+
+def test_batch_ranks_every_asset_as_the_single_form_does():
+    closes_by_asset = {
+        "BTC/USDT": _closes(365, seed=1),
+        "ETH/USDT": _closes(365, seed=2, sigma=0.05),
+        "SOL/USDT": _closes(400, seed=3),
+        "NEW/USDT": _closes(90, seed=4),  # under a year of history
+    }
+
+    percentiles = calculate_volatility_percentiles(closes_by_asset)
+
+    assert percentiles == {asset: calculate_volatility_percentile(c) for asset, c in closes_by_asset.items()}
+    assert percentiles["NEW/USDT"] is None
@@ -0,0 +1,120 @@
+"""Tests for walk-forward analysis (app.backtest.walk_forward)."""
+import copy
+
+import numpy as np
+import pytest
+
+from app.backtest.candle_frame import CandleFrame
+from app.backtest.errors import BacktestError
+from app.backtest.interpreter import interpret_strategy
+from app.backtest.optimization import expand_grid, outcome_metrics, run_sweep
+from app.backtest.pipeline import BacktestParams, build_outcome
+from app.backtest.walk_forward import _slice_signals, run_walk_forward, split_windows
+from app.data.strategy_templates import TEMPLATES
+from app.schemas.strategy import StrategyDefinitionValidate
+from app.services.parameter_sweep import build_sweep_variants
+from app.services.strategy_validation import validate_strategy
+
+_PARAMS = BacktestParams(initial_balance=10000.0, fee_rate=0.001, slippage_rate=0.0005)
+
+
+def _variants():
+    definition = copy.deepcopy(next(t for t in TEMPLATES if t["name"] == "RSI Oversold Bounce")["definition_json"])
+    strategy = validate_strategy(StrategyDefinitionValidate.model_validate(definition)).strategy
+    grid = {"rsi-1.period": [7, 14], "const-oversold.value": [30, 40]}
+    return build_sweep_variants(strategy, expand_grid(grid))
+
+
+@pytest.fixture
+def frame(synthetic_ohlcv_candles) -> CandleFrame:
+    return CandleFrame.from_candles(synthetic_ohlcv_candles)
+
+
+def test_split_windows_rolls_by_out_of_sample_span(frame):
+    windows = split_windows(frame, in_sample_days=90, out_of_sample_days=30)
+
+    # 252 daily bars: windows start at bars 0, 30, ..., 150; the last OOS is partial.
+    assert [(w.in_sample.start, w.in_sample.stop) for w in windows] == [
+        (0, 90), (30, 120), (60, 150), (90, 180), (120, 210), (150, 240)
+    ]
+    assert [(w.out_of_sample.start, w.out_of_sample.stop) for w in windows][-2:] == [(210, 240), (240, 252)]
+    assert split_windows(frame, in_sample_days=300, out_of_sample_days=30) == []
+    with pytest.raises(ValueError):
+        split_windows(frame, in_sample_days=0, out_of_sample_days=30)
+
+
+def test_split_windows_drops_windows_whose_out_of_sample_falls_in_a_gap():
+    days = np.delete(np.arange("2024-01-01", "2024-02-10", dtype="datetime64[D]"), [20, 21, 22])
+    ones = np.ones(len(days))
+    gapped = CandleFrame.from_arrays(days, ones, ones, ones, ones, ones)
+
+    windows = split_windows(gapped, in_sample_days=10, out_of_sample_days=1)
+
+    # The three windows whose one-day out-of-sample span falls in the gap are dropped.
+    assert [(w.out_of_sample.start, w.out_of_sample.stop) for w in windows] == [(i, i + 1) for i in range(10, 37)]
+    assert [w.index for w in windows] == list(range(27))
+
+
+def test_each_window_picks_in_sample_winner_and_runs_it_out_of_sample(frame):
+    variants = _variants()
+
+    result = run_walk_forward(variants, frame, _PARAMS, 90, 30, rank_by="total_return_pct")
+
+    window = split_windows(frame, 90, 30)[1]
+    second = result.windows[1]
+    # The in-sample winner matches a plain sweep over signals sliced from the full range.
+    in_sample_returns = []
+    for variant in variants:
+        signals = _slice_signals(interpret_strategy(variant.strategy, frame), window.in_sample)
+        in_sample_returns.append(
+            build_outcome(frame[window.in_sample], signals, _PARAMS).total_return_pct
+        )
+    assert second.in_sample_metrics["total_return_pct"] == max(in_sample_returns)
+    best = next(v for v in variants if v.overrides == second.overrides)
+    expected = build_outcome(
+        frame[window.out_of_sample],
+        _slice_signals(interpret_strategy(best.strategy, frame), window.out_of_sample),
+        _PARAMS,
+    )
+    assert second.out_of_sample_metrics == outcome_metrics(expected)
+    assert second.in_sample_start == frame.timestamp_at(30)
+    assert second.out_of_sample_start == frame.timestamp_at(120)
+
+
+def test_stitched_curve_compounds_out_of_sample_windows(frame):
+    result = run_walk_forward(_variants(), frame, _PARAMS, 90, 30)
+
+    assert len(result.equity_curve) == 252 - 90
+    boundary = len(result.windows[0].equity_curve)
+    window_growth = result.windows[1].equity_curve[-1]["equity"] / _PARAMS.initial_balance
+    start_balance = result.windows[0].equity_curve[-1]["equity"]
+    assert result.equity_curve[boundary - 1]["equity"] == pytest.approx(start_balance, abs=0.01)
+    assert result.equity_curve[2 * boundary - 1]["equity"] == pytest.approx(start_balance * window_growth, abs=0.01)
+    assert result.num_trades == sum(w.out_of_sample_metrics["num_trades"] for w in result.windows)
+    assert result.total_return_pct == round((result.equity_curve[-1]["equity"] / 10000.0 - 1) * 100, 2)
+
+
+def test_parallel_windows_match_in_process(frame):
+    variants = _variants()
+
+    assert run_walk_forward(variants, frame, _PARAMS, 120, 30, max_workers=2) == run_walk_forward(
+        variants, frame, _PARAMS, 120, 30, max_workers=1
+    )
+
+
+def test_first_window_ranking_equals_sweep_over_same_bars(frame):
+    variants = _variants()
+
+    result = run_walk_forward(variants, frame, _PARAMS, 200, 60, rank_by="sharpe_ratio")
+    sweep = run_sweep(variants, frame[:200], _PARAMS, rank_by="sharpe_ratio")
+
+    # Signals are interpreted on the full range, but indicators only look
+    # backwards, so the first window's in-sample ranking equals a sweep on
+    # the same bars.
+    assert len(result.windows) == 1
+    assert result.windows[0].overrides == sweep[0].overrides
+
+
+def test_range_too_short_for_a_window_raises(frame):
+    with pytest.raises(BacktestError):
+        run_walk_forward(_variants(), frame, _PARAMS, 400, 30)
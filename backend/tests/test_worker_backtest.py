@@ -1,14 +1,20 @@
 """Worker integration tests for backtest validation failure paths."""
+import copy
 from datetime import datetime, timezone
 from uuid import uuid4
 
+import fakeredis
 from sqlmodel import Session
 
-from app.backtest.pipeline import RunOutcome
+from app.backtest.candle_frame import CandleFrame
+from app.backtest.pipeline import BacktestParams, RunOutcome, run_pipeline
 from app.backtest.types import RiskParams, ValidatedStrategy, ValidationResult
+from app.data.strategy_templates import TEMPLATES
 from app.models.backtest_run import BacktestRun
 from app.models.strategy import Strategy
 from app.models.strategy_version import StrategyVersion
+from app.schemas.strategy import StrategyDefinitionValidate
+from app.services.strategy_validation import validate_strategy
 from app.worker import jobs
 
 
@@ -180,3 +186,82 @@ def test_run_backtest_job_completion_survives_finalization_error(engine, test_us
     assert updated.total_return == 5.0
     assert updated.equity_curve_key is not None
     assert updated.trades_key is not None
+
+
+def test_run_backtest_group_job_runs_every_strategy_in_one_pass(
+    engine, test_user, synthetic_ohlcv_candles, monkeypatch
+):
+    """Group job completes each valid run with its own single-run result; a bad definition fails alone."""
+    definitions = [copy.deepcopy(t["definition_json"]) for t in TEMPLATES[:2]]
+    good = [_create_pending_run(engine, test_user, d) for d in definitions]
+    bad = _create_pending_run(engine, test_user, {"blocks": [], "connections": []})
+    frame = CandleFrame.from_candles(synthetic_ohlcv_candles)
+
+    monkeypatch.setattr(jobs, "engine", engine)
+    monkeypatch.setattr(jobs, "fetch_candles", lambda *a, **kw: frame)
+    monkeypatch.setattr(jobs, "upload_json", lambda key, payload: None)
+    monkeypatch.setattr(jobs, "track_backend_event", lambda *a, **kw: None)
+    monkeypatch.setattr(jobs, "flush_backend_events", lambda *a, **kw: None)
+    finalized = []
+    monkeypatch.setattr(jobs, "finalize_run", lambda run, session: finalized.append(run.id))
+
+    jobs.run_backtest_group_job([str(r.id) for r in [*good, bad]])
+
+    with Session(engine) as s:
+        updated = [s.get(BacktestRun, r.id) for r in good]
+        failed = s.get(BacktestRun, bad.id)
+    assert failed.status == "failed"
+    assert "more issues" in failed.error_message
+    assert finalized == [r.id for r in good]
+    for run, definition in zip(updated, definitions):
+        strategy = validate_strategy(StrategyDefinitionValidate.model_validate(definition)).strategy
+        expected = run_pipeline(strategy, frame, BacktestParams(10000.0, 0.001, 0.001))
+        assert run.status == "completed"
+        assert run.total_return == expected.total_return_pct
+        assert run.num_trades == expected.num_trades
+        assert run.trades_key is not None
+
+
+def test_alert_runs_resume_from_the_previous_engine_checkpoint(
+    engine, test_user, synthetic_ohlcv_candles, monkeypatch
+):
+    """A second alert run over one more candle resumes and matches a full run."""
+    definition = copy.deepcopy(TEMPLATES[0]["definition_json"])
+    runs = [_create_pending_run(engine, test_user, definition) for _ in range(2)]
+    with Session(engine) as s:
+        for run in runs:
+            stored = s.get(BacktestRun, run.id)
+            stored.strategy_version_id = runs[0].strategy_version_id
+            stored.triggered_by = "alert"
+            s.add(stored)
+        s.commit()
+    frame = CandleFrame.from_candles(synthetic_ohlcv_candles)
+    candles = iter([frame[:200], frame[:201]])
+    resumed_from = []
+
+    def spy_pipeline(strategy, candles, params, **kwargs):
+        resumed_from.append(kwargs["resume_from"])
+        return run_pipeline(strategy, candles, params, **kwargs)
+
+    fake_redis = fakeredis.FakeRedis()
+    monkeypatch.setattr(jobs, "engine", engine)
+    monkeypatch.setattr(jobs.Redis, "from_url", lambda url: fake_redis)
+    monkeypatch.setattr(jobs, "fetch_candles", lambda *a, **kw: next(candles))
+    monkeypatch.setattr(jobs, "run_pipeline", spy_pipeline)
+    monkeypatch.setattr(jobs, "upload_json", lambda key, payload: None)
+    monkeypatch.setattr(jobs, "track_backend_event", lambda *a, **kw: None)
+    monkeypatch.setattr(jobs, "flush_backend_events", lambda *a, **kw: None)
+    monkeypatch.setattr(jobs, "finalize_run", lambda run, session: None)
+
+    for run in runs:
+        jobs.run_backtest_job(str(run.id))
+
+    assert resumed_from[0] is None
+    assert resumed_from[1].next_index == 200
+    strategy = validate_strategy(StrategyDefinitionValidate.model_validate(definition)).strategy
+    expected = run_pipeline(strategy, frame[:201], BacktestParams(10000.0, 0.001, 0.001))
+    with Session(engine) as s:
+        updated = s.get(BacktestRun, runs[1].id)
+    assert updated.status == "completed"
+    assert updated.total_return == expected.total_return_pct
+    assert updated.max_drawdown == expected.max_drawdown_pct